@@ -0,0 +1,72 @@
+"""
+Compare two benchmark result files written by benchmarks.run.
+
+Usage:
+    python -m benchmarks.compare base.json results.json --threshold 0.1
+
+Prints the throughput ratio of every benchmark present in both files and
+exits with status 1 if any of them got slower by more than the threshold.
+"""
+
+import argparse
+import json
+import sys
+
+
+def compare(base, current, threshold=0.1):
+    """
+    Compare the throughput of two benchmark reports.
+
+    Parameters:
+    base (dict): The reference report.
+    current (dict): The report to check.
+    threshold (float): The tolerated relative slowdown (default is 0.1, i.e. 10%).
+
+    Returns:
+    list: One (name, size, base ops/sec, current ops/sec, ratio, regressed) tuple
+    per benchmark present in both reports.
+    """
+    base_results = {
+        (result["name"], result["size"]): result for result in base["results"]
+    }
+    rows = []
+    for result in current["results"]:
+        key = (result["name"], result["size"])
+        if key not in base_results:
+            continue
+        before = base_results[key]["ops_per_sec"]
+        after = result["ops_per_sec"]
+        ratio = after / before
+        rows.append((*key, before, after, ratio, ratio < 1 - threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("base", help="The reference results file.")
+    parser.add_argument("current", help="The results file to check.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="The tolerated relative slowdown (default is 0.1).",
+    )
+    args = parser.parse_args(argv)
+
+    with open(args.base) as file:
+        base = json.load(file)
+    with open(args.current) as file:
+        current = json.load(file)
+
+    rows = compare(base, current, args.threshold)
+    for name, size, before, after, ratio, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(
+            f"{name:<28} {size:>10} {before:>14,.0f} -> {after:>14,.0f} ops/s "
+            f"({ratio:6.2f}x){flag}"
+        )
+    return 1 if any(row[-1] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
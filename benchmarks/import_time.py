@@ -0,0 +1,146 @@
+"""
+Import-time benchmark for the geotools package.
+
+Usage:
+    python -m benchmarks.import_time --output import-results.json
+    python -m benchmarks.compare base-import.json import-results.json
+
+Each case runs a statement in a fresh interpreter, so nothing is cached in
+sys.modules between runs. The report lists the median and best wall time of
+every case and the heavy dependencies it loaded. The "size" of every result
+is 1, so "ops_per_sec" is the number of imports per second and the file can
+be compared with benchmarks.compare.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+# Dependencies that the package only imports when they are needed
+HEAVY_MODULES = ("numpy", "requests", "asyncio", "sqlite3", "concurrent.futures")
+
+CASES = {
+    "python": "pass",
+    "import_geotools": "import geotools",
+    "import_distance": "import geotools.distance",
+    "import_analysis": "import geotools.analysis",
+    "import_geocode": "import geotools.geocode",
+    "scalar_haversine": (
+        "from geotools.distance import haversine_distance\n"
+        "haversine_distance((40.7128, -74.0060), (34.0522, -118.2437))"
+    ),
+}
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+exec({statement!r})
+elapsed = time.perf_counter() - start
+print(elapsed)
+print(",".join(name for name in {modules!r} if name in sys.modules))
+"""
+
+_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+
+def measure(statement, repeat=10):
+    """
+    Time a statement in fresh interpreters.
+
+    Parameters:
+    statement (str): The Python code to run.
+    repeat (int): The number of interpreters to start.
+
+    Returns:
+    tuple: The in-process durations in seconds and the heavy modules loaded.
+    """
+    durations = []
+    loaded = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                _PROBE.format(statement=statement, modules=HEAVY_MODULES),
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=_ROOT,
+        ).stdout.splitlines()
+        durations.append(float(output[0]))
+        loaded = [name for name in output[1].split(",") if name]
+    return durations, loaded
+
+
+def run_benchmarks(names=None, repeat=10, log=None):
+    """
+    Run the import-time benchmarks.
+
+    Parameters:
+    names (sequence): The names of the cases to run (default is all of them).
+    repeat (int): The number of interpreters started for each case.
+    log (callable): Called with a line of text after each case.
+
+    Returns:
+    dict: The environment ("meta") and the statistics of each case ("results").
+    """
+    results = []
+    for name, statement in CASES.items():
+        if names and name not in names:
+            continue
+        durations, loaded = measure(statement, repeat)
+        best = min(durations)
+        median = statistics.median(durations)
+        results.append(
+            {
+                "name": name,
+                "size": 1,
+                "repeat": repeat,
+                "seconds": {"best": best, "median": median},
+                "ops_per_sec": 1 / median,
+                "loaded": loaded,
+            }
+        )
+        if log is not None:
+            log(
+                f"{name:<20} median {median * 1000:>8.2f} ms "
+                f"best {best * 1000:>8.2f} ms  loaded: {', '.join(loaded) or '-'}"
+            )
+
+    meta = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+    return {"meta": meta, "results": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--cases",
+        nargs="+",
+        choices=list(CASES),
+        help="Cases to run (default is all of them).",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=10, help="Interpreters started per case."
+    )
+    parser.add_argument("--output", help="The JSON results file.")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.cases, args.repeat, log=print)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,597 @@
+"""
+Benchmark suite for the distance, centroid and geocoding hot paths.
+
+Usage:
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --sizes 1000 100000 --repeat 3 --output results.json
+    python -m benchmarks.compare base.json results.json
+
+Every benchmark runs on a synthetic dataset generated from a fixed seed, so
+two runs (e.g. on two commits) measure exactly the same work. Each benchmark
+reports the throughput (operations per second), latency percentiles and the
+peak memory allocated while it runs (measured in a separate run with
+tracemalloc, so tracing does not distort the timings).
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from functools import lru_cache
+import numpy as np
+
+from geotools.analysis import (
+    batch_iterator,
+    calculate_centroid,
+    dbscan,
+    kmeans,
+    summarize,
+)
+from geotools.cells import cell_encode
+from geotools.config import Config
+from geotools.distance import (
+    AnchorSet,
+    _haversine_distance,
+    _vincenty_distance,
+    approximate_distance,
+    batch_haversine_distance,
+    batch_vincenty_distance,
+    haversine_distance,
+    vincenty_distance,
+    within_radius,
+)
+from geotools.geocode import geocode_address, geocode_many
+from geotools.geodesic import batch_geodesic_distance
+from geotools.index import nearest_join
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "tests"))
+from stub_server import StubGeocodingServer  # noqa: E402
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000, 10_000_000)
+SEED = 20240101
+
+# Largest dataset used by benchmarks that make one Python call (or one HTTP
+# request) per item; larger sizes are skipped for them.
+LIMITS = {
+    "haversine_distance": 100_000,
+    "vincenty_distance": 100_000,
+    "lru_haversine_distance": 100_000,
+    "lru_vincenty_distance": 100_000,
+    "cached_haversine_distance": 100_000,
+    "batch_vincenty_distance": 1_000_000,
+    "calculate_centroid_tuples": 1_000_000,
+    "batch_iterator": 1_000_000,
+    "geocode_address": 1_000,
+    "geocode_many": 10_000,
+}
+
+
+def random_points(size, seed=SEED):
+    """
+    Generate points uniformly distributed on the sphere.
+
+    Parameters:
+    size (int): The number of points.
+    seed (int): The seed of the random generator.
+
+    Returns:
+    numpy.ndarray: An (N, 2) array of latitudes and longitudes.
+    """
+    rng = np.random.default_rng(seed)
+    latitudes = np.degrees(np.arcsin(rng.uniform(-1, 1, size)))
+    longitudes = rng.uniform(-180, 180, size)
+    return np.column_stack([latitudes, longitudes])
+
+
+def _percentiles(latencies):
+    p50, p90, p99 = np.percentile(np.asarray(latencies) * 1e6, [50, 90, 99])
+    return {"p50": float(p50), "p90": float(p90), "p99": float(p99)}
+
+
+class Benchmark:
+    """
+    A benchmark over a dataset of a given size.
+
+    Subclasses implement setup (build the dataset, untimed) and run (the timed
+    work, processing size items). Per-item benchmarks also implement items,
+    which yields one callable per item so single-call latencies can be sampled.
+    """
+
+    name = None
+
+    def __init__(self, size):
+        self.size = size
+
+    def setup(self):
+        pass
+
+    def run(self):
+        raise NotImplementedError
+
+    def teardown(self):
+        pass
+
+    def items(self):
+        return None
+
+
+class HaversineDistance(Benchmark):
+    """
+    Scalar distances between random points, with the default configuration.
+    """
+
+    name = "haversine_distance"
+    function = staticmethod(haversine_distance)
+
+    def setup(self):
+        self.points1 = [tuple(point) for point in random_points(self.size).tolist()]
+        self.points2 = [
+            tuple(point) for point in random_points(self.size, SEED + 1).tolist()
+        ]
+
+    def run(self):
+        function = self.function
+        for point1, point2 in zip(self.points1, self.points2):
+            function(point1, point2)
+
+    def items(self):
+        function = self.function
+        for point1, point2 in zip(self.points1[:1000], self.points2[:1000]):
+            yield lambda: function(point1, point2)
+
+
+class VincentyDistance(HaversineDistance):
+    name = "vincenty_distance"
+    function = staticmethod(vincenty_distance)
+
+
+@lru_cache(maxsize=128)
+def _lru_haversine_distance(point1, point2, unit=None):
+    return _haversine_distance(point1, point2, Config.unit if unit is None else unit)
+
+
+@lru_cache(maxsize=128)
+def _lru_vincenty_distance(point1, point2, unit=None):
+    return _vincenty_distance(point1, point2, Config.unit if unit is None else unit)
+
+
+class LruHaversineDistance(HaversineDistance):
+    """
+    The lru_cache(maxsize=128) that wrapped haversine_distance before the
+    DistanceCache: the baseline of haversine_distance, which must not be slower.
+    """
+
+    name = "lru_haversine_distance"
+    function = staticmethod(_lru_haversine_distance)
+
+
+class LruVincentyDistance(HaversineDistance):
+    name = "lru_vincenty_distance"
+    function = staticmethod(_lru_vincenty_distance)
+
+
+class CachedHaversineDistance(HaversineDistance):
+    """
+    Repeated route legs through an enabled DistanceCache: 100 distinct legs
+    cycled over the dataset, so nearly every call is a hit.
+    """
+
+    name = "cached_haversine_distance"
+
+    def setup(self):
+        super().setup()
+        self.points1 = (self.points1[:100] * (self.size // 100 + 1))[: self.size]
+        self.points2 = (self.points2[:100] * (self.size // 100 + 1))[: self.size]
+        self.cache_size = Config.distance_cache_size
+        Config.distance_cache_size = 1000
+
+    def teardown(self):
+        Config.distance_cache_size = self.cache_size
+
+
+class BatchHaversineDistance(Benchmark):
+    name = "batch_haversine_distance"
+    function = staticmethod(batch_haversine_distance)
+
+    def setup(self):
+        self.points1 = random_points(self.size)
+        self.points2 = random_points(self.size, SEED + 1)
+
+    def run(self):
+        self.function(self.points1, self.points2)
+
+
+class BatchVincentyDistance(BatchHaversineDistance):
+    name = "batch_vincenty_distance"
+    function = staticmethod(batch_vincenty_distance)
+
+
+class BatchGeodesicDistance(BatchHaversineDistance):
+    name = "batch_geodesic_distance"
+    function = staticmethod(batch_geodesic_distance)
+
+
+class AntipodalGeodesicDistance(BatchHaversineDistance):
+    """
+    Nearly antipodal pairs, the worst case of the Vincenty iteration.
+    """
+
+    name = "antipodal_geodesic_distance"
+    function = staticmethod(batch_geodesic_distance)
+
+    def setup(self):
+        self.points1 = random_points(self.size)
+        offsets = random_points(self.size, SEED + 1) / 180
+        self.points2 = np.column_stack(
+            [
+                np.clip(offsets[:, 0] - self.points1[:, 0], -90, 90),
+                (self.points1[:, 1] + 360 + offsets[:, 1]) % 360 - 180,
+            ]
+        )
+
+
+class AntipodalVincentyDistance(AntipodalGeodesicDistance):
+    name = "antipodal_vincenty_distance"
+    function = staticmethod(batch_vincenty_distance)
+
+
+class ApproximateDistance(BatchHaversineDistance):
+    """
+    Flat-earth approximation: compare with batch_vincenty_distance.
+    """
+
+    name = "approximate_distance"
+
+    def run(self):
+        approximate_distance(self.points1, self.points2, method="flat")
+
+
+class AnchorHaversineDistance(Benchmark):
+    """
+    Distances from 1000 prepared anchors to assigned points: compare with
+    batch_haversine_distance, which recomputes the anchor terms per pair.
+    """
+
+    name = "anchor_haversine_distance"
+
+    def setup(self):
+        self.anchors = AnchorSet(random_points(1000))
+        self.points = random_points(self.size, SEED + 1)
+        self.indices = np.random.default_rng(SEED).integers(0, 1000, self.size)
+
+    def run(self):
+        self.anchors.batch_haversine_distance(self.points, self.indices)
+
+
+class CellEncode(Benchmark):
+    """
+    Level 30 Hilbert cell IDs, the key for grouping points with an integer sort.
+    """
+
+    name = "cell_encode"
+
+    def setup(self):
+        self.points = random_points(self.size)
+
+    def run(self):
+        cell_encode(self.points)
+
+
+class WithinRadius(Benchmark):
+    """
+    Radius search around New York City: compare with batch_haversine_distance,
+    which computes the distance to every candidate.
+    """
+
+    name = "within_radius"
+
+    def setup(self):
+        self.points = random_points(self.size)
+
+    def run(self):
+        within_radius((40.7128, -74.0060), self.points, 100)
+
+
+class NearestJoin(Benchmark):
+    """
+    The nearest of 10000 stores for every customer, through a SpatialIndex.
+    """
+
+    name = "nearest_join"
+
+    def setup(self):
+        self.stores = random_points(10000, SEED + 1)
+        self.points = random_points(self.size)
+
+    def run(self):
+        nearest_join(self.points, self.stores)
+
+
+class CalculateCentroid(Benchmark):
+    name = "calculate_centroid"
+
+    def setup(self):
+        self.points = random_points(self.size)
+
+    def run(self):
+        calculate_centroid(self.points)
+
+
+class CalculateCentroidTuples(Benchmark):
+    name = "calculate_centroid_tuples"
+
+    def setup(self):
+        self.points = [tuple(point) for point in random_points(self.size).tolist()]
+
+    def run(self):
+        calculate_centroid(iter(self.points))
+
+
+class DBSCAN(Benchmark):
+    """
+    Stops of 50 pings scattered over about 20 meters, clustered with a 50 meter
+    radius.
+    """
+
+    name = "dbscan"
+
+    def setup(self):
+        rng = np.random.default_rng(1)
+        stops = random_points(max(1, self.size // 50))
+        self.points = np.repeat(stops, 50, axis=0)[: self.size]
+        self.points += rng.normal(0, 1e-4, self.points.shape)
+        self.points[:, 0] = np.clip(self.points[:, 0], -90, 90)
+        self.points[:, 1] = (self.points[:, 1] + 180) % 360 - 180
+
+    def run(self):
+        dbscan(self.points, 0.05, min_samples=10)
+
+
+class KMeans(Benchmark):
+    """
+    Ten iterations of k-means with 100 clusters.
+    """
+
+    name = "kmeans"
+
+    def setup(self):
+        self.points = random_points(self.size)
+
+    def run(self):
+        kmeans(self.points, min(100, self.size), max_iterations=10, seed=0)
+
+
+class Summarize(Benchmark):
+    """
+    Count, centroid, bounds, dispersion and hull: compare with calculate_centroid.
+    """
+
+    name = "summarize"
+
+    def setup(self):
+        self.points = random_points(self.size)
+
+    def run(self):
+        summarize(self.points)
+
+
+class BatchIterator(CalculateCentroidTuples):
+    name = "batch_iterator"
+
+    def run(self):
+        for _ in batch_iterator(iter(self.points), 1000):
+            pass
+
+
+class GeocodeAddress(Benchmark):
+    name = "geocode_address"
+
+    def setup(self):
+        self.server = StubGeocodingServer().__enter__()
+        self.endpoints = Config.geocode_endpoints
+        Config.geocode_endpoints = self.server.endpoints
+        self.addresses = [f"{i} Main Street" for i in range(self.size)]
+        self.round = 0
+
+    def _addresses(self):
+        # Fresh addresses on every run so the lru_cache never answers
+        self.round += 1
+        return [f"{address}, {self.round}" for address in self.addresses]
+
+    def run(self):
+        for address in self._addresses():
+            geocode_address(address)
+
+    def items(self):
+        for address in self._addresses()[:200]:
+            yield lambda: geocode_address(address)
+
+    def teardown(self):
+        Config.geocode_endpoints = self.endpoints
+        self.server.__exit__(None, None, None)
+
+
+class GeocodeMany(GeocodeAddress):
+    name = "geocode_many"
+
+    def setup(self):
+        super().setup()
+        self.rate_limits = Config.geocode_rate_limits
+        Config.geocode_rate_limits = {}  # The stub server has no quota
+
+    def run(self):
+        for _ in geocode_many(self._addresses()):
+            pass
+
+    def items(self):
+        return None
+
+    def teardown(self):
+        Config.geocode_rate_limits = self.rate_limits
+        super().teardown()
+
+
+BENCHMARKS = (
+    HaversineDistance,
+    LruHaversineDistance,
+    CachedHaversineDistance,
+    VincentyDistance,
+    LruVincentyDistance,
+    BatchHaversineDistance,
+    BatchVincentyDistance,
+    BatchGeodesicDistance,
+    AntipodalVincentyDistance,
+    AntipodalGeodesicDistance,
+    ApproximateDistance,
+    AnchorHaversineDistance,
+    CellEncode,
+    WithinRadius,
+    NearestJoin,
+    CalculateCentroid,
+    CalculateCentroidTuples,
+    BatchIterator,
+    Summarize,
+    DBSCAN,
+    KMeans,
+    GeocodeAddress,
+    GeocodeMany,
+)
+
+
+def measure(benchmark, repeat):
+    """
+    Run a benchmark and collect its statistics.
+
+    Parameters:
+    benchmark (Benchmark): The benchmark, already set up.
+    repeat (int): The number of timed runs.
+
+    Returns:
+    dict: The throughput, latency percentiles and peak memory of the benchmark.
+    """
+    benchmark.run()  # Warm up
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        benchmark.run()
+        durations.append(time.perf_counter() - start)
+
+    items = benchmark.items()
+    if items is None:
+        # Latency of a whole run, per item
+        latencies = [duration / benchmark.size for duration in durations]
+    else:
+        latencies = []
+        for call in items:
+            start = time.perf_counter()
+            call()
+            latencies.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        benchmark.run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    best = min(durations)
+    return {
+        "name": benchmark.name,
+        "size": benchmark.size,
+        "repeat": repeat,
+        "seconds": {"best": best, "median": float(np.median(durations))},
+        "ops_per_sec": benchmark.size / best,
+        "latency_us": _percentiles(latencies),
+        "peak_memory_bytes": peak,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, names=None, repeat=5, log=None):
+    """
+    Run the benchmark suite.
+
+    Parameters:
+    sizes (sequence): The dataset sizes.
+    names (sequence): The names of the benchmarks to run (default is all of them).
+    repeat (int): The number of timed runs of each benchmark.
+    log (callable): Called with a line of text after each benchmark.
+
+    Returns:
+    dict: The environment ("meta") and the statistics of each benchmark ("results").
+    """
+    results = []
+    for cls in BENCHMARKS:
+        if names and cls.name not in names:
+            continue
+        for size in sizes:
+            if size > LIMITS.get(cls.name, size):
+                continue
+            benchmark = cls(size)
+            benchmark.setup()
+            try:
+                result = measure(benchmark, repeat)
+            finally:
+                benchmark.teardown()
+            results.append(result)
+            if log is not None:
+                log(
+                    f"{result['name']:<28} {size:>10} "
+                    f"{result['ops_per_sec']:>14,.0f} ops/s "
+                    f"p50 {result['latency_us']['p50']:>10.3f} us "
+                    f"peak {result['peak_memory_bytes'] / 2**20:>9.1f} MiB"
+                )
+
+    meta = {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "seed": SEED,
+    }
+    return {"meta": meta, "results": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Dataset sizes."
+    )
+    parser.add_argument(
+        "--benchmarks",
+        nargs="+",
+        choices=[cls.name for cls in BENCHMARKS],
+        help="Benchmarks to run (default is all of them).",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case.")
+    parser.add_argument(
+        "--output", default="benchmark-results.json", help="The JSON results file."
+    )
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes, args.benchmarks, args.repeat, log=print)
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
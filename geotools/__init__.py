@@ -1,3 +1,94 @@
 # Initialize the geotools package
 
-from geotools.distance import haversine_distance, vincenty_distance
+import importlib
+import sys
+
+# Public names and the submodules that define them. They are imported on first
+# access, so "import geotools" does not load NumPy or requests.
+_EXPORTS = {
+    "haversine_distance": "geotools.distance",
+    "vincenty_distance": "geotools.distance",
+    "async_haversine_distance": "geotools.distance",
+    "async_vincenty_distance": "geotools.distance",
+    "batch_haversine_distance": "geotools.distance",
+    "batch_vincenty_distance": "geotools.distance",
+    "distance_matrix": "geotools.distance",
+    "within_radius": "geotools.distance",
+    "approximate_distance": "geotools.distance",
+    "PreparedPoint": "geotools.distance",
+    "AnchorSet": "geotools.distance",
+    "DistanceCache": "geotools.distance",
+    "geodesic_distance": "geotools.geodesic",
+    "geodesic_inverse": "geotools.geodesic",
+    "geodesic_direct": "geotools.geodesic",
+    "batch_geodesic_distance": "geotools.geodesic",
+    "batch_geodesic_direct": "geotools.geodesic",
+    "geohash_encode": "geotools.cells",
+    "geohash_decode": "geotools.cells",
+    "geohash_bounds": "geotools.cells",
+    "geohash_neighbors": "geotools.cells",
+    "geohash_covering": "geotools.cells",
+    "cell_encode": "geotools.cells",
+    "cell_decode": "geotools.cells",
+    "cell_bounds": "geotools.cells",
+    "cell_level": "geotools.cells",
+    "cell_parent": "geotools.cells",
+    "cell_range": "geotools.cells",
+    "cell_neighbors": "geotools.cells",
+    "cell_covering": "geotools.cells",
+    "PointArray": "geotools.points",
+    "read_points": "geotools.io",
+    "read_csv": "geotools.io",
+    "read_geojson": "geotools.io",
+    "write_points": "geotools.io",
+    "SpatialIndex": "geotools.index",
+    "nearest_join": "geotools.index",
+    "calculate_centroid": "geotools.analysis",
+    "CentroidAccumulator": "geotools.analysis",
+    "summarize": "geotools.analysis",
+    "SummaryAccumulator": "geotools.analysis",
+    "dbscan": "geotools.analysis",
+    "kmeans": "geotools.analysis",
+    "geocode_address": "geotools.geocode",
+    "async_geocode_address": "geotools.geocode",
+    "AsyncGeocoder": "geotools.geocode",
+    "geocode_many": "geotools.geocode",
+    "GeocodeCache": "geotools.cache",
+    "Config": "geotools.config",
+}
+
+_SUBMODULES = (
+    "analysis",
+    "cache",
+    "cells",
+    "config",
+    "distance",
+    "geocode",
+    "geodesic",
+    "index",
+    "io",
+    "metrics",
+    "parallel",
+    "points",
+)
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module("geotools." + name)
+    else:
+        raise AttributeError(f"module 'geotools' has no attribute '{name}'")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS) | set(_SUBMODULES))
+
+
+if sys.version_info < (3, 7):  # No module __getattr__ before Python 3.7
+    from geotools.distance import haversine_distance, vincenty_distance  # noqa: F401
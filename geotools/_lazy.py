@@ -0,0 +1,41 @@
+import importlib
+import sys
+import types
+
+# Modules of this package are forwarded to on every access instead of copied
+_PACKAGE = __name__.partition(".")[0] + "."
+
+
+class LazyModule(types.ModuleType):
+    """
+    Placeholder for a module that is imported on first attribute access.
+
+    On first use the module is imported. The attributes of a third-party module
+    are copied into the placeholder, so later lookups cost the same as on the
+    module itself; this suits modules whose attributes do not change after
+    import (e.g. NumPy). Modules of this package may hold state that changes or
+    is patched later, so every lookup is forwarded to the module instead.
+    """
+
+    def __getattr__(self, attribute):
+        name = self.__name__
+        module = sys.modules.get(name) or importlib.import_module(name)
+        if not name.startswith(_PACKAGE):
+            self.__dict__.update(module.__dict__)
+        return getattr(module, attribute)
+
+    def __repr__(self):
+        return f"<lazy module '{self.__name__}'>"
+
+
+def lazy_import(name):
+    """
+    Return a module that is imported on first attribute access.
+
+    Parameters:
+    name (str): The absolute name of the module, e.g. "numpy".
+
+    Returns:
+    module: A LazyModule placeholder for the module.
+    """
+    return LazyModule(name)
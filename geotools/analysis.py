@@ -1,4 +1,40 @@
-import numpy as np
+import itertools
+import math
+from geotools._lazy import lazy_import
+from geotools.config import Config
+from geotools.distance import EARTH_RADIUS_KM
+from geotools.metrics import instrument
+from geotools.points import PointArray, _validate_coordinates
+
+np = lazy_import("numpy")
+index = lazy_import("geotools.index")
+
+# Minimum number of rows reduced at once when the points are already an array
+_ARRAY_BATCH_SIZE = 65536
+
+# Number of point pairs compared at once by dbscan, and the cost above which a
+# pair of dense cells is compared block by block with an early exit instead
+_PAIR_BATCH_SIZE = 1 << 21
+_DENSE_PAIR_COST = 1 << 17
+
+# Rows of points compared with the k-means centers at once, so that the block
+# of similarities stays in the CPU cache
+_ASSIGN_BLOCK_SIZE = 1024
+
+# Grid cells of dbscan are at least this large (on the unit sphere), so the 3
+# cell coordinates fit in 21 bits each and a cell is keyed by one int64
+_CELL_BITS = 21
+_MIN_CELL_SIZE = 2.0**-20 * (1 + 2.0**-20)
+
+# The candidates for the farthest point of a summary are their extremes along
+# this many directions (compared in blocks of this many points), and the hull
+# of those that fit in a hemisphere. The center of the hemisphere is searched
+# for at most this many steps, and the points must be less than about 89.9
+# degrees from it (with a cosine of at least this) to be projected around it.
+_EXTREME_DIRECTIONS = 64
+_EXTREME_BLOCK_SIZE = 2048
+_HEMISPHERE_ITERATIONS = 100
+_MIN_HEMISPHERE_COSINE = 1e-3
 
 
 def batch_iterator(data, size):
@@ -6,66 +42,1289 @@ def batch_iterator(data, size):
     Generate batches of data for processing.
 
     Parameters:
-    data (list or generator): The data to be processed in batches.
+    data (list, numpy.ndarray, PointArray or generator): The data to be processed in batches,
+    or an iterable of (N, 2) chunks of points such as the readers of geotools.io.
     size (int): The size of each batch.
 
     Yields:
-    list: A batch of data.
+    list, numpy.ndarray or PointArray: A batch of data. Arrays (including memory-mapped
+    arrays and PointArrays) are sliced, so their batches are views that share memory
+    with the input. Chunks of points are regrouped into chunks of size points.
     """
-    if isinstance(data, list):
+    if isinstance(data, (list, np.ndarray, PointArray)):
         for i in range(0, len(data), size):
             yield data[i : i + size]
+        return
+
+    iterator = iter(data)
+    for first in iterator:
+        break
     else:
-        batch = []
-        for item in data:
-            batch.append(item)
-            if len(batch) == size:
-                yield batch
-                batch = []
-        if batch:
+        return
+    if _is_point_chunk(first):
+        yield from _rebatch(itertools.chain([first], iterator), size)
+        return
+
+    batch = []
+    for item in itertools.chain([first], iterator):
+        batch.append(item)
+        if len(batch) == size:
             yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _concatenate(chunks):
+    """
+    Join chunks of points into a single array or PointArray.
+    """
+    if len(chunks) == 1:
+        return chunks[0]
+    if all(isinstance(chunk, PointArray) for chunk in chunks):
+        return PointArray._from_data(
+            np.concatenate([chunk._data for chunk in chunks], axis=1)
+        )
+    return np.concatenate([np.asarray(chunk) for chunk in chunks])
+
+
+def _rebatch(chunks, size):
+    """
+    Regroup an iterable of chunks of points into chunks of exactly size points (except the last).
+    """
+    pending = []
+    count = 0
+    for chunk in chunks:
+        pending.append(chunk)
+        count += len(chunk)
+        if count < size:
+            continue
+        merged = _concatenate(pending)
+        stop = count - count % size
+        for start in range(0, stop, size):
+            yield merged[start : start + size]
+        pending = [merged[stop:]] if stop < count else []
+        count -= stop
+    if count:
+        yield _concatenate(pending)
+
+
+class _ExactSum:
+    """
+    Running sum of floats without rounding error (Shewchuk's algorithm, as in math.fsum).
+
+    Partial sums can be merged exactly, so the total does not depend on how the
+    values were split across accumulators.
+    """
+
+    __slots__ = ("partials",)
+
+    def __init__(self):
+        self.partials = []
+
+    def add(self, x):
+        partials = self.partials
+        i = 0
+        for y in partials:
+            if abs(x) < abs(y):
+                x, y = y, x
+            hi = x + y
+            lo = y - (hi - x)
+            if lo:
+                partials[i] = lo
+                i += 1
+            x = hi
+        partials[i:] = [x]
+
+    def merge(self, other):
+        for partial in other.partials:
+            self.add(partial)
+
+    def value(self):
+        return math.fsum(self.partials)
+
+
+def _is_point_chunk(item):
+    """
+    Return True if an item of an iterable is a chunk of points rather than a single point.
+    """
+    return isinstance(item, PointArray) or (
+        isinstance(item, np.ndarray) and item.ndim == 2
+    )
+
+
+def _as_point_chunk(batch):
+    """
+    Convert a batch of points to an (N, 2) numeric array without copying arrays.
+
+    Raises:
+    ValueError: If the batch contains invalid points.
+    """
+    try:
+        chunk = np.asarray(batch)
+    except ValueError:
+        chunk = None
+    if (
+        chunk is not None
+        and chunk.dtype.kind in "biuf"
+        and chunk.ndim == 2
+        and chunk.shape[1] == 2
+    ):
+        return chunk
+    if chunk is not None and chunk.size == 0:
+        return chunk.reshape(0, 2).astype(np.float64)
+
+    # Only the error path looks at individual points
+    if isinstance(batch, np.ndarray):
+        raise ValueError(
+            f"Invalid points array with shape {batch.shape} and dtype {batch.dtype}. Points must be an (N, 2) numeric array."
+        )
+    for point in batch:
+        if (
+            not isinstance(point, (tuple, list, np.ndarray))
+            or len(point) != 2
+            or not all(isinstance(coord, (int, float, np.number)) for coord in point)
+        ):
+            raise ValueError(
+                f"Invalid point: {point}. Each point must be a tuple of two numeric values."
+            )
+    raise ValueError(
+        f"Invalid points: {batch}. Each point must be a tuple of two numeric values."
+    )
+
+
+def _point_chunks(points, batch_size):
+    """
+    Yield the points as (N, 2) numeric arrays.
+
+    Parameters:
+    points (list, numpy.ndarray, PointArray or iterable): Points, or an iterable of (N, 2) chunks of points.
+    batch_size (int): The number of points per chunk for lists and iterables of points.
+    """
+    if isinstance(points, PointArray):
+        points = points.to_numpy()
+    if isinstance(points, np.ndarray):
+        if points.shape == (2,):
+            points = points.reshape(1, 2)  # A single point
+        if points.ndim != 2:
+            yield _as_point_chunk(points)
+            return
+        batches = batch_iterator(points, max(batch_size, _ARRAY_BATCH_SIZE))
+    elif isinstance(points, list) and not (points and _is_point_chunk(points[0])):
+        batches = batch_iterator(points, batch_size)
+    else:
+        iterator = iter(points)
+        for first in iterator:
+            break
+        else:
+            return
+        if _is_point_chunk(first):
+            batches = itertools.chain([first], iterator)
+        else:
+            batches = batch_iterator(itertools.chain([first], iterator), batch_size)
+
+    for batch in batches:
+        yield _as_point_chunk(batch)
+
+
+def _weight_chunks(weights, dtype=None):
+    """
+    Return a function that takes the weights of the next n points.
+
+    Parameters:
+    weights (list, numpy.ndarray or iterable): One non-negative weight per point.
+    dtype (numpy.dtype): The dtype of the returned chunks (default is numpy.float64).
+    """
+    if dtype is None:
+        dtype = np.float64
+    if isinstance(weights, (list, tuple, np.ndarray)):
+        weights = np.asarray(weights, dtype=dtype)
+        offset = [0]
+
+        def take(n):
+            chunk = weights[offset[0] : offset[0] + n]
+            offset[0] += n
+            return chunk
+
+        take.remaining = lambda: weights.size - offset[0]
+    else:
+        iterator = iter(weights)
+
+        def take(n):
+            return np.fromiter(itertools.islice(iterator, n), dtype=dtype)
+
+        take.remaining = lambda: sum(1 for _ in iterator)
+    return take
+
+
+class CentroidAccumulator:
+    """
+    Mergeable accumulator for the centroid of a set of points.
+
+    Points are added chunk by chunk; every chunk is reduced in one vectorized pass
+    and the chunk sums are kept without rounding error. Accumulators that were
+    fed disjoint parts of a dataset (e.g. in separate worker processes) can be
+    merged, and the merged result is exactly the result of a single accumulator
+    fed all of the same chunks.
+
+    Attributes:
+    method (str): The centroid definition, "arithmetic" (mean latitude and longitude)
+    or "spherical" (normalized mean of the 3D unit vectors of the points).
+    count (int): The number of points added so far.
+    """
+
+    __slots__ = ("method", "count", "_sums", "_weight")
+
+    def __init__(self, method="arithmetic"):
+        """
+        Create an empty accumulator.
+
+        Parameters:
+        method (str): The centroid definition ("arithmetic", "spherical").
+
+        Raises:
+        ValueError: If the method is unsupported.
+        """
+        if method not in ("arithmetic", "spherical"):
+            raise ValueError(
+                "Unsupported method. Please use 'arithmetic' or 'spherical'."
+            )
+        self.method = method
+        self.count = 0
+        self._sums = [_ExactSum() for _ in range(2 if method == "arithmetic" else 3)]
+        self._weight = _ExactSum()
 
+    def add(self, points, weights=None):
+        """
+        Add a chunk of points.
 
-def calculate_centroid(points, batch_size=1000):
+        Parameters:
+        points (numpy.ndarray or PointArray): An (N, 2) array of latitudes and longitudes.
+        weights (numpy.ndarray): Optional non-negative weights, one per point.
+
+        Raises:
+        ValueError: If the points or weights are invalid.
+        """
+        chunk = _as_point_chunk(points)
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.float64)
+            if weights.shape != (chunk.shape[0],):
+                raise ValueError("weights must contain exactly one value per point.")
+            if not np.all(weights >= 0) or not np.all(np.isfinite(weights)):
+                raise ValueError("weights must be finite and non-negative.")
+
+        if self.method == "arithmetic":
+            columns = (chunk[:, 0], chunk[:, 1])
+        else:
+            latitudes = np.radians(chunk[:, 0])
+            longitudes = np.radians(chunk[:, 1])
+            cos_latitudes = np.cos(latitudes)
+            columns = (
+                cos_latitudes * np.cos(longitudes),
+                cos_latitudes * np.sin(longitudes),
+                np.sin(latitudes),
+            )
+
+        self._add_columns(columns, weights, chunk.shape[0])
+
+    def _add_columns(self, columns, weights, count):
+        """
+        Add the coordinate columns (latitude and longitude, or x, y and z) of a chunk of points.
+        """
+        for total, column in zip(self._sums, columns):
+            if weights is None:
+                total.add(float(column.sum(dtype=np.float64)))
+            else:
+                total.add(float(np.dot(column, weights)))
+        if weights is None:
+            self._weight.add(float(count))
+        else:
+            self._weight.add(float(weights.sum()))
+        self.count += count
+
+    def merge(self, other):
+        """
+        Merge the points of another accumulator into this one.
+
+        Parameters:
+        other (CentroidAccumulator): An accumulator using the same method.
+
+        Returns:
+        CentroidAccumulator: This accumulator.
+
+        Raises:
+        ValueError: If the accumulators use different methods.
+        """
+        if other.method != self.method:
+            raise ValueError(
+                "Cannot merge centroid accumulators with different methods."
+            )
+        for total, other_total in zip(self._sums, other._sums):
+            total.merge(other_total)
+        self._weight.merge(other._weight)
+        self.count += other.count
+        return self
+
+    def result(self):
+        """
+        Return the centroid of all points added so far.
+
+        Returns:
+        tuple: The latitude and longitude of the centroid.
+
+        Raises:
+        ValueError: If no points were added, all weights are zero, or the spherical centroid is undefined.
+        """
+        if self.count == 0:
+            raise ValueError("No points provided. Please provide a list of points.")
+        total_weight = self._weight.value()
+        if total_weight == 0:
+            raise ValueError("The total weight of the points is zero.")
+
+        if self.method == "arithmetic":
+            return (
+                self._sums[0].value() / total_weight,
+                self._sums[1].value() / total_weight,
+            )
+
+        x, y, z = (total.value() for total in self._sums)
+        if math.sqrt(x * x + y * y + z * z) <= 1e-12 * total_weight:
+            raise ValueError(
+                "The spherical centroid is undefined because the points cancel out (e.g. antipodal points)."
+            )
+        latitude = math.degrees(math.atan2(z, math.hypot(x, y)))
+        longitude = math.degrees(math.atan2(y, x))
+        return latitude, longitude
+
+
+@instrument()
+def calculate_centroid(points, batch_size=1000, weights=None, method="arithmetic"):
     """
     Calculate the centroid of a set of points.
 
+    The points are reduced chunk by chunk: every chunk is summed in one vectorized
+    pass (with pairwise summation) and the chunk sums are accumulated without
+    rounding error, so arbitrarily large inputs keep full precision.
+
+    The "arithmetic" method averages latitudes and longitudes. The "spherical"
+    method averages the 3D unit vectors of the points and projects the mean back
+    onto the sphere, which is correct across the antimeridian and near the poles.
+
     Parameters:
-    points (list or generator): A list or generator of tuples, where each tuple contains the latitude and longitude of a point.
-    batch_size (int): The size of each batch for processing large inputs.
+    points (list, numpy.ndarray or iterable): A list or generator of tuples, where each tuple contains the latitude and longitude of a point; an (N, 2) array (including memory-mapped arrays) or PointArray; or an iterable of (N, 2) chunks of points.
+    batch_size (int): The size of each batch for processing large inputs. Arrays are reduced in blocks of at least 65536 rows.
+    weights (list, numpy.ndarray or iterable): Optional non-negative weights, one per point.
+    method (str): The centroid definition ("arithmetic", "spherical").
 
     Returns:
     tuple: The latitude and longitude of the centroid.
 
     Raises:
-    ValueError: If the points list is empty or contains invalid points.
+    ValueError: If the points list is empty or contains invalid points, or the weights are invalid.
     """
-    if not points:
-        raise ValueError("No points provided. Please provide a list of points.")
+    accumulator = CentroidAccumulator(method)
+    take_weights = None if weights is None else _weight_chunks(weights)
 
-    total_latitude = 0
-    total_longitude = 0
-    total_points = 0
+    for chunk in _point_chunks(points, batch_size):
+        if take_weights is None:
+            accumulator.add(chunk)
+        else:
+            accumulator.add(chunk, take_weights(chunk.shape[0]))
 
-    for batch in batch_iterator(points, batch_size):
-        for point in batch:
-            if (
-                not isinstance(point, tuple)
-                or len(point) != 2
-                or not all(isinstance(coord, (int, float)) for coord in point)
-            ):
-                raise ValueError(
-                    f"Invalid point: {point}. Each point must be a tuple of two numeric values."
+    if take_weights is not None and take_weights.remaining():
+        raise ValueError("weights must contain exactly one value per point.")
+
+    return accumulator.result()
+
+
+def _longitude_range(longitudes):
+    """
+    Return the west and east edges of the shortest arc that contains all the longitudes.
+
+    The arc leaves out the largest gap between consecutive longitudes around the
+    circle, so it crosses the antimeridian (west > east) when that is shorter.
+    """
+    longitudes = np.sort(longitudes)
+    if len(longitudes) > 1:
+        gaps = np.diff(longitudes)
+        i = int(np.argmax(gaps))
+        if gaps[i] > longitudes[0] + 360 - longitudes[-1]:
+            return float(longitudes[i + 1]), float(longitudes[i])
+    return float(longitudes[0]), float(longitudes[-1])
+
+
+def _arc_contains(west, east, longitude):
+    """
+    Return True if a longitude lies on the arc going east from west to east.
+    """
+    return (longitude - west) % 360 <= (east - west) % 360
+
+
+def _arc_union(arc, other):
+    """
+    Return the shortest arc that contains two arcs, or None for the full circle.
+    """
+    (west, east), (other_west, other_east) = arc, other
+    if _arc_contains(west, east, other_west):
+        if not _arc_contains(west, east, other_east):
+            return west, other_east
+        # Either the arc contains the other one, or together they go around
+        if (other_east - west) % 360 >= (other_west - west) % 360:
+            return arc
+        return None
+    if _arc_contains(west, east, other_east):
+        return other_west, east
+    if _arc_contains(other_west, other_east, west):
+        return other
+    if (west - other_east) % 360 < (other_west - east) % 360:
+        return other_west, east
+    return west, other_east
+
+
+def _unwrap(longitudes, west):
+    """
+    Shift the longitudes west of an arc's west edge by 360 degrees, so the arc is continuous.
+    """
+    return np.where(longitudes < west, longitudes + 360, longitudes)
+
+
+def _convex_hull(x, y):
+    """
+    Return the indices of the vertices of the convex hull of planar points, counterclockwise.
+
+    The points inside the octagon of the extreme points in 8 directions are
+    dropped in one vectorized pass, and Andrew's monotone chain runs on the rest.
+    """
+    candidates = np.arange(len(x))
+    if len(x) > 8:
+        extremes = [
+            np.argmin(y),
+            np.argmax(x - y),
+            np.argmax(x),
+            np.argmax(x + y),
+            np.argmax(y),
+            np.argmin(x - y),
+            np.argmin(x),
+            np.argmin(x + y),
+        ]
+        inside = np.ones(len(x), dtype=bool)
+        for start, end in zip(extremes, extremes[1:] + extremes[:1]):
+            dx, dy = x[end] - x[start], y[end] - y[start]
+            if dx or dy:
+                inside &= dx * (y - y[start]) - dy * (x - x[start]) > 0
+        candidates = np.flatnonzero(~inside)
+
+    order = candidates[np.lexsort((y[candidates], x[candidates]))]
+    distinct = np.r_[True, (np.diff(x[order]) != 0) | (np.diff(y[order]) != 0)]
+    order = order[distinct]
+    if len(order) < 3:
+        return order
+    xs, ys = x[order].tolist(), y[order].tolist()
+
+    def chain(indices):
+        vertices = []
+        for i in indices:
+            while len(vertices) > 1:
+                a, b = vertices[-2], vertices[-1]
+                if (xs[b] - xs[a]) * (ys[i] - ys[a]) - (ys[b] - ys[a]) * (
+                    xs[i] - xs[a]
+                ) > 0:
+                    break
+                vertices.pop()
+            vertices.append(i)
+        return vertices
+
+    lower = chain(range(len(order)))
+    upper = chain(range(len(order) - 1, -1, -1))
+    return order[lower[:-1] + upper[:-1]]
+
+
+def _extremes(xyz):
+    """
+    Return the indices of the unit vectors farthest along evenly spread directions (a Fibonacci lattice).
+    """
+    steps = np.arange(_EXTREME_DIRECTIONS) + 0.5
+    z = 1 - 2 * steps / _EXTREME_DIRECTIONS
+    angle = np.pi * (1 + math.sqrt(5)) * steps
+    radius = np.sqrt(1 - z * z)
+    directions = np.column_stack([radius * np.cos(angle), radius * np.sin(angle), z])
+
+    # Single precision is enough to pick a few candidates per block of columns
+    # (small enough to stay in the CPU cache); the extremes among them are
+    # picked again in double precision
+    single = directions.astype(np.float32)
+    columns = np.ascontiguousarray(xyz.T, dtype=np.float32)
+    candidates = np.unique(
+        np.concatenate(
+            [
+                np.argmin(
+                    single @ columns[:, start : start + _EXTREME_BLOCK_SIZE], axis=1
                 )
+                + start
+                for start in range(0, len(xyz), _EXTREME_BLOCK_SIZE)
+            ]
+        )
+    )
+    return np.unique(candidates[np.argmin(directions @ xyz[candidates].T, axis=1)])
+
+
+def _hemisphere_center(xyz, extremes, center):
+    """
+    Return a unit vector within 90 degrees of all unit vectors, or None if none was found.
+
+    The center moves from the given direction toward the farthest vector, which
+    converges to the center of their smallest enclosing ball (Badoiu and
+    Clarkson). It is searched on the extremes only, and every vector found
+    outside of its hemisphere is added to them.
+    """
+    work = xyz[extremes]
+    point = center if center @ center > 0 else work[0]
+    for step in range(_HEMISPHERE_ITERATIONS):
+        direction = point / math.sqrt(point @ point)
+        cosines = work @ direction
+        farthest = np.argmin(cosines)
+        if cosines[farthest] >= _MIN_HEMISPHERE_COSINE:
+            outside = np.argmin(xyz @ direction)
+            if xyz[outside] @ direction >= _MIN_HEMISPHERE_COSINE:
+                return direction
+            work = np.vstack([work, xyz[outside]])
+            farthest = len(work) - 1
+        point = point + (work[farthest] - point) / (step + 2)
+        if not point @ point:
+            break
+    return None
+
+
+def _far_candidates(xyz, center):
+    """
+    Reduce unit vectors to the candidates for the farthest of them from any centroid.
+
+    The extremes along fixed directions are always kept. When the vectors fit
+    in a hemisphere, the vertices of their spherical convex hull are kept too:
+    the planar hull of their gnomonic projection around its center. These
+    include the farthest vector from any centroid less than 90 degrees away
+    from all of them.
+
+    Parameters:
+    xyz (numpy.ndarray): An (N, 3) array of unit vectors.
+    center (numpy.ndarray): A direction to start the search for a hemisphere from, e.g. their mean.
+
+    Returns:
+    numpy.ndarray: The (M, 3) candidates.
+    """
+    extremes = _extremes(xyz)
+    direction = _hemisphere_center(xyz, extremes, center)
+    if direction is None:
+        return xyz[extremes]
+
+    # Orthonormal axes of the plane tangent at the center
+    axis = np.eye(3)[np.argmin(np.abs(direction))]
+    east = np.cross(axis, direction)
+    east /= np.linalg.norm(east)
+    north = np.cross(direction, east)
+    cosines = xyz @ direction
+    x = (xyz @ east) / cosines
+    y = (xyz @ north) / cosines
+
+    # Vectors inside the largest circle around the center that fits in the hull
+    # of the extremes are not vertices (Akl and Toussaint)
+    outer = np.arange(len(xyz))
+    inner = extremes[_convex_hull(x[extremes], y[extremes])]
+    if len(inner) > 2:
+        dx = np.roll(x[inner], -1) - x[inner]
+        dy = np.roll(y[inner], -1) - y[inner]
+        radius = ((dy * x[inner] - dx * y[inner]) / np.hypot(dx, dy)).min()
+        if radius > 0:
+            outer = np.flatnonzero(x * x + y * y >= radius * radius)
+    hull = outer[_convex_hull(x[outer], y[outer])]
+    return xyz[np.union1d(hull, extremes)]
+
 
-        latitudes = [point[0] for point in batch]
-        longitudes = [point[1] for point in batch]
+class SummaryAccumulator:
+    """
+    Mergeable accumulator for the count, centroid, bounds, dispersion and convex hull of a set of points.
+
+    Every chunk is reduced in one vectorized pass: the centroid with a spherical
+    CentroidAccumulator, the dispersion with the mean and the sum of squared
+    deviations of the 3D unit vectors (combined across chunks with Chan's
+    formula), and the extent as the latitude range, the shortest longitude arc
+    and the convex hull vertices. Accumulators fed disjoint parts of a dataset
+    (e.g. in separate worker processes) can be merged.
+
+    The farthest point from the centroid, which is only known at the end, is
+    searched among a few candidates kept per chunk: the extremes of the points
+    along 64 directions and, when they fit in a hemisphere, the vertices of
+    their spherical convex hull. These include it whenever it is less than 90
+    degrees (about 10,000 km) from the centroid; farther points make the
+    distance a lower bound.
+
+    The longitude range of merged chunks is the shortest arc that contains the
+    arcs of the chunks, which is the shortest arc containing the points when
+    they span less than 180 degrees of longitude. It crosses the antimeridian
+    when that is shorter, and the hull is computed with the longitudes made
+    continuous from its west edge.
+
+    Attributes:
+    count (int): The number of points added so far.
+    """
+
+    __slots__ = (
+        "count",
+        "_centroid",
+        "_mean",
+        "_squares",
+        "_south",
+        "_north",
+        "_arc",
+        "_vertices",
+        "_far",
+    )
+
+    def __init__(self):
+        """
+        Create an empty accumulator.
+        """
+        self.count = 0
+        self._centroid = CentroidAccumulator("spherical")
+        self._mean = np.zeros(3)
+        self._squares = 0.0
+        self._south = math.inf
+        self._north = -math.inf
+        self._arc = None
+        self._vertices = np.empty((0, 2))
+        self._far = np.empty((0, 3))
+
+    def _combine(self, count, mean, squares, south, north, arc, vertices, far):
+        """
+        Combine the statistics of other points into this accumulator.
+        """
+        total = self.count + count
+        delta = mean - self._mean
+        self._squares += squares + float(delta @ delta) * self.count * count / total
+        self._mean = self._mean + delta * (count / total)
+        self._south = min(self._south, south)
+        self._north = max(self._north, north)
+        if self.count == 0:
+            self._arc = arc
+        elif self._arc is not None and arc is not None:
+            self._arc = _arc_union(self._arc, arc)
+        else:
+            self._arc = None
+        self.count = total
+
+        # The hull of the union is the hull of the vertices of both hulls
+        points = np.concatenate([self._vertices, vertices])
+        longitudes = points[:, 1]
+        if self._arc is not None:
+            longitudes = _unwrap(longitudes, self._arc[0])
+        self._vertices = points[_convex_hull(longitudes, points[:, 0])]
+        self._far = _far_candidates(np.concatenate([self._far, far]), self._mean)
+
+    def add(self, points):
+        """
+        Add a chunk of points.
+
+        Parameters:
+        points (numpy.ndarray or PointArray): An (N, 2) array of latitudes and longitudes.
+
+        Raises:
+        ValueError: If the points are invalid.
+        """
+        chunk = _as_point_chunk(points)
+        if chunk.shape[0] == 0:
+            return
+        chunk = np.asarray(chunk, dtype=np.float64)
+        _validate_coordinates(chunk[:, 0], chunk[:, 1], "points")
+        xyz = index._unit_vectors(chunk[:, 0], chunk[:, 1])
+        self._centroid._add_columns(xyz.T, None, chunk.shape[0])
+        mean = xyz.mean(axis=0)
+        deviations = xyz - mean
+        self._combine(
+            chunk.shape[0],
+            mean,
+            float(np.einsum("ij,ij->", deviations, deviations)),
+            float(chunk[:, 0].min()),
+            float(chunk[:, 0].max()),
+            _longitude_range(chunk[:, 1]),
+            chunk,
+            xyz,
+        )
+
+    def merge(self, other):
+        """
+        Merge the points of another accumulator into this one.
+
+        Parameters:
+        other (SummaryAccumulator): Another accumulator.
+
+        Returns:
+        SummaryAccumulator: This accumulator.
+        """
+        if other.count == 0:
+            return self
+        self._centroid.merge(other._centroid)
+        self._combine(
+            other.count,
+            other._mean,
+            other._squares,
+            other._south,
+            other._north,
+            other._arc,
+            other._vertices,
+            other._far,
+        )
+        return self
+
+    def result(self, unit=None):
+        """
+        Return the summary of all points added so far.
+
+        Parameters:
+        unit (str): The unit of measurement for the distances (default is Config.unit).
+
+        Returns:
+        dict: The summary, with the keys:
+        "count" (int): The number of points.
+        "centroid" (tuple): The latitude and longitude of the spherical centroid.
+        "bounds" (tuple): The south, west, north and east edges of the bounding box; west is greater than east when the box crosses the antimeridian.
+        "standard_distance" (float): The root mean square distance of the points from the centroid, from the straight-line chords (within 0.01% of the distances along the sphere up to 300 km).
+        "max_distance" (float): The largest distance of a point from the centroid (a lower bound beyond 90 degrees, see above).
+        "hull" (numpy.ndarray): The (M, 2) vertices of the convex hull in longitude and latitude, counterclockwise, or None if the longitude range is the full circle.
+
+        The longitudes of the hull are continuous from the west edge of the
+        bounds, so they exceed 180 when the hull crosses the antimeridian.
+
+        Raises:
+        ValueError: If no points were added or the centroid is undefined.
+        """
+        centroid = self._centroid.result()
+        if unit is None:
+            unit = Config.unit
+        radius = EARTH_RADIUS_KM * (0.621371 if unit == "miles" else 1)
+
+        # The squared chords to the unit vector c of the centroid, from those
+        # to the mean m of the unit vectors: sum |x - m|^2 + n |m - c|^2
+        length = float(np.linalg.norm(self._mean))
+        squares = self._squares + self.count * (1 - length) ** 2
+        chord = math.sqrt(max(squares, 0.0) / self.count)
+        difference = self._far - index._unit_vectors(*centroid)
+        farthest = math.sqrt(np.einsum("ij,ij->i", difference, difference).max())
+
+        if self._arc is None:
+            west, east, hull = -180.0, 180.0, None
+        else:
+            (west, east), hull = self._arc, self._vertices.copy()
+            hull[:, 1] = _unwrap(hull[:, 1], west)
+        return {
+            "count": self.count,
+            "centroid": centroid,
+            "bounds": (self._south, west, self._north, east),
+            "standard_distance": 2 * math.asin(min(chord / 2, 1.0)) * radius,
+            "max_distance": 2 * math.asin(min(farthest / 2, 1.0)) * radius,
+            "hull": hull,
+        }
+
+
+@instrument()
+def summarize(points, batch_size=1000, unit=None):
+    """
+    Summarize the spatial extent of a set of points in one streaming pass.
+
+    The count, spherical centroid, bounding box, dispersion and convex hull are
+    accumulated chunk by chunk with a SummaryAccumulator, so arbitrarily large
+    inputs are read once with bounded memory. The bounding box and hull handle
+    point sets that cross the antimeridian. To summarize a dataset in parallel,
+    feed its parts to separate SummaryAccumulators and merge them.
+
+    The standard distance (root mean square distance from the centroid) is
+    exact in one pass; the mean distance is not, as it depends on a centroid
+    that is only known at the end.
+
+    Parameters:
+    points (list, numpy.ndarray or iterable): A list or generator of (lat, lon) tuples, an (N, 2) array (including memory-mapped arrays) or PointArray, or an iterable of (N, 2) chunks of points.
+    batch_size (int): The size of each batch for processing large inputs. Arrays are reduced in blocks of at least 65536 rows.
+    unit (str): The unit of measurement for the distances (default is Config.unit).
+
+    Returns:
+    dict: The "count", "centroid", "bounds", "standard_distance", "max_distance" and "hull" of the points, as described in SummaryAccumulator.result.
+
+    Raises:
+    ValueError: If the points list is empty or contains invalid points, or the centroid is undefined.
+    """
+    accumulator = SummaryAccumulator()
+    for chunk in _point_chunks(points, batch_size):
+        accumulator.add(chunk)
+    return accumulator.result(unit)
+
+
+def _clustering_points(points, batch_size):
+    """
+    Return the points to cluster as a validated (N, 2) float array.
+
+    Arrays (including memory-mapped arrays) and PointArrays are used as they
+    are; lists and iterables of points or chunks are read into an array.
+
+    Raises:
+    ValueError: If the points are invalid.
+    """
+    if isinstance(points, PointArray):
+        array = np.asarray(points, dtype=np.float64)
+    elif isinstance(points, np.ndarray) and points.ndim == 2:
+        array = _as_point_chunk(points)
+    else:
+        chunks = list(_point_chunks(points, batch_size))
+        array = np.concatenate(chunks) if chunks else np.empty((0, 2))
+    _validate_coordinates(array[:, 0], array[:, 1], "points")
+    return array
+
+
+def _chord(distance, unit):
+    """
+    Convert a distance along the sphere to a chord length on the unit sphere.
+    """
+    radius = EARTH_RADIUS_KM * (0.621371 if unit == "miles" else 1)
+    return 2 * math.sin(min(distance / radius, math.pi) / 2)
+
+
+def _cluster_centroids(points, labels, n_clusters, batch_size):
+    """
+    Calculate the spherical centroid of every cluster, chunk by chunk.
+
+    The points of a chunk are grouped by cluster, so every cluster costs one
+    CentroidAccumulator.add call per chunk it appears in.
+
+    Returns:
+    numpy.ndarray: An (n_clusters, 2) array of centroids (NaN for empty clusters).
+    """
+    accumulators = [CentroidAccumulator("spherical") for _ in range(n_clusters)]
+    start = 0
+    for chunk in batch_iterator(points, max(batch_size, _ARRAY_BATCH_SIZE)):
+        chunk_labels = labels[start : start + len(chunk)]
+        start += len(chunk)
+        order = np.argsort(chunk_labels, kind="stable")
+        sorted_labels = chunk_labels[order]
+        present, first = np.unique(sorted_labels, return_index=True)
+        last = np.append(first[1:], len(order))
+        for label, begin, end in zip(present.tolist(), first, last):
+            if label >= 0:
+                accumulators[label].add(chunk[order[begin:end]])
+    centroids = np.full((n_clusters, 2), np.nan)
+    for label, accumulator in enumerate(accumulators):
+        if accumulator.count:
+            centroids[label] = accumulator.result()
+    return centroids
+
+
+def _cell_keys(xyz, size):
+    """
+    Return the int64 keys of the grid cells of unit vectors.
+    """
+    cells = np.floor(xyz / size).astype(np.int64) + (1 << (_CELL_BITS - 1))
+    return (cells[:, 0] << (2 * _CELL_BITS)) | (cells[:, 1] << _CELL_BITS) | cells[:, 2]
+
+
+def _neighbor_cells(keys, selected, reach):
+    """
+    Yield the pairs (A, B) of occupied cells where B is within reach cells of A, for every A in selected.
+
+    The cells that differ only in their z coordinate have consecutive keys, so
+    each (x, y) column of neighbors is one range of the sorted keys.
+    """
+    steps = range(-reach, reach + 1)
+    columns = np.array(
+        [(dx << (2 * _CELL_BITS)) + (dy << _CELL_BITS) for dx in steps for dy in steps]
+    )
+    batch = max(1, _PAIR_BATCH_SIZE // (len(columns) * (2 * reach + 1)))
+    for start in range(0, len(selected), batch):
+        cells = selected[start : start + batch]
+        targets = (keys[cells][:, None] + columns).reshape(-1)
+        first = np.searchsorted(keys, targets - reach)
+        last = np.searchsorted(keys, targets + reach, side="right")
+        owners = np.repeat(cells, len(columns))
+        counts = last - first
+        neighbors = np.arange(counts.sum()) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        neighbors += np.repeat(first, counts)
+        yield np.repeat(owners, counts), neighbors
+
+
+def _point_pairs(a_starts, a_counts, b_starts, b_counts):
+    """
+    Yield batches of the point pairs of ranges: every point of [a_start, a_start + a_count)
+    with every point of [b_start, b_start + b_count), for every item.
+
+    Items are split along b so that no batch holds much more than _PAIR_BATCH_SIZE pairs.
+
+    Yields:
+    tuple: The items and the positions of the first and second points of the pairs.
+    """
+    step = np.maximum(_PAIR_BATCH_SIZE // np.maximum(a_counts, 1), 1)
+    pieces = -(-b_counts // step)
+    items = np.repeat(np.arange(len(a_counts)), pieces)
+    piece = np.arange(len(items)) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+    b_first = b_starts[items] + piece * step[items]
+    b_sizes = np.minimum(step[items], b_starts[items] + b_counts[items] - b_first)
+    a_first = a_starts[items]
+    costs = a_counts[items] * b_sizes
+    ends = np.cumsum(costs)
+    if len(ends) == 0:
+        return
+    bounds = np.searchsorted(
+        ends, np.arange(_PAIR_BATCH_SIZE, ends[-1], _PAIR_BATCH_SIZE), side="right"
+    )
+    bounds = np.unique(np.concatenate([[0], bounds, [len(ends)]]))
+    for first, last in zip(bounds[:-1], bounds[1:]):
+        cost = costs[first:last]
+        owners = np.repeat(np.arange(first, last), cost)
+        k = np.arange(len(owners)) - np.repeat(np.cumsum(cost) - cost, cost)
+        yield (
+            items[owners],
+            a_first[owners] + k // b_sizes[owners],
+            b_first[owners] + k % b_sizes[owners],
+        )
+
+
+def _within(xyz, a, b, limit):
+    """
+    Return whether the squared chords between the points a and b are at most limit.
+    """
+    difference = xyz[a] - xyz[b]
+    return np.einsum("ij,ij->i", difference, difference) <= limit
+
+
+def _any_within(first, second, limit):
+    """
+    Return whether any point of first is within a squared chord limit of any point of second.
+    """
+    for start in range(0, len(first), 128):
+        block = first[start : start + 128, None, :]
+        for other in range(0, len(second), 2048):
+            difference = block - second[None, other : other + 2048, :]
+            if (np.einsum("ijk,ijk->ij", difference, difference) <= limit).any():
+                return True
+    return False
+
+
+def _find(parent, x):
+    """
+    Return the root of x in a union-find forest, halving the path on the way.
+    """
+    while parent[x] != x:
+        parent[x] = parent[parent[x]]
+        x = parent[x]
+    return x
+
+
+def _compress(parent):
+    """
+    Point every node of a union-find forest directly at its root.
+    """
+    while True:
+        grandparent = parent[parent]
+        if np.array_equal(grandparent, parent):
+            return parent
+        parent = grandparent
+
+
+def _connect(parent, u, v):
+    """
+    Merge the components of the edges (u, v) of a union-find forest.
+
+    Roots are always the smallest node of their component, so hooking the
+    larger root under the smaller one never creates a cycle and every round
+    merges at least one pair of components.
+    """
+    parent = _compress(parent)
+    while len(u):
+        root_u = parent[u]
+        root_v = parent[v]
+        different = root_u != root_v
+        u, v = u[different], v[different]
+        low = np.minimum(root_u, root_v)[different]
+        high = np.maximum(root_u, root_v)[different]
+        np.minimum.at(parent, high, low)
+        parent = _compress(parent)
+    return parent
+
+
+@instrument()
+def dbscan(points, eps, min_samples=5, unit=None, batch_size=1000):
+    """
+    Cluster points with DBSCAN, using Haversine distances on the sphere.
+
+    A point with at least min_samples points (itself included) within eps is a
+    core point; core points within eps of each other are in the same cluster,
+    and the other points within eps of a core point join the cluster of the
+    nearest one. The remaining points are noise.
+
+    Neighborhoods are found on a grid of cells over the 3D unit vectors of the
+    points, so there is no special case at the poles or the antimeridian. The
+    cells are at most eps across for eps above about 10 meters, so every point
+    of a cell with at least min_samples points is a core point without any
+    distance being computed; below that, core points are connected one by one.
+    Distances are only computed between points of neighboring cells, in
+    bounded batches.
+
+    Parameters:
+    points (list, numpy.ndarray, PointArray or iterable): The points as (lat, lon) tuples, an (N, 2) array, or an iterable of (N, 2) chunks of points.
+    eps (float): The neighborhood radius in the specified unit.
+    min_samples (int): The number of points within eps that makes a core point (default is 5).
+    unit (str): The unit of measurement for eps (default is Config.unit).
+    batch_size (int): The number of points per chunk when reading lists and iterables.
+
+    Returns:
+    tuple: The cluster of every point (-1 for noise, clusters are numbered in
+    order of their first point) and an (n_clusters, 2) array of their spherical
+    centroids, as computed by calculate_centroid.
+
+    Raises:
+    ValueError: If the points are invalid, eps is not positive or min_samples is not a positive integer.
+    """
+    if not eps > 0:
+        raise ValueError("eps must be a positive number.")
+    if (
+        isinstance(min_samples, bool)
+        or not isinstance(min_samples, int)
+        or min_samples < 1
+    ):
+        raise ValueError("min_samples must be a positive integer.")
+    points = _clustering_points(points, batch_size)
+    if unit is None:
+        unit = Config.unit
+    n = len(points)
+    if n == 0:
+        return np.empty(0, dtype=np.int64), np.empty((0, 2))
+
+    chord = _chord(eps, unit)
+    limit = chord * chord
+    dense_cells = chord / math.sqrt(3) >= _MIN_CELL_SIZE
+    size = max(chord / math.sqrt(3), _MIN_CELL_SIZE)
+    reach = math.ceil(chord / size)
+
+    xyz = np.vstack(
+        [
+            index._unit_vectors(chunk[:, 0], chunk[:, 1])
+            for chunk in batch_iterator(points, _ARRAY_BATCH_SIZE)
+        ]
+    )
+    keys = _cell_keys(xyz, size)
+    order = np.argsort(keys, kind="stable")
+    xyz = xyz[order]
+    keys, starts, counts = np.unique(keys[order], return_index=True, return_counts=True)
+    cell_of = np.repeat(np.arange(len(keys)), counts)
+    dense = counts >= min_samples if dense_cells else np.zeros(len(keys), dtype=bool)
+    sparse = np.flatnonzero(~dense)
+
+    def sparse_pairs():
+        for cells, neighbors in _neighbor_cells(keys, sparse, reach):
+            for items, a, b in _point_pairs(
+                starts[cells], counts[cells], starts[neighbors], counts[neighbors]
+            ):
+                within = _within(xyz, a, b, limit)
+                yield cells, neighbors, items[within], a[within], b[within]
+
+    # Count the neighbors of the points of sparse cells
+    core = np.repeat(dense, counts)
+    neighbor_counts = np.zeros(n, dtype=np.int64)
+    for _, _, _, a, _ in sparse_pairs():
+        if len(a):
+            low = a.min()
+            counted = np.bincount(a - low)
+            neighbor_counts[low : low + len(counted)] += counted
+    core |= neighbor_counts >= min_samples
+
+    # The core points of a cell are within eps of each other, so clusters are
+    # built from cells: connect the cells that have core points within eps.
+    # Cells at the minimum size are wider than eps, so then the core points
+    # are connected one by one.
+    sources = []
+    targets = []
+    nearest = np.full(n, -1, dtype=np.int64)
+    nearest_chord = np.full(n, np.inf)
+    for cells, neighbors, items, a, b in sparse_pairs():
+        linked = core[b]
+        items, a, b = items[linked], a[linked], b[linked]
+        is_core = core[a]
+        if dense_cells:
+            linked = np.zeros(len(cells), dtype=bool)
+            linked[items[is_core]] = True
+            sources.append(cells[linked])
+            targets.append(neighbors[linked])
+        else:
+            sources.append(a[is_core])
+            targets.append(b[is_core])
+        a, b = a[~is_core], b[~is_core]
+        if len(a):
+            difference = xyz[a] - xyz[b]
+            chords = np.einsum("ij,ij->i", difference, difference)
+            closest = np.lexsort((chords, a))
+            first = closest[np.r_[True, a[closest][1:] != a[closest][:-1]]]
+            better = chords[first] < nearest_chord[a[first]]
+            nearest[a[first][better]] = b[first][better]
+            nearest_chord[a[first][better]] = chords[first][better]
+    parent = np.arange(len(keys) if dense_cells else n)
+    if sources:
+        parent = _connect(parent, np.concatenate(sources), np.concatenate(targets))
+
+    # Pairs of dense cells: small pairs are compared at once, large ones with an early exit
+    heavy = []
+    for cells, neighbors in _neighbor_cells(keys, np.flatnonzero(dense), reach):
+        keep = (cells < neighbors) & dense[neighbors]
+        cells, neighbors = cells[keep], neighbors[keep]
+        large = counts[cells] * counts[neighbors] > _DENSE_PAIR_COST
+        heavy.append(np.column_stack([cells[large], neighbors[large]]))
+        cells, neighbors = cells[~large], neighbors[~large]
+        linked = np.zeros(len(cells), dtype=bool)
+        for items, a, b in _point_pairs(
+            starts[cells], counts[cells], starts[neighbors], counts[neighbors]
+        ):
+            linked[items[_within(xyz, a, b, limit)]] = True
+        parent = _connect(parent, cells[linked], neighbors[linked])
+    for cell, neighbor in np.concatenate(heavy).tolist() if heavy else []:
+        root, other = _find(parent, cell), _find(parent, neighbor)
+        if root != other and _any_within(
+            xyz[starts[cell] : starts[cell] + counts[cell]],
+            xyz[starts[neighbor] : starts[neighbor] + counts[neighbor]],
+            limit,
+        ):
+            parent[max(root, other)] = min(root, other)
+    parent = _compress(parent)
+
+    node_of = cell_of if dense_cells else np.arange(n)
+    sorted_labels = np.where(core, parent[node_of], -1)
+    border = nearest >= 0
+    sorted_labels[border] = parent[node_of[nearest[border]]]
+    labels = np.empty(n, dtype=np.int64)
+    labels[order] = sorted_labels
+
+    # Number the clusters in order of their first point
+    clustered = labels >= 0
+    roots, first = np.unique(labels[clustered], return_index=True)
+    numbers = np.empty(len(roots), dtype=np.int64)
+    numbers[np.argsort(first, kind="stable")] = np.arange(len(roots))
+    labels[clustered] = numbers[np.searchsorted(roots, labels[clustered])]
+    return labels, _cluster_centroids(points, labels, len(roots), n)
+
+
+def _kmeans_plus_plus(xyz, k, rng):
+    """
+    Choose k initial centers among unit vectors with the k-means++ seeding.
+    """
+    centers = np.empty((k, 3))
+    centers[0] = xyz[rng.integers(len(xyz))]
+    difference = xyz - centers[0]
+    distances = np.einsum("ij,ij->i", difference, difference)
+    for i in range(1, k):
+        total = distances.sum()
+        if total > 0:
+            choice = rng.choice(len(xyz), p=distances / total)
+        else:
+            choice = rng.integers(len(xyz))
+        centers[i] = xyz[choice]
+        difference = xyz - centers[i]
+        np.minimum(
+            distances, np.einsum("ij,ij->i", difference, difference), out=distances
+        )
+    return centers
+
+
+def _nearest_centers(xyz, centers):
+    """
+    Return the index of the nearest center (largest dot product) of every unit vector.
+    """
+    labels = np.empty(len(xyz), dtype=np.int64)
+    similarities = np.empty((min(len(xyz), _ASSIGN_BLOCK_SIZE), len(centers)))
+    for start in range(0, len(xyz), _ASSIGN_BLOCK_SIZE):
+        block = xyz[start : start + _ASSIGN_BLOCK_SIZE]
+        out = similarities[: len(block)]
+        np.matmul(block, centers.T, out=out)
+        labels[start : start + len(block)] = out.argmax(axis=1)
+    return labels
+
+
+@instrument()
+def kmeans(
+    points,
+    k,
+    max_iterations=100,
+    tolerance=0.001,
+    unit=None,
+    seed=None,
+    batch_size=_ARRAY_BATCH_SIZE,
+):
+    """
+    Cluster points into k clusters with spherical k-means.
+
+    Every point is assigned to the center with the smallest Haversine distance,
+    and every center moves to the spherical centroid (normalized mean of the 3D
+    unit vectors) of its points, until no center moves by more than the
+    tolerance or no assignment changes. The initial
+    centers are chosen with k-means++ among a sample of the points. Each
+    iteration streams over the points chunk by chunk with batch_iterator, so
+    memory-mapped arrays are never loaded whole.
+
+    Parameters:
+    points (list, numpy.ndarray, PointArray or iterable): The points as (lat, lon) tuples, an (N, 2) array, or an iterable of (N, 2) chunks of points.
+    k (int): The number of clusters.
+    max_iterations (int): The maximum number of iterations (default is 100).
+    tolerance (float): The distance in the specified unit below which the centers are considered fixed (default is 0.001).
+    unit (str): The unit of measurement for the tolerance (default is Config.unit).
+    seed (int): The seed of the random initialization (default is None).
+    batch_size (int): The number of points per chunk (default is 65536).
+
+    Returns:
+    tuple: The cluster of every point and a (k, 2) array of the spherical
+    centroids of the clusters, as computed by calculate_centroid (a cluster
+    that ends up empty keeps its last center).
+
+    Raises:
+    ValueError: If the points are invalid, k is not a positive integer at most the number of points, or the tolerance is negative.
+    """
+    if isinstance(k, bool) or not isinstance(k, int) or k < 1:
+        raise ValueError("k must be a positive integer.")
+    if not tolerance >= 0:
+        raise ValueError("tolerance must be a non-negative number.")
+    points = _clustering_points(points, batch_size)
+    if unit is None:
+        unit = Config.unit
+    limit = _chord(tolerance, unit) ** 2
+    n = len(points)
+    if n < k:
+        raise ValueError(f"k must be at most the number of points ({n}).")
 
-        total_latitude += np.sum(latitudes)
-        total_longitude += np.sum(longitudes)
-        total_points += len(batch)
+    rng = np.random.default_rng(seed)
+    sample = np.sort(rng.choice(n, min(n, max(10000, 50 * k)), replace=False))
+    centers = _kmeans_plus_plus(
+        index._unit_vectors(points[sample, 0], points[sample, 1]), k, rng
+    )
 
-    centroid_latitude = total_latitude / total_points
-    centroid_longitude = total_longitude / total_points
+    labels = np.full(n, -1, dtype=np.int64)
+    for _ in range(max_iterations):
+        sums = np.zeros((k, 3))
+        changed = False
+        start = 0
+        for chunk in batch_iterator(points, batch_size):
+            xyz = index._unit_vectors(chunk[:, 0], chunk[:, 1])
+            chunk_labels = _nearest_centers(xyz, centers)
+            stop = start + len(chunk)
+            changed = changed or not np.array_equal(labels[start:stop], chunk_labels)
+            labels[start:stop] = chunk_labels
+            start = stop
+            for axis in range(3):
+                sums[:, axis] += np.bincount(chunk_labels, xyz[:, axis], minlength=k)
+        if not changed:
+            break
+        norms = np.linalg.norm(sums, axis=1)
+        moved = norms > 0
+        previous = centers.copy()
+        centers[moved] = sums[moved] / norms[moved, None]
+        difference = centers - previous
+        if np.einsum("ij,ij->i", difference, difference).max() <= limit:
+            break
 
-    return centroid_latitude, centroid_longitude
+    centroids = _cluster_centroids(points, labels, k, batch_size)
+    empty = np.isnan(centroids[:, 0])
+    centroids[empty, 0] = np.degrees(np.arcsin(np.clip(centers[empty, 2], -1, 1)))
+    centroids[empty, 1] = np.degrees(np.arctan2(centers[empty, 1], centers[empty, 0]))
+    return labels, centroids
@@ -0,0 +1,251 @@
+import contextlib
+import os
+import sqlite3
+import threading
+import time
+from geotools.geocode import AddressNotFoundError, _normalize_address
+
+# Number of writes of a process between two deletions of expired entries
+_EVICTION_INTERVAL = 100
+
+
+class GeocodeCache:
+    """
+    Persistent geocoding cache stored in a SQLite database.
+
+    Entries are keyed on the provider and the normalized address (whitespace
+    collapsed, case ignored). Addresses that the provider could not find are
+    cached as well, so they are not looked up again. Entries expire after ttl
+    seconds and are deleted every 100 writes of a process; every write deletes
+    the oldest entries beyond max_entries, so the cache never holds more. The
+    number of entries is kept up to date by triggers, so this costs no table
+    scan. The database runs in WAL mode, so many processes (and threads) can
+    read and write the same file concurrently.
+
+    Attributes:
+    path (str): The path of the SQLite database.
+    ttl (float): The number of seconds an entry stays valid (None means forever).
+    negative_ttl (float): The number of seconds a "not found" entry stays valid (default is ttl).
+    max_entries (int): The maximum number of entries (None means unbounded).
+    hits (int): The number of lookups of this process answered with a location.
+    negative_hits (int): The number of lookups of this process answered with a cached "not found".
+    misses (int): The number of lookups of this process that were not in the cache.
+    """
+
+    def __init__(self, path, ttl=None, negative_ttl=None, max_entries=None):
+        """
+        Open (or create) a cache database.
+
+        Parameters:
+        path (str): The path of the SQLite database.
+        ttl (float): The number of seconds an entry stays valid (None means forever).
+        negative_ttl (float): The number of seconds a "not found" entry stays valid (default is ttl).
+        max_entries (int): The maximum number of entries (None means unbounded).
+
+        Raises:
+        ValueError: If ttl, negative_ttl or max_entries is not positive.
+        """
+        for name, value in (
+            ("ttl", ttl),
+            ("negative_ttl", negative_ttl),
+            ("max_entries", max_entries),
+        ):
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive.")
+        self.path = os.fspath(path)
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._local = threading.local()
+
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS geocode ("
+            "provider TEXT NOT NULL, address TEXT NOT NULL, "
+            "latitude REAL, longitude REAL, created REAL NOT NULL, "
+            "PRIMARY KEY (provider, address)) WITHOUT ROWID"
+        )
+        self._connect().execute(
+            "CREATE INDEX IF NOT EXISTS geocode_created ON geocode (created)"
+        )
+        with self._transaction() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS geocode_size ("
+                "id INTEGER PRIMARY KEY CHECK (id = 0), entries INTEGER NOT NULL)"
+            )
+            connection.execute(
+                "INSERT OR IGNORE INTO geocode_size SELECT 0, COUNT(*) FROM geocode"
+            )
+            connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS geocode_insert AFTER INSERT ON geocode "
+                "BEGIN UPDATE geocode_size SET entries = entries + 1; END"
+            )
+            connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS geocode_delete AFTER DELETE ON geocode "
+                "BEGIN UPDATE geocode_size SET entries = entries - 1; END"
+            )
+
+    def _connect(self):
+        """
+        Return the connection of the current thread, reconnecting after a fork.
+        """
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            local.connection = connection
+            local.pid = os.getpid()
+        return local.connection
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """
+        Run statements in one write transaction of the current thread's connection.
+        """
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def _trim(self, connection):
+        """
+        Delete the oldest entries beyond max_entries.
+
+        Returns:
+        int: The number of deleted entries.
+        """
+        excess = self._size(connection) - self.max_entries
+        if excess <= 0:
+            return 0
+        return connection.execute(
+            "DELETE FROM geocode WHERE (provider, address) IN "
+            "(SELECT provider, address FROM geocode ORDER BY created LIMIT ?)",
+            (excess,),
+        ).rowcount
+
+    @staticmethod
+    def _size(connection):
+        return connection.execute("SELECT entries FROM geocode_size").fetchone()[0]
+
+    def get(self, address, api):
+        """
+        Look up an address.
+
+        Parameters:
+        address (str): The address.
+        api (str): The geocoding API ("google", "opencage", "mapquest").
+
+        Returns:
+        tuple: The latitude and longitude of the address, or None if it is not cached.
+
+        Raises:
+        AddressNotFoundError: If the address is cached as not found.
+        """
+        row = (
+            self._connect()
+            .execute(
+                "SELECT latitude, longitude, created FROM geocode "
+                "WHERE provider = ? AND address = ?",
+                (api, _normalize_address(address)),
+            )
+            .fetchone()
+        )
+        if row is not None:
+            latitude, longitude, created = row
+            found = latitude is not None
+            ttl = self.ttl if found else self.negative_ttl
+            if ttl is None or time.time() - created < ttl:
+                if found:
+                    self.hits += 1
+                    return latitude, longitude
+                self.negative_hits += 1
+                raise AddressNotFoundError(
+                    "Unsupported address format. Please provide a valid address."
+                )
+        self.misses += 1
+        return None
+
+    def put(self, address, api, location):
+        """
+        Store the location of an address.
+
+        Parameters:
+        address (str): The address.
+        api (str): The geocoding API ("google", "opencage", "mapquest").
+        location (tuple): The latitude and longitude, or None if the address was not found.
+        """
+        latitude, longitude = (None, None) if location is None else location
+        with self._transaction() as connection:
+            # An upsert keeps the row, so the size triggers see no insertion
+            connection.execute(
+                "INSERT INTO geocode VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (provider, address) DO UPDATE SET "
+                "latitude = excluded.latitude, longitude = excluded.longitude, "
+                "created = excluded.created",
+                (api, _normalize_address(address), latitude, longitude, time.time()),
+            )
+            if self.max_entries is not None:
+                self._trim(connection)
+        self._writes += 1
+        expires = self.ttl is not None or self.negative_ttl is not None
+        if expires and self._writes % _EVICTION_INTERVAL == 1:
+            self.evict()
+
+    def evict(self):
+        """
+        Delete expired entries and the oldest entries beyond max_entries.
+
+        Returns:
+        int: The number of deleted entries.
+        """
+        deleted = 0
+        now = time.time()
+        with self._transaction() as connection:
+            if self.ttl is not None:
+                deleted += connection.execute(
+                    "DELETE FROM geocode WHERE latitude IS NOT NULL AND created <= ?",
+                    (now - self.ttl,),
+                ).rowcount
+            if self.negative_ttl is not None:
+                deleted += connection.execute(
+                    "DELETE FROM geocode WHERE latitude IS NULL AND created <= ?",
+                    (now - self.negative_ttl,),
+                ).rowcount
+            if self.max_entries is not None:
+                deleted += self._trim(connection)
+        return deleted
+
+    def clear(self):
+        """
+        Delete all entries.
+        """
+        self._connect().execute("DELETE FROM geocode")
+
+    @property
+    def hit_rate(self):
+        """
+        The fraction of lookups of this process answered from the cache.
+        """
+        lookups = self.hits + self.negative_hits + self.misses
+        return (self.hits + self.negative_hits) / lookups if lookups else 0.0
+
+    def __len__(self):
+        return self._size(self._connect())
+
+    def close(self):
+        """
+        Close the connection of the current thread.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.pid = None
+            self._local.connection = None
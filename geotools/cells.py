@@ -0,0 +1,723 @@
+import functools
+import numbers
+from geotools._lazy import lazy_import
+from geotools.config import Config
+from geotools.distance import (
+    EARTH_RADIUS_KM,
+    _VINCENTY_RATIO,
+    _as_point_array,
+    _bounding_box,
+    _haversine_angle,
+)
+from geotools.metrics import instrument
+
+np = lazy_import("numpy")
+parallel = lazy_import("geotools.parallel")
+
+# Both cell systems divide the latitude/longitude rectangle into a regular grid
+# and number its cells along a space-filling curve, so that points can be
+# bucketed and joined by sorting integers instead of comparing distances.
+#
+# Geohashes of precision p use 5p bits: the columns (longitude) get the extra
+# bit when 5p is odd, the bits are interleaved (Z-order) starting with
+# longitude and written in base 32. Nearby points share a prefix.
+#
+# Cells of level L use a 2**L by 2**L grid numbered along a Hilbert curve, which
+# keeps consecutive cells adjacent. Like S2 cell IDs, the index d at level L is
+# stored as (2 * d + 1) << 2 * (MAX_LEVEL - L): the lowest set bit encodes the
+# level, the parent of a cell is obtained by moving that bit up, and every
+# descendant of a cell lies in a contiguous range of IDs.
+
+MAX_PRECISION = 12
+MAX_LEVEL = 30
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Masks that spread the 32 low bits of an integer to the even bit positions
+_SPREAD_MASKS = (
+    (16, 0x0000FFFF0000FFFF),
+    (8, 0x00FF00FF00FF00FF),
+    (4, 0x0F0F0F0F0F0F0F0F),
+    (2, 0x3333333333333333),
+    (1, 0x5555555555555555),
+)
+_COMPACT_MASKS = (
+    (1, 0x3333333333333333),
+    (2, 0x0F0F0F0F0F0F0F0F),
+    (4, 0x00FF00FF00FF00FF),
+    (8, 0x0000FFFF0000FFFF),
+    (16, 0x00000000FFFFFFFF),
+)
+
+# Neighbor offsets (rows, columns) in the order N, NE, E, SE, S, SW, W, NW
+_DIRECTIONS = ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1))
+
+# Largest number of grid cells examined by a covering
+_MAX_COVERING_CELLS = 1 << 20
+
+
+def _check_integer(value, name, low, high):
+    """
+    Raise ValueError unless value is an integer between low and high.
+    """
+    if (
+        isinstance(value, bool)
+        or not isinstance(value, numbers.Integral)
+        or not low <= value <= high
+    ):
+        raise ValueError(f"{name} must be an integer between {low} and {high}.")
+
+
+def _spread(x):
+    """
+    Move bit k of every integer to bit 2k.
+    """
+    x = x & 0xFFFFFFFF
+    for shift, mask in _SPREAD_MASKS:
+        x = (x | (x << shift)) & mask
+    return x
+
+
+def _compact(x):
+    """
+    Move bit 2k of every integer to bit k (the inverse of _spread).
+    """
+    x = x & 0x5555555555555555
+    for shift, mask in _COMPACT_MASKS:
+        x = (x | (x >> shift)) & mask
+    return x
+
+
+def _grid_position(values, offset, span, bits):
+    """
+    Return the grid index of coordinates along one axis divided into 2**bits intervals.
+
+    An interval includes its lower edge, like the bisection of the geohash
+    algorithm. The edges are exact in floating point, so the rounded estimate
+    is corrected by comparing with them.
+    """
+    scale = 1 << bits
+    step = span / scale
+    index = np.floor((values + offset) / span * scale).astype(np.int64)
+    np.clip(index, 0, scale - 1, out=index)
+    index -= values < index * step - offset
+    index += (index < scale - 1) & (values >= (index + 1) * step - offset)
+    return index
+
+
+def _bounds(rows, columns, lat_bits, lon_bits):
+    """
+    Return the south, west, north and east edges of grid cells.
+    """
+    south = np.ldexp(rows * 180.0, -lat_bits) - 90
+    west = np.ldexp(columns * 360.0, -lon_bits) - 180
+    north = np.ldexp((rows + 1) * 180.0, -lat_bits) - 90
+    east = np.ldexp((columns + 1) * 360.0, -lon_bits) - 180
+    return south, west, north, east
+
+
+def _neighbor_positions(rows, columns, lat_bits, lon_bits):
+    """
+    Return the rows and columns of the 8 neighbors of grid cells, in the last axis.
+
+    Columns wrap around the antimeridian. Past a pole, the neighbors are the
+    cells of the same row on the opposite meridian, where east and west swap.
+    """
+    n_rows = np.left_shift(1, lat_bits)
+    n_columns = np.left_shift(1, lon_bits)
+    neighbor_rows = []
+    neighbor_columns = []
+    for row_offset, column_offset in _DIRECTIONS:
+        row = rows + row_offset
+        column = columns + column_offset
+        polar = (row < 0) | (row >= n_rows)
+        neighbor_rows.append(np.where(polar, rows, row))
+        column = np.where(polar, columns - column_offset + n_columns // 2, column)
+        neighbor_columns.append(column % n_columns)
+    return np.stack(neighbor_rows, -1), np.stack(neighbor_columns, -1)
+
+
+def _covering(point, radius, unit, lat_bits, lon_bits):
+    """
+    Return the rows and columns of the grid cells that intersect a circle.
+
+    The cells of the bounding box of the circle are enumerated and a cell is
+    kept unless its center is farther from the point than the radius plus the
+    distance from the center to its farthest corner. The radius is widened like
+    in within_radius, so every point within it by haversine_distance or
+    vincenty_distance is covered.
+    """
+    if not (-90 <= point[0] <= 90 and -180 <= point[1] <= 180):
+        raise ValueError(
+            "Invalid coordinates for point. Latitude must be between -90 and 90, and longitude must be between -180 and 180."
+        )
+    if not radius >= 0:
+        raise ValueError("radius must be a non-negative number.")
+    if unit is None:
+        unit = Config.unit
+
+    angle = radius / (EARTH_RADIUS_KM * (0.621371 if unit == "miles" else 1))
+    angle /= _VINCENTY_RATIO
+    min_latitude, max_latitude, longitudes = _bounding_box(point[0], point[1], angle)
+    first_row, last_row = _grid_position(
+        np.array([max(min_latitude, -90), min(max_latitude, 90)]), 90, 180, lat_bits
+    )
+    rows = np.arange(first_row, last_row + 1)
+    n_columns = 1 << lon_bits
+    if longitudes is None:
+        columns = np.arange(n_columns)
+    else:
+        first, last = _grid_position(np.array(longitudes), 180, 360, lon_bits)
+        if longitudes[0] <= longitudes[1]:
+            columns = np.arange(first, last + 1)
+        else:
+            columns = np.concatenate([np.arange(first, n_columns), np.arange(last + 1)])
+    if len(rows) * len(columns) > _MAX_COVERING_CELLS:
+        raise ValueError(
+            f"The covering needs more than {_MAX_COVERING_CELLS} cells. Use a coarser level or precision."
+        )
+
+    rows, columns = (array.reshape(-1) for array in np.meshgrid(rows, columns))
+    south, west, north, east = _bounds(rows, columns, lat_bits, lon_bits)
+    latitudes = (south + north) / 2
+    half_width = (east - west) / 2
+    half_diagonal = np.maximum(
+        _haversine_angle(latitudes, 0, south, half_width),
+        _haversine_angle(latitudes, 0, north, half_width),
+    )
+    distance = _haversine_angle(point[0], point[1], latitudes, (west + east) / 2)
+    keep = distance - half_diagonal <= angle * (1 + 1e-12)
+    return rows[keep], columns[keep]
+
+
+def _geohash_codes(rows, columns, lengths):
+    """
+    Interleave the bits of grid positions into geohash integers.
+    """
+    odd = (5 * lengths) % 2 == 1
+    return np.where(
+        odd,
+        _spread(columns) | (_spread(rows) << 1),
+        (_spread(columns) << 1) | _spread(rows),
+    )
+
+
+def _geohash_strings(codes, lengths):
+    """
+    Convert geohash integers to strings of the given lengths.
+    """
+    width = int(np.max(lengths, initial=1))
+    positions = np.arange(width)
+    shifts = 5 * (lengths[..., None] - 1 - positions)
+    digits = (codes[..., None] >> np.maximum(shifts, 0)) & 31
+    characters = np.frombuffer(_BASE32.encode("ascii"), dtype=np.uint8)
+    characters = characters.astype(np.uint32)[digits]
+    characters[shifts < 0] = 0
+    strings = np.ascontiguousarray(characters).view(f"U{width}")
+    return strings.reshape(codes.shape)
+
+
+def _geohash_into(out, points, precision):
+    """
+    Write the geohash integers of points into out.
+    """
+    bits = 5 * precision
+    rows = _grid_position(points[:, 0], 90, 180, bits // 2)
+    columns = _grid_position(points[:, 1], 180, 360, bits - bits // 2)
+    out[:] = _geohash_codes(rows, columns, np.int64(precision))
+
+
+def _parse_geohashes(geohashes):
+    """
+    Convert geohash strings to integers and lengths.
+
+    Raises:
+    ValueError: If a geohash is empty, too long or contains an invalid character.
+    """
+    array = np.asarray(geohashes, dtype=str)
+    width = array.dtype.itemsize // 4
+    if width > MAX_PRECISION:
+        raise ValueError(
+            f"Invalid geohash: geohashes have at most {MAX_PRECISION} characters."
+        )
+    characters = np.ascontiguousarray(array).reshape(-1)
+    characters = characters.view(np.uint32).reshape(-1, width)
+    lengths = np.count_nonzero(characters, axis=1)
+
+    table = np.full(128, -1, dtype=np.int64)
+    for value, character in enumerate(_BASE32):
+        table[ord(character)] = table[ord(character.upper())] = value
+    table[0] = 0
+    values = table[np.minimum(characters, 127)]
+    invalid = (values < 0) | (characters > 127)
+    invalid = invalid.any(axis=1) | (lengths == 0)
+    if invalid.any():
+        bad = array.reshape(-1)[np.flatnonzero(invalid)[0]]
+        raise ValueError(f"Invalid geohash: {str(bad)!r}.")
+
+    codes = np.zeros(len(lengths), dtype=np.int64)
+    for position in range(width):
+        active = position < lengths
+        codes[active] = codes[active] * 32 + values[active, position]
+    return codes.reshape(array.shape), lengths.reshape(array.shape)
+
+
+def _geohash_grid(codes, lengths):
+    """
+    Return the rows, columns and numbers of latitude and longitude bits of geohashes.
+    """
+    bits = 5 * lengths
+    odd = bits % 2 == 1
+    columns = _compact(np.where(odd, codes, codes >> 1))
+    rows = _compact(np.where(odd, codes >> 1, codes))
+    return rows, columns, bits // 2, bits - bits // 2
+
+
+def _encode(function, points, width, workers):
+    """
+    Encode a point or an array of points with a module-level function(out, points, width).
+
+    Returns:
+    tuple: The int64 codes (one for a single point) and whether points was a single point.
+    """
+    points = _as_point_array(points, "points")
+    single = points.ndim == 1
+    out = parallel.map_chunks(
+        function,
+        np.empty(1 if single else len(points), dtype=np.int64),
+        [points.reshape(-1, 2)],
+        [True],
+        args=(width,),
+        workers=workers,
+    )
+    return out, single
+
+
+@instrument()
+def geohash_encode(points, precision=MAX_PRECISION, workers=None):
+    """
+    Encode points as geohashes.
+
+    Parameters:
+    points (tuple, numpy.ndarray or PointArray): A (lat, lon) point or an (N, 2) array of points.
+    precision (int): The number of characters, from 1 to 12 (default is 12).
+    workers (int): The number of worker processes for arrays (default is Config.workers).
+
+    Returns:
+    str or numpy.ndarray: The geohash of a point, or an array of geohash strings.
+
+    Raises:
+    ValueError: If the coordinates or the precision are invalid.
+    """
+    _check_integer(precision, "precision", 1, MAX_PRECISION)
+    codes, single = _encode(_geohash_into, points, precision, workers)
+    strings = _geohash_strings(codes, np.full(codes.shape, precision))
+    return str(strings[0]) if single else strings
+
+
+@instrument()
+def geohash_decode(geohashes):
+    """
+    Decode geohashes to the centers of their cells.
+
+    Parameters:
+    geohashes (str or sequence): A geohash or an array of geohashes (of any lengths).
+
+    Returns:
+    tuple or numpy.ndarray: The (lat, lon) center of a geohash, or an (N, 2) array of centers.
+
+    Raises:
+    ValueError: If a geohash is invalid.
+    """
+    south, west, north, east = _bounds(*_geohash_grid(*_parse_geohashes(geohashes)))
+    centers = np.stack([(south + north) / 2, (west + east) / 2], axis=-1)
+    return tuple(centers.tolist()) if centers.ndim == 1 else centers
+
+
+@instrument()
+def geohash_bounds(geohashes):
+    """
+    Return the bounding boxes of geohash cells.
+
+    Parameters:
+    geohashes (str or sequence): A geohash or an array of geohashes (of any lengths).
+
+    Returns:
+    tuple or numpy.ndarray: The (min_lat, min_lon, max_lat, max_lon) box of a geohash, or an (N, 4) array of boxes.
+
+    Raises:
+    ValueError: If a geohash is invalid.
+    """
+    bounds = np.stack(_bounds(*_geohash_grid(*_parse_geohashes(geohashes))), axis=-1)
+    return tuple(bounds.tolist()) if bounds.ndim == 1 else bounds
+
+
+@instrument()
+def geohash_neighbors(geohashes):
+    """
+    Return the 8 neighbors of geohashes, with the same precision.
+
+    The neighbors are ordered N, NE, E, SE, S, SW, W, NW. They wrap around the
+    antimeridian, and past a pole they are the cells on the opposite meridian.
+
+    Parameters:
+    geohashes (str or sequence): A geohash or an array of geohashes (of any lengths).
+
+    Returns:
+    list or numpy.ndarray: The neighbors of a geohash, or an (N, 8) array of neighbors.
+
+    Raises:
+    ValueError: If a geohash is invalid.
+    """
+    codes, lengths = _parse_geohashes(geohashes)
+    rows, columns, lat_bits, lon_bits = _geohash_grid(codes, lengths)
+    rows, columns = _neighbor_positions(rows, columns, lat_bits, lon_bits)
+    lengths = np.broadcast_to(lengths[..., None], rows.shape)
+    neighbors = _geohash_strings(_geohash_codes(rows, columns, lengths), lengths)
+    return neighbors.tolist() if neighbors.ndim == 1 else neighbors
+
+
+@instrument()
+def geohash_covering(point, radius, precision, unit=None):
+    """
+    Return the geohashes of the cells that intersect a circle around a point.
+
+    Every point within the radius (by haversine_distance or vincenty_distance)
+    falls in one of the cells; a few cells near the edge may contain no such
+    point.
+
+    Parameters:
+    point (tuple): The latitude and longitude of the center.
+    radius (float): The radius in the specified unit.
+    precision (int): The number of characters of the geohashes, from 1 to 12.
+    unit (str): The unit of measurement for the radius (default is Config.unit).
+
+    Returns:
+    numpy.ndarray: The sorted geohashes.
+
+    Raises:
+    ValueError: If the coordinates, the radius or the precision are invalid, or the covering needs too many cells.
+    """
+    _check_integer(precision, "precision", 1, MAX_PRECISION)
+    bits = 5 * precision
+    rows, columns = _covering(point, radius, unit, bits // 2, bits - bits // 2)
+    lengths = np.full(rows.shape, precision)
+    return np.unique(_geohash_strings(_geohash_codes(rows, columns, lengths), lengths))
+
+
+@functools.lru_cache(maxsize=None)
+def _hilbert_tables():
+    """
+    Build the lookup tables that step along the Hilbert curve 4 levels at a time.
+
+    The orientation of the curve in the remaining sub-square is one of 4 states
+    (whether x and y are swapped, and whether they are complemented). For every
+    state and 4 bits of x and y, the encoding tables give the 8 bits of the
+    index and the next state; the decoding tables are their inverse.
+
+    Returns:
+    tuple: The index digits and next states of the encoding, and the x bits,
+    y bits and next states of the decoding, as arrays indexed by
+    (state << 8) | (x << 4) | y and (state << 8) | digits respectively.
+    """
+    digits = np.zeros(1024, dtype=np.int64)
+    states = np.zeros(1024, dtype=np.int64)
+    xs = np.zeros(1024, dtype=np.int64)
+    ys = np.zeros(1024, dtype=np.int64)
+    next_states = np.zeros(1024, dtype=np.int64)
+    for state in range(4):
+        for x in range(16):
+            for y in range(16):
+                swap, flip = state & 1, state >> 1
+                d = 0
+                for k in range(3, -1, -1):
+                    rx, ry = (x >> k) & 1, (y >> k) & 1
+                    if swap:
+                        rx, ry = ry, rx
+                    rx ^= flip
+                    ry ^= flip
+                    d = (d << 2) | ((3 * rx) ^ ry)
+                    # Rotate the sub-square so that the curve continues in the same orientation
+                    if ry == 0:
+                        flip ^= rx
+                        swap ^= 1
+                index = (state << 8) | (x << 4) | y
+                digits[index] = d
+                states[index] = swap | (flip << 1)
+                xs[(state << 8) | d] = x
+                ys[(state << 8) | d] = y
+                next_states[(state << 8) | d] = states[index]
+    return digits, states, xs, ys, next_states
+
+
+def _hilbert_index(x, y, level):
+    """
+    Return the positions along the Hilbert curve of the cells (x, y) of a 2**level grid.
+    """
+    digits, states = _hilbert_tables()[:2]
+    steps = -(-level // 4)
+    # Each leading zero level padded to reach a multiple of 4 swaps x and y
+    if (4 * steps - level) % 2:
+        x, y = y, x
+    d = np.zeros(np.shape(x), dtype=np.int64)
+    state = np.zeros(np.shape(x), dtype=np.int64)
+    for shift in range(4 * steps - 4, -1, -4):
+        index = (state << 8) | (((x >> shift) & 15) << 4) | ((y >> shift) & 15)
+        d = (d << 8) | digits[index]
+        state = states[index]
+    return d
+
+
+def _hilbert_position(d, level):
+    """
+    Return the cells (x, y) of a 2**level grid at positions d along the Hilbert curve.
+    """
+    xs, ys, states = _hilbert_tables()[2:]
+    steps = -(-level // 4)
+    x = np.zeros(np.shape(d), dtype=np.int64)
+    y = np.zeros(np.shape(d), dtype=np.int64)
+    state = np.zeros(np.shape(d), dtype=np.int64)
+    for shift in range(8 * steps - 8, -1, -8):
+        index = (state << 8) | ((d >> shift) & 255)
+        x = (x << 4) | xs[index]
+        y = (y << 4) | ys[index]
+        state = states[index]
+    if (4 * steps - level) % 2:
+        x, y = y, x
+    return x, y
+
+
+def _cell_ids(rows, columns, level):
+    """
+    Return the IDs of the grid cells (rows, columns) of a level.
+    """
+    d = _hilbert_index(columns, rows, level)
+    return ((d << 1) | 1) << (2 * (MAX_LEVEL - level))
+
+
+def _cells_into(out, points, level):
+    """
+    Write the cell IDs of points into out.
+    """
+    rows = _grid_position(points[:, 0], 90, 180, level)
+    columns = _grid_position(points[:, 1], 180, 360, level)
+    out[:] = _cell_ids(rows, columns, level)
+
+
+def _parse_cells(cells):
+    """
+    Convert cell IDs to an int64 array and return it with the levels.
+
+    Raises:
+    ValueError: If a value is not a valid cell ID.
+    """
+    ids = np.asarray(cells)
+    if ids.dtype.kind not in "iu":
+        raise ValueError("Invalid cell ID: cell IDs must be integers.")
+    ids = ids.astype(np.int64)
+    lowest = ids & -ids
+    trailing = np.frexp(lowest.astype(np.float64))[1] - 1
+    invalid = (ids <= 0) | (ids >= 1 << (2 * MAX_LEVEL + 1)) | (trailing % 2 == 1)
+    if invalid.any():
+        bad = ids.reshape(-1)[np.flatnonzero(invalid.reshape(-1))[0]]
+        raise ValueError(f"Invalid cell ID: {int(bad)}.")
+    return ids, MAX_LEVEL - trailing // 2
+
+
+def _cell_grid(ids, levels):
+    """
+    Return the rows and columns of cells in the grids of their levels.
+    """
+    lowest = ids & -ids
+    x, y = _hilbert_position((ids - lowest + 1) >> 1, MAX_LEVEL)
+    return y >> (MAX_LEVEL - levels), x >> (MAX_LEVEL - levels)
+
+
+def _single(value, cells):
+    """
+    Return a NumPy result as a Python scalar when cells was a single ID.
+    """
+    return value.item() if np.ndim(cells) == 0 else value
+
+
+@instrument()
+def cell_encode(points, level=MAX_LEVEL, workers=None):
+    """
+    Encode points as the integer IDs of their cells at a level.
+
+    A level L divides the latitudes and longitudes into 2**L intervals each
+    (level 30 cells are about 2 by 4 centimeters at the equator), and the cells
+    are numbered along a Hilbert curve. Sorting the IDs groups the points by
+    cell at every coarser level at the same time.
+
+    Parameters:
+    points (tuple, numpy.ndarray or PointArray): A (lat, lon) point or an (N, 2) array of points.
+    level (int): The level of the cells, from 0 to 30 (default is 30).
+    workers (int): The number of worker processes for arrays (default is Config.workers).
+
+    Returns:
+    int or numpy.ndarray: The cell ID of a point, or an int64 array of cell IDs.
+
+    Raises:
+    ValueError: If the coordinates or the level are invalid.
+    """
+    _check_integer(level, "level", 0, MAX_LEVEL)
+    ids, single = _encode(_cells_into, points, level, workers)
+    return int(ids[0]) if single else ids
+
+
+@instrument()
+def cell_decode(cells):
+    """
+    Decode cell IDs to the centers of their cells.
+
+    Parameters:
+    cells (int or sequence): A cell ID or an array of cell IDs (of any levels).
+
+    Returns:
+    tuple or numpy.ndarray: The (lat, lon) center of a cell, or an array of centers with a trailing axis of 2.
+
+    Raises:
+    ValueError: If a value is not a valid cell ID.
+    """
+    ids, levels = _parse_cells(cells)
+    south, west, north, east = _bounds(*_cell_grid(ids, levels), levels, levels)
+    centers = np.stack([(south + north) / 2, (west + east) / 2], axis=-1)
+    return tuple(centers.tolist()) if centers.ndim == 1 else centers
+
+
+@instrument()
+def cell_bounds(cells):
+    """
+    Return the bounding boxes of cells.
+
+    Parameters:
+    cells (int or sequence): A cell ID or an array of cell IDs (of any levels).
+
+    Returns:
+    tuple or numpy.ndarray: The (min_lat, min_lon, max_lat, max_lon) box of a cell, or an array of boxes with a trailing axis of 4.
+
+    Raises:
+    ValueError: If a value is not a valid cell ID.
+    """
+    ids, levels = _parse_cells(cells)
+    bounds = np.stack(_bounds(*_cell_grid(ids, levels), levels, levels), axis=-1)
+    return tuple(bounds.tolist()) if bounds.ndim == 1 else bounds
+
+
+@instrument()
+def cell_level(cells):
+    """
+    Return the levels of cells.
+
+    Parameters:
+    cells (int or sequence): A cell ID or an array of cell IDs.
+
+    Returns:
+    int or numpy.ndarray: The level of a cell, or an array of levels.
+
+    Raises:
+    ValueError: If a value is not a valid cell ID.
+    """
+    return _single(_parse_cells(cells)[1], cells)
+
+
+@instrument()
+def cell_parent(cells, level):
+    """
+    Return the ancestors of cells at a coarser level.
+
+    Parameters:
+    cells (int or sequence): A cell ID or an array of cell IDs.
+    level (int): The level of the ancestors, at most the level of every cell.
+
+    Returns:
+    int or numpy.ndarray: The ancestor of a cell, or an array of ancestors.
+
+    Raises:
+    ValueError: If a value is not a valid cell ID or a cell is coarser than the level.
+    """
+    _check_integer(level, "level", 0, MAX_LEVEL)
+    ids, levels = _parse_cells(cells)
+    if np.any(levels < level):
+        raise ValueError(f"Cells must have a level of at least {level}.")
+    lowest = 1 << (2 * (MAX_LEVEL - level))
+    return _single((ids & -lowest) | lowest, cells)
+
+
+@instrument()
+def cell_range(cells):
+    """
+    Return the first and last level 30 descendants of cells.
+
+    A point lies in a cell exactly when its level 30 cell ID falls in this
+    inclusive range, so the points of a cell can be found in sorted IDs with
+    numpy.searchsorted.
+
+    Parameters:
+    cells (int or sequence): A cell ID or an array of cell IDs.
+
+    Returns:
+    tuple: The first and last IDs, as integers for a single cell or as arrays.
+
+    Raises:
+    ValueError: If a value is not a valid cell ID.
+    """
+    ids, _ = _parse_cells(cells)
+    lowest = ids & -ids
+    return _single(ids - lowest + 1, cells), _single(ids + lowest - 1, cells)
+
+
+@instrument()
+def cell_neighbors(cells):
+    """
+    Return the 8 neighbors of cells, at the same level.
+
+    The neighbors are ordered N, NE, E, SE, S, SW, W, NW. They wrap around the
+    antimeridian, and past a pole they are the cells on the opposite meridian.
+
+    Parameters:
+    cells (int or sequence): A cell ID or an array of cell IDs (of any levels).
+
+    Returns:
+    list or numpy.ndarray: The neighbors of a cell, or an array of neighbors with a trailing axis of 8.
+
+    Raises:
+    ValueError: If a value is not a valid cell ID.
+    """
+    ids, levels = _parse_cells(cells)
+    rows, columns = _cell_grid(ids, levels)
+    rows, columns = _neighbor_positions(rows, columns, levels, levels)
+    neighbors = np.empty(rows.shape, dtype=np.int64)
+    for level in np.unique(levels):
+        same = levels == level
+        neighbors[same] = _cell_ids(rows[same], columns[same], int(level))
+    return neighbors.tolist() if neighbors.ndim == 1 else neighbors
+
+
+@instrument()
+def cell_covering(point, radius, level, unit=None):
+    """
+    Return the IDs of the cells of a level that intersect a circle around a point.
+
+    Every point within the radius (by haversine_distance or vincenty_distance)
+    falls in one of the cells; a few cells near the edge may contain no such
+    point. With cell_range, the covering turns a radius query over sorted cell
+    IDs into a few binary searches. Near the poles the cells become narrow, so
+    a covering there needs many more cells than at the equator.
+
+    Parameters:
+    point (tuple): The latitude and longitude of the center.
+    radius (float): The radius in the specified unit.
+    level (int): The level of the cells, from 0 to 30.
+    unit (str): The unit of measurement for the radius (default is Config.unit).
+
+    Returns:
+    numpy.ndarray: The sorted cell IDs.
+
+    Raises:
+    ValueError: If the coordinates, the radius or the level are invalid, or the covering needs too many cells.
+    """
+    _check_integer(level, "level", 0, MAX_LEVEL)
+    rows, columns = _covering(point, radius, unit, level, level)
+    return np.unique(_cell_ids(rows, columns, level))
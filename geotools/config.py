@@ -4,6 +4,7 @@ DEFAULT_UNIT = "km"
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY", "your-default-api-key")
 OPENCAGE_API_KEY = os.getenv("OPENCAGE_API_KEY", "your-opencage-api-key")
 MAPQUEST_API_KEY = os.getenv("MAPQUEST_API_KEY", "your-mapquest-api-key")
+DEFAULT_GEOCODE_RATE_LIMITS = {"google": 50, "opencage": 15, "mapquest": 20}
 
 
 class Config:
@@ -16,10 +17,28 @@ class Config:
     GOOGLE_API_KEY (str): The API key for Google Geocoding API.
     OPENCAGE_API_KEY (str): The API key for OpenCage Geocoding API.
     MAPQUEST_API_KEY (str): The API key for MapQuest Geocoding API.
+    workers (int): The number of worker processes for batch computations (default is 1, None means one per CPU core).
+    chunk_size (int): The number of pairs computed (or handed to a worker process) at a time (default is 1000000).
+    distance_cache_size (int): The number of distances kept by haversine_distance and vincenty_distance (default is 0, the cache is off).
+    distance_cache_precision (float): The quantization step in degrees of the distance cache keys (default is None, exact keys).
+    geocode_concurrency (int): The maximum number of concurrent geocoding requests (default is 10).
+    geocode_rate_limits (dict): The maximum number of requests per second to each geocoding API.
+    geocode_cache (GeocodeCache): A persistent geocoding cache used by default (default is None).
+    geocode_endpoints (dict): Endpoint URLs by API that replace the default ones, e.g. a proxy or a local stub server (default is empty).
+    metrics_enabled (bool): Whether instrumented functions record metrics in geotools.metrics.registry (default is False).
     """
 
     unit = "km"
     timeout = 10
+    workers = 1
+    chunk_size = 1000000
+    distance_cache_size = 0
+    distance_cache_precision = None
+    geocode_concurrency = 10
+    geocode_rate_limits = dict(DEFAULT_GEOCODE_RATE_LIMITS)
+    geocode_cache = None
+    geocode_endpoints = {}
+    metrics_enabled = False
     GOOGLE_API_KEY = GOOGLE_API_KEY
     OPENCAGE_API_KEY = OPENCAGE_API_KEY
     MAPQUEST_API_KEY = MAPQUEST_API_KEY
@@ -43,6 +62,15 @@ class Config:
         """
         cls.unit = DEFAULT_UNIT
         cls.timeout = 10
+        cls.workers = 1
+        cls.chunk_size = 1000000
+        cls.distance_cache_size = 0
+        cls.distance_cache_precision = None
+        cls.geocode_concurrency = 10
+        cls.geocode_rate_limits = dict(DEFAULT_GEOCODE_RATE_LIMITS)
+        cls.geocode_cache = None
+        cls.geocode_endpoints = {}
+        cls.metrics_enabled = False
         cls.GOOGLE_API_KEY = GOOGLE_API_KEY
         cls.OPENCAGE_API_KEY = OPENCAGE_API_KEY
         cls.MAPQUEST_API_KEY = MAPQUEST_API_KEY
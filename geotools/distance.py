@@ -1,23 +1,26 @@
 import math
+from collections import OrderedDict
+from geotools._lazy import lazy_import
 from geotools.config import Config
-from functools import lru_cache
+from geotools.metrics import instrument, registry, timed
+from geotools.points import PointArray, _validate_coordinates
 
+# NumPy and the process pool are only imported by the batch functions, so a
+# scalar distance does not pay for them.
+np = lazy_import("numpy")
+parallel = lazy_import("geotools.parallel")
 
-@lru_cache(maxsize=128)
-def haversine_distance(point1, point2, unit=None):
-    """
-    Calculate the distance between two points using the Haversine formula.
+# Mean radius of the Earth in kilometers used by the Haversine formula
+EARTH_RADIUS_KM = 6371.01
 
-    Parameters:
-    point1 (tuple): The latitude and longitude of the first point.
-    point2 (tuple): The latitude and longitude of the second point.
-    unit (str): The unit of measurement for the distance (default is "km").
+# WGS-84 ellipsoid used by the Vincenty formula
+WGS84_A = 6378137.0  # Semi-major axis of the Earth (meters)
+WGS84_F = 1 / 298.257223563  # Flattening of the Earth
 
-    Returns:
-    float: The distance between the two points in the specified unit.
 
-    Raises:
-    ValueError: If the coordinates are invalid.
+def _haversine_distance(point1, point2, unit):
+    """
+    Calculate the Haversine distance between two points in a resolved unit, without caching.
     """
     if not (-90 <= point1[0] <= 90 and -180 <= point1[1] <= 180):
         raise ValueError(
@@ -28,54 +31,45 @@ def haversine_distance(point1, point2, unit=None):
             "Invalid coordinates for point2. Latitude must be between -90 and 90, and longitude must be between -180 and 180."
         )
 
-    lat1, lon1 = point1
-    lat2, lon2 = point2
-
     # Convert latitude and longitude from degrees to radians
-    lat1 = math.radians(lat1)
-    lon1 = math.radians(lon1)
-    lat2 = math.radians(lat2)
-    lon2 = math.radians(lon2)
+    lat1 = math.radians(point1[0])
+    lat2 = math.radians(point2[0])
+    return _haversine_from_radians(
+        lat1,
+        math.radians(point1[1]),
+        math.cos(lat1),
+        lat2,
+        math.radians(point2[1]),
+        math.cos(lat2),
+        unit,
+    )
+
 
+def _haversine_from_radians(lat1, lon1, cos_lat1, lat2, lon2, cos_lat2, unit):
+    """
+    Calculate the Haversine distance from coordinates in radians and the cosines of the latitudes.
+    """
     # Haversine formula
     dlat = lat2 - lat1
     dlon = lon2 - lon1
-    a = (
-        math.sin(dlat / 2) ** 2
-        + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
-    )
+    a = math.sin(dlat / 2) ** 2 + cos_lat1 * cos_lat2 * math.sin(dlon / 2) ** 2
     c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
 
     # Radius of Earth in kilometers (mean radius)
-    R = 6371.01
+    R = EARTH_RADIUS_KM
 
     # Calculate the distance
     distance = R * c
 
-    if unit is None:
-        unit = Config.unit
-
     if unit == "miles":
         distance *= 0.621371
 
     return distance
 
 
-@lru_cache(maxsize=128)
-def vincenty_distance(point1, point2, unit=None):
+def _vincenty_distance(point1, point2, unit):
     """
-    Calculate the distance between two points using the Vincenty formula.
-
-    Parameters:
-    point1 (tuple): The latitude and longitude of the first point.
-    point2 (tuple): The latitude and longitude of the second point.
-    unit (str): The unit of measurement for the distance (default is "km").
-
-    Returns:
-    float: The distance between the two points in the specified unit.
-
-    Raises:
-    ValueError: If the coordinates are invalid.
+    Calculate the Vincenty distance between two points in a resolved unit, without caching.
     """
     if not (-90 <= point1[0] <= 90 and -180 <= point1[1] <= 180):
         raise ValueError(
@@ -86,30 +80,30 @@ def vincenty_distance(point1, point2, unit=None):
             "Invalid coordinates for point2. Latitude must be between -90 and 90, and longitude must be between -180 and 180."
         )
 
-    lat1, lon1 = point1
-    lat2, lon2 = point2
+    sinU1, cosU1 = _reduced_latitude(point1[0])
+    sinU2, cosU2 = _reduced_latitude(point2[0])
+    L = math.radians(point2[1]) - math.radians(point1[1])
+    return _vincenty_from_reduced(sinU1, cosU1, sinU2, cosU2, L, unit)
 
-    # Convert latitude and longitude from degrees to radians
-    lat1 = math.radians(lat1)
-    lon1 = math.radians(lon1)
-    lat2 = math.radians(lat2)
-    lon2 = math.radians(lon2)
 
+def _reduced_latitude(latitude):
+    """
+    Return the sine and cosine of the reduced latitude U = atan((1 - f) tan(lat)) for a latitude in degrees.
+    """
+    U = math.atan((1 - WGS84_F) * math.tan(math.radians(latitude)))
+    return math.sin(U), math.cos(U)
+
+
+def _vincenty_from_reduced(sinU1, cosU1, sinU2, cosU2, L, unit):
+    """
+    Calculate the Vincenty distance from the reduced latitudes and the longitude difference L in radians.
+    """
     # Vincenty formula
-    a = 6378137.0  # Semi-major axis of the Earth (meters)
-    f = 1 / 298.257223563  # Flattening of the Earth
+    a = WGS84_A
+    f = WGS84_F
     b = (1 - f) * a
-
-    U1 = math.atan((1 - f) * math.tan(lat1))
-    U2 = math.atan((1 - f) * math.tan(lat2))
-    L = lon2 - lon1
     Lambda = L
 
-    sinU1 = math.sin(U1)
-    cosU1 = math.cos(U1)
-    sinU2 = math.sin(U2)
-    cosU2 = math.cos(U2)
-
     for _ in range(1000):
         sinLambda = math.sin(Lambda)
         cosLambda = math.cos(Lambda)
@@ -122,7 +116,10 @@ def vincenty_distance(point1, point2, unit=None):
         sigma = math.atan2(sinSigma, cosSigma)
         sinAlpha = cosU1 * cosU2 * sinLambda / sinSigma
         cos2Alpha = 1 - sinAlpha**2
-        cos2SigmaM = cosSigma - 2 * sinU1 * sinU2 / cos2Alpha
+        if cos2Alpha != 0:
+            cos2SigmaM = cosSigma - 2 * sinU1 * sinU2 / cos2Alpha
+        else:
+            cos2SigmaM = 0.0  # Both points lie on the equator
         C = f / 16 * cos2Alpha * (4 + f * (4 - 3 * cos2Alpha))
         Lambda_prev = Lambda
         Lambda = L + (1 - C) * f * sinAlpha * (
@@ -144,11 +141,7 @@ def vincenty_distance(point1, point2, unit=None):
             / 4
             * (
                 cosSigma * (-1 + 2 * cos2SigmaM**2)
-                - B
-                / 6
-                * cos2SigmaM
-                * (-3 + 4 * sinSigma**2)
-                * (-3 + 4 * cos2SigmaM**2)
+                - B / 6 * cos2SigmaM * (-3 + 4 * sinSigma**2) * (-3 + 4 * cos2SigmaM**2)
             )
         )
     )
@@ -156,15 +149,220 @@ def vincenty_distance(point1, point2, unit=None):
     # Calculate the distance
     distance = b * A * (sigma - deltaSigma) / 1000  # Convert meters to kilometers
 
-    if unit is None:
-        unit = Config.unit
-
     if unit == "miles":
         distance *= 0.62137119
 
     return distance
 
 
+class DistanceCache:
+    """
+    Least-recently-used cache of scalar distances.
+
+    Entries are keyed on the formula, the two points and the resolved unit, so
+    changing Config.unit never returns a distance in the wrong unit. With a
+    precision, coordinates are rounded to multiples of it (e.g. 1e-6 degrees)
+    before lookup, so repeated legs with jittery coordinates share an entry; the
+    cached value is the distance between the first points seen for that key.
+
+    Attributes:
+    maxsize (int): The maximum number of entries.
+    precision (float): The quantization step of the coordinates in degrees (None means exact keys).
+    hits (int): The number of lookups answered from the cache.
+    misses (int): The number of lookups that computed the distance.
+    """
+
+    def __init__(self, maxsize=128, precision=None):
+        """
+        Create an empty cache.
+
+        Parameters:
+        maxsize (int): The maximum number of entries (default is 128).
+        precision (float): The quantization step of the coordinates in degrees (default is None).
+
+        Raises:
+        ValueError: If maxsize or precision is not positive.
+        """
+        if maxsize <= 0 or (precision is not None and precision <= 0):
+            raise ValueError("maxsize and precision must be positive.")
+        self.maxsize = maxsize
+        self.precision = precision
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, method, point1, point2, unit, function):
+        """
+        Return the cached distance between two points, computing it with function on a miss.
+
+        Parameters:
+        method (str): The name of the formula, part of the key.
+        point1 (tuple): The latitude and longitude of the first point.
+        point2 (tuple): The latitude and longitude of the second point.
+        unit (str): The resolved unit of measurement.
+        function (callable): Called as function(point1, point2, unit) on a miss.
+
+        Returns:
+        float: The distance between the two points.
+        """
+        if self.precision is None:
+            key = (method, tuple(point1), tuple(point2), unit)
+        else:
+            step = self.precision
+            key = (
+                method,
+                round(point1[0] / step),
+                round(point1[1] / step),
+                round(point2[0] / step),
+                round(point2[1] / step),
+                unit,
+            )
+
+        # Single OrderedDict operations are atomic, so the cache needs no lock;
+        # concurrent misses of the same key just compute the distance twice.
+        entries = self._entries
+        distance = entries.get(key)
+        if distance is not None:
+            try:
+                entries.move_to_end(key)
+            except KeyError:  # Evicted by another thread in the meantime
+                pass
+            self.hits += 1
+            return distance
+
+        distance = function(point1, point2, unit)
+        self.misses += 1
+        entries[key] = distance
+        while len(entries) > self.maxsize:
+            try:
+                entries.popitem(last=False)
+            except KeyError:
+                break
+        return distance
+
+    @property
+    def hit_rate(self):
+        """
+        The fraction of lookups answered from the cache.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self):
+        """
+        Remove all entries and reset the counters.
+        """
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_distance_cache = None
+
+
+def get_distance_cache():
+    """
+    Return the cache used by haversine_distance and vincenty_distance.
+
+    The cache follows Config.distance_cache_size and Config.distance_cache_precision;
+    it is replaced by an empty one when either of them changes.
+
+    Returns:
+    DistanceCache: The distance cache, or None if Config.distance_cache_size is 0.
+    """
+    global _distance_cache
+    size = Config.distance_cache_size
+    if not size:
+        return None
+    precision = Config.distance_cache_precision
+    cache = _distance_cache
+    if cache is None or cache.maxsize != size or cache.precision != precision:
+        cache = _distance_cache = DistanceCache(size, precision)
+    return cache
+
+
+def _distance_cache_metrics():
+    cache = _distance_cache
+    if cache is None:
+        return {}
+    return {"distance_cache_hits": cache.hits, "distance_cache_misses": cache.misses}
+
+
+registry.add_collector(_distance_cache_metrics)
+
+
+def _cached_distance(method, function, point1, point2, unit):
+    """
+    Calculate a scalar distance with function, through the distance cache if enabled.
+    """
+    if unit is None:
+        unit = Config.unit
+
+    # The cache is off by default: a miss costs more than the formula itself
+    if not Config.distance_cache_size:
+        return function(point1, point2, unit)
+    return get_distance_cache().get(method, point1, point2, unit, function)
+
+
+def haversine_distance(point1, point2, unit=None):
+    """
+    Calculate the distance between two points using the Haversine formula.
+
+    Results are cached in the distance cache configured by
+    Config.distance_cache_size and Config.distance_cache_precision, which is
+    off by default.
+
+    Parameters:
+    point1 (tuple): The latitude and longitude of the first point.
+    point2 (tuple): The latitude and longitude of the second point.
+    unit (str): The unit of measurement for the distance (default is Config.unit).
+
+    Returns:
+    float: The distance between the two points in the specified unit.
+
+    Raises:
+    ValueError: If the coordinates are invalid.
+    """
+    if Config.metrics_enabled:
+        with timed("haversine_distance"):
+            return _cached_distance(
+                "haversine", _haversine_distance, point1, point2, unit
+            )
+    return _cached_distance("haversine", _haversine_distance, point1, point2, unit)
+
+
+def vincenty_distance(point1, point2, unit=None):
+    """
+    Calculate the distance between two points using the Vincenty formula.
+
+    Results are cached in the distance cache configured by
+    Config.distance_cache_size and Config.distance_cache_precision, which is
+    off by default. The
+    iteration may not converge for nearly antipodal points; geodesic_distance
+    (in geotools.geodesic) converges for every pair of points.
+
+    Parameters:
+    point1 (tuple): The latitude and longitude of the first point.
+    point2 (tuple): The latitude and longitude of the second point.
+    unit (str): The unit of measurement for the distance (default is Config.unit).
+
+    Returns:
+    float: The distance between the two points in the specified unit.
+
+    Raises:
+    ValueError: If the coordinates are invalid.
+    """
+    if Config.metrics_enabled:
+        with timed("vincenty_distance"):
+            return _cached_distance(
+                "vincenty", _vincenty_distance, point1, point2, unit
+            )
+    return _cached_distance("vincenty", _vincenty_distance, point1, point2, unit)
+
+
 async def async_haversine_distance(point1, point2, unit=None):
     """
     Asynchronously calculate the distance between two points using the Haversine formula.
@@ -199,3 +397,1228 @@ async def async_vincenty_distance(point1, point2, unit=None):
     ValueError: If the coordinates are invalid.
     """
     return vincenty_distance(point1, point2, unit)
+
+
+def _as_point_array(points, name):
+    """
+    Convert a point or an array of points to a validated float64 array.
+
+    A PointArray was validated when it was built and is returned as an (N, 2)
+    view of its columns (float32 coordinates are converted to float64).
+
+    Parameters:
+    points (tuple, list, numpy.ndarray or PointArray): A single (lat, lon) point or an (N, 2) array of points.
+    name (str): The argument name used in error messages.
+
+    Returns:
+    numpy.ndarray: An array of shape (2,) for a single point or (N, 2).
+
+    Raises:
+    ValueError: If the points have an invalid shape or contain invalid coordinates.
+    """
+    if isinstance(points, PointArray):
+        return np.asarray(points, dtype=np.float64)
+    array = np.asarray(points, dtype=np.float64)
+    if array.ndim not in (1, 2) or array.shape[-1] != 2:
+        raise ValueError(
+            f"Invalid shape for {name}: {array.shape}. Expected a (lat, lon) point or an (N, 2) array of points."
+        )
+    _validate_coordinates(array[..., 0], array[..., 1], name)
+    return array
+
+
+def _as_coordinates(points, name):
+    """
+    Convert a point or an array of points to latitude and longitude arrays.
+
+    Parameters:
+    points (tuple, list, numpy.ndarray or PointArray): A single (lat, lon) point or an (N, 2) array of points.
+    name (str): The argument name used in error messages.
+
+    Returns:
+    tuple: The latitudes and longitudes as float64 arrays (0-d for a single point).
+
+    Raises:
+    ValueError: If the points have an invalid shape or contain invalid coordinates.
+    """
+    array = _as_point_array(points, name)
+    return array[..., 0], array[..., 1]
+
+
+def _broadcast_shape(latitudes1, latitudes2):
+    """
+    Return the shape of the result for two coordinate arrays.
+
+    Raises:
+    ValueError: If the arrays hold a different number of points.
+    """
+    try:
+        return np.broadcast(latitudes1, latitudes2).shape
+    except ValueError:
+        raise ValueError(
+            f"points1 and points2 must contain the same number of points or one of them must be a single point, got {latitudes1.shape[0]} and {latitudes2.shape[0]}."
+        )
+
+
+# Number of pairs processed per block by the vectorized kernels, and the edge
+# length of the square tiles used by distance_matrix. Blocks keep the
+# scratch buffers resident in the CPU cache instead of streaming full-size
+# temporaries through memory for every arithmetic step.
+_BLOCK_SIZE = 16384
+_TILE_SIZE = 256
+
+# Lower bound of the ratio between Vincenty (WGS-84) and Haversine distances for
+# the same pair of points; the true minimum is about 0.99442 (meridional arcs
+# near the equator). Used to turn Vincenty radii into safe Haversine radii.
+_VINCENTY_RATIO = 0.994
+
+# Margin (in degrees) added to the bounding boxes of radius searches so that
+# rounding never drops a point lying on the edge of the circle.
+_BOX_MARGIN = 1e-9
+
+# Degrees to radians, pre-multiplied by the half- and quarter-angle factors.
+_HALF_RADIAN = math.pi / 360
+_QUARTER_RADIAN = math.pi / 720
+
+
+def _cos_latitude(lat, out, scratch):
+    """
+    Calculate cos(lat) for latitudes given in degrees, using the tangent of the half angle.
+    """
+    np.multiply(lat, _HALF_RADIAN, out=scratch)
+    np.tan(scratch, out=scratch)
+    scratch *= scratch
+    np.subtract(1, scratch, out=out)
+    scratch += 1
+    out /= scratch
+    return out
+
+
+def _versine(angle, out, scratch):
+    """
+    Calculate 1 - cos(angle) for angles given in degrees, using the tangent of the half angle.
+    """
+    np.multiply(angle, _HALF_RADIAN, out=scratch)
+    np.tan(scratch, out=scratch)
+    scratch *= scratch
+    np.multiply(scratch, 2, out=out)
+    scratch += 1
+    out /= scratch
+    return out
+
+
+def _haversine_block(lat1, lon1, lat2, lon2, cos_lat1, cos_lat2, out, t, u):
+    """
+    Calculate central angles for one block of coordinate pairs given in degrees.
+
+    The half-angle terms are expressed through tangents of quarter angles
+    (sin(x)**2 = 4 tan(x/2)**2 / (1 + tan(x/2)**2)**2), which NumPy vectorizes far
+    better than float64 sin/cos. The inputs may be any arrays that broadcast to
+    the shape of out; all intermediate results reuse the scratch buffers t and u.
+    """
+    # sin(dlat / 2) ** 2
+    np.subtract(lat2, lat1, out=t)
+    t *= _QUARTER_RADIAN
+    np.tan(t, out=t)
+    t *= t
+    np.add(t, 1, out=u)
+    u *= u
+    t *= 4
+    t /= u
+
+    # cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
+    np.subtract(lon2, lon1, out=u)
+    u *= _QUARTER_RADIAN
+    np.tan(u, out=u)
+    u *= u
+    np.add(u, 1, out=out)
+    out *= out
+    u *= 4
+    u /= out
+    u *= cos_lat1
+    u *= cos_lat2
+
+    t += u
+    np.subtract(1, t, out=u)
+    np.sqrt(u, out=u)
+    np.sqrt(t, out=t)
+    np.arctan2(t, u, out=out)
+    out *= 2
+
+
+def _haversine_angle(lat1, lon1, lat2, lon2, out=None):
+    """
+    Calculate central angles (in radians) between points given in degrees.
+
+    Parameters:
+    lat1, lon1, lat2, lon2 (numpy.ndarray): Coordinate arrays that broadcast together.
+    out (numpy.ndarray): An optional contiguous array to write the angles into.
+
+    Returns:
+    numpy.ndarray: The central angles with the broadcast shape of the inputs.
+    """
+    shape = _broadcast_shape(lat1, lat2)
+    lat1, lon1, lat2, lon2 = (
+        np.broadcast_to(coordinate, shape).reshape(-1)
+        for coordinate in (lat1, lon1, lat2, lon2)
+    )
+    size = lat1.size
+
+    if out is None:
+        out = np.empty(shape)
+    result = out
+    out = out.reshape(-1)
+    block = min(size, _BLOCK_SIZE)
+    t = np.empty(block)
+    u = np.empty(block)
+    cos_lat1 = np.empty(block)
+    cos_lat2 = np.empty(block)
+    for start in range(0, size, _BLOCK_SIZE):
+        stop = min(start + _BLOCK_SIZE, size)
+        n = stop - start
+        _cos_latitude(lat1[start:stop], cos_lat1[:n], t[:n])
+        _cos_latitude(lat2[start:stop], cos_lat2[:n], t[:n])
+        _haversine_block(
+            lat1[start:stop],
+            lon1[start:stop],
+            lat2[start:stop],
+            lon2[start:stop],
+            cos_lat1[:n],
+            cos_lat2[:n],
+            out[start:stop],
+            t[:n],
+            u[:n],
+        )
+    return result
+
+
+def _haversine_into(out, points1, points2, unit):
+    """
+    Write the Haversine distances between two validated point arrays into out.
+    """
+    _haversine_angle(
+        points1[..., 0], points1[..., 1], points2[..., 0], points2[..., 1], out=out
+    )
+    out *= EARTH_RADIUS_KM
+
+    if unit == "miles":
+        out *= 0.621371
+
+
+@instrument()
+def batch_haversine_distance(points1, points2, unit=None, workers=None):
+    """
+    Calculate the distances between many pairs of points using the Haversine formula.
+
+    The whole batch is validated and computed in a single vectorized pass. Either
+    argument may also be a single point, which is then paired with every point of
+    the other argument. Large batches can be split across worker processes.
+
+    Parameters:
+    points1 (numpy.ndarray, PointArray or tuple): An (N, 2) array of latitudes and longitudes, or a single point.
+    points2 (numpy.ndarray, PointArray or tuple): An (N, 2) array of latitudes and longitudes, or a single point.
+    unit (str): The unit of measurement for the distances (default is Config.unit).
+    workers (int): The number of worker processes (default is Config.workers).
+
+    Returns:
+    numpy.ndarray: The distances between the pairs of points in the specified unit.
+
+    Raises:
+    ValueError: If the coordinates are invalid or the arrays have different lengths.
+    """
+    points1 = _as_point_array(points1, "points1")
+    points2 = _as_point_array(points2, "points2")
+    out = np.empty(_broadcast_shape(points1[..., 0], points2[..., 0]))
+
+    if unit is None:
+        unit = Config.unit
+
+    return parallel.map_chunks(
+        _haversine_into,
+        out,
+        [points1, points2],
+        [points1.ndim == 2, points2.ndim == 2],
+        args=(unit,),
+        workers=workers,
+    )
+
+
+def _vincenty_meters(lat1, lon1, lat2, lon2, max_iterations=1000):
+    """
+    Solve the Vincenty inverse problem for arrays of points given in degrees.
+
+    The lambda update runs over the whole batch at once; pairs that converge (or
+    turn out to be coincident) are dropped from the working set so the remaining
+    iterations only touch the pairs that still need them.
+
+    Parameters:
+    lat1, lon1, lat2, lon2 (numpy.ndarray): Coordinate arrays that broadcast together.
+    max_iterations (int): The iteration cap per pair.
+
+    Returns:
+    tuple: The distances in meters and the number of iterations used by each pair.
+    """
+    shape = _broadcast_shape(lat1, lat2)
+    lat1, lon1, lat2, lon2 = (
+        np.broadcast_to(coordinate, shape).reshape(-1)
+        for coordinate in (lat1, lon1, lat2, lon2)
+    )
+    sinU1, cosU1 = _reduced_latitudes(lat1)
+    sinU2, cosU2 = _reduced_latitudes(lat2)
+    L = np.radians(lon2) - np.radians(lon1)
+    distance, iterations = _vincenty_solve(
+        sinU1, cosU1, sinU2, cosU2, L, max_iterations
+    )
+    return distance.reshape(shape), iterations.reshape(shape)
+
+
+def _reduced_latitudes(latitudes):
+    """
+    Return the sines and cosines of the reduced latitudes for an array of latitudes in degrees.
+    """
+    U = np.arctan((1 - WGS84_F) * np.tan(np.radians(latitudes)))
+    return np.sin(U), np.cos(U)
+
+
+def _vincenty_solve(sinU1, cosU1, sinU2, cosU2, L, max_iterations):
+    """
+    Solve the Vincenty inverse problem from flat arrays of reduced latitudes and longitude differences.
+
+    Returns:
+    tuple: The distances in meters and the number of iterations used by each pair.
+    """
+    size = L.size
+    a = WGS84_A
+    f = WGS84_F
+    b = (1 - f) * a
+    Lambda = L.copy()
+
+    sinSigma = np.zeros(size)
+    cosSigma = np.ones(size)
+    sigma = np.zeros(size)
+    cos2Alpha = np.ones(size)
+    cos2SigmaM = np.zeros(size)
+    iterations = np.zeros(size, dtype=np.int64)
+
+    active = np.arange(size)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for _ in range(max_iterations):
+            if active.size == 0:
+                break
+            iterations[active] += 1
+
+            s_L = L[active]
+            s_sinU1 = sinU1[active]
+            s_cosU1 = cosU1[active]
+            s_sinU2 = sinU2[active]
+            s_cosU2 = cosU2[active]
+            s_Lambda = Lambda[active]
+
+            sinLambda = np.sin(s_Lambda)
+            cosLambda = np.cos(s_Lambda)
+            s_sinSigma = np.sqrt(
+                (s_cosU2 * sinLambda) ** 2
+                + (s_cosU1 * s_sinU2 - s_sinU1 * s_cosU2 * cosLambda) ** 2
+            )
+            s_cosSigma = s_sinU1 * s_sinU2 + s_cosU1 * s_cosU2 * cosLambda
+            s_sigma = np.arctan2(s_sinSigma, s_cosSigma)
+            sinAlpha = s_cosU1 * s_cosU2 * sinLambda / s_sinSigma
+            s_cos2Alpha = 1 - sinAlpha**2
+            # Pairs on the equator have cos2Alpha == 0 and cos2SigmaM == 0
+            s_cos2SigmaM = np.where(
+                s_cos2Alpha != 0,
+                s_cosSigma - 2 * s_sinU1 * s_sinU2 / s_cos2Alpha,
+                0.0,
+            )
+            C = f / 16 * s_cos2Alpha * (4 + f * (4 - 3 * s_cos2Alpha))
+            Lambda_next = s_L + (1 - C) * f * sinAlpha * (
+                s_sigma
+                + C
+                * s_sinSigma
+                * (s_cos2SigmaM + C * s_cosSigma * (-1 + 2 * s_cos2SigmaM**2))
+            )
+
+            coincident = s_sinSigma == 0
+            sinSigma[active] = s_sinSigma
+            cosSigma[active] = s_cosSigma
+            sigma[active] = s_sigma
+            cos2Alpha[active] = s_cos2Alpha
+            cos2SigmaM[active] = s_cos2SigmaM
+            Lambda[active] = np.where(coincident, s_Lambda, Lambda_next)
+
+            done = coincident | (np.abs(Lambda_next - s_Lambda) < 1e-12)
+            active = active[~done]
+
+    u2 = cos2Alpha * (a**2 - b**2) / (b**2)
+    A = 1 + u2 / 16384 * (4096 + u2 * (-768 + u2 * (320 - 175 * u2)))
+    B = u2 / 1024 * (256 + u2 * (-128 + u2 * (74 - 47 * u2)))
+    deltaSigma = (
+        B
+        * sinSigma
+        * (
+            cos2SigmaM
+            + B
+            / 4
+            * (
+                cosSigma * (-1 + 2 * cos2SigmaM**2)
+                - B / 6 * cos2SigmaM * (-3 + 4 * sinSigma**2) * (-3 + 4 * cos2SigmaM**2)
+            )
+        )
+    )
+    distance = b * A * (sigma - deltaSigma)
+    distance[sinSigma == 0] = 0.0  # Points are coincident
+
+    return distance, iterations
+
+
+def _vincenty_into(out, points1, points2, unit, max_iterations):
+    """
+    Write the Vincenty distances (column 0) and iteration counts (column 1) into out.
+    """
+    distance, iterations = _vincenty_meters(
+        points1[..., 0],
+        points1[..., 1],
+        points2[..., 0],
+        points2[..., 1],
+        max_iterations,
+    )
+    distance /= 1000  # Convert meters to kilometers
+
+    if unit == "miles":
+        distance *= 0.62137119
+
+    out[..., 0] = distance
+    out[..., 1] = iterations
+
+
+@instrument()
+def batch_vincenty_distance(
+    points1,
+    points2,
+    unit=None,
+    max_iterations=1000,
+    return_iterations=False,
+    workers=None,
+):
+    """
+    Calculate the distances between many pairs of points using the Vincenty formula.
+
+    The iteration runs over the whole batch at once and each pair stops iterating
+    as soon as it has converged. Coincident pairs return 0 and pairs that hit the
+    iteration cap (typically near-antipodal points) keep their last estimate,
+    exactly like vincenty_distance; their iteration count equals max_iterations
+    (batch_geodesic_distance converges for them). Large batches can be split
+    across worker processes.
+
+    Parameters:
+    points1 (numpy.ndarray, PointArray or tuple): An (N, 2) array of latitudes and longitudes, or a single point.
+    points2 (numpy.ndarray, PointArray or tuple): An (N, 2) array of latitudes and longitudes, or a single point.
+    unit (str): The unit of measurement for the distances (default is Config.unit).
+    max_iterations (int): The maximum number of iterations per pair (default is 1000).
+    return_iterations (bool): Whether to also return the number of iterations used by each pair.
+    workers (int): The number of worker processes (default is Config.workers).
+
+    Returns:
+    numpy.ndarray: The distances between the pairs of points in the specified unit.
+    When return_iterations is True, a tuple of the distances and the iteration counts.
+
+    Raises:
+    ValueError: If the coordinates are invalid or the arrays have different lengths.
+    """
+    points1 = _as_point_array(points1, "points1")
+    points2 = _as_point_array(points2, "points2")
+    shape = _broadcast_shape(points1[..., 0], points2[..., 0])
+
+    if unit is None:
+        unit = Config.unit
+
+    out = parallel.map_chunks(
+        _vincenty_into,
+        np.empty(shape + (2,)),
+        [points1, points2],
+        [points1.ndim == 2, points2.ndim == 2],
+        args=(unit, max_iterations),
+        workers=workers,
+    )
+    distance = out[..., 0].copy()
+
+    if return_iterations:
+        return distance, out[..., 1].astype(np.int64)
+    return distance
+
+
+def _fill_matrix(out, points1, points2, method, unit, symmetric=False):
+    """
+    Fill out with the distances between two validated point arrays, tile by tile.
+    """
+    lat1, lon1 = points1[:, 0], points1[:, 1]
+    lat2, lon2 = points2[:, 0], points2[:, 1]
+    shape = out.shape
+
+    if method == "haversine":
+        scale = EARTH_RADIUS_KM * (0.621371 if unit == "miles" else 1)
+        scratch = np.empty(max(shape))
+        cos_lat1 = _cos_latitude(lat1, np.empty(shape[0]), scratch[: shape[0]])
+        cos_lat2 = _cos_latitude(lat2, np.empty(shape[1]), scratch[: shape[1]])
+        tile = np.empty((_TILE_SIZE, _TILE_SIZE))
+        t = np.empty((_TILE_SIZE, _TILE_SIZE))
+        u = np.empty((_TILE_SIZE, _TILE_SIZE))
+    else:
+        scale = (0.62137119 if unit == "miles" else 1) / 1000
+
+    for row_start in range(0, shape[0], _TILE_SIZE):
+        row_stop = min(row_start + _TILE_SIZE, shape[0])
+        rows = slice(row_start, row_stop)
+        for col_start in range(row_start if symmetric else 0, shape[1], _TILE_SIZE):
+            col_stop = min(col_start + _TILE_SIZE, shape[1])
+            cols = slice(col_start, col_stop)
+
+            if method == "haversine":
+                tile_shape = (row_stop - row_start, col_stop - col_start)
+                block = tile[: tile_shape[0], : tile_shape[1]]
+                _haversine_block(
+                    lat1[rows, None],
+                    lon1[rows, None],
+                    lat2[None, cols],
+                    lon2[None, cols],
+                    cos_lat1[rows, None],
+                    cos_lat2[None, cols],
+                    block,
+                    t[: tile_shape[0], : tile_shape[1]],
+                    u[: tile_shape[0], : tile_shape[1]],
+                )
+            else:
+                block, _ = _vincenty_meters(
+                    lat1[rows, None],
+                    lon1[rows, None],
+                    lat2[None, cols],
+                    lon2[None, cols],
+                )
+            block *= scale
+
+            out[rows, cols] = block
+            if symmetric and col_start != row_start:
+                out[cols, rows] = block.T
+
+
+@instrument()
+def distance_matrix(
+    points1,
+    points2=None,
+    method="haversine",
+    unit=None,
+    dtype=None,
+    out=None,
+    filename=None,
+    workers=None,
+):
+    """
+    Calculate the matrix of distances between two sets of points.
+
+    The matrix is filled in square tiles so the working set of every step stays
+    in the CPU cache; only the output itself grows with the number of points.
+    When points2 is omitted, the pairwise matrix of points1 is computed and only
+    one triangle of tiles is evaluated. With several workers, bands of rows are
+    computed in parallel processes that write straight into the output.
+
+    Parameters:
+    points1 (numpy.ndarray or PointArray): An (N, 2) array of latitudes and longitudes.
+    points2 (numpy.ndarray or PointArray): An (M, 2) array of latitudes and longitudes (default is points1).
+    method (str): The distance formula to use ("haversine", "vincenty").
+    unit (str): The unit of measurement for the distances (default is Config.unit).
+    dtype (numpy.dtype): The dtype of the output, e.g. numpy.float32 (default is numpy.float64).
+    out (numpy.ndarray): An existing (N, M) array to write the distances into (workers write
+    straight into the file behind a numpy.memmap).
+    filename (str): A path to write the matrix to as a memory-mapped .npy file.
+    workers (int): The number of worker processes (default is Config.workers).
+
+    Returns:
+    numpy.ndarray: The (N, M) distance matrix (a numpy.memmap when filename is given).
+
+    Raises:
+    ValueError: If the coordinates are invalid, the method is unsupported or out has the wrong shape.
+    """
+    if method not in ("haversine", "vincenty"):
+        raise ValueError("Unsupported method. Please use 'haversine' or 'vincenty'.")
+
+    points1 = _as_point_array(points1, "points1").reshape(-1, 2)
+    symmetric = points2 is None
+    if symmetric:
+        points2 = points1
+    else:
+        points2 = _as_point_array(points2, "points2").reshape(-1, 2)
+    shape = (points1.shape[0], points2.shape[0])
+    if dtype is None:
+        dtype = np.float64
+
+    if out is not None:
+        if out.shape != shape:
+            raise ValueError(f"Invalid shape for out: {out.shape}. Expected {shape}.")
+        filename = None
+    elif filename is not None:
+        out = np.lib.format.open_memmap(filename, mode="w+", dtype=dtype, shape=shape)
+    else:
+        out = np.empty(shape, dtype=dtype)
+
+    if unit is None:
+        unit = Config.unit
+
+    if parallel.resolve_workers(workers) > 1:
+        parallel.map_chunks(
+            _fill_matrix,
+            out,
+            [points1, points2],
+            [True, False],
+            args=(method, unit),
+            workers=workers,
+            chunk_size=max(1, Config.chunk_size // max(shape[1], 1)),
+            filename=filename,
+        )
+    else:
+        _fill_matrix(out, points1, points2, method, unit, symmetric)
+
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out
+
+
+def _bounding_box(latitude, longitude, angle):
+    """
+    Return the latitude/longitude bounding box of a spherical cap.
+
+    Parameters:
+    latitude (float): The latitude of the center in degrees.
+    longitude (float): The longitude of the center in degrees.
+    angle (float): The angular radius of the cap in radians.
+
+    Returns:
+    tuple: The minimum and maximum latitudes, and the (minimum, maximum) longitudes
+    or None when the cap covers every longitude (e.g. it contains a pole). The
+    minimum longitude is greater than the maximum when the box crosses the antimeridian.
+    """
+    delta = math.degrees(angle) + _BOX_MARGIN
+    min_latitude = latitude - delta
+    max_latitude = latitude + delta
+    if min_latitude <= -90 or max_latitude >= 90:
+        return min_latitude, max_latitude, None
+
+    # Widest longitude offset of the cap, reached at the tangent meridians
+    ratio = math.sin(angle) / math.cos(math.radians(latitude))
+    if ratio >= 1:
+        return min_latitude, max_latitude, None
+    spread = math.degrees(math.asin(ratio)) + _BOX_MARGIN
+    if spread >= 180:
+        return min_latitude, max_latitude, None
+    min_longitude = longitude - spread
+    max_longitude = longitude + spread
+    if min_longitude < -180:
+        min_longitude += 360
+    if max_longitude > 180:
+        max_longitude -= 360
+    return min_latitude, max_latitude, (min_longitude, max_longitude)
+
+
+@instrument()
+def within_radius(
+    point, candidates, radius, method="haversine", unit=None, max_iterations=1000
+):
+    """
+    Find the candidates within a radius of a point.
+
+    A vectorized latitude/longitude bounding-box test discards the candidates
+    that are obviously too far away first (the box wraps around the
+    antimeridian and spans every longitude when the circle contains a pole).
+    The exact Haversine or Vincenty distance is then only computed for the
+    candidates left inside the box.
+
+    Parameters:
+    point (tuple): The latitude and longitude of the center.
+    candidates (numpy.ndarray or PointArray): An (N, 2) array of latitudes and longitudes.
+    radius (float): The search radius in the specified unit.
+    method (str): The distance formula to use ("haversine", "vincenty").
+    unit (str): The unit of measurement for the radius and distances (default is Config.unit).
+    max_iterations (int): The maximum number of Vincenty iterations per pair (default is 1000).
+
+    Returns:
+    tuple: The indices of the candidates within the radius (in increasing order)
+    and their distances in the specified unit.
+
+    Raises:
+    ValueError: If the coordinates are invalid, the radius is negative or the method is unsupported.
+    """
+    if method not in ("haversine", "vincenty"):
+        raise ValueError("Unsupported method. Please use 'haversine' or 'vincenty'.")
+    if not (-90 <= point[0] <= 90 and -180 <= point[1] <= 180):
+        raise ValueError(
+            "Invalid coordinates for point. Latitude must be between -90 and 90, and longitude must be between -180 and 180."
+        )
+    if not radius >= 0:
+        raise ValueError("radius must be a non-negative number.")
+    candidates = _as_point_array(candidates, "candidates").reshape(-1, 2)
+    if unit is None:
+        unit = Config.unit
+
+    angle = radius / (EARTH_RADIUS_KM * (0.621371 if unit == "miles" else 1))
+    if method == "vincenty":
+        angle /= _VINCENTY_RATIO
+    min_latitude, max_latitude, longitudes = _bounding_box(point[0], point[1], angle)
+
+    latitude_column = candidates[:, 0]
+    longitude_column = candidates[:, 1]
+    inside = latitude_column >= min_latitude
+    inside &= latitude_column <= max_latitude
+    indices = np.flatnonzero(inside)
+    if longitudes is not None:
+        min_longitude, max_longitude = longitudes
+        lon2 = longitude_column[indices]
+        if min_longitude <= max_longitude:
+            inside = (lon2 >= min_longitude) & (lon2 <= max_longitude)
+        else:
+            inside = (lon2 >= min_longitude) | (lon2 <= max_longitude)
+        indices = indices[inside]
+
+    lat2 = latitude_column[indices]
+    lon2 = longitude_column[indices]
+    if method == "haversine":
+        distances = _haversine_angle(point[0], point[1], lat2, lon2)
+        distances *= EARTH_RADIUS_KM
+        if unit == "miles":
+            distances *= 0.621371
+    else:
+        distances, _ = _vincenty_meters(point[0], point[1], lat2, lon2, max_iterations)
+        distances *= (0.62137119 if unit == "miles" else 1) / 1000
+
+    inside = distances <= radius
+    return indices[inside], distances[inside]
+
+
+# Methods of approximate_distance
+APPROXIMATIONS = ("equirectangular", "cosines", "flat")
+
+# Square of the eccentricity of the WGS-84 ellipsoid, and its semi-major axis in km
+_WGS84_E2 = WGS84_F * (2 - WGS84_F)
+_WGS84_A_KM = WGS84_A / 1000
+
+
+def _approximate_km(method, lat1, lon1, lat2, lon2):
+    """
+    Calculate an approximate distance in kilometers between two points given in degrees.
+    """
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians((lon2 - lon1 + 180) % 360 - 180)
+    lat1 = math.radians(lat1)
+    lat2 = math.radians(lat2)
+    if method == "cosines":
+        # 1 - cos(angle), the law of cosines in versine form (see _approximate_block)
+        versine = (
+            2 * math.sin(dlat / 2) ** 2
+            + 2 * math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+        )
+        return EARTH_RADIUS_KM * 2 * math.asin(math.sqrt(min(1.0, versine / 2)))
+
+    cos_latitude = math.cos((lat1 + lat2) / 2)
+    if method == "equirectangular":
+        return EARTH_RADIUS_KM * math.hypot(dlon * cos_latitude, dlat)
+
+    w = 1 - _WGS84_E2 * (1 - cos_latitude * cos_latitude)
+    normal = _WGS84_A_KM / math.sqrt(w)
+    meridional = normal * (1 - _WGS84_E2) / w
+    return math.hypot(normal * cos_latitude * dlon, meridional * dlat)
+
+
+def _norm(x, y, out):
+    """
+    Calculate sqrt(x**2 + y**2) in place of x; numpy.hypot is several times slower.
+    """
+    x *= x
+    np.multiply(y, y, out=out)
+    out += x
+    np.sqrt(out, out=out)
+
+
+def _approximate_block(method, lat1, lon1, lat2, lon2, out, t, u):
+    """
+    Calculate approximate distances in kilometers for one block of coordinate pairs given in degrees.
+
+    All intermediate results reuse the scratch buffers t and u, like _haversine_block.
+    """
+    if method == "cosines":
+        # 1 - cos(angle) = vers(dlat) + cos(lat1) cos(lat2) vers(dlon), the law
+        # of cosines with every term evaluated through tangents of half angles
+        # (NumPy's tan is much faster than its cos and sin). Subtracting
+        # cosines close to 1 would cancel out most digits of short arcs.
+        np.subtract(lon2, lon1, out=u)
+        _versine(u, u, t)
+        u *= _cos_latitude(lat1, out, t)
+        u *= _cos_latitude(lat2, out, t)
+        np.subtract(lat2, lat1, out=out)
+        _versine(out, out, t)
+        out += u
+
+        # acos(1 - v) is ill-conditioned for short arcs, unlike the equivalent
+        # 2 asin(sqrt(v / 2))
+        out *= 0.5
+        np.minimum(out, 1, out=out)
+        np.sqrt(out, out=out)
+        np.arcsin(out, out=out)
+        out *= 2 * EARTH_RADIUS_KM
+        return
+
+    # |dlon| wrapped into [0, 180] degrees (the formulas below only use its square)
+    np.subtract(lon2, lon1, out=u)
+    np.abs(u, out=u)
+    np.subtract(360, u, out=t)
+    np.minimum(u, t, out=u)
+
+    # x = cos(mean latitude) * dlon, with dlon left in u
+    np.add(lat1, lat2, out=out)
+    out *= 0.5
+    _cos_latitude(out, out, t)
+    if method == "equirectangular":
+        u *= out
+        np.subtract(lat2, lat1, out=t)
+        _norm(u, t, out)
+        out *= EARTH_RADIUS_KM * math.pi / 180
+        return
+
+    # Radii of curvature at the mean latitude: w = 1 - e2 sin(lat)**2,
+    # normal = a / sqrt(w) and meridional = normal * (1 - e2) / w
+    u *= out
+    out *= out
+    out *= _WGS84_E2
+    out += 1 - _WGS84_E2
+    np.sqrt(out, out=t)
+    u /= t
+    t *= out
+    out = np.subtract(lat2, lat1, out=out)
+    out *= 1 - _WGS84_E2
+    out /= t
+    _norm(u, out, out)
+    out *= _WGS84_A_KM * math.pi / 180
+
+
+def _approximate_into(out, points1, points2, method, unit):
+    """
+    Write approximate distances between two validated point arrays into out.
+    """
+    lat1, lon1, lat2, lon2 = (
+        np.broadcast_to(coordinate, out.shape).reshape(-1)
+        for coordinate in (
+            points1[..., 0],
+            points1[..., 1],
+            points2[..., 0],
+            points2[..., 1],
+        )
+    )
+    result = out
+    out = out.reshape(-1)
+    size = lat1.size
+    block = min(size, _BLOCK_SIZE)
+    t = np.empty(block)
+    u = np.empty(block)
+    for start in range(0, size, _BLOCK_SIZE):
+        stop = min(start + _BLOCK_SIZE, size)
+        n = stop - start
+        _approximate_block(
+            method,
+            lat1[start:stop],
+            lon1[start:stop],
+            lat2[start:stop],
+            lon2[start:stop],
+            out[start:stop],
+            t[:n],
+            u[:n],
+        )
+
+    if unit == "miles":
+        result *= 0.621371
+
+
+def _is_point(value):
+    """
+    Return True if a value is a single (lat, lon) point of Python numbers.
+    """
+    return (
+        isinstance(value, (tuple, list))
+        and len(value) == 2
+        and all(isinstance(coordinate, (int, float)) for coordinate in value)
+    )
+
+
+@instrument()
+def approximate_distance(
+    point1, point2, method="equirectangular", unit=None, workers=None
+):
+    """
+    Calculate fast approximate distances between points.
+
+    The approximations trade accuracy for speed, e.g. to rank candidates
+    cheaply and refine only the best ones with haversine_distance or
+    vincenty_distance. The maximum relative errors against vincenty_distance,
+    measured on random pairs at least 1 meter apart with latitudes between -70
+    and 70 degrees, are:
+
+    ================  ========  =========  ==========
+    method            <= 10 km  <= 100 km  <= 1000 km
+    ================  ========  =========  ==========
+    equirectangular   0.6%      0.6%       0.6%
+    cosines           0.6%      0.6%       0.6%
+    flat              0.001%    0.01%      0.8%
+    ================  ========  =========  ==========
+
+    "equirectangular" projects the two points onto a plane scaled by the cosine
+    of their mean latitude and "cosines" is the spherical law of cosines (in
+    versine form, so it keeps its precision on short arcs); both work on a
+    sphere, so like the Haversine formula their error is dominated by the
+    flattening of the Earth.
+    "flat" is a local flat-earth projection using the radii of curvature of the
+    WGS-84 ellipsoid at the mean latitude, which is the most accurate for short
+    distances.
+
+    Parameters:
+    point1 (tuple, numpy.ndarray or PointArray): A (lat, lon) point or an (N, 2) array of points.
+    point2 (tuple, numpy.ndarray or PointArray): A (lat, lon) point or an (N, 2) array of points.
+    method (str): The approximation ("equirectangular", "cosines", "flat").
+    unit (str): The unit of measurement for the distance (default is Config.unit).
+    workers (int): The number of worker processes for arrays (default is Config.workers).
+
+    Returns:
+    float or numpy.ndarray: The approximate distance for two points, or an array of
+    distances (a single point is paired with every point of the other argument).
+
+    Raises:
+    ValueError: If the coordinates are invalid, the arrays have different lengths or the method is unsupported.
+    """
+    if method not in APPROXIMATIONS:
+        raise ValueError(
+            "Unsupported method. Please use 'equirectangular', 'cosines' or 'flat'."
+        )
+    if unit is None:
+        unit = Config.unit
+
+    if _is_point(point1) and _is_point(point2):
+        for name, point in (("point1", point1), ("point2", point2)):
+            if not (-90 <= point[0] <= 90 and -180 <= point[1] <= 180):
+                raise ValueError(
+                    f"Invalid coordinates for {name}. Latitude must be between -90 and 90, and longitude must be between -180 and 180."
+                )
+        distance = _approximate_km(method, *point1, *point2)
+        return distance * 0.621371 if unit == "miles" else distance
+
+    point1 = _as_point_array(point1, "point1")
+    point2 = _as_point_array(point2, "point2")
+    out = np.empty(_broadcast_shape(point1[..., 0], point2[..., 0]))
+    return parallel.map_chunks(
+        _approximate_into,
+        out,
+        [point1, point2],
+        [point1.ndim == 2, point2.ndim == 2],
+        args=(method, unit),
+        workers=workers,
+    )
+
+
+def _check_point(point, name):
+    """
+    Raise ValueError if a (lat, lon) point is out of range.
+    """
+    if not (-90 <= point[0] <= 90 and -180 <= point[1] <= 180):
+        raise ValueError(
+            f"Invalid coordinates for {name}. Latitude must be between -90 and 90, and longitude must be between -180 and 180."
+        )
+
+
+class PreparedPoint:
+    """
+    A point whose trigonometric terms are computed once, for many distances from it.
+
+    The point is validated and its latitude and longitude in radians, the
+    cosine of its latitude and the sine and cosine of its reduced latitude (for
+    the Vincenty formula) are stored, so a distance to another point only has
+    to convert and validate that other point. The results are identical to
+    haversine_distance and vincenty_distance; the distance cache is not used.
+
+    Attributes:
+    latitude (float): The latitude in degrees.
+    longitude (float): The longitude in degrees.
+    """
+
+    __slots__ = (
+        "latitude",
+        "longitude",
+        "_lat",
+        "_lon",
+        "_cos_lat",
+        "_sin_u",
+        "_cos_u",
+    )
+
+    def __init__(self, point):
+        """
+        Prepare a point.
+
+        Parameters:
+        point (tuple): The latitude and longitude of the point.
+
+        Raises:
+        ValueError: If the coordinates are invalid.
+        """
+        _check_point(point, "point")
+        self.latitude = float(point[0])
+        self.longitude = float(point[1])
+        self._lat = math.radians(self.latitude)
+        self._lon = math.radians(self.longitude)
+        self._cos_lat = math.cos(self._lat)
+        self._sin_u, self._cos_u = _reduced_latitude(self.latitude)
+
+    def haversine_distance(self, point, unit=None):
+        """
+        Calculate the distance to a point using the Haversine formula.
+
+        Parameters:
+        point (tuple): The latitude and longitude of the other point.
+        unit (str): The unit of measurement for the distance (default is Config.unit).
+
+        Returns:
+        float: The distance in the specified unit.
+
+        Raises:
+        ValueError: If the coordinates of the other point are invalid.
+        """
+        _check_point(point, "point")
+        lat = math.radians(point[0])
+        return _haversine_from_radians(
+            self._lat,
+            self._lon,
+            self._cos_lat,
+            lat,
+            math.radians(point[1]),
+            math.cos(lat),
+            Config.unit if unit is None else unit,
+        )
+
+    def vincenty_distance(self, point, unit=None):
+        """
+        Calculate the distance to a point using the Vincenty formula.
+
+        Parameters:
+        point (tuple): The latitude and longitude of the other point.
+        unit (str): The unit of measurement for the distance (default is Config.unit).
+
+        Returns:
+        float: The distance in the specified unit.
+
+        Raises:
+        ValueError: If the coordinates of the other point are invalid.
+        """
+        _check_point(point, "point")
+        sin_u, cos_u = _reduced_latitude(point[0])
+        return _vincenty_from_reduced(
+            self._sin_u,
+            self._cos_u,
+            sin_u,
+            cos_u,
+            math.radians(point[1]) - self._lon,
+            Config.unit if unit is None else unit,
+        )
+
+    def __iter__(self):
+        return iter((self.latitude, self.longitude))
+
+    def __repr__(self):
+        return f"PreparedPoint(({self.latitude}, {self.longitude}))"
+
+
+class AnchorSet:
+    """
+    A fixed set of anchor points (e.g. depots) prepared once for distances to many incoming points.
+
+    The anchors are validated once and their trigonometric terms are stored
+    both as NumPy columns for the batch methods and as PreparedPoints for
+    scalar distances, so neither path recomputes them per call. Batch results
+    are identical to batch_haversine_distance and batch_vincenty_distance.
+    """
+
+    def __init__(self, points):
+        """
+        Prepare a set of anchors.
+
+        Parameters:
+        points (list, numpy.ndarray or PointArray): The anchors as (lat, lon) tuples or an (N, 2) array.
+
+        Raises:
+        ValueError: If the points have an invalid shape or contain invalid coordinates.
+        """
+        array = _as_point_array(points, "points").reshape(-1, 2)
+        self._latitudes = np.ascontiguousarray(array[:, 0])
+        self._longitudes = np.ascontiguousarray(array[:, 1])
+        self._cos_latitudes = _cos_latitude(
+            self._latitudes, np.empty(len(array)), np.empty(len(array))
+        )
+        self._radian_longitudes = np.radians(self._longitudes)
+        self._sin_u, self._cos_u = _reduced_latitudes(self._latitudes)
+        self._points = [PreparedPoint(point) for point in array.tolist()]
+
+    def __len__(self):
+        return len(self._points)
+
+    def __getitem__(self, index):
+        """
+        Return an anchor as a PreparedPoint.
+        """
+        return self._points[index]
+
+    def __iter__(self):
+        return iter(self._points)
+
+    def haversine_distance(self, index, point, unit=None):
+        """
+        Calculate the distance between an anchor and a point using the Haversine formula.
+
+        Parameters:
+        index (int): The index of the anchor.
+        point (tuple): The latitude and longitude of the point.
+        unit (str): The unit of measurement for the distance (default is Config.unit).
+
+        Returns:
+        float: The distance in the specified unit.
+
+        Raises:
+        ValueError: If the coordinates of the point are invalid.
+        """
+        return self._points[index].haversine_distance(point, unit)
+
+    def vincenty_distance(self, index, point, unit=None):
+        """
+        Calculate the distance between an anchor and a point using the Vincenty formula.
+
+        Parameters:
+        index (int): The index of the anchor.
+        point (tuple): The latitude and longitude of the point.
+        unit (str): The unit of measurement for the distance (default is Config.unit).
+
+        Returns:
+        float: The distance in the specified unit.
+
+        Raises:
+        ValueError: If the coordinates of the point are invalid.
+        """
+        return self._points[index].vincenty_distance(point, unit)
+
+    def _pairs(self, points, indices, columns):
+        """
+        Select the anchor columns for each pair and broadcast them with the points.
+
+        Returns:
+        tuple: The flat anchor columns, the flat latitudes and longitudes of the points, and the result shape.
+        """
+        points = _as_point_array(points, "points")
+        if indices is not None:
+            indices = np.asarray(indices, dtype=np.intp)
+            if indices.ndim > 1:
+                raise ValueError(
+                    "indices must be an integer or a one-dimensional array."
+                )
+            if indices.size and not (
+                -len(self) <= indices.min() and indices.max() < len(self)
+            ):
+                raise ValueError(f"Anchor index out of range for {len(self)} anchors.")
+            columns = [column[indices] for column in columns]
+        try:
+            shape = np.broadcast(columns[0], points[..., 0]).shape
+        except ValueError:
+            raise ValueError(
+                f"points must be a single point or contain one point per anchor pair, got {points.shape[0]} points for {columns[0].shape[0]} anchors."
+            ) from None
+        flat = [np.broadcast_to(column, shape).reshape(-1) for column in columns]
+        latitudes, longitudes = (
+            np.broadcast_to(points[..., i], shape).reshape(-1) for i in (0, 1)
+        )
+        return flat, latitudes, longitudes, shape
+
+    @instrument("AnchorSet.batch_haversine_distance")
+    def batch_haversine_distance(self, points, indices=None, unit=None):
+        """
+        Calculate the distances between anchors and points using the Haversine formula.
+
+        Without indices the anchors are paired with the points (a single point is
+        paired with every anchor); with indices, the k-th point is paired with
+        the anchor indices[k] (a single index is paired with every point).
+
+        Parameters:
+        points (numpy.ndarray, PointArray or tuple): An (N, 2) array of latitudes and longitudes, or a single point.
+        indices (int or numpy.ndarray): The anchor of each point (default is every anchor in order).
+        unit (str): The unit of measurement for the distances (default is Config.unit).
+
+        Returns:
+        numpy.ndarray: The distances in the specified unit.
+
+        Raises:
+        ValueError: If the coordinates are invalid, an index is out of range or the lengths do not match.
+        """
+        (lat1, lon1, cos_lat1), lat2, lon2, shape = self._pairs(
+            points,
+            indices,
+            (self._latitudes, self._longitudes, self._cos_latitudes),
+        )
+        size = lat2.size
+        out = np.empty(size)
+        block = min(size, _BLOCK_SIZE)
+        t = np.empty(block)
+        u = np.empty(block)
+        cos_lat2 = np.empty(block)
+        for start in range(0, size, _BLOCK_SIZE):
+            stop = min(start + _BLOCK_SIZE, size)
+            n = stop - start
+            _cos_latitude(lat2[start:stop], cos_lat2[:n], t[:n])
+            _haversine_block(
+                lat1[start:stop],
+                lon1[start:stop],
+                lat2[start:stop],
+                lon2[start:stop],
+                cos_lat1[start:stop],
+                cos_lat2[:n],
+                out[start:stop],
+                t[:n],
+                u[:n],
+            )
+        out *= EARTH_RADIUS_KM
+        if (Config.unit if unit is None else unit) == "miles":
+            out *= 0.621371
+        return out.reshape(shape)
+
+    @instrument("AnchorSet.batch_vincenty_distance")
+    def batch_vincenty_distance(
+        self, points, indices=None, unit=None, max_iterations=1000
+    ):
+        """
+        Calculate the distances between anchors and points using the Vincenty formula.
+
+        The anchors and points are paired like in batch_haversine_distance.
+
+        Parameters:
+        points (numpy.ndarray, PointArray or tuple): An (N, 2) array of latitudes and longitudes, or a single point.
+        indices (int or numpy.ndarray): The anchor of each point (default is every anchor in order).
+        unit (str): The unit of measurement for the distances (default is Config.unit).
+        max_iterations (int): The maximum number of iterations per pair (default is 1000).
+
+        Returns:
+        numpy.ndarray: The distances in the specified unit.
+
+        Raises:
+        ValueError: If the coordinates are invalid, an index is out of range or the lengths do not match.
+        """
+        (sin_u1, cos_u1, lon1), lat2, lon2, shape = self._pairs(
+            points, indices, (self._sin_u, self._cos_u, self._radian_longitudes)
+        )
+        sin_u2, cos_u2 = _reduced_latitudes(lat2)
+        distance, _ = _vincenty_solve(
+            sin_u1, cos_u1, sin_u2, cos_u2, np.radians(lon2) - lon1, max_iterations
+        )
+        distance /= 1000  # Convert meters to kilometers
+        if (Config.unit if unit is None else unit) == "miles":
+            distance *= 0.62137119
+        return distance.reshape(shape)
+
+    def __repr__(self):
+        return f"AnchorSet(size={len(self)})"
@@ -1,40 +1,99 @@
-import requests
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from geotools._lazy import lazy_import
 from geotools.config import Config
+from geotools import metrics
 from functools import lru_cache
 
+# Imported on first use, so importing geotools.geocode (e.g. through
+# geotools.cache) stays cheap
+asyncio = lazy_import("asyncio")
+requests = lazy_import("requests")
 
-@lru_cache(maxsize=128)
-def geocode_address(address, api="google", api_key=None):
+# Endpoint URL, address parameter and Config API key attribute of each API
+_APIS = {
+    "google": (
+        "https://maps.googleapis.com/maps/api/geocode/json",
+        "address",
+        "GOOGLE_API_KEY",
+    ),
+    "opencage": (
+        "https://api.opencagedata.com/geocode/v1/json",
+        "q",
+        "OPENCAGE_API_KEY",
+    ),
+    "mapquest": (
+        "http://www.mapquestapi.com/geocoding/v1/address",
+        "location",
+        "MAPQUEST_API_KEY",
+    ),
+}
+
+
+class AddressNotFoundError(ValueError):
     """
-    Geocode an address using a geocoding API.
+    Raised when a geocoding API finds no location for an address.
+    """
+
+
+# MapQuest batch geocoding endpoint and its maximum number of locations per request
+_MAPQUEST_BATCH_URL = "http://www.mapquestapi.com/geocoding/v1/batch"
+_MAPQUEST_BATCH_SIZE = 100
+
+
+def _endpoint(name, default, endpoints=None):
+    """
+    Return the URL of an endpoint, honoring endpoints and then Config.geocode_endpoints.
+    """
+    for overrides in (endpoints, Config.geocode_endpoints):
+        if overrides and name in overrides:
+            return overrides[name]
+    return default
+
+
+def _request_params(address, api, api_key=None, endpoints=None):
+    """
+    Build the URL and query parameters of a geocoding request.
 
     Parameters:
     address (str): The address to geocode.
     api (str): The geocoding API to use ("google", "opencage", "mapquest").
     api_key (str): The API key to use for the geocoding API.
+    endpoints (dict): Optional endpoint URLs by API that replace the default ones
+    (and the ones in Config.geocode_endpoints).
 
     Returns:
-    tuple: The latitude and longitude of the address.
+    tuple: The URL and the query parameters.
 
     Raises:
-    ValueError: If the API key is invalid or the address format is unsupported.
+    ValueError: If the API is unsupported.
     """
-    if api == "google":
-        api_url = "https://maps.googleapis.com/maps/api/geocode/json"
-        params = {"address": address, "key": api_key or Config.GOOGLE_API_KEY}
-    elif api == "opencage":
-        api_url = "https://api.opencagedata.com/geocode/v1/json"
-        params = {"q": address, "key": api_key or Config.OPENCAGE_API_KEY}
-    elif api == "mapquest":
-        api_url = "http://www.mapquestapi.com/geocoding/v1/address"
-        params = {"location": address, "key": api_key or Config.MAPQUEST_API_KEY}
-    else:
+    if api not in _APIS:
         raise ValueError(
             "Unsupported API. Please use 'google', 'opencage', or 'mapquest'."
         )
+    api_url, address_param, key_name = _APIS[api]
+    api_url = _endpoint(api, api_url, endpoints)
+    params = {address_param: address, "key": api_key or getattr(Config, key_name)}
+    return api_url, params
+
 
-    response = requests.get(api_url, params=params)
+def _parse_response(response, api):
+    """
+    Extract the coordinates from the response of a geocoding API.
+
+    Parameters:
+    response (requests.Response): The response of the geocoding request.
+    api (str): The geocoding API that was used ("google", "opencage", "mapquest").
 
+    Returns:
+    tuple: The latitude and longitude of the address.
+
+    Raises:
+    ValueError: If the API key is invalid or the address format is unsupported.
+    """
     try:
         data = response.json()
     except requests.exceptions.JSONDecodeError:
@@ -46,7 +105,7 @@ def geocode_address(address, api="google", api_key=None):
         if data["status"] == "REQUEST_DENIED":
             raise ValueError("Invalid API key. Please provide a valid API key.")
         elif data["status"] == "ZERO_RESULTS":
-            raise ValueError(
+            raise AddressNotFoundError(
                 "Unsupported address format. Please provide a valid address."
             )
         elif data["status"] == "OK":
@@ -58,7 +117,7 @@ def geocode_address(address, api="google", api_key=None):
         if data["status"]["code"] == 403:
             raise ValueError("Invalid API key. Please provide a valid API key.")
         elif data["status"]["code"] == 404:
-            raise ValueError(
+            raise AddressNotFoundError(
                 "Unsupported address format. Please provide a valid address."
             )
         elif data["status"]["code"] == 200:
@@ -76,10 +135,332 @@ def geocode_address(address, api="google", api_key=None):
             raise Exception("Geocoding API error: " + str(data["info"]["statuscode"]))
 
 
+def _pooled_session(pool_size):
+    """
+    Create a requests.Session that keeps up to pool_size connections per host alive.
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=len(_APIS), pool_maxsize=pool_size
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_session = None
+
+
+def _get_session():
+    global _session
+    if _session is None:
+        _session = _pooled_session(Config.geocode_concurrency)
+    return _session
+
+
+def _parse_batch_response(response, addresses):
+    """
+    Extract the coordinates of every address from a MapQuest batch response.
+
+    Parameters:
+    response (requests.Response): The response of the batch geocoding request.
+    addresses (list): The addresses of the request, in request order.
+
+    Returns:
+    list: The latitude and longitude of each address, or the ValueError of
+    addresses that could not be geocoded.
+
+    Raises:
+    ValueError: If the API key is invalid or the response could not be decoded.
+    """
+    try:
+        data = response.json()
+    except requests.exceptions.JSONDecodeError:
+        raise ValueError(
+            "Response could not be decoded. The response is empty or invalid."
+        )
+
+    if data["info"]["statuscode"] == 403:
+        raise ValueError("Invalid API key. Please provide a valid API key.")
+    elif data["info"]["statuscode"] != 0:
+        raise Exception("Geocoding API error: " + str(data["info"]["statuscode"]))
+
+    results = data["results"]
+    if len(results) != len(addresses):
+        raise Exception(
+            f"Geocoding API error: expected {len(addresses)} results, got {len(results)}"
+        )
+    locations = []
+    for result in results:
+        if result["locations"]:
+            location = result["locations"][0]["latLng"]
+            locations.append((location["lat"], location["lng"]))
+        else:
+            locations.append(
+                AddressNotFoundError(
+                    "Unsupported address format. Please provide a valid address."
+                )
+            )
+    return locations
+
+
+def _get(session, api, api_url, params, timeout=None):
+    """
+    Send a geocoding request, recording its latency when metrics are enabled.
+    """
+    if not Config.metrics_enabled:
+        return session.get(api_url, params=params, timeout=timeout)
+    with metrics.registry.timer("geocode_request", provider=api):
+        return session.get(api_url, params=params, timeout=timeout)
+
+
+def _record_error(api, error):
+    """
+    Count a failed lookup per provider and error type when metrics are enabled.
+    """
+    if Config.metrics_enabled:
+        metrics.registry.increment(
+            "geocode_errors", provider=api, error=type(error).__name__
+        )
+
+
+def _cached_lookup(cache, address, api, fetch):
+    """
+    Look up an address in a GeocodeCache and call fetch() on a miss, caching its outcome.
+
+    Addresses that the API could not find are cached as well; other errors are not.
+    """
+    if cache is not None:
+        location = cache.get(address, api)
+        if location is not None:
+            return location
+    try:
+        location = fetch()
+    except AddressNotFoundError as error:
+        _record_error(api, error)
+        if cache is not None:
+            cache.put(address, api, None)
+        raise
+    except Exception as error:
+        _record_error(api, error)
+        raise
+    if cache is not None:
+        cache.put(address, api, location)
+    return location
+
+
+def _normalize_address(address):
+    """
+    Normalize an address for deduplication: collapse whitespace and ignore case.
+    """
+    return " ".join(address.split()).casefold()
+
+
+@metrics.instrument()
+@lru_cache(maxsize=128)
+def geocode_address(address, api="google", api_key=None):
+    """
+    Geocode an address using a geocoding API.
+
+    When Config.geocode_cache is set to a GeocodeCache, it is consulted before
+    the API is called.
+
+    Parameters:
+    address (str): The address to geocode.
+    api (str): The geocoding API to use ("google", "opencage", "mapquest").
+    api_key (str): The API key to use for the geocoding API.
+
+    Returns:
+    tuple: The latitude and longitude of the address.
+
+    Raises:
+    ValueError: If the API key is invalid or the address format is unsupported.
+    """
+    api_url, params = _request_params(address, api, api_key)
+    return _cached_lookup(
+        Config.geocode_cache,
+        address,
+        api,
+        lambda: _parse_response(_get(_get_session(), api, api_url, params), api),
+    )
+
+
+# The metrics wrapper counts every call, including those answered by the lru_cache
+geocode_address.cache_info = geocode_address.__wrapped__.cache_info
+geocode_address.cache_clear = geocode_address.__wrapped__.cache_clear
+
+
+class AsyncGeocoder:
+    """
+    Asynchronous geocoder with a pooled keep-alive HTTP client.
+
+    All requests share one requests.Session whose connection pool keeps
+    connections to the geocoding APIs open between lookups. Requests run on a
+    thread pool so they never block the event loop, and at most concurrency of
+    them are in flight at a time; awaiting many lookups with asyncio.gather
+    overlaps their network latency. Concurrent lookups of the same address share
+    a single request.
+
+    Attributes:
+    api (str): The default geocoding API ("google", "opencage", "mapquest").
+    api_key (str): The default API key (default is the key in Config).
+    concurrency (int): The maximum number of requests in flight.
+    endpoints (dict): Endpoint URLs by API that replace the default ones (e.g. a local test server).
+    timeout (float): The timeout of each request in seconds (default is Config.timeout).
+    cache (GeocodeCache): A persistent cache consulted before each request.
+    """
+
+    def __init__(
+        self,
+        api="google",
+        api_key=None,
+        concurrency=None,
+        endpoints=None,
+        timeout=None,
+        cache=None,
+    ):
+        """
+        Create a geocoder.
+
+        Parameters:
+        api (str): The default geocoding API ("google", "opencage", "mapquest").
+        api_key (str): The default API key (default is the key in Config).
+        concurrency (int): The maximum number of requests in flight (default is Config.geocode_concurrency).
+        endpoints (dict): Endpoint URLs by API that replace the default ones.
+        timeout (float): The timeout of each request in seconds (default is Config.timeout).
+        cache (GeocodeCache): A persistent cache consulted before each request (default is Config.geocode_cache).
+
+        Raises:
+        ValueError: If the API is unsupported or the concurrency is not positive.
+        """
+        _request_params("", api)  # Validate the API
+        if concurrency is None:
+            concurrency = Config.geocode_concurrency
+        if concurrency < 1:
+            raise ValueError("concurrency must be a positive integer.")
+        self.api = api
+        self.api_key = api_key
+        self.concurrency = concurrency
+        self.endpoints = dict(endpoints or {})
+        self.timeout = Config.timeout if timeout is None else timeout
+        self.cache = Config.geocode_cache if cache is None else cache
+
+        self.session = _pooled_session(concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+        self._loop = None
+        self._semaphore = None
+        self._pending = {}
+
+    def _fetch(self, address, api, api_key):
+        api_url, params = _request_params(address, api, api_key, self.endpoints)
+        return _cached_lookup(
+            self.cache,
+            address,
+            api,
+            lambda: _parse_response(
+                _get(self.session, api, api_url, params, self.timeout), api
+            ),
+        )
+
+    def _bind_loop(self):
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Semaphores and futures belong to the event loop they were created on
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._pending = {}
+
+    async def _run(self, function, *args):
+        """
+        Run a blocking function on the worker threads once a request slot is free.
+        """
+        self._bind_loop()
+        async with self._semaphore:
+            return await self._loop.run_in_executor(self._executor, function, *args)
+
+    @metrics.instrument("AsyncGeocoder.geocode")
+    async def geocode(self, address, api=None, api_key=None):
+        """
+        Geocode an address.
+
+        Parameters:
+        address (str): The address to geocode.
+        api (str): The geocoding API to use (default is the geocoder's API).
+        api_key (str): The API key to use (default is the geocoder's API key).
+
+        Returns:
+        tuple: The latitude and longitude of the address.
+
+        Raises:
+        ValueError: If the API key is invalid or the address format is unsupported.
+        """
+        self._bind_loop()
+        key = (address, api or self.api, api_key or self.api_key)
+        task = self._pending.get(key)
+        if task is None:
+            task = self._pending[key] = asyncio.ensure_future(
+                self._run(self._fetch, *key)
+            )
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def geocode_all(
+        self, addresses, api=None, api_key=None, return_exceptions=False
+    ):
+        """
+        Geocode many addresses concurrently.
+
+        Parameters:
+        addresses (iterable): The addresses to geocode.
+        api (str): The geocoding API to use (default is the geocoder's API).
+        api_key (str): The API key to use (default is the geocoder's API key).
+        return_exceptions (bool): Whether to return the exceptions of failed lookups
+        in place of their results instead of raising the first one.
+
+        Returns:
+        list: The latitude and longitude of each address, in input order.
+
+        Raises:
+        ValueError: If a lookup fails and return_exceptions is False.
+        """
+        return await asyncio.gather(
+            *(self.geocode(address, api, api_key) for address in addresses),
+            return_exceptions=return_exceptions,
+        )
+
+    def close(self):
+        """
+        Close the pooled connections and the worker threads.
+        """
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        self.close()
+
+
+_default_geocoder = None
+
+
+def _get_default_geocoder():
+    global _default_geocoder
+    if _default_geocoder is None:
+        _default_geocoder = AsyncGeocoder()
+    return _default_geocoder
+
+
+@metrics.instrument()
 async def async_geocode_address(address, api="google", api_key=None):
     """
     Asynchronously geocode an address using a geocoding API.
 
+    The lookup runs geocode_address (and its cache) on the worker threads of a
+    shared AsyncGeocoder, so it never blocks the event loop and awaiting many
+    lookups with asyncio.gather overlaps their network latency.
+
     Parameters:
     address (str): The address to geocode.
     api (str): The geocoding API to use ("google", "opencage", "mapquest").
@@ -91,4 +472,335 @@ async def async_geocode_address(address, api="google", api_key=None):
     Raises:
     ValueError: If the API key is invalid or the address format is unsupported.
     """
-    return geocode_address(address, api, api_key)
+    return await _get_default_geocoder()._run(geocode_address, address, api, api_key)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens refill continuously at rate per second up to capacity. A caller that
+    finds the bucket empty reserves its token anyway and sleeps until the token
+    is due, so concurrent callers are served in order at the configured rate.
+
+    Attributes:
+    rate (float): The number of tokens added per second.
+    capacity (float): The maximum number of tokens (the largest burst).
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        Create a full token bucket.
+
+        Parameters:
+        rate (float): The number of tokens added per second.
+        capacity (float): The maximum number of tokens (default is rate, at least 1).
+
+        Raises:
+        ValueError: If the rate or capacity is not positive.
+        """
+        if capacity is None:
+            capacity = max(rate, 1)
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive.")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """
+        Take tokens from the bucket, sleeping until they are available.
+
+        Parameters:
+        tokens (float): The number of tokens to take.
+
+        Returns:
+        float: The number of seconds spent waiting.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def _get_rate_limiter(api):
+    """
+    Return the token bucket shared by all requests to an API in this process.
+    """
+    rate = Config.geocode_rate_limits.get(api)
+    if rate is None:
+        return None
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(api)
+        if limiter is None or limiter.rate != rate:
+            limiter = _rate_limiters[api] = TokenBucket(rate)
+    return limiter
+
+
+class GeocodeStats:
+    """
+    Throughput statistics of a geocode_many run, updated while it runs.
+
+    Attributes:
+    addresses (int): The number of addresses yielded so far.
+    unique (int): The number of distinct (normalized) addresses seen so far.
+    duplicates (int): The number of addresses answered by an earlier lookup of the same address.
+    requests (int): The number of HTTP requests sent.
+    cache_hits (int): The number of distinct addresses answered by the GeocodeCache.
+    errors (int): The number of addresses that could not be geocoded.
+    rate_limited (float): The total time in seconds that requests waited for the rate limiter.
+    elapsed (float): The number of seconds since the run started.
+    throughput (float): The number of addresses yielded per second.
+    """
+
+    def __init__(self):
+        self.addresses = 0
+        self.unique = 0
+        self.duplicates = 0
+        self.requests = 0
+        self.cache_hits = 0
+        self.errors = 0
+        self.rate_limited = 0.0
+        self._started = time.monotonic()
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self._started
+
+    @property
+    def throughput(self):
+        elapsed = self.elapsed
+        return self.addresses / elapsed if elapsed > 0 else 0.0
+
+    def __repr__(self):
+        return (
+            f"GeocodeStats(addresses={self.addresses}, unique={self.unique}, "
+            f"requests={self.requests}, errors={self.errors}, "
+            f"throughput={self.throughput:.1f}/s)"
+        )
+
+
+def _geocode_batch(
+    session, limiter, api, api_key, endpoints, timeout, cache, items, stats
+):
+    """
+    Geocode a batch of (address, future) items in a worker thread and resolve the futures.
+    """
+    try:
+        if limiter is not None:
+            wait = limiter.acquire()
+            stats.rate_limited += wait
+        if api == "mapquest":
+            addresses = [address for address, _ in items]
+            api_url = _endpoint("mapquest_batch", _MAPQUEST_BATCH_URL, endpoints)
+            params = [("location", address) for address in addresses]
+            params.append(("key", api_key or Config.MAPQUEST_API_KEY))
+            params.append(("maxResults", 1))
+            response = _get(session, api, api_url, params, timeout)
+            results = _parse_batch_response(response, addresses)
+        else:
+            ((address, _),) = items
+            api_url, params = _request_params(address, api, api_key, endpoints)
+            response = _get(session, api, api_url, params, timeout)
+            results = [_parse_response(response, api)]
+    except Exception as error:
+        results = [error] * len(items)
+
+    for (address, future), result in zip(items, results):
+        if cache is not None and not isinstance(result, Exception):
+            cache.put(address, api, result)
+        elif cache is not None and isinstance(result, AddressNotFoundError):
+            cache.put(address, api, None)
+        if isinstance(result, Exception):
+            _record_error(api, result)
+            future.set_exception(result)
+        else:
+            future.set_result(result)
+
+
+def geocode_many(
+    addresses,
+    api="google",
+    api_key=None,
+    concurrency=None,
+    rate=None,
+    batch_size=None,
+    endpoints=None,
+    return_exceptions=False,
+    stats=None,
+    cache=None,
+):
+    """
+    Geocode a stream of addresses with rate limiting, deduplication and batching.
+
+    The addresses are read lazily and looked up on a pool of threads sharing
+    keep-alive connections. Addresses that only differ in case or whitespace are
+    looked up once. Requests are throttled by a token bucket per API
+    (Config.geocode_rate_limits, shared by all lookups of this process), and
+    MapQuest lookups use its batch endpoint with up to 100 addresses per request.
+    Results are yielded in input order as soon as they and all results before
+    them are available, so at most a bounded window of addresses is in flight.
+    Addresses found in the cache are not requested again.
+
+    Parameters:
+    addresses (iterable): The addresses to geocode.
+    api (str): The geocoding API to use ("google", "opencage", "mapquest").
+    api_key (str): The API key to use for the geocoding API.
+    concurrency (int): The maximum number of requests in flight (default is Config.geocode_concurrency).
+    rate (float): The maximum number of requests per second (default is the limit of the API in Config.geocode_rate_limits).
+    batch_size (int): The number of addresses per MapQuest batch request (default and maximum is 100).
+    endpoints (dict): Endpoint URLs by API that replace the default ones ("mapquest_batch" for the MapQuest batch endpoint).
+    return_exceptions (bool): Whether to yield the exceptions of failed lookups instead of raising them.
+    stats (GeocodeStats): An optional GeocodeStats object that is updated while the results are yielded.
+    cache (GeocodeCache): A persistent cache consulted before each lookup (default is Config.geocode_cache).
+
+    Yields:
+    tuple: The address and its latitude and longitude (or its exception when return_exceptions is True).
+
+    Raises:
+    ValueError: If the API is unsupported, or a lookup fails and return_exceptions is False.
+    """
+    _request_params("", api)  # Validate the API
+    if concurrency is None:
+        concurrency = Config.geocode_concurrency
+    if concurrency < 1:
+        raise ValueError("concurrency must be a positive integer.")
+    if api == "mapquest":
+        batch_size = min(batch_size or _MAPQUEST_BATCH_SIZE, _MAPQUEST_BATCH_SIZE)
+    else:
+        batch_size = 1
+    limiter = _get_rate_limiter(api) if rate is None else TokenBucket(rate)
+    if stats is None:
+        stats = GeocodeStats()
+    if cache is None:
+        cache = Config.geocode_cache
+    return _geocode_stream(
+        addresses,
+        api,
+        api_key,
+        concurrency,
+        batch_size,
+        limiter,
+        endpoints,
+        return_exceptions,
+        stats,
+        cache,
+    )
+
+
+def _geocode_stream(
+    addresses,
+    api,
+    api_key,
+    concurrency,
+    batch_size,
+    limiter,
+    endpoints,
+    return_exceptions,
+    stats,
+    cache,
+):
+    session = _pooled_session(concurrency)
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    window = 2 * concurrency * batch_size
+    lookups = {}  # Normalized address -> Future of its location
+    queue = deque()  # (address, Future) in input order
+    batch = []
+    tasks = []
+
+    def flush():
+        if batch:
+            tasks.append(
+                executor.submit(
+                    _geocode_batch,
+                    session,
+                    limiter,
+                    api,
+                    api_key,
+                    endpoints,
+                    Config.timeout,
+                    cache,
+                    list(batch),
+                    stats,
+                )
+            )
+            stats.requests += 1
+            del batch[:]
+
+    def pop():
+        address, future = queue.popleft()
+        if not future.done():
+            flush()  # The lookup may be waiting in the current batch
+        error = future.exception()
+        stats.addresses += 1
+        if error is not None:
+            stats.errors += 1
+            if not return_exceptions:
+                raise error
+            return address, error
+        return address, future.result()
+
+    try:
+        for address in addresses:
+            key = _normalize_address(address)
+            future = lookups.get(key)
+            if future is None:
+                future = lookups[key] = Future()
+                stats.unique += 1
+                try:
+                    location = None if cache is None else cache.get(address, api)
+                except AddressNotFoundError as error:
+                    future.set_exception(error)
+                    stats.cache_hits += 1
+                else:
+                    if location is not None:
+                        future.set_result(location)
+                        stats.cache_hits += 1
+                    else:
+                        batch.append((address, future))
+                        if len(batch) >= batch_size:
+                            flush()
+            else:
+                stats.duplicates += 1
+            queue.append((address, future))
+
+            while queue and (len(queue) > window or queue[0][1].done()):
+                yield pop()
+        flush()
+        while queue:
+            yield pop()
+    finally:
+        for task in tasks:
+            task.cancel()
+        executor.shutdown(wait=True)
+        session.close()
+
+
+def _geocode_cache_metrics():
+    info = geocode_address.cache_info()
+    counters = {"geocode_lru_hits": info.hits, "geocode_lru_misses": info.misses}
+    cache = Config.geocode_cache
+    if cache is None:
+        return counters
+    return {
+        **counters,
+        "geocode_cache_hits": cache.hits,
+        "geocode_cache_negative_hits": cache.negative_hits,
+        "geocode_cache_misses": cache.misses,
+    }
+
+
+metrics.registry.add_collector(_geocode_cache_metrics)
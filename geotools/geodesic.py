@@ -0,0 +1,1390 @@
+import math
+import sys
+from geotools._lazy import lazy_import
+from geotools.config import Config
+from geotools.distance import (
+    WGS84_A,
+    WGS84_F,
+    _as_point_array,
+    _broadcast_shape,
+)
+from geotools.metrics import instrument, timed
+
+np = lazy_import("numpy")
+parallel = lazy_import("geotools.parallel")
+
+# Geodesics on the WGS-84 ellipsoid after C. F. F. Karney, "Algorithms for
+# geodesics", J. Geodesy 87 (2013), as implemented in GeographicLib. The
+# inverse problem is solved by Newton's method on the azimuth at the first
+# point, started from a spherical or astroid estimate and safeguarded by
+# bisection, so it converges for every pair of points, including nearly
+# antipodal ones where the Vincenty iteration fails.
+
+_F1 = 1 - WGS84_F
+_E2 = WGS84_F * (2 - WGS84_F)
+_EP2 = _E2 / (_F1 * _F1)
+_N = WGS84_F / (2 - WGS84_F)
+_B = WGS84_A * _F1
+
+_TINY = math.sqrt(sys.float_info.min)
+_TOL0 = sys.float_info.epsilon
+_TOL1 = 200 * _TOL0
+_TOL2 = math.sqrt(_TOL0)
+_XTHRESH = 1000 * _TOL2
+_ETOL2 = 0.1 * _TOL2 / math.sqrt(WGS84_F * (1 - WGS84_F / 2) / 2)
+
+# Newton iterations before falling back to bisection, and the overall cap
+# (bisection halves the bracket, so 53 more steps exhaust double precision).
+# The cap bounds the cost of a single pair; most pairs need 2 to 4 iterations.
+MAX_NEWTON_ITERATIONS = 20
+MAX_ITERATIONS = MAX_NEWTON_ITERATIONS + sys.float_info.mant_dig + 10
+
+
+def _polyval(coefficients, x):
+    """
+    Evaluate a polynomial (highest degree first) by Horner's method.
+    """
+    y = 0.0
+    for coefficient in coefficients:
+        y = y * x + coefficient
+    return y
+
+
+def _series_coefficients(table, orders):
+    """
+    Split a flat table of integer coefficients into (polynomial, divisor) pairs.
+
+    Each polynomial of degree m takes m + 1 entries followed by its divisor.
+    """
+    series = []
+    offset = 0
+    for m in orders:
+        series.append((tuple(table[offset : offset + m + 1]), table[offset + m + 1]))
+        offset += m + 2
+    return series
+
+
+# Coefficients of the series in the third flattening n and in
+# eps = (sqrt(1 + k2) - 1) / (sqrt(1 + k2) + 1), expanded to sixth order
+_ORDER = 6
+_A1 = ((1, 4, 64, 0), 256)
+_A2 = ((-11, -28, -192, 0), 256)
+_EPS2_ORDERS = [(_ORDER - degree) // 2 for degree in range(1, _ORDER + 1)]
+_C1 = _series_coefficients(
+    [-1, 6, -16, 32, -9, 64, -128, 2048, 9, -16, 768, 3, -5, 512, -7, 1280, -7, 2048],
+    _EPS2_ORDERS,
+)
+_C1P = _series_coefficients(
+    [
+        205, -432, 768, 1536, 4005, -4736, 3840, 12288, -225, 116, 384,
+        -7173, 2695, 7680, 3467, 7680, 38081, 61440,
+    ],  # fmt: skip
+    _EPS2_ORDERS,
+)
+_C2 = _series_coefficients(
+    [1, 2, 16, 32, 35, 64, 384, 2048, 15, 80, 768, 7, 35, 512, 63, 1280, 77, 2048],
+    _EPS2_ORDERS,
+)
+_A3 = tuple(
+    _polyval(polynomial, _N) / divisor
+    for polynomial, divisor in _series_coefficients(
+        [-3, 128, -2, -3, 64, -1, -3, -1, 16, 3, -1, -2, 8, 1, -1, 2, 1, 1],
+        [min(_ORDER - j - 1, j) for j in range(_ORDER - 1, -1, -1)],
+    )
+)
+_C3_ORDERS = [
+    min(_ORDER - j - 1, j)
+    for k in range(1, _ORDER)
+    for j in range(_ORDER - 1, k - 1, -1)
+]
+_C3_TERMS = [
+    _polyval(polynomial, _N) / divisor
+    for polynomial, divisor in _series_coefficients(
+        [
+            3, 128, 2, 5, 128, -1, 3, 3, 64, -1, 0, 1, 8, -1, 1, 4, 5, 256,
+            1, 3, 128, -3, -2, 3, 64, 1, -3, 2, 32, 7, 512, -10, 9, 384,
+            5, -9, 5, 192, 7, 512, -14, 7, 512, 21, 2560,
+        ],  # fmt: skip
+        _C3_ORDERS,
+    )
+]
+# One polynomial in eps per coefficient c1 ... c5, of degree 4 down to 0
+_C3_OFFSETS = [sum(range(_ORDER - k + 1, _ORDER)) for k in range(1, _ORDER)]
+_C3 = [
+    tuple(_C3_TERMS[offset : offset + _ORDER - k])
+    for k, offset in zip(range(1, _ORDER), _C3_OFFSETS)
+]
+
+
+def _a1m1(eps):
+    """
+    Return A1 - 1, the scale of the distance integral.
+    """
+    polynomial, divisor = _A1
+    t = _polyval(polynomial, eps * eps) / divisor
+    return (t + eps) / (1 - eps)
+
+
+def _a2m1(eps):
+    """
+    Return A2 - 1, the scale of the reduced length integral.
+    """
+    polynomial, divisor = _A2
+    t = _polyval(polynomial, eps * eps) / divisor
+    return (t - eps) / (1 + eps)
+
+
+def _a3(eps):
+    """
+    Return A3, the scale of the longitude integral.
+    """
+    return _polyval(_A3, eps)
+
+
+def _eps_series(series, eps):
+    """
+    Return the coefficients [0, c1, c2, ...] of a series whose terms are eps**l * P_l(eps**2).
+    """
+    eps2 = eps * eps
+    coefficients = [0.0]
+    d = eps
+    for polynomial, divisor in series:
+        coefficients.append(d * _polyval(polynomial, eps2) / divisor)
+        d = d * eps
+    return coefficients
+
+
+def _c3(eps):
+    """
+    Return the coefficients [0, c1, ..., c5] of the longitude series.
+    """
+    coefficients = [0.0]
+    d = eps
+    for polynomial in _C3:
+        coefficients.append(d * _polyval(polynomial, eps))
+        d = d * eps
+    return coefficients
+
+
+def _sin_series(sinx, cosx, c):
+    """
+    Evaluate sum(c[l] * sin(2 l x)) by Clenshaw summation.
+
+    Works on floats and on arrays alike.
+    """
+    k = len(c)
+    n = k - 1
+    ar = 2 * (cosx - sinx) * (cosx + sinx)  # 2 cos(2x)
+    y1 = 0.0
+    if n & 1:
+        k -= 1
+        y0 = c[k]
+    else:
+        y0 = 0.0
+    for _ in range(n // 2):
+        k -= 1
+        y1 = ar * y0 - y1 + c[k]
+        k -= 1
+        y0 = ar * y1 - y0 + c[k]
+    return 2 * sinx * cosx * y0
+
+
+def _epsilon(calp0):
+    """
+    Return the expansion parameter eps for a geodesic with azimuth alpha0 at the equator.
+    """
+    k2 = calp0 * calp0 * _EP2
+    return k2 / (2 * (1 + (1 + k2) ** 0.5) + k2)
+
+
+def _lengths(eps, sig12, ssig1, csig1, dn1, ssig2, csig2, dn2, reduced=True):
+    """
+    Return the reduced distance s12 / b and, if reduced is True, the reduced length m12 / b.
+
+    Works on floats and on arrays alike.
+    """
+    a1 = 1 + _a1m1(eps)
+    c1 = _eps_series(_C1, eps)
+    b1 = _sin_series(ssig2, csig2, c1) - _sin_series(ssig1, csig1, c1)
+    s12b = a1 * (sig12 + b1)
+    if not reduced:
+        return s12b, None
+    a2 = 1 + _a2m1(eps)
+    c2 = _eps_series(_C2, eps)
+    b2 = _sin_series(ssig2, csig2, c2) - _sin_series(ssig1, csig1, c2)
+    j12 = (a1 - a2) * sig12 + (a1 * b1 - a2 * b2)
+    m12b = dn2 * (csig1 * ssig2) - dn1 * (ssig1 * csig2) - csig1 * csig2 * j12
+    return s12b, m12b
+
+
+def _normalize(x, y):
+    """
+    Scale a two-vector (the sine and cosine of an angle) to unit length.
+    """
+    r = math.hypot(x, y)
+    return x / r, y / r
+
+
+def _round_angle(x):
+    """
+    Round an angle so that small values underflow to zero.
+    """
+    z = 1 / 16
+    y = abs(x)
+    if y < z:
+        y = z - (z - y)
+    return math.copysign(y, x)
+
+
+def _sincosd(x):
+    """
+    Return the sine and cosine of an angle in degrees, exact for multiples of 90 degrees.
+    """
+    r = math.fmod(x, 360)
+    q = round(r / 90)
+    r = math.radians(r - 90 * q)
+    s = math.sin(r)
+    c = math.cos(r)
+    q %= 4
+    if q == 1:
+        s, c = c, -s
+    elif q == 2:
+        s, c = -s, -c
+    elif q == 3:
+        s, c = -c, s
+    c += 0.0
+    if s == 0:
+        s = math.copysign(s, x)
+    return s, c
+
+
+def _atan2d(y, x):
+    """
+    Return atan2(y, x) in degrees, exact for multiples of 90 degrees.
+    """
+    if abs(y) > abs(x):
+        q = 2
+        x, y = y, x
+    else:
+        q = 0
+    if x < 0:
+        q += 1
+        x = -x
+    angle = math.degrees(math.atan2(y, x))
+    if q == 1:
+        angle = math.copysign(180, y) - angle
+    elif q == 2:
+        angle = 90 - angle
+    elif q == 3:
+        angle = -90 + angle
+    return angle
+
+
+def _normalize_angle(x):
+    """
+    Reduce an angle in degrees to [-180, 180].
+    """
+    y = math.remainder(x, 360)
+    return math.copysign(180.0, x) if abs(y) == 180 else y
+
+
+def _reduced_latitude(lat):
+    """
+    Return the sine and cosine of the reduced latitude and the factor sqrt(1 + ep2 sin(beta)**2).
+    """
+    sbet, cbet = _sincosd(lat)
+    sbet, cbet = _normalize(_F1 * sbet, cbet)
+    cbet = max(_TINY, cbet)
+    return sbet, cbet, math.sqrt(1 + _EP2 * sbet * sbet)
+
+
+def _astroid(x, y):
+    """
+    Solve the astroid equation k**4 + 2 k**3 - (x**2 + y**2 - 1) k**2 - 2 y**2 k - y**2 = 0 for k >= 0.
+    """
+    p = x * x
+    q = y * y
+    r = (p + q - 1) / 6
+    if q == 0 and r <= 0:
+        return 0.0
+    s = p * q / 4
+    r2 = r * r
+    r3 = r * r2
+    disc = s * (s + 2 * r3)
+    u = r
+    if disc >= 0:
+        t3 = s + r3
+        t3 += -math.sqrt(disc) if t3 < 0 else math.sqrt(disc)
+        t = math.copysign(abs(t3) ** (1 / 3), t3)
+        u += t + (r2 / t if t != 0 else 0)
+    else:
+        angle = math.atan2(math.sqrt(-disc), -(s + r3))
+        u += 2 * r * math.cos(angle / 3)
+    v = math.sqrt(u * u + q)
+    uv = q / (v - u) if u < 0 else u + v
+    w = (uv - q) / (2 * v)
+    return uv / (math.sqrt(uv + w * w) + w)
+
+
+def _inverse_start(sbet1, cbet1, sbet2, cbet2, lam12, slam12, clam12):
+    """
+    Estimate the azimuth at the first point for Newton's method.
+
+    Returns:
+    tuple: (sig12, salp1, calp1, salp2, calp2, dnm); sig12 is negative unless the
+    points are so close that the estimate is already the solution.
+    """
+    sig12 = -1.0
+    salp2 = calp2 = dnm = math.nan
+    sbet12 = sbet2 * cbet1 - cbet2 * sbet1
+    cbet12 = cbet2 * cbet1 + sbet2 * sbet1
+    sbet12a = sbet2 * cbet1 + cbet2 * sbet1
+
+    shortline = cbet12 >= 0 and sbet12 < 0.5 and cbet2 * lam12 < 0.5
+    if shortline:
+        sbetm2 = (sbet1 + sbet2) ** 2
+        sbetm2 /= sbetm2 + (cbet1 + cbet2) ** 2
+        dnm = math.sqrt(1 + _EP2 * sbetm2)
+        omg12 = lam12 / (_F1 * dnm)
+        somg12 = math.sin(omg12)
+        comg12 = math.cos(omg12)
+    else:
+        somg12 = slam12
+        comg12 = clam12
+
+    salp1 = cbet2 * somg12
+    if comg12 >= 0:
+        calp1 = sbet12 + cbet2 * sbet1 * somg12 * somg12 / (1 + comg12)
+    else:
+        calp1 = sbet12a - cbet2 * sbet1 * somg12 * somg12 / (1 - comg12)
+
+    ssig12 = math.hypot(salp1, calp1)
+    csig12 = sbet1 * sbet2 + cbet1 * cbet2 * comg12
+
+    if shortline and ssig12 < _ETOL2:
+        # Really short lines
+        salp2 = cbet1 * somg12
+        calp2 = sbet12 - cbet1 * sbet2 * (
+            somg12 * somg12 / (1 + comg12) if comg12 >= 0 else 1 - comg12
+        )
+        salp2, calp2 = _normalize(salp2, calp2)
+        sig12 = math.atan2(ssig12, csig12)
+    elif csig12 < 0 and ssig12 < 6 * _N * math.pi * cbet1 * cbet1:
+        # Nearly antipodal points: scale the problem to the astroid
+        lamscale = WGS84_F * cbet1 * _a3(_epsilon(sbet1)) * math.pi
+        betscale = lamscale * cbet1
+        x = math.atan2(-slam12, -clam12) / lamscale
+        y = sbet12a / betscale
+        if y > -_TOL1 and x > -1 - _XTHRESH:
+            salp1 = min(1.0, -x)
+            calp1 = -math.sqrt(1 - salp1 * salp1)
+        else:
+            k = _astroid(x, y)
+            omg12a = lamscale * (-x * k / (1 + k))
+            somg12 = math.sin(omg12a)
+            comg12 = -math.cos(omg12a)
+            salp1 = cbet2 * somg12
+            calp1 = sbet12a - cbet2 * sbet1 * somg12 * somg12 / (1 - comg12)
+
+    if salp1 > 0:
+        salp1, calp1 = _normalize(salp1, calp1)
+    else:
+        salp1 = 1.0
+        calp1 = 0.0
+    return sig12, salp1, calp1, salp2, calp2, dnm
+
+
+def _two_sum(u, v):
+    """
+    Return the sum of two floats and its rounding error.
+    """
+    s = u + v
+    up = s - v
+    vpp = s - up
+    up -= u
+    vpp -= v
+    return s, (s if s == 0 else 0.0 - (up + vpp))
+
+
+def _angle_difference(x, y):
+    """
+    Return y - x reduced to [-180, 180] as a sum d + t with the rounding error t.
+    """
+    d, t = _two_sum(math.remainder(-x, 360), math.remainder(y, 360))
+    d, t = _two_sum(math.remainder(d, 360), t)
+    if d == 0 or abs(d) == 180:
+        d = math.copysign(d, y - x if t == 0 else -t)
+    return d, t
+
+
+def _sincosde(x, t):
+    """
+    Return the sine and cosine of x + t in degrees, with x in [-180, 180] and t small.
+    """
+    q = round(x / 90)
+    r = math.radians(_round_angle(x - 90 * q + t))
+    s = math.sin(r)
+    c = math.cos(r)
+    q %= 4
+    if q == 1:
+        s, c = c, -s
+    elif q == 2:
+        s, c = -s, -c
+    elif q == 3:
+        s, c = -c, s
+    c += 0.0
+    if s == 0:
+        s = math.copysign(s, x)
+    return s, c
+
+
+def _lambda12(sbet1, cbet1, dn1, sbet2, cbet2, dn2, salp1, calp1, slam120, clam120):
+    """
+    Solve the hybrid problem: follow the geodesic leaving point 1 with azimuth
+    alpha1 to the latitude of point 2 and return the longitude error.
+
+    Returns:
+    tuple: (lam12, dlam12, salp2, calp2, sig12, ssig1, csig1, ssig2, csig2, eps)
+    where lam12 is the longitude difference minus the target and dlam12 its
+    derivative with respect to alpha1.
+    """
+    if sbet1 == 0 and calp1 == 0:
+        # Break the degeneracy of equatorial lines
+        calp1 = -_TINY
+
+    salp0 = salp1 * cbet1
+    calp0 = math.hypot(calp1, salp1 * sbet1)
+
+    ssig1 = sbet1
+    somg1 = salp0 * sbet1
+    csig1 = comg1 = calp1 * cbet1
+    ssig1, csig1 = _normalize(ssig1, csig1)
+
+    salp2 = salp0 / cbet2 if cbet2 != cbet1 else salp1
+    if cbet2 != cbet1 or abs(sbet2) != -sbet1:
+        calp2 = (
+            math.sqrt(
+                (calp1 * cbet1) ** 2
+                + (
+                    (cbet2 - cbet1) * (cbet1 + cbet2)
+                    if cbet1 < -sbet1
+                    else (sbet1 - sbet2) * (sbet1 + sbet2)
+                )
+            )
+            / cbet2
+        )
+    else:
+        calp2 = abs(calp1)
+    ssig2 = sbet2
+    somg2 = salp0 * sbet2
+    csig2 = comg2 = calp2 * cbet2
+    ssig2, csig2 = _normalize(ssig2, csig2)
+
+    sig12 = math.atan2(
+        max(0.0, csig1 * ssig2 - ssig1 * csig2) + 0.0, csig1 * csig2 + ssig1 * ssig2
+    )
+    somg12 = max(0.0, comg1 * somg2 - somg1 * comg2) + 0.0
+    comg12 = comg1 * comg2 + somg1 * somg2
+    eta = math.atan2(
+        somg12 * clam120 - comg12 * slam120, comg12 * clam120 + somg12 * slam120
+    )
+
+    eps = _epsilon(calp0)
+    c3 = _c3(eps)
+    b312 = _sin_series(ssig2, csig2, c3) - _sin_series(ssig1, csig1, c3)
+    lam12 = eta - WGS84_F * _a3(eps) * salp0 * (sig12 + b312)
+
+    if calp2 == 0:
+        dlam12 = -2 * _F1 * dn1 / sbet1
+    else:
+        _, m12b = _lengths(eps, sig12, ssig1, csig1, dn1, ssig2, csig2, dn2)
+        dlam12 = m12b * _F1 / (calp2 * cbet2)
+    return lam12, dlam12, salp2, calp2, sig12, ssig1, csig1, ssig2, csig2, eps
+
+
+def _inverse(lat1, lon1, lat2, lon2):
+    """
+    Solve the inverse geodesic problem for two points given in degrees.
+
+    Returns:
+    tuple: (s12, azi1, azi2, iterations) with the distance in meters, the
+    azimuths at both points in degrees and the number of Newton/bisection steps.
+    """
+    lon12, lon12s = _angle_difference(lon1, lon2)
+    lonsign = math.copysign(1, lon12)
+    lon12 *= lonsign
+    lon12s *= lonsign
+    lam12 = math.radians(lon12)
+    slam12, clam12 = _sincosde(lon12, lon12s)
+    lon12s = (180 - lon12) - lon12s  # The supplementary longitude difference
+
+    # Make |lat1| >= |lat2| and lat1 <= 0 (the problem is symmetric)
+    lat1 = _round_angle(lat1)
+    lat2 = _round_angle(lat2)
+    swapp = -1 if abs(lat1) < abs(lat2) else 1
+    if swapp < 0:
+        lonsign *= -1
+        lat1, lat2 = lat2, lat1
+    latsign = math.copysign(1, -lat1)
+    lat1 *= latsign
+    lat2 *= latsign
+
+    sbet1, cbet1, dn1 = _reduced_latitude(lat1)
+    sbet2, cbet2, dn2 = _reduced_latitude(lat2)
+    # Make the reduced latitudes exactly symmetric when the latitudes are
+    if cbet1 < -sbet1:
+        if cbet2 == cbet1:
+            sbet2 = math.copysign(sbet1, sbet2)
+    elif abs(sbet2) == -sbet1:
+        cbet2 = cbet1
+
+    iterations = 0
+    meridian = lat1 == -90 or slam12 == 0
+    if meridian:
+        # The geodesic runs along a meridian (possibly over a pole)
+        calp1 = clam12
+        salp1 = slam12
+        calp2 = 1.0
+        salp2 = 0.0
+        ssig1 = sbet1
+        csig1 = calp1 * cbet1
+        ssig2 = sbet2
+        csig2 = calp2 * cbet2
+        sig12 = math.atan2(
+            max(0.0, csig1 * ssig2 - ssig1 * csig2) + 0.0,
+            csig1 * csig2 + ssig1 * ssig2,
+        )
+        s12x, m12x = _lengths(_N, sig12, ssig1, csig1, dn1, ssig2, csig2, dn2)
+        if sig12 < _TOL2 or m12x >= 0:
+            # The meridian is the shortest path
+            if sig12 < 3 * _TINY or (sig12 < _TOL0 and (s12x < 0 or m12x < 0)):
+                s12x = 0.0
+            s12x *= _B
+        else:
+            meridian = False
+
+    if not meridian and sbet1 == 0 and lon12s >= WGS84_F * 180:
+        # Both points are on the equator and the geodesic follows it
+        calp1 = calp2 = 0.0
+        salp1 = salp2 = 1.0
+        s12x = WGS84_A * lam12
+    elif not meridian:
+        sig12, salp1, calp1, salp2, calp2, dnm = _inverse_start(
+            sbet1, cbet1, sbet2, cbet2, lam12, slam12, clam12
+        )
+        if sig12 >= 0:
+            # Short line: the spherical estimate is accurate
+            s12x = sig12 * _B * dnm
+        else:
+            # Newton's method on alpha1, keeping a bracket [alpha1a, alpha1b]
+            # of the root for bisection when a step goes astray
+            tripn = tripb = False
+            salp1a = _TINY
+            calp1a = 1.0
+            salp1b = _TINY
+            calp1b = -1.0
+            while True:
+                v, dv, salp2, calp2, sig12, ssig1, csig1, ssig2, csig2, eps = _lambda12(
+                    sbet1, cbet1, dn1, sbet2, cbet2, dn2, salp1, calp1, slam12, clam12
+                )
+                if (
+                    tripb
+                    or not abs(v) >= (8 if tripn else 1) * _TOL0
+                    or iterations == MAX_ITERATIONS
+                ):
+                    break
+                # Update the bracket
+                if v > 0 and (
+                    iterations > MAX_NEWTON_ITERATIONS
+                    or calp1 / salp1 > calp1b / salp1b
+                ):
+                    salp1b = salp1
+                    calp1b = calp1
+                elif v < 0 and (
+                    iterations > MAX_NEWTON_ITERATIONS
+                    or calp1 / salp1 < calp1a / salp1a
+                ):
+                    salp1a = salp1
+                    calp1a = calp1
+
+                iterations += 1
+                if iterations < MAX_NEWTON_ITERATIONS and dv > 0:
+                    dalp1 = -v / dv
+                    if abs(dalp1) < math.pi:
+                        sdalp1 = math.sin(dalp1)
+                        cdalp1 = math.cos(dalp1)
+                        nsalp1 = salp1 * cdalp1 + calp1 * sdalp1
+                        if nsalp1 > 0:
+                            calp1 = calp1 * cdalp1 - salp1 * sdalp1
+                            salp1, calp1 = _normalize(nsalp1, calp1)
+                            tripn = abs(v) <= 16 * _TOL0
+                            continue
+                # Newton failed or left the bracket: bisect
+                salp1, calp1 = _normalize((salp1a + salp1b) / 2, (calp1a + calp1b) / 2)
+                tripn = False
+                tripb = (
+                    abs(salp1a - salp1) + (calp1a - calp1) < _TOL0
+                    or abs(salp1 - salp1b) + (calp1 - calp1b) < _TOL0
+                )
+            s12x, _ = _lengths(
+                eps, sig12, ssig1, csig1, dn1, ssig2, csig2, dn2, reduced=False
+            )
+            s12x *= _B
+
+    # Undo the symmetry transformations
+    if swapp < 0:
+        salp1, salp2 = salp2, salp1
+        calp1, calp2 = calp2, calp1
+    salp1 *= swapp * lonsign
+    calp1 *= swapp * latsign
+    salp2 *= swapp * lonsign
+    calp2 *= swapp * latsign
+    return 0.0 + s12x, _atan2d(salp1, calp1), _atan2d(salp2, calp2), iterations
+
+
+def _direct(lat1, lon1, azi1, s12):
+    """
+    Solve the direct geodesic problem for a start point and azimuth in degrees and a distance in meters.
+
+    Returns:
+    tuple: (lat2, lon2, azi2) in degrees.
+    """
+    salp1, calp1 = _sincosd(_round_angle(azi1))
+    sbet1, cbet1, _ = _reduced_latitude(_round_angle(lat1))
+
+    # The geodesic crosses the equator with azimuth alpha0
+    salp0 = salp1 * cbet1
+    calp0 = math.hypot(calp1, salp1 * sbet1)
+    ssig1 = sbet1
+    somg1 = salp0 * sbet1
+    csig1 = comg1 = cbet1 * calp1 if sbet1 != 0 or calp1 != 0 else 1.0
+    ssig1, csig1 = _normalize(ssig1, csig1)
+
+    eps = _epsilon(calp0)
+    a1m1 = _a1m1(eps)
+    b11 = _sin_series(ssig1, csig1, _eps_series(_C1, eps))
+    s = math.sin(b11)
+    c = math.cos(b11)
+    stau1 = ssig1 * c + csig1 * s
+    ctau1 = csig1 * c - ssig1 * s
+
+    # Invert the distance series for the arc length sigma12
+    tau12 = s12 / (_B * (1 + a1m1))
+    s = math.sin(tau12)
+    c = math.cos(tau12)
+    b12 = -_sin_series(
+        stau1 * c + ctau1 * s, ctau1 * c - stau1 * s, _eps_series(_C1P, eps)
+    )
+    sig12 = tau12 - (b12 - b11)
+    ssig12 = math.sin(sig12)
+    csig12 = math.cos(sig12)
+
+    ssig2 = ssig1 * csig12 + csig1 * ssig12
+    csig2 = csig1 * csig12 - ssig1 * ssig12
+    sbet2 = calp0 * ssig2
+    cbet2 = math.hypot(salp0, calp0 * csig2)
+    if cbet2 == 0:
+        # The geodesic ends at a pole
+        cbet2 = csig2 = _TINY
+    salp2 = salp0
+    calp2 = calp0 * csig2
+
+    somg2 = salp0 * ssig2
+    comg2 = csig2
+    omg12 = math.atan2(somg2 * comg1 - comg2 * somg1, comg2 * comg1 + somg2 * somg1)
+    c3 = _c3(eps)
+    lam12 = omg12 - WGS84_F * salp0 * _a3(eps) * (
+        sig12 + (_sin_series(ssig2, csig2, c3) - _sin_series(ssig1, csig1, c3))
+    )
+    lon2 = _normalize_angle(
+        _normalize_angle(lon1) + _normalize_angle(math.degrees(lam12))
+    )
+    return _atan2d(sbet2, _F1 * cbet2), lon2, _atan2d(salp2, calp2)
+
+
+# Vectorized versions of the solvers for the batch functions. They follow the
+# scalar code above branch for branch, with the branches turned into masks.
+
+
+def _sincosd_array(x):
+    """
+    Return the sines and cosines of angles in degrees, exact for multiples of 90 degrees.
+    """
+    q = np.rint(x / 90)
+    r = np.radians(x - 90 * q)
+    s = np.sin(r)
+    c = np.cos(r)
+    q = q.astype(np.int64) % 4
+    s, c = (
+        np.choose(q, [s, c, -s, -c]),
+        np.choose(q, [c, -s, -c, s]) + 0.0,
+    )
+    return np.where(s == 0, np.copysign(s, x), s), c
+
+
+def _normalize_array(x, y):
+    """
+    Vectorized _normalize.
+    """
+    r = np.hypot(x, y)
+    return x / r, y / r
+
+
+def _reduced_latitude_array(lat):
+    """
+    Vectorized _reduced_latitude.
+    """
+    sbet, cbet = _sincosd_array(lat)
+    sbet, cbet = _normalize_array(_F1 * sbet, cbet)
+    cbet = np.maximum(_TINY, cbet)
+    return sbet, cbet, np.sqrt(1 + _EP2 * sbet * sbet)
+
+
+def _round_angle_array(x):
+    """
+    Vectorized _round_angle.
+    """
+    z = 1 / 16
+    y = np.abs(x)
+    return np.copysign(np.where(y < z, z - (z - y), y), x)
+
+
+def _two_sum_array(u, v):
+    """
+    Vectorized _two_sum.
+    """
+    s = u + v
+    up = s - v
+    vpp = s - up
+    up -= u
+    vpp -= v
+    return s, np.where(s == 0, s, 0.0 - (up + vpp))
+
+
+def _astroid_array(x, y):
+    """
+    Vectorized _astroid.
+    """
+    p = x * x
+    q = y * y
+    r = (p + q - 1) / 6
+    s = p * q / 4
+    r2 = r * r
+    r3 = r * r2
+    disc = s * (s + 2 * r3)
+    t3 = s + r3
+    t3 = t3 + np.copysign(np.sqrt(np.maximum(disc, 0)), t3)
+    t = np.cbrt(t3)
+    u = np.where(
+        disc >= 0,
+        r + t + np.where(t != 0, r2 / np.where(t != 0, t, 1), 0),
+        r + 2 * r * np.cos(np.arctan2(np.sqrt(np.maximum(-disc, 0)), -(s + r3)) / 3),
+    )
+    v = np.sqrt(u * u + q)
+    uv = np.where(u < 0, q / (v - u), u + v)
+    w = (uv - q) / (2 * v)
+    k = uv / (np.sqrt(uv + w * w) + w)
+    return np.where((q == 0) & (r <= 0), 0.0, k)
+
+
+def _inverse_start_array(sbet1, cbet1, sbet2, cbet2, lam12, slam12, clam12):
+    """
+    Vectorized _inverse_start.
+    """
+    sbet12 = sbet2 * cbet1 - cbet2 * sbet1
+    cbet12 = cbet2 * cbet1 + sbet2 * sbet1
+    sbet12a = sbet2 * cbet1 + cbet2 * sbet1
+
+    shortline = (cbet12 >= 0) & (sbet12 < 0.5) & (cbet2 * lam12 < 0.5)
+    sbetm2 = (sbet1 + sbet2) ** 2
+    sbetm2 /= sbetm2 + (cbet1 + cbet2) ** 2
+    dnm = np.sqrt(1 + _EP2 * sbetm2)
+    omg12 = lam12 / (_F1 * dnm)
+    somg12 = np.where(shortline, np.sin(omg12), slam12)
+    comg12 = np.where(shortline, np.cos(omg12), clam12)
+
+    salp1 = cbet2 * somg12
+    calp1 = np.where(
+        comg12 >= 0,
+        sbet12 + cbet2 * sbet1 * somg12 * somg12 / (1 + comg12),
+        sbet12a - cbet2 * sbet1 * somg12 * somg12 / (1 - comg12),
+    )
+    ssig12 = np.hypot(salp1, calp1)
+    csig12 = sbet1 * sbet2 + cbet1 * cbet2 * comg12
+
+    # Really short lines
+    short = shortline & (ssig12 < _ETOL2)
+    salp2 = cbet1 * somg12
+    calp2 = sbet12 - cbet1 * sbet2 * np.where(
+        comg12 >= 0, somg12 * somg12 / (1 + comg12), 1 - comg12
+    )
+    salp2, calp2 = _normalize_array(salp2, calp2)
+    sig12 = np.where(short, np.arctan2(ssig12, csig12), -1.0)
+
+    # Nearly antipodal points
+    antipodal = ~short & (csig12 < 0) & (ssig12 < 6 * _N * math.pi * cbet1 * cbet1)
+    if antipodal.any():
+        index = np.flatnonzero(antipodal)
+        sb1, cb1, cb2 = sbet1[index], cbet1[index], cbet2[index]
+        lamscale = WGS84_F * cb1 * _a3(_epsilon(sb1)) * math.pi
+        x = np.arctan2(-slam12[index], -clam12[index]) / lamscale
+        y = sbet12a[index] / (lamscale * cb1)
+        sphere = (y > -_TOL1) & (x > -1 - _XTHRESH)
+        k = _astroid_array(x, y)
+        omg12a = lamscale * (-x * k / (1 + k))
+        somg = np.sin(omg12a)
+        comg = -np.cos(omg12a)
+        sa1 = np.minimum(1.0, -x)
+        salp1[index] = np.where(sphere, sa1, cb2 * somg)
+        calp1[index] = np.where(
+            sphere,
+            -np.sqrt(1 - sa1 * sa1),
+            sbet12a[index] - cb2 * sb1 * somg * somg / (1 - comg),
+        )
+
+    positive = salp1 > 0
+    salp1, calp1 = _normalize_array(np.where(positive, salp1, 1.0), calp1)
+    calp1 = np.where(positive, calp1, 0.0)
+    return sig12, salp1, calp1, salp2, calp2, dnm
+
+
+def _lambda12_array(
+    sbet1, cbet1, dn1, sbet2, cbet2, dn2, salp1, calp1, slam120, clam120
+):
+    """
+    Vectorized _lambda12 (without the azimuths at the second point).
+    """
+    calp1 = np.where((sbet1 == 0) & (calp1 == 0), -_TINY, calp1)
+    salp0 = salp1 * cbet1
+    calp0 = np.hypot(calp1, salp1 * sbet1)
+
+    somg1 = salp0 * sbet1
+    comg1 = calp1 * cbet1
+    ssig1, csig1 = _normalize_array(sbet1, comg1)
+
+    calp2 = np.where(
+        (cbet2 != cbet1) | (np.abs(sbet2) != -sbet1),
+        np.sqrt(
+            (calp1 * cbet1) ** 2
+            + np.where(
+                cbet1 < -sbet1,
+                (cbet2 - cbet1) * (cbet1 + cbet2),
+                (sbet1 - sbet2) * (sbet1 + sbet2),
+            )
+        )
+        / cbet2,
+        np.abs(calp1),
+    )
+    somg2 = salp0 * sbet2
+    comg2 = calp2 * cbet2
+    ssig2, csig2 = _normalize_array(sbet2, comg2)
+
+    sig12 = np.arctan2(
+        np.maximum(0.0, csig1 * ssig2 - ssig1 * csig2) + 0.0,
+        csig1 * csig2 + ssig1 * ssig2,
+    )
+    somg12 = np.maximum(0.0, comg1 * somg2 - somg1 * comg2) + 0.0
+    comg12 = comg1 * comg2 + somg1 * somg2
+    eta = np.arctan2(
+        somg12 * clam120 - comg12 * slam120, comg12 * clam120 + somg12 * slam120
+    )
+
+    eps = _epsilon(calp0)
+    c3 = _c3(eps)
+    b312 = _sin_series(ssig2, csig2, c3) - _sin_series(ssig1, csig1, c3)
+    lam12 = eta - WGS84_F * _a3(eps) * salp0 * (sig12 + b312)
+
+    _, m12b = _lengths(eps, sig12, ssig1, csig1, dn1, ssig2, csig2, dn2)
+    dlam12 = np.where(
+        calp2 == 0,
+        -2 * _F1 * dn1 / sbet1,
+        m12b * _F1 / (calp2 * cbet2),
+    )
+    return lam12, dlam12, sig12, ssig1, csig1, ssig2, csig2, eps
+
+
+def _newton_array(sbet1, cbet1, dn1, sbet2, cbet2, dn2, salp1, calp1, slam12, clam12):
+    """
+    Run the safeguarded Newton iteration of _inverse on arrays of pairs.
+
+    Pairs that have converged are dropped from the working set, so later
+    iterations only touch the (few) pairs that still need them.
+
+    Returns:
+    tuple: The reduced distances s12 / b and the number of iterations of each pair.
+    """
+    size = sbet1.size
+    s12b = np.empty(size)
+    iterations = np.zeros(size, dtype=np.int64)
+    active = np.arange(size)
+    state = [sbet1, cbet1, dn1, sbet2, cbet2, dn2, slam12, clam12]
+    salp1a = np.full(size, _TINY)
+    calp1a = np.ones(size)
+    salp1b = np.full(size, _TINY)
+    calp1b = -np.ones(size)
+    tripn = np.zeros(size, dtype=bool)
+    tripb = np.zeros(size, dtype=bool)
+
+    for count in range(MAX_ITERATIONS + 1):
+        sb1, cb1, d1, sb2, cb2, d2, sl12, cl12 = state
+        v, dv, sig12, ssig1, csig1, ssig2, csig2, eps = _lambda12_array(
+            sb1, cb1, d1, sb2, cb2, d2, salp1, calp1, sl12, cl12
+        )
+        done = (
+            tripb
+            | ~(np.abs(v) >= np.where(tripn, 8, 1) * _TOL0)
+            | (count == MAX_ITERATIONS)
+        )
+        if done.any():
+            s12b[active[done]], _ = _lengths(
+                eps[done],
+                sig12[done],
+                ssig1[done],
+                csig1[done],
+                d1[done],
+                ssig2[done],
+                csig2[done],
+                d2[done],
+                reduced=False,
+            )
+            iterations[active[done]] = count
+            keep = ~done
+            active = active[keep]
+            if not active.size:
+                break
+            state = [array[keep] for array in state]
+            v, dv = v[keep], dv[keep]
+            salp1, calp1 = salp1[keep], calp1[keep]
+            salp1a, calp1a = salp1a[keep], calp1a[keep]
+            salp1b, calp1b = salp1b[keep], calp1b[keep]
+
+        # Update the brackets
+        late = count > MAX_NEWTON_ITERATIONS
+        upper = (v > 0) & (late | (calp1 / salp1 > calp1b / salp1b))
+        lower = (v < 0) & (late | (calp1 / salp1 < calp1a / salp1a))
+        salp1b = np.where(upper, salp1, salp1b)
+        calp1b = np.where(upper, calp1, calp1b)
+        salp1a = np.where(lower, salp1, salp1a)
+        calp1a = np.where(lower, calp1, calp1a)
+
+        # Newton step where it stays in range, bisection elsewhere
+        dalp1 = -v / np.where(dv > 0, dv, 1)
+        sdalp1 = np.sin(dalp1)
+        cdalp1 = np.cos(dalp1)
+        nsalp1 = salp1 * cdalp1 + calp1 * sdalp1
+        newton = (
+            (count + 1 < MAX_NEWTON_ITERATIONS)
+            & (dv > 0)
+            & (np.abs(dalp1) < math.pi)
+            & (nsalp1 > 0)
+        )
+        nsalp1, ncalp1 = _normalize_array(
+            np.where(newton, nsalp1, (salp1a + salp1b) / 2),
+            np.where(newton, calp1 * cdalp1 - salp1 * sdalp1, (calp1a + calp1b) / 2),
+        )
+        tripn = newton & (np.abs(v) <= 16 * _TOL0)
+        tripb = ~newton & (
+            (np.abs(salp1a - nsalp1) + (calp1a - ncalp1) < _TOL0)
+            | (np.abs(nsalp1 - salp1b) + (ncalp1 - calp1b) < _TOL0)
+        )
+        salp1, calp1 = nsalp1, ncalp1
+    return s12b, iterations
+
+
+def _inverse_array(lat1, lon1, lat2, lon2):
+    """
+    Solve the inverse geodesic problem for arrays of points given in degrees.
+
+    Parameters:
+    lat1, lon1, lat2, lon2 (numpy.ndarray): Validated one-dimensional coordinate arrays.
+
+    Returns:
+    tuple: The distances in meters and the number of iterations used by each pair.
+    """
+    # Longitude difference in [0, 180] plus its rounding error (the input
+    # longitudes are in [-180, 180], so they need no reduction)
+    lon12, lon12s = _two_sum_array(-lon1, lon2)
+    lon12, t = _two_sum_array(lon12 - 360 * np.rint(lon12 / 360), lon12s)
+    lon12s = t
+    edge = (lon12 == 0) | (np.abs(lon12) == 180)
+    lon12 = np.where(edge, np.copysign(lon12, np.where(t == 0, lon2 - lon1, -t)), lon12)
+    lonsign = np.copysign(1, lon12)
+    lon12 *= lonsign
+    lon12s *= lonsign
+    lam12 = np.radians(lon12)
+    q = np.rint(lon12 / 90)
+    slam12, clam12 = _sincosd_array(
+        90 * q + _round_angle_array(lon12 - 90 * q + lon12s)
+    )
+    lon12s = (180 - lon12) - lon12s
+
+    lat1 = _round_angle_array(lat1)
+    lat2 = _round_angle_array(lat2)
+    swap = np.abs(lat1) < np.abs(lat2)
+    lat1, lat2 = np.where(swap, lat2, lat1), np.where(swap, lat1, lat2)
+    latsign = np.copysign(1, -lat1)
+    lat1 = lat1 * latsign
+    lat2 = lat2 * latsign
+
+    sbet1, cbet1, dn1 = _reduced_latitude_array(lat1)
+    sbet2, cbet2, dn2 = _reduced_latitude_array(lat2)
+    south = cbet1 < -sbet1
+    sbet2 = np.where(south & (cbet2 == cbet1), np.copysign(sbet1, sbet2), sbet2)
+    cbet2 = np.where(~south & (np.abs(sbet2) == -sbet1), cbet1, cbet2)
+
+    meters = np.empty(lat1.shape)
+    iterations = np.zeros(lat1.shape, dtype=np.int64)
+
+    # Meridians
+    meridian = (lat1 == -90) | (slam12 == 0)
+    if meridian.any():
+        index = np.flatnonzero(meridian)
+        sb1, cb1, sb2, cb2 = sbet1[index], cbet1[index], sbet2[index], cbet2[index]
+        ssig1, csig1 = sb1, clam12[index] * cb1
+        ssig2, csig2 = sb2, cb2
+        sig12 = np.arctan2(
+            np.maximum(0.0, csig1 * ssig2 - ssig1 * csig2) + 0.0,
+            csig1 * csig2 + ssig1 * ssig2,
+        )
+        s12x, m12x = _lengths(
+            _N, sig12, ssig1, csig1, dn1[index], ssig2, csig2, dn2[index]
+        )
+        valid = (sig12 < _TOL2) | (m12x >= 0)
+        zero = (sig12 < 3 * _TINY) | ((sig12 < _TOL0) & ((s12x < 0) | (m12x < 0)))
+        meters[index] = np.where(zero, 0.0, s12x) * _B
+        meridian[index[~valid]] = False
+
+    # Equatorial geodesics
+    equator = ~meridian & (sbet1 == 0) & (lon12s >= WGS84_F * 180)
+    meters[equator] = WGS84_A * lam12[equator]
+
+    remaining = np.flatnonzero(~meridian & ~equator)
+    if remaining.size:
+        sb1, cb1, d1 = sbet1[remaining], cbet1[remaining], dn1[remaining]
+        sb2, cb2, d2 = sbet2[remaining], cbet2[remaining], dn2[remaining]
+        sl12, cl12 = slam12[remaining], clam12[remaining]
+        sig12, salp1, calp1, _, _, dnm = _inverse_start_array(
+            sb1, cb1, sb2, cb2, lam12[remaining], sl12, cl12
+        )
+        short = sig12 >= 0
+        meters[remaining[short]] = sig12[short] * _B * dnm[short]
+        newton = ~short
+        if newton.any():
+            s12b, count = _newton_array(
+                sb1[newton],
+                cb1[newton],
+                d1[newton],
+                sb2[newton],
+                cb2[newton],
+                d2[newton],
+                salp1[newton],
+                calp1[newton],
+                sl12[newton],
+                cl12[newton],
+            )
+            meters[remaining[newton]] = s12b * _B
+            iterations[remaining[newton]] = count
+    return meters + 0.0, iterations
+
+
+def _direct_array(lat1, lon1, azi1, s12):
+    """
+    Solve the direct geodesic problem for arrays of start points, azimuths (degrees) and distances (meters).
+
+    Returns:
+    tuple: The latitudes, longitudes and azimuths (degrees) at the end points.
+    """
+    salp1, calp1 = _sincosd_array(_round_angle_array(azi1))
+    sbet1, cbet1, _ = _reduced_latitude_array(_round_angle_array(lat1))
+
+    salp0 = salp1 * cbet1
+    calp0 = np.hypot(calp1, salp1 * sbet1)
+    somg1 = salp0 * sbet1
+    comg1 = np.where((sbet1 != 0) | (calp1 != 0), cbet1 * calp1, 1.0)
+    ssig1, csig1 = _normalize_array(sbet1, comg1)
+
+    eps = _epsilon(calp0)
+    a1m1 = _a1m1(eps)
+    b11 = _sin_series(ssig1, csig1, _eps_series(_C1, eps))
+    s = np.sin(b11)
+    c = np.cos(b11)
+    stau1 = ssig1 * c + csig1 * s
+    ctau1 = csig1 * c - ssig1 * s
+
+    tau12 = s12 / (_B * (1 + a1m1))
+    s = np.sin(tau12)
+    c = np.cos(tau12)
+    b12 = -_sin_series(
+        stau1 * c + ctau1 * s, ctau1 * c - stau1 * s, _eps_series(_C1P, eps)
+    )
+    sig12 = tau12 - (b12 - b11)
+    ssig12 = np.sin(sig12)
+    csig12 = np.cos(sig12)
+
+    ssig2 = ssig1 * csig12 + csig1 * ssig12
+    csig2 = csig1 * csig12 - ssig1 * ssig12
+    sbet2 = calp0 * ssig2
+    cbet2 = np.hypot(salp0, calp0 * csig2)
+    pole = cbet2 == 0
+    cbet2 = np.where(pole, _TINY, cbet2)
+    csig2 = np.where(pole, _TINY, csig2)
+
+    somg2 = salp0 * ssig2
+    omg12 = np.arctan2(somg2 * comg1 - csig2 * somg1, csig2 * comg1 + somg2 * somg1)
+    c3 = _c3(eps)
+    lam12 = omg12 - WGS84_F * salp0 * _a3(eps) * (
+        sig12 + (_sin_series(ssig2, csig2, c3) - _sin_series(ssig1, csig1, c3))
+    )
+    lon2 = lon1 + np.degrees(lam12)
+    lon2 -= 360 * np.rint(lon2 / 360)
+    lat2 = np.degrees(np.arctan2(sbet2, _F1 * cbet2))
+    return lat2, lon2, np.degrees(np.arctan2(salp0, calp0 * csig2))
+
+
+def _to_meters(distance, unit):
+    """
+    Convert a distance in a resolved unit to meters.
+    """
+    return distance * 1000 / (0.62137119 if unit == "miles" else 1)
+
+
+def _from_meters(meters, unit):
+    """
+    Convert a distance in meters to a resolved unit.
+    """
+    return meters / 1000 * (0.62137119 if unit == "miles" else 1)
+
+
+def _check_point(point, name):
+    """
+    Raise ValueError if a (lat, lon) point is out of range.
+    """
+    if not (-90 <= point[0] <= 90 and -180 <= point[1] <= 180):
+        raise ValueError(
+            f"Invalid coordinates for {name}. Latitude must be between -90 and 90, and longitude must be between -180 and 180."
+        )
+
+
+def _geodesic_distance(point1, point2, unit):
+    """
+    Calculate the geodesic distance between two points in a resolved unit, without caching.
+    """
+    _check_point(point1, "point1")
+    _check_point(point2, "point2")
+    return _from_meters(_inverse(*point1, *point2)[0], unit)
+
+
+def geodesic_distance(point1, point2, unit=None):
+    """
+    Calculate the distance between two points along the geodesic of the WGS-84 ellipsoid.
+
+    Unlike vincenty_distance, which can fail to converge for nearly antipodal
+    points and then returns its last estimate, the geodesic solver converges for
+    every pair of points, to about 15 nanometers, in a bounded number of
+    iterations (MAX_ITERATIONS; 2 to 6 in practice). Results are cached in the
+    distance cache like vincenty_distance.
+
+    Parameters:
+    point1 (tuple): The latitude and longitude of the first point.
+    point2 (tuple): The latitude and longitude of the second point.
+    unit (str): The unit of measurement for the distance (default is Config.unit).
+
+    Returns:
+    float: The distance between the two points in the specified unit.
+
+    Raises:
+    ValueError: If the coordinates are invalid.
+    """
+    from geotools.distance import _cached_distance
+
+    if Config.metrics_enabled:
+        with timed("geodesic_distance"):
+            return _cached_distance(
+                "geodesic", _geodesic_distance, point1, point2, unit
+            )
+    return _cached_distance("geodesic", _geodesic_distance, point1, point2, unit)
+
+
+def geodesic_inverse(point1, point2, unit=None):
+    """
+    Solve the inverse geodesic problem: the distance and azimuths between two points.
+
+    Parameters:
+    point1 (tuple): The latitude and longitude of the first point.
+    point2 (tuple): The latitude and longitude of the second point.
+    unit (str): The unit of measurement for the distance (default is Config.unit).
+
+    Returns:
+    tuple: The distance in the specified unit and the azimuths (degrees clockwise
+    from north) of the geodesic at the first and at the second point.
+
+    Raises:
+    ValueError: If the coordinates are invalid.
+    """
+    _check_point(point1, "point1")
+    _check_point(point2, "point2")
+    if unit is None:
+        unit = Config.unit
+    meters, azimuth1, azimuth2, _ = _inverse(*point1, *point2)
+    return _from_meters(meters, unit), azimuth1, azimuth2
+
+
+def geodesic_direct(point, azimuth, distance, unit=None):
+    """
+    Solve the direct geodesic problem: the destination reached from a point.
+
+    Parameters:
+    point (tuple): The latitude and longitude of the start point.
+    azimuth (float): The azimuth at the start point (degrees clockwise from north).
+    distance (float): The distance to travel in the specified unit (negative to travel backwards).
+    unit (str): The unit of measurement for the distance (default is Config.unit).
+
+    Returns:
+    tuple: The latitude and longitude of the destination and the azimuth of the geodesic there.
+
+    Raises:
+    ValueError: If the coordinates are invalid or the azimuth or distance is not finite.
+    """
+    _check_point(point, "point")
+    if not (math.isfinite(azimuth) and math.isfinite(distance)):
+        raise ValueError("The azimuth and distance must be finite numbers.")
+    if unit is None:
+        unit = Config.unit
+    return _direct(point[0], point[1], azimuth, _to_meters(distance, unit))
+
+
+def _geodesic_into(out, points1, points2, unit):
+    """
+    Write the geodesic distances (column 0) and iteration counts (column 1) into out.
+    """
+    shape = out.shape[:-1]
+    lat1, lon1, lat2, lon2 = (
+        np.broadcast_to(coordinate, shape).reshape(-1)
+        for coordinate in (
+            points1[..., 0],
+            points1[..., 1],
+            points2[..., 0],
+            points2[..., 1],
+        )
+    )
+    with np.errstate(invalid="ignore", divide="ignore"):
+        meters, iterations = _inverse_array(lat1, lon1, lat2, lon2)
+    out[..., 0] = _from_meters(meters, unit).reshape(shape)
+    out[..., 1] = iterations.reshape(shape)
+
+
+@instrument()
+def batch_geodesic_distance(
+    points1, points2, unit=None, return_iterations=False, workers=None
+):
+    """
+    Calculate the geodesic distances between many pairs of points on the WGS-84 ellipsoid.
+
+    The solver of geodesic_distance runs over the whole batch at once; pairs
+    that have converged leave the working set, and no pair takes more than
+    MAX_ITERATIONS iterations, so the cost of a batch is bounded even when it is
+    full of nearly antipodal points. Either argument may also be a single point.
+    Large batches can be split across worker processes.
+
+    Parameters:
+    points1 (numpy.ndarray, PointArray or tuple): An (N, 2) array of latitudes and longitudes, or a single point.
+    points2 (numpy.ndarray, PointArray or tuple): An (N, 2) array of latitudes and longitudes, or a single point.
+    unit (str): The unit of measurement for the distances (default is Config.unit).
+    return_iterations (bool): Whether to also return the number of iterations used by each pair.
+    workers (int): The number of worker processes (default is Config.workers).
+
+    Returns:
+    numpy.ndarray: The distances between the pairs of points in the specified unit.
+    When return_iterations is True, a tuple of the distances and the iteration counts.
+
+    Raises:
+    ValueError: If the coordinates are invalid or the arrays have different lengths.
+    """
+    points1 = _as_point_array(points1, "points1")
+    points2 = _as_point_array(points2, "points2")
+    shape = _broadcast_shape(points1[..., 0], points2[..., 0])
+
+    if unit is None:
+        unit = Config.unit
+
+    out = parallel.map_chunks(
+        _geodesic_into,
+        np.empty(shape + (2,)),
+        [points1, points2],
+        [points1.ndim == 2, points2.ndim == 2],
+        args=(unit,),
+        workers=workers,
+    )
+    distance = out[..., 0].copy()
+
+    if return_iterations:
+        return distance, out[..., 1].astype(np.int64)
+    return distance
+
+
+def _direct_into(out, points, azimuths, distances, unit):
+    """
+    Write the destinations (columns 0 and 1) and final azimuths (column 2) into out.
+    """
+    shape = out.shape[:-1]
+    lat1, lon1, azi1, s12 = (
+        np.broadcast_to(array, shape).reshape(-1)
+        for array in (points[..., 0], points[..., 1], azimuths, distances)
+    )
+    lat2, lon2, azi2 = _direct_array(lat1, lon1, azi1, _to_meters(s12, unit))
+    out[..., 0] = lat2.reshape(shape)
+    out[..., 1] = lon2.reshape(shape)
+    out[..., 2] = azi2.reshape(shape)
+
+
+@instrument()
+def batch_geodesic_direct(points, azimuths, distances, unit=None, workers=None):
+    """
+    Solve the direct geodesic problem for many start points, azimuths and distances.
+
+    Any of the arguments may be a single value, which is then paired with every
+    element of the others.
+
+    Parameters:
+    points (numpy.ndarray, PointArray or tuple): An (N, 2) array of latitudes and longitudes, or a single point.
+    azimuths (numpy.ndarray or float): The azimuths at the start points (degrees clockwise from north).
+    distances (numpy.ndarray or float): The distances to travel in the specified unit.
+    unit (str): The unit of measurement for the distances (default is Config.unit).
+    workers (int): The number of worker processes (default is Config.workers).
+
+    Returns:
+    tuple: An (N, 2) array of the latitudes and longitudes of the destinations,
+    and the azimuths of the geodesics there.
+
+    Raises:
+    ValueError: If the coordinates are invalid, an azimuth or distance is not
+    finite or the arrays have different lengths.
+    """
+    points = _as_point_array(points, "points")
+    azimuths = np.asarray(azimuths, dtype=np.float64)
+    distances = np.asarray(distances, dtype=np.float64)
+    if azimuths.ndim > 1 or distances.ndim > 1:
+        raise ValueError(
+            "azimuths and distances must be numbers or one-dimensional arrays."
+        )
+    if not (np.isfinite(azimuths).all() and np.isfinite(distances).all()):
+        raise ValueError("The azimuths and distances must be finite numbers.")
+    try:
+        shape = np.broadcast(points[..., 0], azimuths, distances).shape
+    except ValueError:
+        raise ValueError(
+            "points, azimuths and distances must have the same length or be single values."
+        ) from None
+
+    if unit is None:
+        unit = Config.unit
+
+    out = parallel.map_chunks(
+        _direct_into,
+        np.empty(shape + (3,)),
+        [points, azimuths, distances],
+        [points.ndim == 2, azimuths.ndim == 1, distances.ndim == 1],
+        args=(unit,),
+        workers=workers,
+    )
+    return out[..., :2].copy(), out[..., 2].copy()
@@ -0,0 +1,550 @@
+import numpy as np
+from geotools import parallel
+from geotools.config import Config
+from geotools.distance import (
+    EARTH_RADIUS_KM,
+    _VINCENTY_RATIO,
+    _as_coordinates,
+    _haversine_angle,
+    _vincenty_meters,
+)
+from geotools.metrics import instrument
+
+# Number of query points processed together by the vectorized tree traversal.
+_QUERY_BATCH_SIZE = 1024
+
+
+def _unit_vectors(latitudes, longitudes):
+    """
+    Convert latitudes and longitudes in degrees to an (N, 3) array of unit vectors.
+    """
+    lat = np.radians(latitudes)
+    lon = np.radians(longitudes)
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def _chord_squared(distance, scale):
+    """
+    Convert distances along the sphere to squared chord lengths on the unit sphere.
+    """
+    angle = np.minimum(np.asarray(distance, dtype=np.float64) / scale, np.pi)
+    return (2 * np.sin(angle / 2)) ** 2
+
+
+def _expand_ranges(owners, starts, stops):
+    """
+    Expand (owner, [start, stop)) ranges into flat owner and position arrays.
+    """
+    counts = stops - starts
+    positions = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    positions += np.repeat(starts, counts)
+    return np.repeat(owners, counts), positions
+
+
+def _smallest_per_group(groups, keys, k, n_groups):
+    """
+    Return the positions of the k smallest keys of every group.
+
+    The groups must be sorted, and every group in range(n_groups) must have at
+    least k members. A group's keys are selected in place (k = 1) or in a padded
+    row per group, so the candidate pairs are not sorted as a whole.
+    """
+    starts = np.searchsorted(groups, np.arange(n_groups))
+    counts = np.diff(np.append(starts, groups.size))
+    if k == 1:
+        smallest = np.repeat(np.minimum.reduceat(keys, starts), counts)
+        # The first position of the smallest key of every group
+        hits = np.flatnonzero(keys == smallest)
+        return hits[np.searchsorted(hits, starts)][:, None]
+    width = counts.max()
+    if n_groups * width > 4 * groups.size:
+        # A few large groups: padding would cost more than sorting
+        order = np.lexsort((keys, groups))
+        return order[starts[:, None] + np.arange(k)]
+    padded = np.full((n_groups, width), np.inf)
+    padded[groups, np.arange(groups.size) - np.repeat(starts, counts)] = keys
+    columns = np.argpartition(padded, k - 1, axis=1)[:, :k]
+    resort = np.argsort(np.take_along_axis(padded, columns, axis=1), axis=1)
+    return starts[:, None] + np.take_along_axis(columns, resort, axis=1)
+
+
+class SpatialIndex:
+    """
+    Spatial index for k-nearest and radius queries on the sphere.
+
+    The points are converted to unit vectors and organized in a balanced k-d tree
+    with an implicit (heap) layout: node ``i`` has children ``2i + 1`` and
+    ``2i + 2`` and every leaf sits at the same depth, so the whole tree is a
+    handful of flat arrays. Chord lengths between unit vectors are monotonic in
+    great-circle distance, which makes the Euclidean bounding boxes of the tree
+    exact pruning bounds for Haversine queries. Queries traverse the tree
+    level by level for a whole batch of query points at once.
+
+    Attributes:
+    leaf_size (int): The target number of points per leaf.
+    """
+
+    def __init__(self, points, leaf_size=64):
+        """
+        Build the index over an array of points.
+
+        Parameters:
+        points (numpy.ndarray): An (N, 2) array of latitudes and longitudes.
+        leaf_size (int): The target number of points per leaf (default is 64).
+
+        Raises:
+        ValueError: If no points are provided or the coordinates are invalid.
+        """
+        latitudes, longitudes = (
+            np.atleast_1d(c) for c in _as_coordinates(points, "points")
+        )
+        size = latitudes.size
+        if size == 0:
+            raise ValueError("No points provided. Please provide an array of points.")
+        if leaf_size < 1:
+            raise ValueError("leaf_size must be a positive integer.")
+
+        self.leaf_size = int(leaf_size)
+        depth = int(np.ceil(np.log2(size / leaf_size))) if size > leaf_size else 0
+        xyz = _unit_vectors(latitudes, longitudes)
+
+        # Sort every node of a level along its widest dimension; the node's
+        # children are then the lower and upper halves of its range.
+        order = np.arange(size)
+        for level in range(depth):
+            starts = self._node_starts(size, level)
+            owners = np.repeat(np.arange(starts.size - 1), np.diff(starts))
+            level_xyz = xyz[order]
+            lower = np.minimum.reduceat(level_xyz, starts[:-1])
+            upper = np.maximum.reduceat(level_xyz, starts[:-1])
+            spread = upper - lower
+            keys = level_xyz[np.arange(size), np.argmax(spread, axis=1)[owners]]
+            order = order[np.lexsort((keys, owners))]
+
+        self._init_arrays(
+            latitudes[order], longitudes[order], order, depth, xyz=xyz[order]
+        )
+
+    @staticmethod
+    def _node_starts(size, level):
+        """
+        Return the boundaries of the ranges covered by the nodes of one level.
+        """
+        return (np.arange(2**level + 1) * size) >> level
+
+    def _init_arrays(self, latitudes, longitudes, order, depth, xyz=None, boxes=None):
+        """
+        Set the arrays backing the index and compute the node bounding boxes.
+        """
+        self._latitudes = latitudes
+        self._longitudes = longitudes
+        self._order = order
+        self._depth = depth
+        self._xyz = _unit_vectors(latitudes, longitudes) if xyz is None else xyz
+        self._leaf_starts = self._node_starts(latitudes.size, depth)
+
+        if boxes is None:
+            n_nodes = 2 ** (depth + 1) - 1
+            lower = np.empty((n_nodes, 3))
+            upper = np.empty((n_nodes, 3))
+            first_leaf = 2**depth - 1
+            lower[first_leaf:] = np.minimum.reduceat(self._xyz, self._leaf_starts[:-1])
+            upper[first_leaf:] = np.maximum.reduceat(self._xyz, self._leaf_starts[:-1])
+            for level in range(depth - 1, -1, -1):
+                nodes = np.arange(2**level - 1, 2 ** (level + 1) - 1)
+                lower[nodes] = np.minimum(lower[2 * nodes + 1], lower[2 * nodes + 2])
+                upper[nodes] = np.maximum(upper[2 * nodes + 1], upper[2 * nodes + 2])
+            boxes = np.stack([lower, upper])
+        self._boxes = boxes
+
+    def __len__(self):
+        return self._latitudes.size
+
+    def _box_distance(self, xyz, nodes):
+        """
+        Return squared lower bounds of the chord from each query vector to each node box.
+        """
+        gap = np.maximum(self._boxes[0, nodes] - xyz, 0) + np.maximum(
+            xyz - self._boxes[1, nodes], 0
+        )
+        return np.einsum("ij,ij->i", gap, gap)
+
+    def _candidates(self, xyz, bounds):
+        """
+        Find the leaves that may hold points within the squared chord bound of each query.
+
+        Returns:
+        tuple: Arrays of query positions and sorted point positions of all candidate pairs.
+        """
+        queries = np.arange(xyz.shape[0])
+        nodes = np.zeros(queries.size, dtype=np.int64)
+        keep = self._box_distance(xyz, nodes) <= bounds
+        queries, nodes = queries[keep], nodes[keep]
+        for _ in range(self._depth):
+            queries = np.repeat(queries, 2)
+            nodes = 2 * np.repeat(nodes, 2) + np.tile([1, 2], nodes.size)
+            keep = self._box_distance(xyz[queries], nodes) <= bounds[queries]
+            queries, nodes = queries[keep], nodes[keep]
+
+        leaves = nodes - (2**self._depth - 1)
+        return _expand_ranges(
+            queries, self._leaf_starts[leaves], self._leaf_starts[leaves + 1]
+        )
+
+    def _chords(self, xyz, queries, positions):
+        """
+        Return squared chord lengths between query vectors and indexed points.
+        """
+        diff = self._xyz[positions] - xyz[queries]
+        return np.einsum("ij,ij->i", diff, diff)
+
+    def _distances(self, latitudes, longitudes, queries, positions, method, unit):
+        """
+        Calculate exact distances between query points and indexed points.
+        """
+        if unit is None:
+            unit = Config.unit
+        lat1 = latitudes[queries]
+        lon1 = longitudes[queries]
+        lat2 = self._latitudes[positions]
+        lon2 = self._longitudes[positions]
+        if method == "haversine":
+            distance = _haversine_angle(lat1, lon1, lat2, lon2) * EARTH_RADIUS_KM
+            return distance * 0.621371 if unit == "miles" else distance
+        distance = _vincenty_meters(lat1, lon1, lat2, lon2)[0] / 1000
+        return distance * 0.62137119 if unit == "miles" else distance
+
+    @staticmethod
+    def _scale(method, unit):
+        """
+        Return the distance in the requested unit that corresponds to one radian.
+        """
+        if unit is None:
+            unit = Config.unit
+        if method == "haversine":
+            return EARTH_RADIUS_KM * (0.621371 if unit == "miles" else 1)
+        return (
+            EARTH_RADIUS_KM * (0.62137119 if unit == "miles" else 1) * _VINCENTY_RATIO
+        )
+
+    @staticmethod
+    def _check_method(method):
+        if method not in ("haversine", "vincenty"):
+            raise ValueError(
+                "Unsupported method. Please use 'haversine' or 'vincenty'."
+            )
+
+    def _knn_batch(self, latitudes, longitudes, k):
+        """
+        Find the k nearest indexed points (by Haversine distance) for a batch of queries.
+
+        Returns:
+        numpy.ndarray: A (Q, k) array of point positions sorted by distance.
+        """
+        n_queries = latitudes.size
+        xyz = _unit_vectors(latitudes, longitudes)
+
+        # Descend greedily to the deepest node holding at least k points; the
+        # k-th nearest of its points bounds the search radius of the query.
+        size = len(self)
+        level = 0
+        while level < self._depth and (size >> (level + 1)) >= k:
+            level += 1
+        nodes = np.zeros(n_queries, dtype=np.int64)
+        for _ in range(level):
+            left = 2 * nodes + 1
+            right = left + 1
+            nodes = np.where(
+                self._box_distance(xyz, right) < self._box_distance(xyz, left),
+                right,
+                left,
+            )
+        starts = self._node_starts(size, level)
+        home = nodes - (2**level - 1)
+        queries, positions = _expand_ranges(
+            np.arange(n_queries), starts[home], starts[home + 1]
+        )
+        chords = self._chords(xyz, queries, positions)
+        kth = chords[_smallest_per_group(queries, chords, k, n_queries)[:, -1]]
+
+        queries, positions = self._candidates(xyz, kth * (1 + 1e-9) + 1e-15)
+        chords = self._chords(xyz, queries, positions)
+        return positions[_smallest_per_group(queries, chords, k, n_queries)]
+
+    def query(self, points, k=1, method="haversine", unit=None):
+        """
+        Find the k nearest indexed points of each query point.
+
+        Parameters:
+        points (numpy.ndarray or tuple): A single (lat, lon) point or an (N, 2) array of query points.
+        k (int): The number of neighbors to return (default is 1).
+        method (str): The distance formula to use ("haversine", "vincenty").
+        unit (str): The unit of measurement for the distances (default is Config.unit).
+
+        Returns:
+        tuple: The indices of the neighbors in the indexed points and their distances,
+        sorted by distance. Both have shape (k,) for a single point and (N, k) otherwise.
+
+        Raises:
+        ValueError: If the coordinates are invalid, k is out of range or the method is unsupported.
+        """
+        self._check_method(method)
+        if not 1 <= k <= len(self):
+            raise ValueError(
+                f"k must be between 1 and the number of indexed points ({len(self)})."
+            )
+        latitudes, longitudes = _as_coordinates(points, "points")
+        single = latitudes.ndim == 0
+        indices, distances = self._query(
+            np.atleast_1d(latitudes), np.atleast_1d(longitudes), k, method, unit
+        )
+        if single:
+            return indices[0], distances[0]
+        return indices, distances
+
+    def _query(self, latitudes, longitudes, k, method, unit):
+        """
+        Find the k nearest indexed points of arrays of validated query coordinates.
+        """
+        n_queries = latitudes.size
+        indices = np.empty((n_queries, k), dtype=np.int64)
+        distances = np.empty((n_queries, k))
+        for start in range(0, n_queries, _QUERY_BATCH_SIZE):
+            batch = slice(start, min(start + _QUERY_BATCH_SIZE, n_queries))
+            lat, lon = latitudes[batch], longitudes[batch]
+            positions = self._knn_batch(lat, lon, k)
+            queries = np.repeat(np.arange(lat.size), k)
+
+            if method == "vincenty":
+                # Every point within the largest Vincenty distance of the
+                # Haversine neighbors is a candidate for the Vincenty neighbors.
+                distance = self._distances(
+                    lat, lon, queries, positions.ravel(), method, unit
+                ).reshape(-1, k)
+                bounds = _chord_squared(distance.max(axis=1), self._scale(method, unit))
+                xyz = _unit_vectors(lat, lon)
+                queries, candidates = self._candidates(xyz, bounds * (1 + 1e-9) + 1e-15)
+                distance = self._distances(lat, lon, queries, candidates, method, unit)
+                selected = _smallest_per_group(queries, distance, k, lat.size)
+                positions = candidates[selected]
+                distance = distance[selected]
+            else:
+                distance = self._distances(
+                    lat, lon, queries, positions.ravel(), method, unit
+                ).reshape(-1, k)
+                # Order ties and rounding differences by the exact distance
+                resort = np.argsort(distance, axis=1, kind="stable")
+                positions = np.take_along_axis(positions, resort, axis=1)
+                distance = np.take_along_axis(distance, resort, axis=1)
+
+            indices[batch] = self._order[positions]
+            distances[batch] = distance
+        return indices, distances
+
+    def query_radius(self, points, radius, method="haversine", unit=None):
+        """
+        Find all indexed points within a radius of each query point.
+
+        Parameters:
+        points (numpy.ndarray or tuple): A single (lat, lon) point or an (N, 2) array of query points.
+        radius (float or numpy.ndarray): The search radius, or one radius per query point.
+        method (str): The distance formula to use ("haversine", "vincenty").
+        unit (str): The unit of measurement for the radius and distances (default is Config.unit).
+
+        Returns:
+        tuple: The indices of the matching indexed points and their distances, sorted
+        by distance. For an (N, 2) array of query points, two lists of N arrays.
+
+        Raises:
+        ValueError: If the coordinates are invalid, the radius is negative or the method is unsupported.
+        """
+        self._check_method(method)
+        latitudes, longitudes = _as_coordinates(points, "points")
+        single = latitudes.ndim == 0
+        latitudes, longitudes = np.atleast_1d(latitudes, longitudes)
+        radius = np.broadcast_to(np.asarray(radius, dtype=np.float64), latitudes.shape)
+        if np.any(radius < 0):
+            raise ValueError("radius must be non-negative.")
+
+        indices = []
+        distances = []
+        for start in range(0, latitudes.size, _QUERY_BATCH_SIZE):
+            batch = slice(start, min(start + _QUERY_BATCH_SIZE, latitudes.size))
+            lat, lon, limit = latitudes[batch], longitudes[batch], radius[batch]
+            bounds = _chord_squared(limit, self._scale(method, unit))
+            xyz = _unit_vectors(lat, lon)
+
+            queries, positions = self._candidates(xyz, bounds * (1 + 1e-9) + 1e-15)
+            keep = (
+                self._chords(xyz, queries, positions)
+                <= bounds[queries] * (1 + 1e-9) + 1e-15
+            )
+            queries, positions = queries[keep], positions[keep]
+            distance = self._distances(lat, lon, queries, positions, method, unit)
+            keep = distance <= limit[queries]
+            queries, positions, distance = (
+                queries[keep],
+                positions[keep],
+                distance[keep],
+            )
+
+            order = np.lexsort((distance, queries))
+            splits = np.searchsorted(queries[order], np.arange(1, lat.size))
+            indices.extend(np.split(self._order[positions[order]], splits))
+            distances.extend(np.split(distance[order], splits))
+
+        if single:
+            return indices[0], distances[0]
+        return indices, distances
+
+    def save(self, path):
+        """
+        Save the index to a compact binary (.npz) file.
+
+        Parameters:
+        path (str): The path of the file to write, used as is (no ".npz" is appended).
+        """
+        # Given a path without the extension, numpy.savez would append ".npz"
+        with open(path, "wb") as file:
+            np.savez(
+                file,
+                latitudes=self._latitudes,
+                longitudes=self._longitudes,
+                order=self._order,
+                boxes=self._boxes,
+                meta=np.array([self._depth, self.leaf_size]),
+            )
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load an index saved with save without rebuilding the tree.
+
+        Parameters:
+        path (str): The path of the file to read.
+
+        Returns:
+        SpatialIndex: The loaded index.
+        """
+        with np.load(path) as data:
+            depth, leaf_size = (int(value) for value in data["meta"])
+            return cls._from_arrays(
+                data["latitudes"],
+                data["longitudes"],
+                data["order"],
+                data["boxes"],
+                depth,
+                leaf_size,
+            )
+
+    @classmethod
+    def _from_arrays(cls, latitudes, longitudes, order, boxes, depth, leaf_size):
+        """
+        Rebuild an index from its arrays without rebuilding the tree.
+        """
+        index = cls.__new__(cls)
+        index.leaf_size = leaf_size
+        index._init_arrays(latitudes, longitudes, order, depth, boxes=boxes)
+        return index
+
+
+def _join_into(
+    out,
+    latitudes,
+    longitudes,
+    index_latitudes,
+    index_longitudes,
+    order,
+    boxes,
+    depth,
+    leaf_size,
+    k,
+    method,
+    unit,
+):
+    """
+    Fill out[..., 0] with the indices and out[..., 1] with the distances of the k nearest indexed points.
+    """
+    index = SpatialIndex._from_arrays(
+        index_latitudes, index_longitudes, order, boxes, depth, leaf_size
+    )
+    out[..., 0], out[..., 1] = index._query(latitudes, longitudes, k, method, unit)
+
+
+@instrument()
+def nearest_join(
+    left, right, k=1, max_distance=None, method="haversine", unit=None, workers=None
+):
+    """
+    Find the k nearest points of right for every point of left.
+
+    The points of right are indexed once in a SpatialIndex and the points of
+    left are queried against it in vectorized batches, so a join of N points
+    with M points costs about N log M operations instead of N * M distances.
+    Index the smaller set as right, e.g. the stores when joining millions of
+    customers to their nearest store; a SpatialIndex can also be passed to
+    reuse it across joins. With more than one worker, the queries are split
+    into chunks that run in a pool of worker processes, with the coordinates
+    and the index passed through shared memory.
+
+    Parameters:
+    left (numpy.ndarray or tuple): A single (lat, lon) point or an (N, 2) array of points to match.
+    right (numpy.ndarray or SpatialIndex): An (M, 2) array of candidate points, or a SpatialIndex over them.
+    k (int): The number of nearest points to return for every point of left (default is 1).
+    max_distance (float): The largest distance of a match; farther matches are reported with index -1 and an infinite distance (default is None, no limit).
+    method (str): The distance formula to use ("haversine", "vincenty").
+    unit (str): The unit of measurement for max_distance and the distances (default is Config.unit).
+    workers (int): The number of worker processes (default is Config.workers).
+
+    Returns:
+    tuple: The indices of the matches in right and their distances, sorted by
+    distance. Both have shape (k,) for a single point and (N, k) otherwise.
+
+    Raises:
+    ValueError: If the coordinates are invalid, k is out of range, max_distance is negative or the method is unsupported.
+    """
+    SpatialIndex._check_method(method)
+    if max_distance is not None and not max_distance >= 0:
+        raise ValueError("max_distance must be non-negative.")
+    index = right if isinstance(right, SpatialIndex) else SpatialIndex(right, 16)
+    if not 1 <= k <= len(index):
+        raise ValueError(
+            f"k must be between 1 and the number of indexed points ({len(index)})."
+        )
+    latitudes, longitudes = _as_coordinates(left, "left")
+    single = latitudes.ndim == 0
+    latitudes, longitudes = np.atleast_1d(latitudes, longitudes)
+    if unit is None:
+        unit = Config.unit
+
+    workers = parallel.resolve_workers(workers)
+    if workers > 1:
+        # A few chunks per worker balance the load between them
+        out = parallel.map_chunks(
+            _join_into,
+            np.empty((latitudes.size, k, 2)),
+            [
+                latitudes,
+                longitudes,
+                index._latitudes,
+                index._longitudes,
+                index._order,
+                index._boxes,
+            ],
+            [True, True, False, False, False, False],
+            args=(index._depth, index.leaf_size, k, method, unit),
+            workers=workers,
+            chunk_size=max(_QUERY_BATCH_SIZE, -(-latitudes.size // (4 * workers))),
+        )
+        indices, distances = out[..., 0].astype(np.int64), out[..., 1].copy()
+    else:
+        indices, distances = index._query(latitudes, longitudes, k, method, unit)
+
+    if max_distance is not None:
+        far = distances > max_distance
+        indices[far] = -1
+        distances[far] = np.inf
+    if single:
+        return indices[0], distances[0]
+    return indices, distances
@@ -0,0 +1,439 @@
+import csv
+import io
+import os
+import re
+import shutil
+import struct
+import tempfile
+from geotools._lazy import lazy_import
+from geotools.analysis import _ARRAY_BATCH_SIZE, _point_chunks, _weight_chunks
+from geotools.points import (
+    PointArray,
+    _column_index,
+    _resolve_dtype,
+    _validate_coordinates,
+)
+
+np = lazy_import("numpy")
+
+# Point files start with a 64-byte header:
+#   magic (8 bytes), version (uint16), flags (uint16), coordinate size in bytes
+#   (uint32), number of points (uint64), then zero padding.
+# The header is followed by the latitudes and the longitudes (one contiguous
+# little-endian (2, N) float block), then the optional int64 IDs and float64
+# weights. Every section after the coordinates starts on a 64-byte boundary.
+MAGIC = b"GEOPTS\x00\x00"
+VERSION = 1
+_HEADER = struct.Struct("<8sHHIQ")
+_HEADER_SIZE = 64
+_ALIGNMENT = 64
+_HAS_IDS = 1
+_HAS_WEIGHTS = 2
+
+# Number of bytes the text readers parse at a time
+_BLOCK_SIZE = 1 << 22
+
+# The position array of a GeoJSON Point geometry: an object without nested
+# objects whose "type" is "Point", in either member order (the "coordinates"
+# of other objects, such as properties, do not match)
+_GEOJSON_POINT = re.compile(
+    rb'\{(?=[^{}]*"type"\s*:\s*"Point")'
+    rb'[^{}]*?"coordinates"\s*:\s*\[([-+0-9.eE\s,]*)\][^{}]*\}'
+)
+
+
+def _align(offset):
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def _layout(count, itemsize, flags):
+    """
+    Return the offsets of the ID and weight sections and the total file size.
+    """
+    offset = _HEADER_SIZE + 2 * count * itemsize
+    ids_offset = weights_offset = None
+    if flags & _HAS_IDS:
+        ids_offset = offset = _align(offset)
+        offset += count * 8
+    if flags & _HAS_WEIGHTS:
+        weights_offset = offset = _align(offset)
+        offset += count * 8
+    return ids_offset, weights_offset, offset
+
+
+def _pad(file):
+    file.write(b"\x00" * (_align(file.tell()) - file.tell()))
+
+
+class PointFileWriter:
+    """
+    Writer of point files, fed one chunk of points at a time.
+
+    The latitudes are written straight to the file; the longitudes, IDs and
+    weights are spooled to temporary files next to it and appended when the
+    writer is closed, so the number of points does not need to be known up
+    front and memory use is bounded by the size of a chunk.
+    """
+
+    def __init__(self, path, dtype=None, ids=False, weights=False):
+        """
+        Create a point file (an existing file is overwritten).
+
+        Parameters:
+        path (str): The path of the point file.
+        dtype (str or numpy.dtype): The dtype of the coordinates, "float64" or "float32" (default is "float64").
+        ids (bool): Whether every point has an integer ID.
+        weights (bool): Whether every point has a weight.
+
+        Raises:
+        ValueError: If the dtype is unsupported.
+        """
+        self.path = path
+        self.dtype = _resolve_dtype(dtype).newbyteorder("<")
+        self.count = 0
+        self._flags = (_HAS_IDS if ids else 0) | (_HAS_WEIGHTS if weights else 0)
+        directory = os.path.dirname(os.path.abspath(path))
+        self._file = open(path, "wb")
+        self._file.write(b"\x00" * _HEADER_SIZE)
+        self._spools = [
+            tempfile.TemporaryFile(dir=directory)
+            for _ in range(1 + bool(ids) + bool(weights))
+        ]
+
+    def append(self, points, ids=None, weights=None):
+        """
+        Append a chunk of points.
+
+        Parameters:
+        points (list, numpy.ndarray or PointArray): The points, as (latitude, longitude) pairs.
+        ids (list or numpy.ndarray): One integer ID per point (required if the file has IDs).
+        weights (list or numpy.ndarray): One non-negative weight per point (required if the file has weights).
+
+        Raises:
+        ValueError: If the points are invalid, or the IDs or weights are missing or invalid.
+        """
+        if isinstance(points, PointArray):
+            latitudes, longitudes = points.latitudes, points.longitudes
+        else:
+            array = np.asarray(points, dtype=self.dtype).reshape(-1, 2)
+            latitudes, longitudes = array[:, 0], array[:, 1]
+            _validate_coordinates(latitudes, longitudes, "points")
+        n = latitudes.size
+
+        columns = [longitudes.astype(self.dtype, copy=False)]
+        for flag, values, name, dtype in (
+            (_HAS_IDS, ids, "ids", "<i8"),
+            (_HAS_WEIGHTS, weights, "weights", "<f8"),
+        ):
+            if not self._flags & flag:
+                if values is not None:
+                    raise ValueError(f"The point file was created without {name}.")
+                continue
+            if values is None:
+                raise ValueError(f"{name} must be provided for every chunk of points.")
+            values = np.asarray(values, dtype=dtype)
+            if values.shape != (n,):
+                raise ValueError(f"{name} must contain exactly one value per point.")
+            if flag == _HAS_WEIGHTS and not (
+                np.all(values >= 0) and np.all(np.isfinite(values))
+            ):
+                raise ValueError("weights must be finite and non-negative.")
+            columns.append(values)
+
+        self._file.write(latitudes.astype(self.dtype, copy=False).tobytes())
+        for spool, column in zip(self._spools, columns):
+            spool.write(column.tobytes())
+        self.count += n
+
+    def close(self):
+        """
+        Append the spooled columns and write the header.
+        """
+        if self._file is None:
+            return
+        try:
+            for index, spool in enumerate(self._spools):
+                if index:
+                    _pad(self._file)
+                spool.seek(0)
+                shutil.copyfileobj(spool, self._file, 1 << 20)
+            self._file.seek(0)
+            self._file.write(
+                _HEADER.pack(
+                    MAGIC, VERSION, self._flags, self.dtype.itemsize, self.count
+                )
+            )
+        finally:
+            self._release()
+
+    def _release(self):
+        for spool in self._spools:
+            spool.close()
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        elif self._file is not None:
+            self._release()
+            os.remove(self.path)
+        return False
+
+
+def write_points(
+    path, points, ids=None, weights=None, dtype=None, batch_size=_ARRAY_BATCH_SIZE
+):
+    """
+    Write points (and optionally their IDs and weights) to a point file.
+
+    The input is written chunk by chunk, so it can be a memory-mapped array, a
+    generator of points or an iterable of (N, 2) chunks larger than memory.
+
+    Parameters:
+    path (str): The path of the point file.
+    points (list, numpy.ndarray, PointArray or iterable): Points, or an iterable of (N, 2) chunks of points.
+    ids (list, numpy.ndarray or iterable): Optional integer IDs, one per point.
+    weights (list, numpy.ndarray or iterable): Optional non-negative weights, one per point.
+    dtype (str or numpy.dtype): The dtype of the coordinates, "float64" or "float32" (default is "float64").
+    batch_size (int): The number of points written at a time for lists and iterables of points.
+
+    Returns:
+    int: The number of points written.
+
+    Raises:
+    ValueError: If the points are invalid, or the IDs or weights do not match the points.
+    """
+    with PointFileWriter(path, dtype, ids is not None, weights is not None) as writer:
+        take_ids = None if ids is None else _weight_chunks(ids, np.int64)
+        take_weights = None if weights is None else _weight_chunks(weights)
+        for chunk in _point_chunks(points, batch_size):
+            n = chunk.shape[0]
+            writer.append(
+                chunk,
+                None if take_ids is None else take_ids(n),
+                None if take_weights is None else take_weights(n),
+            )
+        for take, name in ((take_ids, "ids"), (take_weights, "weights")):
+            if take is not None and take.remaining():
+                raise ValueError(f"{name} must contain exactly one value per point.")
+    return writer.count
+
+
+class PointFile:
+    """
+    A point file opened as memory-mapped arrays.
+
+    Nothing is parsed or loaded when the file is opened: the operating system
+    pages the data in as it is used, so files larger than memory can be passed
+    to the analysis and distance functions, which process them chunk by chunk.
+
+    Attributes:
+    path (str): The path of the point file.
+    points (PointArray): The points, backed by the file.
+    ids (numpy.ndarray): The int64 IDs of the points, or None.
+    weights (numpy.ndarray): The float64 weights of the points, or None.
+    """
+
+    def __init__(self, path, points, ids=None, weights=None):
+        self.path = path
+        self.points = points
+        self.ids = ids
+        self.weights = weights
+
+    def __len__(self):
+        return len(self.points)
+
+    def close(self):
+        """
+        Release the memory maps (arrays taken from the file keep them open).
+        """
+        self.points = self.ids = self.weights = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+        return False
+
+    def __repr__(self):
+        return f"PointFile({self.path!r}, size={len(self.points)})"
+
+
+def _map(path, dtype, offset, shape):
+    if 0 in shape:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+
+
+def read_points(path, validate=False):
+    """
+    Open a point file written by write_points or PointFileWriter.
+
+    Parameters:
+    path (str): The path of the point file.
+    validate (bool): Whether to check the range of every coordinate, which reads the
+    whole file (default is False, as the coordinates were validated when written).
+
+    Returns:
+    PointFile: The memory-mapped points, IDs and weights.
+
+    Raises:
+    ValueError: If the file is not a valid point file.
+    """
+    with open(path, "rb") as file:
+        header = file.read(_HEADER_SIZE)
+    if len(header) < _HEADER_SIZE or header[:8] != MAGIC:
+        raise ValueError(f"Invalid point file: {path}.")
+    _, version, flags, itemsize, count = _HEADER.unpack_from(header)
+    if version != VERSION or itemsize not in (4, 8):
+        raise ValueError(f"Unsupported point file version or format: {path}.")
+    ids_offset, weights_offset, size = _layout(count, itemsize, flags)
+    if os.path.getsize(path) < size:
+        raise ValueError(f"Invalid point file: {path} is truncated.")
+
+    data = _map(path, f"<f{itemsize}", _HEADER_SIZE, (2, count))
+    if validate:
+        _validate_coordinates(data[0], data[1], "points")
+    ids = None if ids_offset is None else _map(path, "<i8", ids_offset, (count,))
+    weights = (
+        None if weights_offset is None else _map(path, "<f8", weights_offset, (count,))
+    )
+    return PointFile(path, PointArray._from_data(data), ids, weights)
+
+
+def _parse_block(lines, columns, delimiter, dtype):
+    """
+    Parse the coordinate columns of a block of text lines into a PointArray.
+    """
+    array = np.loadtxt(
+        lines,
+        delimiter=delimiter,
+        usecols=columns,
+        dtype=dtype,
+        comments=None,
+        quotechar='"',
+        ndmin=2,
+    )
+    return PointArray(array, dtype=dtype)
+
+
+def read_csv(
+    path,
+    latitude="latitude",
+    longitude="longitude",
+    delimiter=",",
+    header=True,
+    dtype=None,
+    block_size=_BLOCK_SIZE,
+):
+    """
+    Stream the points of a CSV file as chunks.
+
+    The file is read in blocks of block_size bytes, and the latitude and
+    longitude columns of every block are parsed by NumPy's C reader straight
+    into a PointArray, so memory use stays bounded whatever the size of the file.
+    Quoted fields may contain the delimiter but not line breaks.
+
+    Parameters:
+    path (str): The path of the CSV file.
+    latitude (str or int): The name (or index) of the latitude column (default is "latitude").
+    longitude (str or int): The name (or index) of the longitude column (default is "longitude").
+    delimiter (str): The field delimiter (default is ",").
+    header (bool): Whether the first line holds the column names (default is True).
+    dtype (str or numpy.dtype): The dtype of the coordinates (default is "float64").
+    block_size (int): The number of bytes read at a time (default is 4 MiB).
+
+    Yields:
+    PointArray: The validated points of each block.
+
+    Raises:
+    ValueError: If a column is missing or a row contains invalid coordinates.
+    """
+    dtype = _resolve_dtype(dtype)
+    with open(path) as file:
+        if header:
+            names = next(csv.reader([file.readline()], delimiter=delimiter), [])
+            columns = (
+                _column_index(names, latitude, "latitude"),
+                _column_index(names, longitude, "longitude"),
+            )
+        elif isinstance(latitude, int) and isinstance(longitude, int):
+            columns = (latitude, longitude)
+        else:
+            raise ValueError(
+                "latitude and longitude must be column indexes when the CSV file has no header."
+            )
+
+        rest = ""
+        while True:
+            block = file.read(block_size)
+            if not block:
+                break
+            cut = block.rfind("\n") + 1
+            if not cut:
+                rest += block
+                continue
+            text = rest + block[:cut]
+            rest = block[cut:]
+            yield _parse_block(io.StringIO(text), columns, delimiter, dtype)
+        if rest.strip():
+            yield _parse_block(io.StringIO(rest), columns, delimiter, dtype)
+
+
+def read_geojson(path, dtype=None, block_size=_BLOCK_SIZE):
+    """
+    Stream the Point features of a GeoJSON file as chunks.
+
+    Both FeatureCollection documents and newline-delimited GeoJSON sequences are
+    supported. The file is scanned in blocks of block_size bytes for the position
+    arrays of Point geometries, which are parsed in bulk, so the document is never
+    loaded as a whole. Features with other geometry types, empty Points and
+    positions that are not 2 or 3 numbers are skipped. GeoJSON
+    positions are (longitude, latitude) pairs; the yielded points are
+    (latitude, longitude) like everywhere else in the library.
+
+    Parameters:
+    path (str): The path of the GeoJSON file.
+    dtype (str or numpy.dtype): The dtype of the coordinates (default is "float64").
+    block_size (int): The number of bytes read at a time (default is 4 MiB).
+
+    Yields:
+    PointArray: The validated points of each block.
+
+    Raises:
+    ValueError: If a position contains invalid coordinates.
+    """
+    dtype = _resolve_dtype(dtype)
+    with open(path, "rb") as file:
+        rest = b""
+        while True:
+            block = file.read(block_size)
+            data = rest + block
+            # A Point object never contains another "}", so no match straddles the last one
+            cut = data.rfind(b"}") + 1 if block else len(data)
+            rest = data[cut:]
+            # A position has a longitude, a latitude and an optional altitude
+            positions = [
+                position
+                for position in _GEOJSON_POINT.findall(data, 0, cut)
+                if position.count(b",") in (1, 2)
+            ]
+            if positions:
+                # One position per line (pretty-printed arrays span several lines)
+                text = b";".join(positions).translate(None, b"\r\n")
+                array = np.loadtxt(
+                    io.BytesIO(text.replace(b";", b"\n")),
+                    delimiter=",",
+                    usecols=(1, 0),
+                    dtype=dtype,
+                    comments=None,
+                    ndmin=2,
+                )
+                yield PointArray(array, dtype=dtype)
+            if not block:
+                break
@@ -0,0 +1,293 @@
+import bisect
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from geotools.config import Config
+
+# Upper bounds (in seconds) of the latency histogram buckets
+BUCKETS = (
+    1e-6,
+    2.5e-6,
+    5e-6,
+    1e-5,
+    2.5e-5,
+    5e-5,
+    1e-4,
+    2.5e-4,
+    5e-4,
+    1e-3,
+    2.5e-3,
+    5e-3,
+    1e-2,
+    2.5e-2,
+    5e-2,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+# Code flag of "async def" functions (inspect.CO_COROUTINE, without importing inspect)
+_CO_COROUTINE = 0x80
+
+_BUCKET_NAMES = [str(bound) for bound in BUCKETS] + ["+Inf"]
+
+
+def _key(name, labels):
+    return (name, tuple(sorted(labels.items())))
+
+
+def _format_key(key):
+    name, labels = key
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+class _Histogram:
+    """
+    Latency histogram with fixed buckets (the count of each bucket, not cumulative).
+    """
+
+    __slots__ = ("counts", "count", "total")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # The last bucket is +Inf
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+
+class MetricsRegistry:
+    """
+    Registry of counters and latency histograms.
+
+    Metrics are identified by a name and optional labels (e.g. provider="google").
+    Collectors are functions called on every snapshot that return extra counter
+    values, such as the hit and miss counts that the caches keep anyway.
+    """
+
+    def __init__(self):
+        self._counters = {}
+        self._histograms = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def increment(self, name, value=1, **labels):
+        """
+        Add value to a counter.
+
+        Parameters:
+        name (str): The name of the counter.
+        value (int): The amount to add (default is 1).
+        labels (dict): The labels of the counter.
+        """
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        """
+        Record a duration in a latency histogram.
+
+        Parameters:
+        name (str): The name of the histogram.
+        seconds (float): The duration in seconds.
+        labels (dict): The labels of the histogram.
+        """
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """
+        Time a block of code and record its duration in a latency histogram.
+
+        Parameters:
+        name (str): The name of the histogram.
+        labels (dict): The labels of the histogram.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def add_collector(self, collector):
+        """
+        Register a function that returns extra counter values for every snapshot.
+
+        Parameters:
+        collector (callable): Returns a dict of counter values keyed on their names.
+        """
+        self._collectors.append(collector)
+
+    def _collect(self):
+        """
+        Return copies of the counters (including collected values) and histograms.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {
+                key: (list(histogram.counts), histogram.count, histogram.total)
+                for key, histogram in self._histograms.items()
+            }
+        for collector in self._collectors:
+            for name, value in collector().items():
+                counters[_key(name, {})] = value
+        return counters, histograms
+
+    def snapshot(self):
+        """
+        Return the current values of all metrics.
+
+        Returns:
+        dict: The counters ("counters") and histograms ("histograms"), keyed on
+        the metric name followed by its labels, e.g. 'calls{function="haversine_distance"}'.
+        """
+        counters, histograms = self._collect()
+        return {
+            "counters": {_format_key(key): value for key, value in counters.items()},
+            "histograms": {
+                _format_key(key): {
+                    "count": count,
+                    "sum": total,
+                    "buckets": dict(zip(_BUCKET_NAMES, counts)),
+                }
+                for key, (counts, count, total) in histograms.items()
+            },
+        }
+
+    def to_prometheus(self, prefix="geotools_"):
+        """
+        Format all metrics in the Prometheus text exposition format.
+
+        Parameters:
+        prefix (str): The prefix of the metric names (default is "geotools_").
+
+        Returns:
+        str: The metrics, one sample per line.
+        """
+        counters, histograms = self._collect()
+        lines = []
+        for (name, labels), value in sorted(counters.items()):
+            lines.append(f"{_format_key((prefix + name, labels))} {value}")
+        for (name, labels), (counts, count, total) in sorted(histograms.items()):
+            name = prefix + name + "_seconds"
+            cumulative = 0
+            for bound, bucket in zip(_BUCKET_NAMES, counts):
+                cumulative += bucket
+                bucket_labels = labels + (("le", bound),)
+                lines.append(
+                    f"{_format_key((name + '_bucket', bucket_labels))} {cumulative}"
+                )
+            lines.append(f"{_format_key((name + '_count', labels))} {count}")
+            lines.append(f"{_format_key((name + '_sum', labels))} {total}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        """
+        Write a snapshot of all metrics to a JSON file.
+
+        Parameters:
+        path (str): The path of the JSON file.
+        """
+        with open(path, "w") as file:
+            json.dump(self.snapshot(), file, indent=2)
+
+    def reset(self):
+        """
+        Remove all counters and histograms (collectors are kept).
+        """
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+registry = MetricsRegistry()
+
+
+class timed:
+    """
+    Context manager that records one call of a function, like the instrument decorator.
+
+    For hot paths that check Config.metrics_enabled themselves, so that disabled
+    metrics cost a single attribute check instead of an extra wrapper call.
+
+    Parameters:
+    name (str): The name of the function in the metrics.
+    """
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        registry.observe(
+            "latency", time.perf_counter() - self.start, function=self.name
+        )
+        registry.increment("calls", function=self.name)
+        if exc_type is not None and issubclass(exc_type, Exception):
+            registry.increment("errors", function=self.name, error=exc_type.__name__)
+        return False
+
+
+def instrument(name=None):
+    """
+    Decorator that records the calls, errors and latency of a function.
+
+    While Config.metrics_enabled is False the wrapper only checks the flag and
+    calls the function. Otherwise every call increments the counter
+    calls{function=name}, failed calls increment errors{function=name,error=type}
+    and the duration is recorded in the histogram latency{function=name}.
+
+    Parameters:
+    name (str): The name of the function in the metrics (default is its __name__).
+
+    Returns:
+    callable: The decorator.
+    """
+
+    def decorator(function):
+        label = name or function.__name__
+
+        # Wrappers such as lru_cache objects have no code object of their own
+        code = getattr(function, "__code__", None)
+        if code is not None and code.co_flags & _CO_COROUTINE:
+
+            @functools.wraps(function)
+            async def wrapper(*args, **kwargs):
+                if not Config.metrics_enabled:
+                    return await function(*args, **kwargs)
+                with timed(label):
+                    return await function(*args, **kwargs)
+
+        else:
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not Config.metrics_enabled:
+                    return function(*args, **kwargs)
+                with timed(label):
+                    return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
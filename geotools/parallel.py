@@ -0,0 +1,261 @@
+import atexit
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from geotools.config import Config
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None
+
+# Arrays up to this many bytes are pickled with the task instead of being
+# placed in shared memory (e.g. a single query point).
+_INLINE_BYTES = 4096
+
+_executors = {}
+
+
+def resolve_workers(workers=None):
+    """
+    Resolve the number of worker processes to use.
+
+    Parameters:
+    workers (int): The requested number of workers (default is Config.workers).
+    A value of None in Config.workers means one worker per CPU core.
+
+    Returns:
+    int: The number of worker processes (1 means run in the calling process).
+    """
+    if workers is None:
+        workers = Config.workers
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if shared_memory is None:
+        return 1
+    return max(1, int(workers))
+
+
+def _get_executor(workers):
+    """
+    Return a process pool with the given number of workers, reusing existing pools.
+    """
+    executor = _executors.get(workers)
+    if executor is None:
+        executor = _executors[workers] = ProcessPoolExecutor(max_workers=workers)
+    return executor
+
+
+@atexit.register
+def shutdown():
+    """
+    Shut down the worker pools started by this module.
+    """
+    while _executors:
+        _, executor = _executors.popitem()
+        executor.shutdown()
+
+
+class _SharedArray:
+    """
+    A NumPy array stored in a shared memory block that workers can attach to by name.
+    """
+
+    def __init__(self, shape, dtype):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        nbytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        self.memory = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self.memory.buf)
+
+    @classmethod
+    def from_array(cls, array):
+        block = cls(array.shape, array.dtype)
+        block.array[...] = array
+        return block
+
+    @property
+    def descriptor(self):
+        return ("shm", self.memory.name, self.shape, self.dtype.str)
+
+    def release(self):
+        self.array = None
+        self.memory.close()
+        self.memory.unlink()
+
+
+def _describe(array, blocks):
+    """
+    Return a picklable descriptor of an input array, copying it to shared memory if needed.
+    """
+    if array.nbytes <= _INLINE_BYTES:
+        return ("inline", np.asarray(array))
+    block = _SharedArray.from_array(array)
+    blocks.append(block)
+    return block.descriptor
+
+
+def _describe_memmap(out):
+    """
+    Return a descriptor of the file behind a writable memory-mapped output, or None.
+
+    Only an array that maps its file directly (not a view or a copy-on-write
+    mapping) can be opened again by the workers.
+    """
+    if (
+        isinstance(out, np.memmap)
+        and out.filename is not None
+        and out.mode in ("r+", "w+")
+        and isinstance(out.base, mmap.mmap)
+        and out.flags.c_contiguous
+    ):
+        return ("memmap", out.filename, out.offset, out.shape, out.dtype.str)
+    return None
+
+
+def _attach(descriptor, handles):
+    """
+    Open the array behind a descriptor inside a worker process.
+    """
+    kind = descriptor[0]
+    if kind == "inline":
+        return descriptor[1]
+    if kind == "npy":
+        return np.load(descriptor[1], mmap_mode="r+")
+    if kind == "memmap":
+        _, filename, offset, shape, dtype = descriptor
+        return np.memmap(filename, np.dtype(dtype), "r+", offset, shape)
+    _, name, shape, dtype = descriptor
+    memory = shared_memory.SharedMemory(name=name)
+    # Workers share the resource tracker of the parent process (it is passed
+    # to forked and spawned children alike), so the block stays registered
+    # once and is unregistered when the parent unlinks it.
+    handles.append(memory)
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=memory.buf)
+
+
+def _compute_task(function, output, inputs, sliced, start, stop, args, handles):
+    out = _attach(output, handles)
+    arrays = [
+        (
+            _attach(descriptor, handles)[start:stop]
+            if split
+            else _attach(descriptor, handles)
+        )
+        for descriptor, split in zip(inputs, sliced)
+    ]
+    function(out[start:stop], *arrays, *args)
+    if isinstance(out, np.memmap):
+        out.flush()
+
+
+def _run_task(function, output, inputs, sliced, start, stop, args):
+    """
+    Run one chunk of a map_chunks call inside a worker process.
+    """
+    handles = []
+    try:
+        _compute_task(function, output, inputs, sliced, start, stop, args, handles)
+    finally:
+        for memory in handles:
+            try:
+                memory.close()
+            except BufferError:  # Still referenced by a pending exception
+                pass
+    return stop - start
+
+
+def map_chunks(
+    function, out, inputs, sliced, args=(), workers=None, chunk_size=None, filename=None
+):
+    """
+    Fill an output array chunk by chunk across a pool of worker processes.
+
+    For every chunk [start, stop) of the leading axis of out, the call
+    function(out[start:stop], *inputs, *args) is made in a worker process, where
+    the inputs flagged in sliced are replaced by their [start:stop] slice. Input
+    arrays are copied once into shared memory and the workers write their results
+    straight into a shared output buffer (or into the .npy file given by
+    filename, or the file behind a numpy.memmap output), so no array data is
+    pickled. Without parallelism the chunks are computed one after another in
+    the calling process, which bounds the size of the temporaries and lets
+    memory-mapped inputs be read a chunk at a time. So does a memory-mapped
+    output that the workers cannot open (e.g. a view of a numpy.memmap), which
+    would otherwise need a shared buffer as large as the whole output.
+
+    Parameters:
+    function (callable): A module-level function (it must be picklable).
+    out (numpy.ndarray): The output array.
+    inputs (sequence): The input arrays.
+    sliced (sequence): One flag per input: True to split the input along its
+    leading axis like out, False to pass it whole to every chunk.
+    args (tuple): Extra picklable arguments.
+    workers (int): The number of worker processes (default is Config.workers).
+    chunk_size (int): The number of leading-axis items per task (default is Config.chunk_size).
+    filename (str): The .npy file that out is memory-mapped from, if any.
+
+    Returns:
+    numpy.ndarray: The output array.
+    """
+    workers = resolve_workers(workers)
+    if chunk_size is None:
+        chunk_size = Config.chunk_size
+    chunk_size = max(1, int(chunk_size))
+    size = out.shape[0] if out.ndim else 0
+
+    if size <= chunk_size:
+        function(out, *inputs, *args)
+        return out
+    output = None
+    if filename is not None:
+        output = ("npy", filename)
+    elif workers > 1 and isinstance(out, np.memmap):
+        output = _describe_memmap(out)
+        if output is None:
+            workers = 1
+    if workers <= 1:
+        for start in range(0, size, chunk_size):
+            stop = min(start + chunk_size, size)
+            arrays = [
+                array[start:stop] if split else array
+                for array, split in zip(inputs, sliced)
+            ]
+            function(out[start:stop], *arrays, *args)
+        return out
+
+    blocks = []
+    try:
+        if output is not None:
+            if isinstance(out, np.memmap):
+                out.flush()
+            result = None
+        else:
+            result = _SharedArray(out.shape, out.dtype)
+            blocks.append(result)
+            output = result.descriptor
+        inputs = [_describe(array, blocks) for array in inputs]
+
+        executor = _get_executor(workers)
+        futures = [
+            executor.submit(
+                _run_task,
+                function,
+                output,
+                inputs,
+                tuple(sliced),
+                start,
+                min(start + chunk_size, size),
+                args,
+            )
+            for start in range(0, size, chunk_size)
+        ]
+        for future in futures:
+            future.result()
+
+        if result is not None:
+            out[...] = result.array
+    finally:
+        for block in blocks:
+            block.release()
+    return out
@@ -0,0 +1,290 @@
+import csv
+from geotools._lazy import lazy_import
+
+np = lazy_import("numpy")
+
+_DTYPES = ("float64", "float32")
+
+
+def _validate_coordinates(latitudes, longitudes, name):
+    """
+    Check the ranges of many coordinates at once.
+
+    Min/max reductions keep the common (valid) case free of temporary arrays; the
+    offending index is only looked up once a violation has been detected.
+
+    Raises:
+    ValueError: If any latitude or longitude is out of range or NaN.
+    """
+    if latitudes.size == 0:
+        return
+    if (
+        -90 <= latitudes.min()
+        and latitudes.max() <= 90
+        and -180 <= longitudes.min()
+        and longitudes.max() <= 180
+    ):
+        return
+    invalid = ~((np.abs(latitudes) <= 90) & (np.abs(longitudes) <= 180))
+    index = int(np.flatnonzero(invalid)[0])
+    raise ValueError(
+        f"Invalid coordinates for {name} at index {index}. Latitude must be between -90 and 90, and longitude must be between -180 and 180."
+    )
+
+
+def _resolve_dtype(dtype):
+    """
+    Return the NumPy dtype of a point array.
+
+    Raises:
+    ValueError: If the dtype is neither float64 nor float32.
+    """
+    dtype = np.dtype(np.float64 if dtype is None else dtype)
+    if dtype.name not in _DTYPES:
+        raise ValueError("Unsupported dtype. Please use 'float64' or 'float32'.")
+    return dtype
+
+
+def _column_index(header, column, name):
+    """
+    Return the position of a CSV column given by its name or index.
+
+    Raises:
+    ValueError: If the header has no such column.
+    """
+    if isinstance(column, int):
+        return column
+    names = [field.strip().lower() for field in header]
+    try:
+        return names.index(column.lower())
+    except ValueError:
+        raise ValueError(
+            f"Column '{column}' not found in the CSV header. Please set {name} to one of: {', '.join(header)}."
+        ) from None
+
+
+class PointArray:
+    """
+    Compact, read-only array of points stored as contiguous latitude and longitude columns.
+
+    A PointArray holds two float64 (or float32) columns in a single (2, N) block
+    instead of one tuple object per point, which cuts the memory of 10M points
+    from gigabytes to 160 MB (80 MB with float32). Coordinates are validated once
+    when the array is built, so the distance and analysis functions use it as-is
+    without copying or validating it again. Slicing returns views that share
+    memory with the original array, and NumPy sees the points as an (N, 2) array
+    of latitudes and longitudes, e.g. numpy.asarray(points) makes no copy.
+
+    Attributes:
+    latitudes (numpy.ndarray): The latitudes (a read-only view).
+    longitudes (numpy.ndarray): The longitudes (a read-only view).
+    dtype (numpy.dtype): The dtype of the coordinates.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, points=(), dtype=None):
+        """
+        Create a point array from a sequence of points.
+
+        Parameters:
+        points (list, numpy.ndarray or PointArray): A list of (latitude, longitude) tuples or an (N, 2) array.
+        dtype (str or numpy.dtype): The dtype of the coordinates, "float64" or "float32" (default is "float64").
+
+        Raises:
+        ValueError: If the points have an invalid shape or contain invalid coordinates, or the dtype is unsupported.
+        """
+        if isinstance(points, PointArray):
+            dtype = points.dtype if dtype is None else dtype
+            self._data = points._data.astype(_resolve_dtype(dtype))
+            self._data.flags.writeable = False
+            return
+        dtype = _resolve_dtype(dtype)
+        try:
+            array = np.asarray(points, dtype=dtype)
+        except (TypeError, ValueError):
+            raise ValueError(
+                "Invalid points. Each point must be a tuple of two numeric values."
+            ) from None
+        if array.size == 0:
+            array = array.reshape(0, 2)
+        if array.ndim != 2 or array.shape[1] != 2:
+            raise ValueError(
+                f"Invalid shape for points: {array.shape}. Expected an (N, 2) array of points."
+            )
+        self._init_columns(np.array(array.T, order="C"))
+
+    def _init_columns(self, data):
+        """
+        Validate and take ownership of a new C-contiguous (2, N) block.
+        """
+        _validate_coordinates(data[0], data[1], "points")
+        data.flags.writeable = False
+        self._data = data
+
+    @classmethod
+    def _from_data(cls, data):
+        """
+        Wrap a validated (2, N) block (or a view of one) without copying it.
+        """
+        points = cls.__new__(cls)
+        points._data = data.view()
+        points._data.flags.writeable = False
+        return points
+
+    @classmethod
+    def from_columns(cls, latitudes, longitudes, dtype=None):
+        """
+        Create a point array from separate latitude and longitude sequences.
+
+        Parameters:
+        latitudes (list or numpy.ndarray): The latitudes.
+        longitudes (list or numpy.ndarray): The longitudes.
+        dtype (str or numpy.dtype): The dtype of the coordinates (default is "float64").
+
+        Returns:
+        PointArray: The points.
+
+        Raises:
+        ValueError: If the columns have different lengths or contain invalid coordinates.
+        """
+        dtype = _resolve_dtype(dtype)
+        latitudes = np.asarray(latitudes, dtype=dtype).reshape(-1)
+        longitudes = np.asarray(longitudes, dtype=dtype).reshape(-1)
+        if latitudes.size != longitudes.size:
+            raise ValueError(
+                f"The latitudes and longitudes have different lengths ({latitudes.size} and {longitudes.size})."
+            )
+        data = np.empty((2, latitudes.size), dtype=dtype)
+        data[0] = latitudes
+        data[1] = longitudes
+        points = cls.__new__(cls)
+        points._init_columns(data)
+        return points
+
+    @classmethod
+    def from_csv(
+        cls,
+        path,
+        latitude="latitude",
+        longitude="longitude",
+        delimiter=",",
+        header=True,
+        dtype=None,
+    ):
+        """
+        Read a point array from a CSV file.
+
+        The columns are parsed by NumPy's C reader straight into arrays, without
+        creating a Python object per row.
+
+        Parameters:
+        path (str): The path of the CSV file.
+        latitude (str or int): The name (or index) of the latitude column (default is "latitude").
+        longitude (str or int): The name (or index) of the longitude column (default is "longitude").
+        delimiter (str): The field delimiter (default is ",").
+        header (bool): Whether the first line holds the column names (default is True).
+        dtype (str or numpy.dtype): The dtype of the coordinates (default is "float64").
+
+        Returns:
+        PointArray: The points.
+
+        Raises:
+        ValueError: If a column is missing or a row contains invalid coordinates.
+        """
+        dtype = _resolve_dtype(dtype)
+        columns = (latitude, longitude)
+        if header:
+            with open(path, newline="") as file:
+                names = next(csv.reader(file, delimiter=delimiter), [])
+            columns = (
+                _column_index(names, latitude, "latitude"),
+                _column_index(names, longitude, "longitude"),
+            )
+        elif not all(isinstance(column, int) for column in columns):
+            raise ValueError(
+                "latitude and longitude must be column indexes when the CSV file has no header."
+            )
+        data = np.loadtxt(
+            path,
+            delimiter=delimiter,
+            skiprows=1 if header else 0,
+            usecols=columns,
+            dtype=dtype,
+            ndmin=2,
+            quotechar='"',
+        )
+        points = cls.__new__(cls)
+        points._init_columns(np.ascontiguousarray(data.T))
+        return points
+
+    @property
+    def latitudes(self):
+        return self._data[0]
+
+    @property
+    def longitudes(self):
+        return self._data[1]
+
+    @property
+    def dtype(self):
+        return self._data.dtype
+
+    @property
+    def shape(self):
+        return (self._data.shape[1], 2)
+
+    @property
+    def nbytes(self):
+        return self._data.nbytes
+
+    def __len__(self):
+        return self._data.shape[1]
+
+    def __getitem__(self, index):
+        """
+        Return a point as a (latitude, longitude) tuple, or a PointArray for slices and index arrays.
+
+        Slices share memory with this array; index and boolean arrays copy the selected points.
+        """
+        if isinstance(index, slice):
+            return PointArray._from_data(self._data[:, index])
+        if isinstance(index, (int, np.integer)):
+            latitude, longitude = self._data[:, index].tolist()
+            return latitude, longitude
+        return PointArray._from_data(self._data[:, index])
+
+    def __iter__(self):
+        return zip(self._data[0].tolist(), self._data[1].tolist())
+
+    def __array__(self, dtype=None, copy=None):
+        array = self._data.T
+        if dtype is not None and np.dtype(dtype) != array.dtype:
+            return array.astype(dtype)
+        if copy:
+            return array.copy()
+        return array
+
+    def to_numpy(self):
+        """
+        Return the points as an (N, 2) array of latitudes and longitudes.
+
+        Returns:
+        numpy.ndarray: A read-only view of the columns (no copy).
+        """
+        return self._data.T
+
+    def copy(self):
+        """
+        Return a copy of the points that owns its memory.
+
+        Returns:
+        PointArray: The copied points.
+        """
+        return PointArray._from_data(self._data.copy())
+
+    def __repr__(self):
+        return f"PointArray(size={len(self)}, dtype={self.dtype.name})"
+
+    def __reduce__(self):
+        return PointArray._from_data, (self._data,)
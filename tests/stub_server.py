@@ -0,0 +1,153 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Coordinates returned for every known address
+LOCATION = (37.4224764, -122.0842499)
+INVALID_ADDRESS = "Invalid Address"
+INVALID_KEY = "invalid-api-key"
+
+
+def _google(address, key):
+    if key == INVALID_KEY:
+        return {"status": "REQUEST_DENIED", "results": []}
+    if address == INVALID_ADDRESS:
+        return {"status": "ZERO_RESULTS", "results": []}
+    location = {"lat": LOCATION[0], "lng": LOCATION[1]}
+    return {"status": "OK", "results": [{"geometry": {"location": location}}]}
+
+
+def _opencage(address, key):
+    if key == INVALID_KEY:
+        return {"status": {"code": 403, "message": "invalid API key"}, "results": []}
+    if address == INVALID_ADDRESS:
+        return {"status": {"code": 404, "message": "not found"}, "results": []}
+    location = {"lat": LOCATION[0], "lng": LOCATION[1]}
+    return {
+        "status": {"code": 200, "message": "OK"},
+        "results": [{"geometry": location}],
+    }
+
+
+def _mapquest_result(address):
+    if address == INVALID_ADDRESS:
+        return {"providedLocation": {"location": address}, "locations": []}
+    location = {"lat": LOCATION[0], "lng": LOCATION[1]}
+    return {
+        "providedLocation": {"location": address},
+        "locations": [{"latLng": location}],
+    }
+
+
+def _mapquest(address, key):
+    if key == INVALID_KEY:
+        return {"info": {"statuscode": 403}, "results": []}
+    return {"info": {"statuscode": 0}, "results": [_mapquest_result(address)]}
+
+
+def _mapquest_batch(addresses, key):
+    if key == INVALID_KEY:
+        return {"info": {"statuscode": 403}, "results": []}
+    return {
+        "info": {"statuscode": 0},
+        "results": [_mapquest_result(address) for address in addresses],
+    }
+
+
+_RESPONSES = {"/google": _google, "/opencage": _opencage, "/mapquest": _mapquest}
+
+
+class StubGeocodingServer:
+    """
+    Local HTTP server that answers like the Google, OpenCage and MapQuest geocoding APIs.
+
+    The /mapquest_batch path answers like the MapQuest batch endpoint. Every
+    response is delayed by delay seconds to simulate network latency. The
+    server records the number of requests, the number of connections and the
+    largest number of requests it was serving at the same time.
+    """
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.requests = 0
+        self.connections = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep connections alive
+            disable_nagle_algorithm = True  # Headers and body are separate writes
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                values = parse_qs(url.query)
+                query = {key: value[0] for key, value in values.items()}
+                if url.path == "/mapquest_batch":
+                    stub._serve(
+                        lambda: self._send_json(
+                            _mapquest_batch(values["location"], query.get("key"))
+                        )
+                    )
+                    return
+                respond = _RESPONSES.get(url.path)
+                if respond is None:
+                    self._send(404, b"")
+                    return
+                address = (
+                    query.get("address") or query.get("q") or query.get("location")
+                )
+                stub._serve(lambda: self._send_json(respond(address, query.get("key"))))
+
+            def _send_json(self, data):
+                self._send(200, json.dumps(data).encode())
+
+            def _send(self, status, body):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.handler = Handler
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def endpoints(self):
+        apis = ("google", "opencage", "mapquest", "mapquest_batch")
+        return {api: self.url + "/" + api for api in apis}
+
+    def _serve(self, respond):
+        with self._lock:
+            self.requests += 1
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            respond()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.server.shutdown()
+        self.server.server_close()
@@ -1,5 +1,75 @@
+import math
+import os
+import pickle
+import tempfile
 import unittest
-from geotools.analysis import calculate_centroid, batch_iterator
+import numpy as np
+from geotools.analysis import (
+    calculate_centroid,
+    batch_iterator,
+    CentroidAccumulator,
+    SummaryAccumulator,
+    dbscan,
+    kmeans,
+    summarize,
+)
+from geotools.distance import batch_haversine_distance
+
+
+def clustered_points(n_clusters, size, spread, seed=0, noise=0):
+    """
+    Return groups of points scattered around random centers, plus uniform noise.
+    """
+    rng = np.random.default_rng(seed)
+    centers = np.column_stack(
+        [rng.uniform(-70, 70, n_clusters), rng.uniform(-180, 180, n_clusters)]
+    )
+    points = np.repeat(centers, size, axis=0) + rng.normal(
+        0, spread, (n_clusters * size, 2)
+    )
+    points = np.vstack(
+        [
+            points,
+            np.column_stack(
+                [rng.uniform(-70, 70, noise), rng.uniform(-180, 180, noise)]
+            ),
+        ]
+    )
+    points[:, 1] = (points[:, 1] + 180) % 360 - 180
+    return points
+
+
+def reference_dbscan(points, eps, min_samples):
+    """
+    Return the DBSCAN labels of the points, from all the pairwise distances.
+    """
+    n = len(points)
+    neighbors = np.array([batch_haversine_distance(p, points) <= eps for p in points])
+    core = neighbors.sum(axis=1) >= min_samples
+    labels = np.full(n, -1)
+    cluster = 0
+    for i in range(n):
+        if not core[i] or labels[i] >= 0:
+            continue
+        labels[i] = cluster
+        stack = [i]
+        while stack:
+            j = stack.pop()
+            for m in np.flatnonzero(neighbors[j] & core & (labels < 0)):
+                labels[m] = cluster
+                stack.append(m)
+        cluster += 1
+    # Border points join the nearest core point
+    for i in np.flatnonzero(~core):
+        candidates = np.flatnonzero(neighbors[i] & core)
+        if len(candidates):
+            distances = batch_haversine_distance(points[i], points[candidates])
+            labels[i] = labels[candidates[np.argmin(distances)]]
+    # Number the clusters in order of their first point
+    order = {}
+    for label in labels[labels >= 0]:
+        order.setdefault(label, len(order))
+    return np.array([order.get(label, -1) for label in labels])
 
 
 class TestFindCentroid(unittest.TestCase):
@@ -68,6 +138,430 @@ class TestFindCentroid(unittest.TestCase):
         self.assertAlmostEqual(result[0], expected_centroid[0], places=5)
         self.assertAlmostEqual(result[1], expected_centroid[1], places=5)
 
+    def test_find_centroid_numpy_array(self):
+        points = np.array([(i, i) for i in range(10000)], dtype=np.float64)
+        result = calculate_centroid(points)
+        self.assertAlmostEqual(result[0], 4999.5, places=5)
+        self.assertAlmostEqual(result[1], 4999.5, places=5)
+
+        result = calculate_centroid(np.array([40.7128, -74.0060]))  # Single point
+        self.assertAlmostEqual(result[0], 40.7128, places=5)
+        self.assertAlmostEqual(result[1], -74.0060, places=5)
+
+    def test_find_centroid_empty_array(self):
+        with self.assertRaises(ValueError) as context:
+            calculate_centroid(np.empty((0, 2)))
+        self.assertIn("No points provided", str(context.exception))
+
+        with self.assertRaises(ValueError) as context:
+            calculate_centroid(iter([]))
+        self.assertIn("No points provided", str(context.exception))
+
+    def test_find_centroid_invalid_array(self):
+        with self.assertRaises(ValueError) as context:
+            calculate_centroid(np.zeros((10, 3)))
+        self.assertIn("Invalid points array", str(context.exception))
+
+    def test_find_centroid_memmap(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "points.dat")
+            points = np.memmap(filename, dtype=np.float32, mode="w+", shape=(100000, 2))
+            points[:, 0] = np.linspace(-45, 45, 100000)
+            points[:, 1] = np.linspace(0, 90, 100000)
+            points.flush()
+            del points
+
+            points = np.memmap(filename, dtype=np.float32, mode="r", shape=(100000, 2))
+            result = calculate_centroid(points)
+            del points
+        self.assertAlmostEqual(result[0], 0.0, places=5)
+        self.assertAlmostEqual(result[1], 45.0, places=5)
+
+    def test_find_centroid_chunk_iterator(self):
+        points = np.array([(i, -i) for i in range(10000)], dtype=np.float64)
+        chunks = (chunk for chunk in np.array_split(points, 7))
+        result = calculate_centroid(chunks)
+        self.assertAlmostEqual(result[0], 4999.5, places=5)
+        self.assertAlmostEqual(result[1], -4999.5, places=5)
+
+    def test_find_centroid_compensated_summation(self):
+        points = np.full((300000, 2), 0.1)
+        points[::3] = (1e8, -1e8)
+        result = calculate_centroid(points)
+        self.assertAlmostEqual(
+            result[0], math.fsum(points[:, 0]) / len(points), places=6
+        )
+        self.assertAlmostEqual(
+            result[1], math.fsum(points[:, 1]) / len(points), places=6
+        )
+
+    def test_batch_iterator_numpy_array(self):
+        data = np.arange(20).reshape(10, 2)
+        result_batches = list(batch_iterator(data, 4))
+        self.assertEqual([len(batch) for batch in result_batches], [4, 4, 2])
+        self.assertTrue(all(np.shares_memory(batch, data) for batch in result_batches))
+
+
+class TestSphericalCentroid(unittest.TestCase):
+    def test_spherical_centroid_antimeridian(self):
+        points = [(10.0, 179.0), (10.0, -179.0)]
+        result = calculate_centroid(points, method="spherical")
+        self.assertAlmostEqual(result[0], 10.0015, places=4)
+        self.assertAlmostEqual(abs(result[1]), 180.0, places=5)
+
+    def test_spherical_centroid_pole(self):
+        points = [(80.0, 0.0), (80.0, 90.0), (80.0, 180.0), (80.0, -90.0)]
+        result = calculate_centroid(points, method="spherical")
+        self.assertAlmostEqual(result[0], 90.0, places=5)
+
+    def test_spherical_centroid_matches_arithmetic_for_small_extent(self):
+        points = [(40.7128, -74.0060), (40.7306, -73.9352), (40.6782, -73.9442)]
+        spherical = calculate_centroid(points, method="spherical")
+        arithmetic = calculate_centroid(points)
+        self.assertAlmostEqual(spherical[0], arithmetic[0], places=3)
+        self.assertAlmostEqual(spherical[1], arithmetic[1], places=3)
+
+    def test_spherical_centroid_undefined(self):
+        with self.assertRaises(ValueError) as context:
+            calculate_centroid([(0.0, 0.0), (0.0, 180.0)], method="spherical")
+        self.assertIn("undefined", str(context.exception))
+
+    def test_weighted_centroid(self):
+        points = [(0.0, 0.0), (0.0, 10.0)]
+        result = calculate_centroid(points, weights=[3, 1])
+        self.assertAlmostEqual(result[0], 0.0, places=5)
+        self.assertAlmostEqual(result[1], 2.5, places=5)
+
+        result = calculate_centroid(
+            iter(points), weights=iter([1, 1]), method="spherical"
+        )
+        self.assertAlmostEqual(result[1], 5.0, places=5)
+
+    def test_weighted_centroid_chunks(self):
+        rng = np.random.default_rng(5)
+        points = np.column_stack(
+            [rng.uniform(-60, 60, 5000), rng.uniform(-180, 180, 5000)]
+        )
+        weights = rng.uniform(0, 10, 5000)
+        result = calculate_centroid(
+            iter(np.array_split(points, 9)), weights=weights, method="spherical"
+        )
+        expected = calculate_centroid(points, weights=weights, method="spherical")
+        self.assertAlmostEqual(result[0], expected[0], places=9)
+        self.assertAlmostEqual(result[1], expected[1], places=9)
+
+    def test_invalid_weights(self):
+        points = [(0.0, 0.0), (0.0, 10.0)]
+        with self.assertRaises(ValueError) as context:
+            calculate_centroid(points, weights=[1])
+        self.assertIn("one value per point", str(context.exception))
+
+        with self.assertRaises(ValueError) as context:
+            calculate_centroid(points, weights=[1, 2, 3])
+        self.assertIn("one value per point", str(context.exception))
+
+        with self.assertRaises(ValueError) as context:
+            calculate_centroid(points, weights=[1, -1])
+        self.assertIn("non-negative", str(context.exception))
+
+        with self.assertRaises(ValueError) as context:
+            calculate_centroid(points, weights=[0, 0])
+        self.assertIn("total weight", str(context.exception))
+
+    def test_unsupported_method(self):
+        with self.assertRaises(ValueError) as context:
+            calculate_centroid([(0.0, 0.0)], method="median")
+        self.assertIn("Unsupported method", str(context.exception))
+
+    def test_accumulator_merge(self):
+        rng = np.random.default_rng(8)
+        points = np.column_stack(
+            [rng.uniform(-90, 90, 3000), rng.uniform(-180, 180, 3000)]
+        )
+        for method in ("arithmetic", "spherical"):
+            chunks = np.array_split(points, 6)
+            single = CentroidAccumulator(method)
+            for chunk in chunks:
+                single.add(chunk)
+
+            left = CentroidAccumulator(method)
+            right = CentroidAccumulator(method)
+            for chunk in chunks[:2]:
+                left.add(chunk)
+            for chunk in chunks[2:]:
+                right.add(chunk)
+            right = pickle.loads(pickle.dumps(right))  # As if sent by a worker
+
+            merged = CentroidAccumulator(method).merge(right).merge(left)
+            self.assertEqual(merged.count, 3000)
+            self.assertEqual(merged.result(), single.result())
+
+    def test_accumulator_merge_different_methods(self):
+        with self.assertRaises(ValueError):
+            CentroidAccumulator("arithmetic").merge(CentroidAccumulator("spherical"))
+
+
+class TestSummarize(unittest.TestCase):
+    def test_summary(self):
+        square = [(0, 0), (0, 2), (2, 2), (2, 0)]
+        points = square + [(1, 1), (0.5, 1.5), (1, 0)]
+        summary = summarize(points)
+        self.assertEqual(summary["count"], 7)
+        self.assertEqual(summary["bounds"], (0, 0, 2, 2))
+        np.testing.assert_allclose(
+            summary["centroid"], calculate_centroid(points, method="spherical")
+        )
+        # Counterclockwise in longitude and latitude, from the south-west corner
+        np.testing.assert_array_equal(summary["hull"], [(0, 0), (0, 2), (2, 2), (2, 0)])
+
+    def test_dispersion(self):
+        rng = np.random.default_rng(10)
+        points = np.column_stack(
+            [rng.normal(40.7, 0.3, 20000), rng.normal(-74, 0.3, 20000)]
+        )
+        summary = summarize(points, unit="miles")
+        distances = batch_haversine_distance(summary["centroid"], points, unit="miles")
+        self.assertAlmostEqual(
+            summary["standard_distance"],
+            math.sqrt(np.mean(distances**2)),
+            delta=1e-4 * summary["standard_distance"],
+        )
+        self.assertAlmostEqual(summary["max_distance"], distances.max(), places=9)
+
+    def test_max_distance(self):
+        rng = np.random.default_rng(14)
+        for radius, flattening in [(40, 1), (80, 0.5)]:
+            # Up to the radius (in degrees) from a point at 60N, narrower from
+            # south to north, so that the farthest point is no vertex of the
+            # longitude and latitude hull
+            angle = np.radians(radius) * np.sqrt(rng.uniform(0, 1, 20000))
+            bearing = rng.uniform(0, 2 * np.pi, 20000)
+            bearing = np.arctan2(np.sin(bearing) * flattening, np.cos(bearing))
+            center = math.radians(60)
+            lat = np.arcsin(
+                math.sin(center) * np.cos(angle)
+                + math.cos(center) * np.sin(angle) * np.cos(bearing)
+            )
+            lon = np.arctan2(
+                np.sin(bearing) * np.sin(angle) * math.cos(center),
+                np.cos(angle) - math.sin(center) * np.sin(lat),
+            )
+            points = np.degrees(np.column_stack([lat, lon]))
+            points = points[np.argsort(points[:, 0])]  # Chunks in separate bands
+            accumulators = [SummaryAccumulator(), SummaryAccumulator()]
+            for number, chunk in enumerate(np.array_split(points, 8)):
+                accumulators[number % 2].add(chunk)
+            summary = accumulators[0].merge(accumulators[1]).result()
+            distances = batch_haversine_distance(summary["centroid"], points)
+            with self.subTest(radius=radius):
+                self.assertAlmostEqual(
+                    summary["max_distance"],
+                    distances.max(),
+                    delta=1e-9 * distances.max(),
+                )
+
+        # Points all over the globe give a lower bound
+        points = np.column_stack(
+            [
+                np.degrees(np.arcsin(rng.uniform(-1, 1, 5000))),
+                rng.uniform(-180, 180, 5000),
+            ]
+        )
+        summary = summarize(points)
+        distances = batch_haversine_distance(summary["centroid"], points)
+        self.assertLessEqual(summary["max_distance"], distances.max() * (1 + 1e-12))
+        self.assertGreater(summary["max_distance"], 0.9 * distances.max())
+
+    def test_hull(self):
+        rng = np.random.default_rng(12)
+        points = np.column_stack([rng.normal(0, 1, 100000), rng.normal(0, 1, 100000)])
+        hull = summarize(points)["hull"]
+        self.assertTrue(np.isin(hull[:, 0], points[:, 0]).all())
+        # Every point is on the inner side of every edge
+        for start, end in zip(hull, np.roll(hull, -1, axis=0)):
+            cross = (end[1] - start[1]) * (points[:, 0] - start[0]) - (
+                end[0] - start[0]
+            ) * (points[:, 1] - start[1])
+            self.assertTrue((cross >= 0).all())
+
+    def test_antimeridian(self):
+        points = [(-1, 179), (1, 179.5), (0, -179), (0.5, -179.9), (0, 180)]
+        summary = summarize(points)
+        self.assertEqual(summary["bounds"], (-1, 179, 1, -179))
+        self.assertAlmostEqual(abs(summary["centroid"][1]), 180, delta=1)
+        hull = summary["hull"]
+        self.assertTrue(((179 <= hull[:, 1]) & (hull[:, 1] <= 181)).all())
+        self.assertIn(181, hull[:, 1])
+        # Chunks on either side of the antimeridian
+        chunks = [np.array(points[:2]), np.array(points[2:])]
+        self.assertEqual(summarize(iter(chunks))["bounds"], (-1, 179, 1, -179))
+
+    def test_accumulator_merge(self):
+        rng = np.random.default_rng(11)
+        points = np.column_stack(
+            [rng.uniform(-60, 60, 5000), rng.uniform(-100, 60, 5000)]
+        )
+        chunks = np.array_split(points, 5)
+        single = SummaryAccumulator()
+        for chunk in chunks:
+            single.add(chunk)
+        left, right = SummaryAccumulator(), SummaryAccumulator()
+        for chunk in chunks[:2]:
+            left.add(chunk)
+        for chunk in chunks[2:]:
+            right.add(chunk)
+        right = pickle.loads(pickle.dumps(right))  # As if sent by a worker
+
+        merged = left.merge(right).merge(SummaryAccumulator()).result()
+        expected = single.result()
+        self.assertEqual(merged["count"], 5000)
+        self.assertEqual(merged["bounds"], expected["bounds"])
+        self.assertEqual(merged["centroid"], expected["centroid"])
+        self.assertAlmostEqual(
+            merged["standard_distance"], expected["standard_distance"], places=9
+        )
+        np.testing.assert_array_equal(merged["hull"], expected["hull"])
+        self.assertEqual(merged["bounds"], summarize(points)["bounds"])
+
+    def test_full_circle(self):
+        accumulator = SummaryAccumulator()
+        for west, east in [(-180, 0), (-10, 170), (160, -170)]:
+            accumulator.add([(0, west), (10, east)])
+        summary = accumulator.result()
+        self.assertEqual(summary["bounds"], (0, -180, 10, 180))
+        self.assertIsNone(summary["hull"])
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            summarize([])
+        with self.assertRaises(ValueError):
+            summarize([(0, 0), (0, 181)])
+        with self.assertRaises(ValueError):
+            summarize([(0, 0), (0, 180), (0, -90), (0, 90)])  # Undefined centroid
+
+
+class TestDBSCAN(unittest.TestCase):
+    def test_matches_reference(self):
+        for eps, min_samples, points in [
+            (50, 5, clustered_points(8, 60, 0.3, noise=200)),
+            (20, 3, clustered_points(5, 40, 0.2, seed=1, noise=100)),
+            (200, 10, clustered_points(3, 100, 1.5, seed=2)),
+            # Below the minimum cell size, cells are wider than eps
+            (0.003, 4, clustered_points(20, 30, 2e-5, seed=13, noise=50)),
+        ]:
+            with self.subTest(eps=eps, min_samples=min_samples):
+                labels, centroids = dbscan(points, eps, min_samples)
+                expected = reference_dbscan(points, eps, min_samples)
+                np.testing.assert_array_equal(labels, expected)
+                self.assertEqual(centroids.shape, (labels.max() + 1, 2))
+
+    def test_small_eps(self):
+        # Two groups 5.5 meters apart (more than eps), within one cell of the grid
+        group = np.array([(0, 0), (0, 1e-5), (1e-5, 0), (1e-5, 1e-5), (5e-6, 5e-6)])
+        points = np.vstack([group, group + (0, 5e-5)]) + (10, 10)
+        labels, centroids = dbscan(points, 0.003, 5)
+        np.testing.assert_array_equal(labels, reference_dbscan(points, 0.003, 5))
+        np.testing.assert_array_equal(labels, [0] * 5 + [1] * 5)
+        self.assertEqual(len(centroids), 2)
+
+    def test_antimeridian_and_poles(self):
+        rng = np.random.default_rng(3)
+        points = np.vstack(
+            [
+                np.column_stack([rng.normal(0, 0.1, 100), rng.normal(180, 0.1, 100)]),
+                np.column_stack(
+                    [rng.uniform(89.9, 90, 100), rng.uniform(-180, 180, 100)]
+                ),
+            ]
+        )
+        points[:, 1] = (points[:, 1] + 180) % 360 - 180
+        labels, centroids = dbscan(points, 30, 5)
+        np.testing.assert_array_equal(labels, reference_dbscan(points, 30, 5))
+        self.assertEqual(len(centroids), 2)
+        self.assertAlmostEqual(abs(centroids[0, 1]), 180, delta=0.1)
+        self.assertGreater(centroids[1, 0], 89.9)
+
+    def test_centroids(self):
+        points = clustered_points(4, 50, 0.2, seed=4, noise=50)
+        labels, centroids = dbscan(points, 40, 4, unit="miles")
+        np.testing.assert_array_equal(
+            labels, reference_dbscan(points, 40 / 0.621371, 4)
+        )
+        for cluster, centroid in enumerate(centroids):
+            expected = calculate_centroid(points[labels == cluster], method="spherical")
+            np.testing.assert_allclose(centroid, expected, rtol=0, atol=1e-9)
+
+    def test_chunk_iterator(self):
+        points = clustered_points(4, 50, 0.2, seed=5)
+        labels, _ = dbscan(points, 40, 4)
+        chunks, _ = dbscan(iter(np.array_split(points, 7)), 40, 4)
+        np.testing.assert_array_equal(chunks, labels)
+
+    def test_empty_and_noise(self):
+        labels, centroids = dbscan(np.empty((0, 2)), 10)
+        self.assertEqual(labels.shape, (0,))
+        self.assertEqual(centroids.shape, (0, 2))
+        labels, centroids = dbscan([(0, 0), (10, 10)], 10, 2)
+        np.testing.assert_array_equal(labels, [-1, -1])
+        self.assertEqual(centroids.shape, (0, 2))
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            dbscan([(0, 0)], 0)
+        with self.assertRaises(ValueError):
+            dbscan([(0, 0)], 10, min_samples=0)
+        with self.assertRaises(ValueError):
+            dbscan([(0, 0), (91, 0)], 10)
+
+
+class TestKMeans(unittest.TestCase):
+    def test_separated_clusters(self):
+        points = clustered_points(6, 200, 0.1, seed=6)
+        labels, centroids = kmeans(points, 6, seed=0)
+        self.assertEqual(centroids.shape, (6, 2))
+        # Every generated group ends up in a cluster of its own
+        groups = labels.reshape(6, 200)
+        self.assertTrue((groups == groups[:, :1]).all())
+        self.assertEqual(len(set(groups[:, 0])), 6)
+
+    def test_centroids_and_assignment(self):
+        points = clustered_points(10, 100, 2, seed=7, noise=500)
+        labels, centroids = kmeans(points, 8, seed=1)
+        for cluster, centroid in enumerate(centroids):
+            if (labels == cluster).any():
+                expected = calculate_centroid(
+                    points[labels == cluster], method="spherical"
+                )
+                np.testing.assert_allclose(centroid, expected, rtol=0, atol=1e-9)
+        # Converged: every point is assigned to its nearest centroid
+        distances = np.column_stack(
+            [batch_haversine_distance(c, points) for c in centroids]
+        )
+        nearest = distances[np.arange(len(points)), labels]
+        np.testing.assert_allclose(nearest, distances.min(axis=1), rtol=0, atol=2e-3)
+
+    def test_antimeridian(self):
+        points = clustered_points(1, 100, 0.1, seed=8)
+        points[:, 1] = (points[:, 1] - points[:, 1].mean() + 360) % 360 - 180
+        labels, centroids = kmeans(points, 1, seed=2)
+        self.assertAlmostEqual(abs(centroids[0, 1]), 180, delta=0.1)
+
+    def test_seed_and_chunks(self):
+        points = clustered_points(5, 100, 1, seed=9)
+        labels, centroids = kmeans(points, 5, seed=3)
+        again, _ = kmeans(iter(np.array_split(points, 3)), 5, seed=3, batch_size=64)
+        np.testing.assert_array_equal(labels, again)
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            kmeans([(0, 0)], 0)
+        with self.assertRaises(ValueError):
+            kmeans([(0, 0)], 2)
+        with self.assertRaises(ValueError):
+            kmeans([(0, 0), (1, 1)], 1, tolerance=-1)
+        with self.assertRaises(ValueError):
+            kmeans([(0, 0), (0, 181)], 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,144 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
+from geotools.cache import GeocodeCache
+from geotools.config import Config
+from geotools.geocode import AddressNotFoundError, AsyncGeocoder, geocode_many
+from stub_server import LOCATION, StubGeocodingServer
+
+
+def _fill_cache(path, start):
+    cache = GeocodeCache(path)
+    for i in range(start, start + 50):
+        cache.put(f"{i} Main Street", "google", (i, -i))
+    cache.close()
+
+
+class TestGeocodeCache(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "geocode.db")
+        self.addCleanup(Config.reset_config)
+
+    def test_get_put(self):
+        cache = GeocodeCache(self.path)
+        self.assertIsNone(cache.get("1600 Amphitheatre Parkway", "google"))
+        cache.put("1600 Amphitheatre Parkway", "google", LOCATION)
+        self.assertEqual(cache.get(" 1600  amphitheatre PARKWAY", "google"), LOCATION)
+        self.assertIsNone(cache.get("1600 Amphitheatre Parkway", "opencage"))
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        self.assertAlmostEqual(cache.hit_rate, 1 / 3)
+
+        # The entries are persistent
+        cache.close()
+        self.assertEqual(
+            GeocodeCache(self.path).get("1600 Amphitheatre Parkway", "google"), LOCATION
+        )
+
+    def test_negative_caching(self):
+        cache = GeocodeCache(self.path)
+        cache.put("Invalid Address", "google", None)
+        with self.assertRaises(AddressNotFoundError) as context:
+            cache.get("Invalid Address", "google")
+        self.assertIn("Unsupported address format", str(context.exception))
+        self.assertEqual(cache.negative_hits, 1)
+
+    def test_ttl(self):
+        cache = GeocodeCache(self.path, ttl=60, negative_ttl=10)
+        with patch("geotools.cache.time.time", return_value=1000.0):
+            cache.put("Mountain View", "google", LOCATION)
+            cache.put("Invalid Address", "google", None)
+        with patch("geotools.cache.time.time", return_value=1030.0):
+            self.assertEqual(cache.get("Mountain View", "google"), LOCATION)
+            self.assertIsNone(cache.get("Invalid Address", "google"))
+            self.assertEqual(cache.evict(), 1)
+        with patch("geotools.cache.time.time", return_value=1070.0):
+            self.assertIsNone(cache.get("Mountain View", "google"))
+        self.assertEqual(len(cache), 1)
+
+        with self.assertRaises(ValueError):
+            GeocodeCache(self.path, ttl=0)
+
+    def test_ttl_deletes_expired_entries(self):
+        cache = GeocodeCache(self.path, ttl=60)
+        with patch("geotools.cache.time.time", return_value=1000.0):
+            for i in range(50):
+                cache.put(f"{i} Main Street", "google", (i, -i))
+        with patch("geotools.cache.time.time", return_value=1100.0):
+            for i in range(50, 150):
+                cache.put(f"{i} Main Street", "google", (i, -i))
+        # Without a max_entries, the expired rows are deleted from the file
+        connection = sqlite3.connect(self.path)
+        rows = connection.execute("SELECT COUNT(*) FROM geocode").fetchone()[0]
+        connection.close()
+        self.assertEqual(rows, 100)
+        self.assertEqual(len(cache), 100)
+
+    def test_max_entries(self):
+        cache = GeocodeCache(self.path, max_entries=10)
+        for i in range(25):
+            with patch("geotools.cache.time.time", return_value=1000.0 + i):
+                cache.put(f"{i} Main Street", "google", (i, -i))
+            self.assertLessEqual(len(cache), 10)
+        # Updating an entry does not add one
+        cache.put("24 Main Street", "google", (24, -24))
+        self.assertEqual(len(cache), 10)
+        self.assertIsNone(cache.get("14 Main Street", "google"))
+        self.assertEqual(cache.get("24 Main Street", "google"), (24, -24))
+
+    def test_concurrent_processes(self):
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            list(executor.map(_fill_cache, [self.path, self.path], [0, 50]))
+        cache = GeocodeCache(self.path)
+        self.assertEqual(len(cache), 100)
+        self.assertEqual(cache.get("75 Main Street", "google"), (75, -75))
+
+    def test_geocode_many_uses_cache(self):
+        cache = GeocodeCache(self.path)
+        addresses = ["1 Main Street", "2 Main Street", "Invalid Address"]
+        with StubGeocodingServer() as server:
+            first = list(
+                geocode_many(
+                    addresses,
+                    endpoints=server.endpoints,
+                    return_exceptions=True,
+                    cache=cache,
+                )
+            )
+            self.assertEqual(server.requests, 3)
+            Config.geocode_cache = cache
+            second = list(
+                geocode_many(
+                    addresses, endpoints=server.endpoints, return_exceptions=True
+                )
+            )
+            self.assertEqual(server.requests, 3)
+        self.assertEqual(first[:2], second[:2])
+        self.assertIsInstance(second[2][1], AddressNotFoundError)
+
+
+class TestAsyncGeocoderCache(unittest.IsolatedAsyncioTestCase):
+    async def test_async_geocoder_uses_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = GeocodeCache(os.path.join(directory, "geocode.db"))
+            with StubGeocodingServer() as server:
+                async with AsyncGeocoder(
+                    endpoints=server.endpoints, cache=cache
+                ) as geocoder:
+                    self.assertEqual(await geocoder.geocode("Mountain View"), LOCATION)
+                    self.assertEqual(await geocoder.geocode("Mountain View"), LOCATION)
+                    with self.assertRaises(AddressNotFoundError):
+                        await geocoder.geocode("Invalid Address")
+                    with self.assertRaises(AddressNotFoundError):
+                        await geocoder.geocode("Invalid Address")
+                self.assertEqual(server.requests, 2)
+            self.assertEqual((cache.hits, cache.negative_hits), (1, 1))
+            cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
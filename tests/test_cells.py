@@ -0,0 +1,209 @@
+import unittest
+import numpy as np
+from geotools.cells import (
+    cell_bounds,
+    cell_covering,
+    cell_decode,
+    cell_encode,
+    cell_level,
+    cell_neighbors,
+    cell_parent,
+    cell_range,
+    geohash_bounds,
+    geohash_covering,
+    geohash_decode,
+    geohash_encode,
+    geohash_neighbors,
+)
+from geotools.distance import batch_haversine_distance, batch_vincenty_distance
+from geotools.points import PointArray
+
+
+def random_points(n, seed=0):
+    """
+    Return points spread uniformly over the sphere.
+    """
+    rng = np.random.default_rng(seed)
+    latitudes = np.degrees(np.arcsin(rng.uniform(-1, 1, n)))
+    return np.column_stack([latitudes, rng.uniform(-180, 180, n)])
+
+
+def contains(bounds, points):
+    """
+    Return whether every point lies in its bounding box.
+    """
+    return (
+        (bounds[:, 0] <= points[:, 0])
+        & (points[:, 0] <= bounds[:, 2])
+        & (bounds[:, 1] <= points[:, 1])
+        & (points[:, 1] <= bounds[:, 3])
+    ).all()
+
+
+class TestGeohash(unittest.TestCase):
+    def test_reference_values(self):
+        self.assertEqual(geohash_encode((42.6, -5.6), 5), "ezs42")
+        self.assertEqual(geohash_encode((57.64911, 10.40744), 11), "u4pruydqqvj")
+        self.assertEqual(geohash_encode((90, 180), 3), "zzz")
+        self.assertEqual(geohash_encode((-90, -180), 3), "000")
+        self.assertEqual(
+            geohash_bounds("ezs42"),
+            (42.5830078125, -5.625, 42.626953125, -5.5810546875),
+        )
+        self.assertEqual(geohash_decode("EZS42"), (42.60498046875, -5.60302734375))
+
+    def test_round_trip(self):
+        points = random_points(50000)
+        for precision in (1, 5, 8, 12):
+            with self.subTest(precision=precision):
+                geohashes = geohash_encode(PointArray(points), precision)
+                self.assertEqual(geohashes.shape, (50000,))
+                self.assertTrue(all(len(g) == precision for g in geohashes[:100]))
+                self.assertTrue(contains(geohash_bounds(geohashes), points))
+                self.assertEqual(
+                    geohash_encode(tuple(points[0]), precision), geohashes[0]
+                )
+        centers = geohash_decode(["ezs42", "u4pruydqqvj", "e"])
+        self.assertEqual(centers.shape, (3, 2))
+        self.assertAlmostEqual(centers[1, 0], 57.64911, places=5)
+
+    def test_prefixes(self):
+        points = random_points(1000, seed=1)
+        long = geohash_encode(points, 9)
+        short = geohash_encode(points, 4)
+        self.assertTrue(all(g.startswith(s) for g, s in zip(long, short)))
+
+    def test_neighbors(self):
+        self.assertEqual(
+            geohash_neighbors("ezs42"),
+            ["ezs48", "ezs49", "ezs43", "ezs41", "ezs40", "ezefp", "ezefr", "ezefx"],
+        )
+        # Across the antimeridian and the north pole
+        self.assertEqual(geohash_neighbors("b")[6], "z")
+        self.assertEqual(geohash_neighbors("b")[0], "u")
+        neighbors = geohash_neighbors(["ezs42", "u4pruydqqvj"])
+        self.assertEqual(neighbors.shape, (2, 8))
+        self.assertEqual(neighbors[0, 7], "ezefx")
+
+    def test_covering(self):
+        points = random_points(200000, seed=2)
+        for center, radius, precision in [
+            ((40.7128, -74.0060), 50, 4),
+            ((0, 179.9), 300, 3),
+            ((89.5, 20), 200, 3),
+        ]:
+            with self.subTest(center=center):
+                covering = geohash_covering(center, radius, precision)
+                self.assertTrue((covering[:-1] < covering[1:]).all())
+                inside = batch_vincenty_distance(center, points) <= radius
+                geohashes = geohash_encode(points[inside], precision)
+                self.assertTrue(np.isin(geohashes, covering).all())
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            geohash_encode((0, 0), 13)
+        with self.assertRaises(ValueError):
+            geohash_encode([(0, 0), (95, 0)])
+        with self.assertRaises(ValueError):
+            geohash_decode("ezs4a")
+        with self.assertRaises(ValueError):
+            geohash_decode(["ezs42", ""])
+        with self.assertRaises(ValueError):
+            geohash_covering((0, 0), -1, 5)
+
+
+class TestCells(unittest.TestCase):
+    def test_round_trip(self):
+        points = random_points(50000, seed=3)
+        leaves = cell_encode(points)
+        self.assertEqual(leaves.dtype, np.int64)
+        for level in (0, 1, 7, 16, 30):
+            with self.subTest(level=level):
+                cells = cell_encode(points, level)
+                self.assertTrue(contains(cell_bounds(cells), points))
+                self.assertTrue((cell_level(cells) == level).all())
+                np.testing.assert_array_equal(cell_parent(leaves, level), cells)
+                first, last = cell_range(cells)
+                self.assertTrue(((first <= leaves) & (leaves <= last)).all())
+        cell = cell_encode((40.7128, -74.0060), 20)
+        self.assertIsInstance(cell, int)
+        self.assertEqual(cell_level(cell), 20)
+        latitude, longitude = cell_decode(cell)
+        self.assertAlmostEqual(latitude, 40.7128, places=3)
+        self.assertAlmostEqual(longitude, -74.0060, places=3)
+
+    def test_hilbert_order(self):
+        # Consecutive cells along the curve are adjacent in the grid
+        for level in (1, 3, 5):
+            with self.subTest(level=level):
+                cells = (np.arange(4**level) * 2 + 1) << (2 * (30 - level))
+                bounds = cell_bounds(cells)
+                rows = np.round((bounds[:, 0] + 90) / 180 * 2**level)
+                columns = np.round((bounds[:, 1] + 180) / 360 * 2**level)
+                steps = np.abs(np.diff(rows)) + np.abs(np.diff(columns))
+                self.assertTrue((steps == 1).all())
+                self.assertEqual(len(set(zip(rows, columns))), 4**level)
+
+    def test_grouping_by_sort(self):
+        points = random_points(10000, seed=4)
+        cells = cell_encode(points, 30)
+        order = np.argsort(cells)
+        parents = cell_parent(cells[order], 5)
+        self.assertTrue((np.diff(parents) >= 0).all())
+        np.testing.assert_array_equal(parents, cell_encode(points[order], 5))
+
+    def test_neighbors(self):
+        cell = cell_encode((10, 10), 12)
+        neighbors = cell_neighbors(cell)
+        self.assertEqual(len(neighbors), 8)
+        center = np.array(cell_decode(cell))
+        offsets = cell_decode(neighbors) - center
+        height, width = 180 / 2**12, 360 / 2**12
+        np.testing.assert_allclose(
+            offsets / [height, width],
+            [(1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1)],
+        )
+        # Across the antimeridian
+        east = cell_neighbors(cell_encode((0, 179.99), 8))[2]
+        self.assertLess(cell_decode(east)[1], -179)
+        self.assertEqual(cell_neighbors([cell, cell]).shape, (2, 8))
+
+    def test_covering(self):
+        points = random_points(200000, seed=5)
+        for center, radius, level in [
+            ((40.7128, -74.0060), 50, 10),
+            ((0, 179.9), 300, 8),
+            ((-89.5, 0), 100, 8),
+            ((0, 0), 5000, 4),
+        ]:
+            with self.subTest(center=center):
+                covering = cell_covering(center, radius, level)
+                distances = np.minimum(
+                    batch_haversine_distance(center, points),
+                    batch_vincenty_distance(center, points),
+                )
+                cells = cell_encode(points[distances <= radius], level)
+                self.assertTrue(np.isin(cells, covering).all())
+        self.assertEqual(len(cell_covering((10.5, 10.5), 0, 20)), 1)
+        miles = cell_covering((40.7128, -74.0060), 31, 10, unit="miles")
+        self.assertTrue(
+            np.isin(cell_covering((40.7128, -74.0060), 49, 10), miles).all()
+        )
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            cell_encode((0, 0), 31)
+        with self.assertRaises(ValueError):
+            cell_decode(0)
+        with self.assertRaises(ValueError):
+            cell_level(2)
+        with self.assertRaises(ValueError):
+            cell_parent(cell_encode((0, 0), 5), 6)
+        with self.assertRaises(ValueError):
+            cell_decode([1.5])
+        with self.assertRaises(ValueError):
+            cell_covering((0, 0), 20000, 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,24 @@
+import os
+import tempfile
 import unittest
+import numpy as np
+from geotools.config import Config
 from geotools.distance import (
+    DistanceCache,
+    get_distance_cache,
     haversine_distance,
     vincenty_distance,
     async_haversine_distance,
     async_vincenty_distance,
+    batch_haversine_distance,
+    batch_vincenty_distance,
+    distance_matrix,
+    within_radius,
+    approximate_distance,
+    AnchorSet,
+    PreparedPoint,
 )
+from geotools.points import PointArray
 
 
 class TestCalculateDistance(unittest.IsolatedAsyncioTestCase):
@@ -88,7 +102,17 @@ class TestCalculateDistance(unittest.IsolatedAsyncioTestCase):
         self.assertIn("Invalid coordinates for point2", str(context.exception))
         return None
 
+    def test_calculate_distance_vincenty_equator(self):
+        point1 = (0.0, 0.0)
+        point2 = (0.0, 10.0)
+        expected_distance = 1113.19  # Expected distance in kilometers along the equator
+        result = vincenty_distance(point1, point2)
+        self.assertAlmostEqual(result, expected_distance, places=2)
+        return None
+
     def test_calculate_distance_caching(self):
+        self.addCleanup(Config.reset_config)
+        Config.distance_cache_size = 128  # The cache is off by default
         point1 = (40.7128, -74.0060)  # New York City
         point2 = (34.0522, -118.2437)  # Los Angeles
         result1 = haversine_distance(point1, point2)
@@ -98,6 +122,8 @@ class TestCalculateDistance(unittest.IsolatedAsyncioTestCase):
         return None
 
     def test_calculate_distance_vincenty_caching(self):
+        self.addCleanup(Config.reset_config)
+        Config.distance_cache_size = 128  # The cache is off by default
         point1 = (40.7128, -74.0060)  # New York City
         point2 = (34.0522, -118.2437)  # Los Angeles
         result1 = vincenty_distance(point1, point2)
@@ -213,5 +239,508 @@ class TestCalculateDistance(unittest.IsolatedAsyncioTestCase):
         return None
 
 
+class TestDistanceCache(unittest.TestCase):
+    def setUp(self):
+        Config.distance_cache_size = 128
+        get_distance_cache().clear()
+
+    def tearDown(self):
+        Config.reset_config()
+
+    def test_cache_hits(self):
+        cache = get_distance_cache()
+        point1 = (40.7128, -74.0060)  # New York City
+        point2 = (34.0522, -118.2437)  # Los Angeles
+        first = haversine_distance(point1, point2)
+        second = haversine_distance(point1, point2)
+        vincenty_distance(point1, point2)
+        self.assertEqual(first, second)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        self.assertAlmostEqual(cache.hit_rate, 1 / 3)
+
+    def test_cache_keys_on_resolved_unit(self):
+        point1 = (40.7128, -74.0060)  # New York City
+        point2 = (34.0522, -118.2437)  # Los Angeles
+        km = haversine_distance(point1, point2)
+        Config.unit = "miles"
+        self.assertAlmostEqual(haversine_distance(point1, point2), km * 0.621371)
+        self.assertAlmostEqual(haversine_distance(point1, point2, unit="km"), km)
+
+    def test_cache_quantization(self):
+        Config.update_config(distance_cache_precision=1e-6)
+        cache = get_distance_cache()
+        self.assertEqual(cache.precision, 1e-6)
+        first = haversine_distance((40.7128, -74.0060), (34.0522, -118.2437))
+        second = haversine_distance((40.71280001, -74.0060), (34.0522, -118.2437))
+        self.assertEqual(first, second)
+        self.assertEqual(cache.hits, 1)
+
+    def test_cache_size_and_disable(self):
+        cache = DistanceCache(maxsize=2)
+        for i in range(3):
+            cache.get("haversine", (i, 0), (0, 0), "km", haversine_distance)
+        self.assertEqual(len(cache), 2)
+        cache.get("haversine", (0, 0), (0, 0), "km", haversine_distance)
+        self.assertEqual(cache.misses, 4)  # The oldest entry was evicted
+
+        Config.reset_config()  # Off by default
+        self.assertIsNone(get_distance_cache())
+        self.assertAlmostEqual(
+            haversine_distance((40.7128, -74.0060), (34.0522, -118.2437)),
+            3935.75,
+            places=2,
+        )
+        with self.assertRaises(ValueError):
+            DistanceCache(maxsize=0)
+
+
+class TestBatchDistance(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.points1 = np.column_stack(
+            [rng.uniform(-90, 90, 1000), rng.uniform(-180, 180, 1000)]
+        )
+        self.points2 = np.column_stack(
+            [rng.uniform(-90, 90, 1000), rng.uniform(-180, 180, 1000)]
+        )
+
+    def tearDown(self):
+        Config.reset_config()
+
+    def test_batch_haversine_matches_scalar(self):
+        result = batch_haversine_distance(self.points1, self.points2)
+        expected = [
+            haversine_distance(tuple(p1), tuple(p2))
+            for p1, p2 in zip(self.points1, self.points2)
+        ]
+        self.assertEqual(result.shape, (1000,))
+        np.testing.assert_allclose(result, expected, rtol=1e-9, atol=1e-6)
+
+    def test_batch_haversine_single_point(self):
+        point = (40.7128, -74.0060)  # New York City
+        result = batch_haversine_distance(point, self.points2[:10])
+        expected = [haversine_distance(point, tuple(p)) for p in self.points2[:10]]
+        np.testing.assert_allclose(result, expected, rtol=1e-9)
+
+        result = batch_haversine_distance(point, (34.0522, -118.2437))
+        self.assertAlmostEqual(float(result), 3935.75, places=2)
+
+    def test_batch_haversine_same_points(self):
+        result = batch_haversine_distance(self.points1, self.points1)
+        np.testing.assert_allclose(result, 0.0, atol=1e-9)
+
+    def test_batch_haversine_units(self):
+        points1 = [(40.7128, -74.0060), (51.5074, -0.1278)]  # New York City, London
+        points2 = [(34.0522, -118.2437), (48.8566, 2.3522)]  # Los Angeles, Paris
+        result_km = batch_haversine_distance(points1, points2, unit="km")
+        result_miles = batch_haversine_distance(points1, points2, unit="miles")
+        np.testing.assert_allclose(result_km, [3935.75, 343.56], atol=0.01)
+        np.testing.assert_allclose(result_miles, result_km * 0.621371)
+
+        Config.update_config(unit="miles")
+        np.testing.assert_allclose(
+            batch_haversine_distance(points1, points2), result_miles
+        )
+
+    def test_batch_haversine_invalid_coordinates(self):
+        self.points1[7] = (91.0, -74.0060)  # Invalid latitude
+        with self.assertRaises(ValueError) as context:
+            batch_haversine_distance(self.points1, self.points2)
+        self.assertIn(
+            "Invalid coordinates for points1 at index 7", str(context.exception)
+        )
+
+        self.points2[3] = (34.0522, np.nan)  # Invalid longitude
+        with self.assertRaises(ValueError) as context:
+            batch_haversine_distance(self.points2, self.points2)
+        self.assertIn(
+            "Invalid coordinates for points1 at index 3", str(context.exception)
+        )
+
+    def test_batch_haversine_invalid_shapes(self):
+        with self.assertRaises(ValueError) as context:
+            batch_haversine_distance(self.points1, self.points2[:10])
+        self.assertIn("same number of points", str(context.exception))
+
+        with self.assertRaises(ValueError) as context:
+            batch_haversine_distance(np.zeros((10, 3)), self.points2[:10])
+        self.assertIn("Invalid shape for points1", str(context.exception))
+
+    def test_batch_vincenty_matches_scalar(self):
+        result = batch_vincenty_distance(self.points1, self.points2)
+        expected = [
+            vincenty_distance(tuple(p1), tuple(p2))
+            for p1, p2 in zip(self.points1, self.points2)
+        ]
+        np.testing.assert_allclose(result, expected, rtol=0, atol=1e-9)
+
+    def test_batch_vincenty_special_pairs(self):
+        points1 = [(40.7128, -74.0060), (40.7128, -74.0060), (0.0, 0.0), (0.0, 0.0)]
+        points2 = [(34.0522, -118.2437), (40.7128, -74.0060), (0.0, 10.0), (0.5, 179.7)]
+        result, iterations = batch_vincenty_distance(
+            points1, points2, return_iterations=True
+        )
+        self.assertAlmostEqual(result[0], 3944.42, places=2)
+        self.assertEqual(result[1], 0.0)  # Coincident points
+        self.assertAlmostEqual(result[2], 1113.19, places=2)  # Along the equator
+        self.assertEqual(iterations[1], 1)
+        self.assertEqual(iterations[3], 1000)  # Near-antipodal, no convergence
+        for i in (0, 2, 3):
+            self.assertAlmostEqual(
+                result[i], vincenty_distance(points1[i], points2[i]), places=9
+            )
+
+    def test_batch_vincenty_iteration_cap(self):
+        _, iterations = batch_vincenty_distance(
+            (0.0, 0.0),
+            [(0.5, 179.7), (10.0, 10.0)],
+            max_iterations=20,
+            return_iterations=True,
+        )
+        self.assertEqual(iterations[0], 20)
+        self.assertLess(iterations[1], 20)
+
+    def test_batch_vincenty_units(self):
+        result_km = batch_vincenty_distance(self.points1, self.points2, unit="km")
+        result_miles = batch_vincenty_distance(self.points1, self.points2, unit="miles")
+        np.testing.assert_allclose(result_miles, result_km * 0.62137119)
+
+    def test_batch_vincenty_invalid_coordinates(self):
+        with self.assertRaises(ValueError) as context:
+            batch_vincenty_distance((40.7128, -74.0060), [(0.0, 0.0), (0.0, 190.0)])
+        self.assertIn(
+            "Invalid coordinates for points2 at index 1", str(context.exception)
+        )
+
+
+class TestDistanceMatrix(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.points1 = np.column_stack(
+            [rng.uniform(-90, 90, 300), rng.uniform(-180, 180, 300)]
+        )
+        self.points2 = np.column_stack(
+            [rng.uniform(-90, 90, 270), rng.uniform(-180, 180, 270)]
+        )
+
+    def expected(self, points1, points2, function=batch_haversine_distance, **kwargs):
+        return np.stack([function(point, points2, **kwargs) for point in points1])
+
+    def test_distance_matrix_haversine(self):
+        result = distance_matrix(self.points1, self.points2)
+        self.assertEqual(result.shape, (300, 270))
+        self.assertEqual(result.dtype, np.float64)
+        np.testing.assert_allclose(
+            result, self.expected(self.points1, self.points2), rtol=1e-12
+        )
+
+    def test_distance_matrix_pairwise(self):
+        result = distance_matrix(self.points1)
+        self.assertEqual(result.shape, (300, 300))
+        np.testing.assert_allclose(
+            result, self.expected(self.points1, self.points1), rtol=1e-9, atol=1e-9
+        )
+        np.testing.assert_allclose(np.diag(result), 0.0, atol=1e-9)
+
+    def test_distance_matrix_vincenty(self):
+        result = distance_matrix(
+            self.points1[:20], self.points2[:30], method="vincenty"
+        )
+        np.testing.assert_allclose(
+            result,
+            self.expected(
+                self.points1[:20], self.points2[:30], batch_vincenty_distance
+            ),
+            rtol=0,
+            atol=1e-9,
+        )
+
+    def test_distance_matrix_units_and_dtype(self):
+        result = distance_matrix(
+            self.points1, self.points2, unit="miles", dtype=np.float32
+        )
+        self.assertEqual(result.dtype, np.float32)
+        np.testing.assert_allclose(
+            result,
+            self.expected(self.points1, self.points2, unit="miles"),
+            rtol=1e-6,
+        )
+
+    def test_distance_matrix_out(self):
+        out = np.zeros((300, 270))
+        result = distance_matrix(self.points1, self.points2, out=out)
+        self.assertIs(result, out)
+        np.testing.assert_allclose(out, self.expected(self.points1, self.points2))
+
+        with self.assertRaises(ValueError) as context:
+            distance_matrix(self.points1, self.points2, out=np.zeros((270, 300)))
+        self.assertIn("Invalid shape for out", str(context.exception))
+
+    def test_distance_matrix_memmap(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "matrix.npy")
+            result = distance_matrix(
+                self.points1, self.points2, dtype=np.float32, filename=filename
+            )
+            self.assertIsInstance(result, np.memmap)
+            del result
+            loaded = np.load(filename, mmap_mode="r")
+            self.assertEqual(loaded.shape, (300, 270))
+            np.testing.assert_allclose(
+                loaded, self.expected(self.points1, self.points2), rtol=1e-6
+            )
+            del loaded
+
+    def test_distance_matrix_unsupported_method(self):
+        with self.assertRaises(ValueError) as context:
+            distance_matrix(self.points1, self.points2, method="manhattan")
+        self.assertIn("Unsupported method", str(context.exception))
+
+
+class TestWithinRadius(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        latitudes = np.degrees(np.arcsin(rng.uniform(-1, 1, 20000)))
+        longitudes = rng.uniform(-180, 180, 20000)
+        self.candidates = np.column_stack([latitudes, longitudes])
+
+    def check(self, point, radius, method="haversine", unit=None):
+        indices, distances = within_radius(
+            point, self.candidates, radius, method=method, unit=unit
+        )
+        if method == "haversine":
+            expected = batch_haversine_distance(point, self.candidates, unit=unit)
+        else:
+            expected = batch_vincenty_distance(point, self.candidates, unit=unit)
+        np.testing.assert_array_equal(indices, np.flatnonzero(expected <= radius))
+        np.testing.assert_allclose(distances, expected[indices], rtol=1e-12)
+        return indices
+
+    def test_within_radius(self):
+        self.assertGreater(len(self.check((40.7128, -74.0060), 1000)), 0)
+        self.check((40.7128, -74.0060), 500, unit="miles")
+        self.check((34.0522, -118.2437), 800, method="vincenty")
+
+    def test_antimeridian(self):
+        indices = self.check((-17.7134, 178.0650), 1500)  # Fiji
+        longitudes = self.candidates[indices, 1]
+        self.assertTrue((longitudes < 0).any() and (longitudes > 0).any())
+        self.check((0, -180), 1000, method="vincenty")
+
+    def test_poles(self):
+        self.check((89.9, 0), 1000)
+        self.check((-85, 45), 1000, method="vincenty")
+        self.check((60, 10), 4000)  # Circle reaching over the north pole
+
+    def test_edge_cases(self):
+        self.assertEqual(len(self.check((0, 0), 25000)), len(self.candidates))
+        self.assertEqual(len(self.check((0, 0), 0)), 0)
+
+        points = np.array([(10.0, 20.0), (10.0, 20.0), (11.0, 20.0)])
+        indices, distances = within_radius((10.0, 20.0), points, 0)
+        np.testing.assert_array_equal(indices, [0, 1])
+        np.testing.assert_array_equal(distances, [0, 0])
+
+    def test_point_array(self):
+        indices, distances = within_radius(
+            (48.8566, 2.3522), PointArray(self.candidates), 700
+        )
+        expected = within_radius((48.8566, 2.3522), self.candidates, 700)
+        np.testing.assert_array_equal(indices, expected[0])
+        np.testing.assert_array_equal(distances, expected[1])
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            within_radius((100, 0), self.candidates, 10)
+        with self.assertRaises(ValueError):
+            within_radius((0, 0), [(0, 0), (0, 200)], 10)
+        with self.assertRaises(ValueError):
+            within_radius((0, 0), self.candidates, -1)
+        with self.assertRaises(ValueError) as context:
+            within_radius((0, 0), self.candidates, 10, method="manhattan")
+        self.assertIn("Unsupported method", str(context.exception))
+
+
+class TestApproximateDistance(unittest.TestCase):
+    # Documented maximum relative errors against vincenty_distance
+    MAX_ERRORS = {
+        "equirectangular": {10: 0.006, 100: 0.006, 1000: 0.006},
+        "cosines": {10: 0.006, 100: 0.006, 1000: 0.006},
+        "flat": {10: 0.00001, 100: 0.0001, 1000: 0.008},
+    }
+
+    def pairs(self, max_distance, n=20000):
+        rng = np.random.default_rng(int(max_distance * 1000))
+        latitudes = rng.uniform(-69, 69, n)
+        offsets = rng.uniform(0, max_distance / 111.32, n)
+        bearings = rng.uniform(0, 2 * np.pi, n)
+        points1 = np.column_stack([latitudes, rng.uniform(-180, 180, n)])
+        points2 = np.column_stack(
+            [
+                np.clip(latitudes + offsets * np.cos(bearings), -70, 70),
+                points1[:, 1]
+                + offsets * np.sin(bearings) / np.cos(np.radians(latitudes)),
+            ]
+        )
+        points2[:, 1] = (points2[:, 1] + 180) % 360 - 180
+        return points1, points2
+
+    def test_documented_errors(self):
+        # Pairs up to 10 meters apart check the <= 10 km bound on short arcs
+        for max_distance, column in ((0.01, 10), (10, 10), (100, 100), (1000, 1000)):
+            points1, points2 = self.pairs(max_distance)
+            expected = batch_vincenty_distance(points1, points2)
+            mask = (expected >= 0.001) & (expected <= max_distance)
+            for method, errors in self.MAX_ERRORS.items():
+                with self.subTest(method=method, max_distance=max_distance):
+                    result = approximate_distance(points1, points2, method=method)
+                    error = np.abs(result - expected)[mask] / expected[mask]
+                    self.assertLess(error.max(), errors[column])
+                    scalars = [
+                        approximate_distance(point1, point2, method=method)
+                        for point1, point2 in zip(
+                            map(tuple, points1[mask][:500].tolist()),
+                            map(tuple, points2[mask][:500].tolist()),
+                        )
+                    ]
+                    error = np.abs(scalars - expected[mask][:500])
+                    self.assertLess(
+                        (error / expected[mask][:500]).max(), errors[column]
+                    )
+
+    def test_scalars_match_arrays(self):
+        point1 = (40.7128, -74.0060)  # New York City
+        point2 = (40.7306, -73.9352)  # Brooklyn
+        for method in ("equirectangular", "cosines", "flat"):
+            with self.subTest(method=method):
+                result = approximate_distance(point1, point2, method=method)
+                self.assertIsInstance(result, float)
+                self.assertAlmostEqual(
+                    result, vincenty_distance(point1, point2), delta=0.05
+                )
+                self.assertAlmostEqual(
+                    result,
+                    approximate_distance([point1], np.array([point2]), method)[0],
+                    places=9,
+                )
+                self.assertEqual(approximate_distance(point1, point1, method), 0)
+
+    def test_antimeridian_and_units(self):
+        for method in ("equirectangular", "cosines", "flat"):
+            result = approximate_distance((0, 179.9), (0, -179.9), method=method)
+            self.assertAlmostEqual(result, 22.24, delta=0.05)
+        result = approximate_distance((0, 0), (0, 1), method="flat", unit="miles")
+        self.assertAlmostEqual(result, vincenty_distance((0, 0), (0, 1), "miles"), 4)
+
+    def test_rerank(self):
+        rng = np.random.default_rng(3)
+        candidates = PointArray(
+            np.column_stack([rng.uniform(40, 42, 5000), rng.uniform(-75, -73, 5000)])
+        )
+        point = (40.7128, -74.0060)
+        approximate = approximate_distance(point, candidates, "flat")
+        top = np.argpartition(approximate, 20)[:20]
+        exact = batch_vincenty_distance(point, candidates[top])
+        nearest = top[np.argsort(exact)[:5]]
+        expected = np.argsort(batch_vincenty_distance(point, candidates))[:5]
+        np.testing.assert_array_equal(nearest, expected)
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            approximate_distance((100, 0), (0, 0))
+        with self.assertRaises(ValueError):
+            approximate_distance([(0, 0), (0, 200)], (0, 0))
+        with self.assertRaises(ValueError):
+            approximate_distance([(0, 0), (0, 1)], [(0, 0), (0, 1), (0, 2)])
+        with self.assertRaises(ValueError) as context:
+            approximate_distance((0, 0), (0, 1), method="manhattan")
+        self.assertIn("Unsupported method", str(context.exception))
+
+
+class TestAnchorSet(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        self.anchors = np.column_stack(
+            [rng.uniform(-90, 90, 50), rng.uniform(-180, 180, 50)]
+        )
+        self.points = np.column_stack(
+            [rng.uniform(-90, 90, 1000), rng.uniform(-180, 180, 1000)]
+        )
+        self.indices = rng.integers(0, 50, 1000)
+        self.anchor_set = AnchorSet(self.anchors)
+
+    def test_prepared_point(self):
+        point = PreparedPoint((40.7128, -74.0060))
+        self.assertEqual(tuple(point), (40.7128, -74.0060))
+        for other in [(34.0522, -118.2437), (40.7128, -74.0060), (-40, 106)]:
+            with self.subTest(point=other):
+                for unit in ("km", "miles"):
+                    self.assertEqual(
+                        point.haversine_distance(other, unit),
+                        haversine_distance((40.7128, -74.0060), other, unit),
+                    )
+                    self.assertEqual(
+                        point.vincenty_distance(other, unit),
+                        vincenty_distance((40.7128, -74.0060), other, unit),
+                    )
+
+    def test_scalar_matches_functions(self):
+        for i in range(200):
+            anchor = tuple(self.anchors[self.indices[i]])
+            point = tuple(self.points[i])
+            self.assertEqual(
+                self.anchor_set.haversine_distance(self.indices[i], point),
+                haversine_distance(anchor, point),
+            )
+            self.assertEqual(
+                self.anchor_set.vincenty_distance(self.indices[i], point),
+                vincenty_distance(anchor, point),
+            )
+        self.assertEqual(len(self.anchor_set), 50)
+        self.assertIsInstance(self.anchor_set[3], PreparedPoint)
+
+    def test_batch_matches_functions(self):
+        anchors = self.anchors[self.indices]
+        np.testing.assert_array_equal(
+            self.anchor_set.batch_haversine_distance(self.points, self.indices),
+            batch_haversine_distance(anchors, self.points),
+        )
+        np.testing.assert_array_equal(
+            self.anchor_set.batch_vincenty_distance(
+                PointArray(self.points), self.indices, unit="miles"
+            ),
+            batch_vincenty_distance(anchors, self.points, unit="miles"),
+        )
+
+    def test_batch_pairing(self):
+        point = (51.5074, -0.1278)
+        np.testing.assert_array_equal(
+            self.anchor_set.batch_haversine_distance(point),
+            batch_haversine_distance(self.anchors, point),
+        )
+        np.testing.assert_array_equal(
+            self.anchor_set.batch_vincenty_distance(self.points[:50]),
+            batch_vincenty_distance(self.anchors, self.points[:50]),
+        )
+        np.testing.assert_array_equal(
+            self.anchor_set.batch_haversine_distance(self.points, indices=7),
+            batch_haversine_distance(self.anchors[7], self.points),
+        )
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            PreparedPoint((100, 0))
+        with self.assertRaises(ValueError):
+            AnchorSet([(0, 0), (0, 200)])
+        with self.assertRaises(ValueError):
+            self.anchor_set.haversine_distance(0, (0, 181))
+        with self.assertRaises(ValueError):
+            self.anchor_set.batch_haversine_distance(self.points)
+        with self.assertRaises(ValueError):
+            self.anchor_set.batch_vincenty_distance(self.points[:2], [0, 50])
+        with self.assertRaises(ValueError):
+            self.anchor_set.batch_haversine_distance([(0, 0), (91, 0)], [0, 1])
+
+
 if __name__ == "__main__":
     unittest.main()
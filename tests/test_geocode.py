@@ -1,6 +1,17 @@
+import asyncio
+import time
 import unittest
 from unittest.mock import patch
-from geotools.geocode import geocode_address, async_geocode_address
+from geotools.config import Config
+from geotools.geocode import (
+    AsyncGeocoder,
+    GeocodeStats,
+    TokenBucket,
+    async_geocode_address,
+    geocode_address,
+    geocode_many,
+)
+from stub_server import INVALID_KEY, LOCATION, StubGeocodingServer
 
 
 class TestGeocodeAddress(unittest.IsolatedAsyncioTestCase):
@@ -146,5 +157,148 @@ class TestGeocodeAddress(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(result, expected_location)
 
 
+class TestAsyncGeocoder(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.server = StubGeocodingServer(delay=0.05).__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+
+    async def test_geocode_all_apis(self):
+        async with AsyncGeocoder(endpoints=self.server.endpoints) as geocoder:
+            for api in ("google", "opencage", "mapquest"):
+                result = await geocoder.geocode("Mountain View, CA", api=api)
+                self.assertEqual(result, LOCATION)
+
+    async def test_geocode_errors(self):
+        async with AsyncGeocoder(endpoints=self.server.endpoints) as geocoder:
+            for api in ("google", "opencage"):
+                with self.assertRaises(ValueError) as context:
+                    await geocoder.geocode("Invalid Address", api=api)
+                self.assertIn("Unsupported address format", str(context.exception))
+            for api in ("google", "opencage", "mapquest"):
+                with self.assertRaises(ValueError) as context:
+                    await geocoder.geocode(
+                        "Mountain View", api=api, api_key=INVALID_KEY
+                    )
+                self.assertIn("Invalid API key", str(context.exception))
+
+        with self.assertRaises(ValueError):
+            AsyncGeocoder(api="unknown")
+        with self.assertRaises(ValueError):
+            AsyncGeocoder(concurrency=0)
+
+    async def test_geocode_all_overlaps_requests(self):
+        addresses = [f"{i} Main Street" for i in range(40)]
+        async with AsyncGeocoder(
+            concurrency=8, endpoints=self.server.endpoints
+        ) as geocoder:
+            start = time.perf_counter()
+            results = await geocoder.geocode_all(addresses)
+            elapsed = time.perf_counter() - start
+
+        self.assertEqual(results, [LOCATION] * 40)
+        self.assertEqual(self.server.requests, 40)
+        self.assertGreater(self.server.max_in_flight, 1)
+        self.assertLessEqual(self.server.max_in_flight, 8)
+        self.assertLessEqual(self.server.connections, 8)  # Connections are reused
+        self.assertLess(elapsed, 40 * 0.05)
+
+    async def test_geocode_all_return_exceptions(self):
+        async with AsyncGeocoder(endpoints=self.server.endpoints) as geocoder:
+            results = await geocoder.geocode_all(
+                ["Mountain View", "Invalid Address"], return_exceptions=True
+            )
+        self.assertEqual(results[0], LOCATION)
+        self.assertIsInstance(results[1], ValueError)
+
+    async def test_geocode_shares_duplicate_requests(self):
+        async with AsyncGeocoder(endpoints=self.server.endpoints) as geocoder:
+            results = await asyncio.gather(
+                *(geocoder.geocode("Mountain View") for _ in range(5))
+            )
+        self.assertEqual(results, [LOCATION] * 5)
+        self.assertEqual(self.server.requests, 1)
+
+
+class TestGeocodeMany(unittest.TestCase):
+    def setUp(self):
+        self.server = StubGeocodingServer(delay=0.01).__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.addCleanup(Config.reset_config)
+
+    def test_geocode_many_in_order_with_dedupe(self):
+        addresses = [f"{i % 30} Main Street" for i in range(100)]
+        addresses[5] = "  0 main   STREET "  # Same as "0 Main Street"
+        stats = GeocodeStats()
+        results = list(
+            geocode_many(iter(addresses), endpoints=self.server.endpoints, stats=stats)
+        )
+        self.assertEqual(results, [(address, LOCATION) for address in addresses])
+        self.assertEqual(self.server.requests, 30)
+        self.assertEqual(stats.addresses, 100)
+        self.assertEqual(stats.unique, 30)
+        self.assertEqual(stats.duplicates, 70)
+        self.assertEqual(stats.requests, 30)
+        self.assertGreater(stats.throughput, 0)
+
+    def test_geocode_many_mapquest_batches(self):
+        addresses = [f"{i} Main Street" for i in range(250)]
+        addresses[10] = "Invalid Address"
+        stats = GeocodeStats()
+        results = list(
+            geocode_many(
+                addresses,
+                api="mapquest",
+                endpoints=self.server.endpoints,
+                return_exceptions=True,
+                stats=stats,
+            )
+        )
+        self.assertEqual([address for address, _ in results], addresses)
+        self.assertIsInstance(results[10][1], ValueError)
+        self.assertEqual(results[11][1], LOCATION)
+        self.assertEqual(self.server.requests, 3)  # 100 + 100 + 50 addresses
+        self.assertEqual(stats.requests, 3)
+        self.assertEqual(stats.errors, 1)
+
+    def test_geocode_many_raises(self):
+        results = geocode_many(
+            ["Mountain View", "Invalid Address"],
+            api="opencage",
+            endpoints=self.server.endpoints,
+        )
+        self.assertEqual(next(results), ("Mountain View", LOCATION))
+        with self.assertRaises(ValueError) as context:
+            next(results)
+        self.assertIn("Unsupported address format", str(context.exception))
+
+        with self.assertRaises(ValueError):
+            geocode_many([], api="unknown")
+
+    def test_geocode_many_rate_limit(self):
+        addresses = [f"{i} Main Street" for i in range(12)]
+        start = time.perf_counter()
+        results = list(
+            geocode_many(addresses, rate=20, endpoints=self.server.endpoints)
+        )
+        elapsed = time.perf_counter() - start
+        self.assertEqual(len(results), 12)
+        # Bursts of 20 tokens: no waiting for the first 12 requests
+        self.assertLess(elapsed, 0.5)
+
+        Config.geocode_rate_limits = {"google": 10}
+        start = time.perf_counter()
+        list(geocode_many(addresses, endpoints=self.server.endpoints))
+        # 10 tokens in the bucket, then 2 more at 10 per second
+        self.assertGreaterEqual(time.perf_counter() - start, 0.19)
+
+    def test_token_bucket(self):
+        bucket = TokenBucket(rate=100, capacity=2)
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertGreater(bucket.acquire(), 0.0)
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+
 if __name__ == "__main__":
     unittest.main()
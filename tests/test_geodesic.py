@@ -0,0 +1,195 @@
+import unittest
+import numpy as np
+from geotools.distance import batch_vincenty_distance
+from geotools.geodesic import (
+    MAX_ITERATIONS,
+    batch_geodesic_direct,
+    batch_geodesic_distance,
+    geodesic_direct,
+    geodesic_distance,
+    geodesic_inverse,
+)
+from geotools.points import PointArray
+
+# Reference solutions computed with GeographicLib (WGS-84): the two points,
+# the distance in kilometers and the azimuths at both points
+INVERSE_CASES = [
+    ((-41.32, 174.81), (40.96, -5.5), 19959.679267353822, 161.06766998616015, 18.825195123247063),
+    ((0, 0), (0.5, 179.5), 19936.288578965316, 25.67187286829188, 154.3270854699416),
+    ((0, 0), (0, 180), 20003.931458625448, 0.0, 180.0),
+    ((90, 0), (-90, 0), 20003.931458625448, 180.0, 180.0),
+    ((-30, 0), (29.9, 179.8), 19989.83282760953, 161.89052473632697, 18.0907372457395),
+    ((0, 0), (0, 179.5), 19980.86190889096, 55.966495140158635, 124.03350485984137),
+    ((51.5074, -0.1278), (40.7128, -74.006), 5585.2335789313, -71.63100188681736, -128.75877088048765),
+]  # fmt: skip
+
+# The start point, azimuth, distance in kilometers and the destination and final azimuth
+DIRECT_CASES = [
+    ((40.7128, -74.006), 51.0, 5000, (53.04753910475337, -8.337462984881498), 101.70740747937269),
+    ((-33.8688, 151.2093), -120, 15000, (5.7693349081672665, 9.462315894627295), -46.34118511237295),
+]  # fmt: skip
+
+
+def antipodal_pairs(n, spread=0.5, seed=0):
+    """
+    Return random pairs of points close to being antipodal.
+    """
+    rng = np.random.default_rng(seed)
+    points1 = np.column_stack([rng.uniform(-60, 60, n), rng.uniform(-180, 180, n)])
+    points2 = np.column_stack(
+        [
+            -points1[:, 0] + rng.uniform(-spread, spread, n),
+            points1[:, 1] + 180 + rng.uniform(-spread, spread, n),
+        ]
+    )
+    points2[:, 1] = (points2[:, 1] + 180) % 360 - 180
+    return points1, points2
+
+
+class TestGeodesicInverse(unittest.TestCase):
+    def test_reference_values(self):
+        for point1, point2, distance, azimuth1, azimuth2 in INVERSE_CASES:
+            with self.subTest(point1=point1, point2=point2):
+                result = geodesic_inverse(point1, point2)
+                self.assertAlmostEqual(result[0], distance, places=8)
+                self.assertAlmostEqual(result[1], azimuth1, places=9)
+                self.assertAlmostEqual(result[2], azimuth2, places=9)
+                self.assertAlmostEqual(
+                    geodesic_distance(point1, point2), distance, places=8
+                )
+
+    def test_same_point(self):
+        self.assertEqual(geodesic_distance((40.7128, -74.0060), (40.7128, -74.0060)), 0)
+
+    def test_units(self):
+        point1, point2 = (40.7128, -74.0060), (34.0522, -118.2437)
+        self.assertAlmostEqual(
+            geodesic_distance(point1, point2, unit="miles"),
+            geodesic_distance(point1, point2) * 0.62137119,
+            places=9,
+        )
+
+    def test_invalid_coordinates(self):
+        with self.assertRaises(ValueError):
+            geodesic_distance((100, 0), (0, 0))
+        with self.assertRaises(ValueError):
+            geodesic_inverse((0, 0), (0, 200))
+
+    def test_agrees_with_vincenty(self):
+        rng = np.random.default_rng(1)
+        points1 = np.column_stack(
+            [rng.uniform(-90, 90, 2000), rng.uniform(-180, 180, 2000)]
+        )
+        points2 = points1[::-1]
+        expected, iterations = batch_vincenty_distance(
+            points1, points2, return_iterations=True
+        )
+        converged = iterations < 100
+        result = batch_geodesic_distance(points1, points2)
+        np.testing.assert_allclose(
+            result[converged], expected[converged], rtol=0, atol=1e-6
+        )
+
+    def test_batch_matches_scalar(self):
+        points1, points2 = antipodal_pairs(500, spread=1)
+        expected = [geodesic_distance(p1, p2) for p1, p2 in zip(points1, points2)]
+        np.testing.assert_allclose(
+            batch_geodesic_distance(points1, points2), expected, rtol=0, atol=1e-9
+        )
+        special = [case[:2] for case in INVERSE_CASES]
+        np.testing.assert_allclose(
+            batch_geodesic_distance([p[0] for p in special], [p[1] for p in special]),
+            [case[2] for case in INVERSE_CASES],
+            rtol=0,
+            atol=1e-8,
+        )
+
+    def test_antipodal_convergence(self):
+        for spread in (1, 1e-3, 1e-7):
+            with self.subTest(spread=spread):
+                points1, points2 = antipodal_pairs(5000, spread)
+                distances, iterations = batch_geodesic_distance(
+                    points1, points2, return_iterations=True
+                )
+                self.assertLess(iterations.max(), 10)
+                self.assertLess(iterations.max(), MAX_ITERATIONS)
+                self.assertTrue(np.isfinite(distances).all())
+                self.assertLessEqual(distances.max(), 20003.931458625448 + 1e-9)
+
+    def test_batch_input(self):
+        points = PointArray([(40.7128, -74.0060), (34.0522, -118.2437)])
+        result = batch_geodesic_distance(points, (51.5074, -0.1278))
+        self.assertEqual(result.shape, (2,))
+        self.assertAlmostEqual(result[0], 5585.2335789313, places=8)
+        with self.assertRaises(ValueError):
+            batch_geodesic_distance([(0, 0), (1, 1)], [(0, 0), (1, 1), (2, 2)])
+        with self.assertRaises(ValueError):
+            batch_geodesic_distance([(0, 0), (91, 1)], (0, 0))
+
+
+class TestGeodesicDirect(unittest.TestCase):
+    def test_reference_values(self):
+        for point, azimuth, distance, destination, final_azimuth in DIRECT_CASES:
+            with self.subTest(point=point, azimuth=azimuth):
+                latitude, longitude, result = geodesic_direct(point, azimuth, distance)
+                self.assertAlmostEqual(latitude, destination[0], places=10)
+                self.assertAlmostEqual(longitude, destination[1], places=10)
+                self.assertAlmostEqual(result, final_azimuth, places=10)
+
+    def test_round_trip(self):
+        rng = np.random.default_rng(3)
+        for _ in range(200):
+            point1 = (rng.uniform(-90, 90), rng.uniform(-180, 180))
+            point2 = (rng.uniform(-90, 90), rng.uniform(-180, 180))
+            distance, azimuth1, azimuth2 = geodesic_inverse(point1, point2)
+            latitude, longitude, azimuth = geodesic_direct(point1, azimuth1, distance)
+            self.assertAlmostEqual(latitude, point2[0], places=8)
+            self.assertAlmostEqual(
+                (longitude - point2[1] + 180) % 360 - 180,
+                0,
+                delta=1e-8 / max(np.cos(np.radians(point2[0])), 1e-6),
+            )
+
+    def test_batch_matches_scalar(self):
+        rng = np.random.default_rng(4)
+        points = np.column_stack(
+            [rng.uniform(-90, 90, 300), rng.uniform(-180, 180, 300)]
+        )
+        azimuths = rng.uniform(-180, 180, 300)
+        distances = rng.uniform(-20000, 20000, 300)
+        destinations, final_azimuths = batch_geodesic_direct(
+            points, azimuths, distances
+        )
+        for i in range(300):
+            latitude, longitude, azimuth = geodesic_direct(
+                tuple(points[i]), azimuths[i], distances[i]
+            )
+            self.assertAlmostEqual(destinations[i, 0], latitude, places=9)
+            self.assertAlmostEqual(
+                (destinations[i, 1] - longitude + 180) % 360 - 180, 0, places=9
+            )
+            self.assertAlmostEqual(
+                (final_azimuths[i] - azimuth + 180) % 360 - 180, 0, places=9
+            )
+
+    def test_batch_broadcasting(self):
+        destinations, _ = batch_geodesic_direct((0, 0), [0, 90, 180, -90], 1000)
+        self.assertEqual(destinations.shape, (4, 2))
+        self.assertAlmostEqual(destinations[1, 1], 8.983152841195215, places=10)
+        self.assertAlmostEqual(destinations[0, 0], -destinations[2, 0], places=10)
+        miles, _ = batch_geodesic_direct((0, 0), 90, 1000 * 0.62137119, unit="miles")
+        self.assertAlmostEqual(miles[1], 8.983152841195215, places=9)
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            geodesic_direct((0, 0), float("nan"), 10)
+        with self.assertRaises(ValueError):
+            geodesic_direct((-91, 0), 0, 10)
+        with self.assertRaises(ValueError):
+            batch_geodesic_direct([(0, 0), (1, 1)], [0, 1, 2], 10)
+        with self.assertRaises(ValueError):
+            batch_geodesic_direct((0, 0), 0, [1, float("inf")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+
+def loaded_modules(statement, modules=("numpy", "requests", "asyncio")):
+    """
+    Run a statement in a fresh interpreter and return which of the modules it loaded.
+    """
+    code = f"{statement}\nimport sys\nprint('loaded:' + ','.join(m for m in {modules!r} if m in sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=ROOT,
+    ).stdout.splitlines()[-1]
+    return set(filter(None, output[len("loaded:") :].split(",")))
+
+
+class TestLazyImport(unittest.TestCase):
+    def test_import_package(self):
+        self.assertEqual(loaded_modules("import geotools"), set())
+
+    def test_import_analysis(self):
+        self.assertNotIn("requests", loaded_modules("import geotools.analysis"))
+
+    def test_import_geocode(self):
+        self.assertEqual(loaded_modules("import geotools.geocode"), set())
+
+    def test_scalar_distance_without_numpy(self):
+        statement = (
+            "from geotools import haversine_distance, vincenty_distance\n"
+            "print(round(haversine_distance((40.7128, -74.0060), (34.0522, -118.2437))))\n"
+            "vincenty_distance((40.7128, -74.0060), (34.0522, -118.2437))\n"
+            "from geotools import geodesic_direct, geodesic_distance\n"
+            "geodesic_distance((0, 0), (0.5, 179.5))\n"
+            "geodesic_direct((0, 0), 45, 1000)"
+        )
+        self.assertNotIn("numpy", loaded_modules(statement))
+
+    def test_lazy_attributes(self):
+        import geotools
+        from geotools.analysis import calculate_centroid
+        from geotools.index import SpatialIndex
+
+        self.assertIs(geotools.calculate_centroid, calculate_centroid)
+        self.assertIs(geotools.SpatialIndex, SpatialIndex)
+        self.assertIs(geotools.distance, sys.modules["geotools.distance"])
+        self.assertIn("geocode_many", dir(geotools))
+        with self.assertRaises(AttributeError):
+            geotools.missing_attribute
+
+    def test_lazy_numpy(self):
+        statement = (
+            "from geotools.distance import batch_haversine_distance\n"
+            "print(batch_haversine_distance([(0, 0)], [(0, 1)]))"
+        )
+        self.assertIn("numpy", loaded_modules(statement))
+
+    def test_lazy_package_module_sees_changes(self):
+        import geotools.parallel
+        from geotools import distance
+
+        distance.parallel.resolve_workers(1)  # Import through the placeholder
+        with patch.object(geotools.parallel, "resolve_workers", return_value=7):
+            self.assertEqual(distance.parallel.resolve_workers(1), 7)
+        self.assertEqual(distance.parallel.resolve_workers(1), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
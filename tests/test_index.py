@@ -0,0 +1,193 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from geotools.distance import distance_matrix
+from geotools.index import SpatialIndex, nearest_join
+
+
+class TestSpatialIndex(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        self.points = np.column_stack(
+            [rng.uniform(-90, 90, 2000), rng.uniform(-180, 180, 2000)]
+        )
+        self.queries = np.column_stack(
+            [rng.uniform(-90, 90, 200), rng.uniform(-180, 180, 200)]
+        )
+        self.index = SpatialIndex(self.points, leaf_size=16)
+        self.matrix = distance_matrix(self.queries, self.points)
+
+    def test_query_nearest(self):
+        indices, distances = self.index.query(self.queries, k=1)
+        self.assertEqual(indices.shape, (200, 1))
+        np.testing.assert_array_equal(indices[:, 0], np.argmin(self.matrix, axis=1))
+        np.testing.assert_allclose(distances[:, 0], np.min(self.matrix, axis=1))
+
+    def test_query_k_nearest(self):
+        indices, distances = self.index.query(self.queries, k=7)
+        np.testing.assert_allclose(distances, np.sort(self.matrix, axis=1)[:, :7])
+        np.testing.assert_allclose(
+            np.take_along_axis(self.matrix, indices, axis=1), distances
+        )
+
+    def test_query_single_point(self):
+        point = (40.7128, -74.0060)  # New York City
+        indices, distances = self.index.query(point, k=3)
+        self.assertEqual(indices.shape, (3,))
+        expected = distance_matrix([point], self.points)[0]
+        np.testing.assert_array_equal(indices, np.argsort(expected)[:3])
+        np.testing.assert_allclose(distances, np.sort(expected)[:3])
+
+    def test_query_vincenty(self):
+        indices, distances = self.index.query(self.queries[:50], k=3, method="vincenty")
+        matrix = distance_matrix(self.queries[:50], self.points, method="vincenty")
+        np.testing.assert_allclose(distances, np.sort(matrix, axis=1)[:, :3])
+
+    def test_query_units(self):
+        _, distances_km = self.index.query(self.queries, k=2, unit="km")
+        _, distances_miles = self.index.query(self.queries, k=2, unit="miles")
+        np.testing.assert_allclose(distances_miles, distances_km * 0.621371)
+
+    def test_query_radius(self):
+        indices, distances = self.index.query_radius(self.queries, 1500)
+        self.assertEqual(len(indices), 200)
+        for i in range(200):
+            expected = np.flatnonzero(self.matrix[i] <= 1500)
+            self.assertEqual(sorted(indices[i]), sorted(expected))
+            np.testing.assert_allclose(distances[i], np.sort(self.matrix[i][expected]))
+
+    def test_query_radius_vincenty(self):
+        indices, _ = self.index.query_radius(self.queries[:50], 1500, method="vincenty")
+        matrix = distance_matrix(self.queries[:50], self.points, method="vincenty")
+        for i in range(50):
+            self.assertEqual(
+                sorted(indices[i]), sorted(np.flatnonzero(matrix[i] <= 1500))
+            )
+
+    def test_query_radius_single_point(self):
+        indices, distances = self.index.query_radius((0.0, 0.0), 0)
+        self.assertEqual(indices.shape, (0,))
+        self.assertEqual(distances.shape, (0,))
+
+        indices, _ = self.index.query_radius(tuple(self.points[5]), 0)
+        self.assertIn(5, indices)
+
+    def test_small_index(self):
+        index = SpatialIndex([(40.7128, -74.0060)])
+        indices, distances = index.query((34.0522, -118.2437))
+        self.assertEqual(indices[0], 0)
+        self.assertAlmostEqual(distances[0], 3935.75, places=2)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError) as context:
+            SpatialIndex(np.empty((0, 2)))
+        self.assertIn("No points provided", str(context.exception))
+
+        with self.assertRaises(ValueError) as context:
+            self.index.query(self.queries, k=0)
+        self.assertIn("k must be between 1", str(context.exception))
+
+        with self.assertRaises(ValueError) as context:
+            self.index.query(self.queries, method="manhattan")
+        self.assertIn("Unsupported method", str(context.exception))
+
+        with self.assertRaises(ValueError) as context:
+            self.index.query_radius((91.0, 0.0), 10)
+        self.assertIn("Invalid coordinates for points", str(context.exception))
+
+    def test_save_and_load(self):
+        expected = self.index.query(self.queries, k=4)
+        for name in ("index.npz", "stores.idx"):
+            with self.subTest(name=name), tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, name)
+                self.index.save(path)
+                self.assertEqual(os.listdir(directory), [name])
+                loaded = SpatialIndex.load(path)
+                self.assertEqual(len(loaded), len(self.index))
+                self.assertEqual(loaded.leaf_size, 16)
+                result = loaded.query(self.queries, k=4)
+                np.testing.assert_array_equal(result[0], expected[0])
+                np.testing.assert_array_equal(result[1], expected[1])
+
+
+class TestNearestJoin(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(12)
+        self.right = np.column_stack(
+            [rng.uniform(-90, 90, 3000), rng.uniform(-180, 180, 3000)]
+        )
+        self.left = np.column_stack(
+            [rng.uniform(-90, 90, 5000), rng.uniform(-180, 180, 5000)]
+        )
+        self.matrix = distance_matrix(self.left[:300], self.right)
+
+    def test_nearest(self):
+        indices, distances = nearest_join(self.left, self.right)
+        self.assertEqual(indices.shape, (5000, 1))
+        self.assertEqual(distances.shape, (5000, 1))
+        np.testing.assert_array_equal(indices[:300, 0], self.matrix.argmin(axis=1))
+        np.testing.assert_allclose(distances[:300, 0], self.matrix.min(axis=1))
+
+    def test_k_nearest(self):
+        indices, distances = nearest_join(self.left, self.right, k=4)
+        expected = np.argsort(self.matrix, axis=1)[:, :4]
+        np.testing.assert_array_equal(indices[:300], expected)
+        np.testing.assert_allclose(
+            distances[:300], np.take_along_axis(self.matrix, expected, axis=1)
+        )
+
+    def test_clustered_right(self):
+        # Points far from a dense cluster have many candidates each
+        rng = np.random.default_rng(13)
+        right = np.column_stack([rng.normal(48, 0.5, 2000), rng.normal(2, 0.5, 2000)])
+        matrix = distance_matrix(self.left[:300], right)
+        for k in (1, 5):
+            with self.subTest(k=k):
+                indices, _ = nearest_join(self.left[:300], right, k=k)
+                np.testing.assert_array_equal(
+                    indices, np.argsort(matrix, axis=1)[:, :k]
+                )
+
+    def test_max_distance(self):
+        indices, distances = nearest_join(
+            self.left, self.right, k=2, max_distance=150, unit="miles"
+        )
+        miles = self.matrix * 0.621371
+        expected = np.sort(miles, axis=1)[:, :2]
+        far = expected > 150
+        self.assertTrue(far.any() and not far.all())
+        np.testing.assert_array_equal(indices[:300] == -1, far)
+        self.assertTrue(np.isinf(distances[:300][far]).all())
+        np.testing.assert_allclose(distances[:300][~far], expected[~far])
+
+    def test_index_and_workers(self):
+        index = SpatialIndex(self.right)
+        expected = nearest_join(self.left, self.right, k=2, method="vincenty")
+        for result in (
+            nearest_join(self.left, index, k=2, method="vincenty"),
+            nearest_join(self.left, self.right, k=2, method="vincenty", workers=2),
+        ):
+            np.testing.assert_array_equal(result[0], expected[0])
+            np.testing.assert_array_equal(result[1], expected[1])
+
+    def test_single_point(self):
+        indices, distances = nearest_join((40.7128, -74.0060), self.right, k=3)
+        self.assertEqual(indices.shape, (3,))
+        expected = SpatialIndex(self.right).query((40.7128, -74.0060), k=3)
+        np.testing.assert_array_equal(indices, expected[0])
+        np.testing.assert_array_equal(distances, expected[1])
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            nearest_join(self.left, self.right, k=3001)
+        with self.assertRaises(ValueError):
+            nearest_join(self.left, self.right, max_distance=-1)
+        with self.assertRaises(ValueError):
+            nearest_join(self.left, self.right, method="manhattan")
+        with self.assertRaises(ValueError):
+            nearest_join([(0, 0), (91, 0)], self.right)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,220 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from geotools.analysis import batch_iterator, calculate_centroid
+from geotools.distance import batch_haversine_distance
+from geotools.io import (
+    MAGIC,
+    PointFileWriter,
+    read_csv,
+    read_geojson,
+    read_points,
+    write_points,
+)
+from geotools.points import PointArray
+
+
+class TestPointFile(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "points.bin")
+        rng = np.random.default_rng(3)
+        self.points = np.column_stack(
+            [rng.uniform(-90, 90, 10000), rng.uniform(-180, 180, 10000)]
+        )
+        self.ids = np.arange(10000, dtype=np.int64) * 7
+        self.weights = rng.uniform(0, 5, 10000)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        count = write_points(self.path, self.points, self.ids, self.weights)
+        self.assertEqual(count, 10000)
+        with open(self.path, "rb") as file:
+            self.assertEqual(file.read(8), MAGIC)
+
+        with read_points(self.path) as point_file:
+            self.assertEqual(len(point_file), 10000)
+            self.assertIsInstance(point_file.points, PointArray)
+            self.assertIsInstance(point_file.points.latitudes, np.memmap)
+            np.testing.assert_array_equal(point_file.points.to_numpy(), self.points)
+            np.testing.assert_array_equal(point_file.ids, self.ids)
+            np.testing.assert_array_equal(point_file.weights, self.weights)
+
+    def test_without_ids_and_weights(self):
+        write_points(self.path, PointArray(self.points), dtype="float32")
+        point_file = read_points(self.path, validate=True)
+        self.assertEqual(point_file.points.dtype, np.float32)
+        self.assertIsNone(point_file.ids)
+        self.assertIsNone(point_file.weights)
+        np.testing.assert_allclose(point_file.points.to_numpy(), self.points, rtol=1e-6)
+
+    def test_streamed_chunks(self):
+        with PointFileWriter(self.path, weights=True) as writer:
+            for start in range(0, 10000, 3000):
+                writer.append(
+                    self.points[start : start + 3000],
+                    weights=self.weights[start : start + 3000],
+                )
+        self.assertEqual(writer.count, 10000)
+        point_file = read_points(self.path)
+        np.testing.assert_array_equal(point_file.points.to_numpy(), self.points)
+        np.testing.assert_array_equal(point_file.weights, self.weights)
+
+        write_points(self.path, batch_iterator(self.points, 999), ids=iter(self.ids))
+        np.testing.assert_array_equal(read_points(self.path).ids, self.ids)
+
+    def test_analysis_and_distance(self):
+        write_points(self.path, self.points, weights=self.weights)
+        point_file = read_points(self.path)
+        result = calculate_centroid(point_file.points, weights=point_file.weights)
+        expected = calculate_centroid(self.points, weights=self.weights)
+        self.assertAlmostEqual(result[0], expected[0], places=12)
+        self.assertAlmostEqual(result[1], expected[1], places=12)
+        np.testing.assert_array_equal(
+            batch_haversine_distance(point_file.points, (0, 0)),
+            batch_haversine_distance(self.points, (0, 0)),
+        )
+
+    def test_empty(self):
+        write_points(self.path, [])
+        self.assertEqual(len(read_points(self.path)), 0)
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            write_points(self.path, [(100, 0)])
+        self.assertFalse(os.path.exists(self.path))
+        with self.assertRaises(ValueError):
+            write_points(self.path, self.points, ids=self.ids[:10])
+        with self.assertRaises(ValueError):
+            write_points(self.path, self.points, weights=-self.weights)
+        with PointFileWriter(self.path) as writer:
+            with self.assertRaises(ValueError):
+                writer.append(self.points, weights=self.weights)
+
+    def test_invalid_file(self):
+        with open(self.path, "wb") as file:
+            file.write(b"latitude,longitude\n")
+        with self.assertRaises(ValueError):
+            read_points(self.path)
+
+        write_points(self.path, self.points)
+        with open(self.path, "r+b") as file:
+            file.truncate(1000)
+        with self.assertRaises(ValueError) as context:
+            read_points(self.path)
+        self.assertIn("truncated", str(context.exception))
+
+
+class TestTextReaders(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(5)
+        self.points = np.column_stack(
+            [rng.uniform(-90, 90, 5000), rng.uniform(-180, 180, 5000)]
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w") as file:
+            file.write(text)
+        return path
+
+    def test_read_csv(self):
+        lines = ["id,name,Latitude,Longitude"] + [
+            f'{i},"Store {i}, Main St",{lat!r},{lon!r}'
+            for i, (lat, lon) in enumerate(self.points.tolist())
+        ]
+        path = self.write("points.csv", "\n".join(lines))  # No final newline
+        chunks = list(read_csv(path, block_size=10000))
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(isinstance(chunk, PointArray) for chunk in chunks))
+        np.testing.assert_array_equal(
+            np.concatenate([chunk.to_numpy() for chunk in chunks]), self.points
+        )
+
+        batches = list(batch_iterator(read_csv(path, block_size=10000), 2000))
+        self.assertEqual([len(batch) for batch in batches], [2000, 2000, 1000])
+        result = calculate_centroid(read_csv(path, block_size=10000))
+        expected = calculate_centroid(self.points)
+        self.assertAlmostEqual(result[0], expected[0], places=12)
+        self.assertAlmostEqual(result[1], expected[1], places=12)
+
+    def test_read_csv_without_header(self):
+        path = self.write("points.csv", "1.5;2.5\r\n3.5;4.5\r\n")
+        chunks = list(
+            read_csv(path, latitude=0, longitude=1, delimiter=";", header=False)
+        )
+        self.assertEqual(list(chunks[0]), [(1.5, 2.5), (3.5, 4.5)])
+        with self.assertRaises(ValueError):
+            list(read_csv(path, header=False))
+
+    def test_read_csv_invalid(self):
+        path = self.write("points.csv", "latitude,longitude\n40.7,-74.0\n95.0,0.0\n")
+        with self.assertRaises(ValueError):
+            list(read_csv(path))
+        with self.assertRaises(ValueError):
+            list(read_csv(path, latitude="lat"))
+
+    def test_read_geojson(self):
+        features = [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [lon, lat]},
+                "properties": {"id": i},
+            }
+            for i, (lat, lon) in enumerate(self.points.tolist())
+        ]
+        features.insert(
+            10,
+            {
+                "type": "Feature",
+                "geometry": {"type": "LineString", "coordinates": [[0, 0], [1, 1]]},
+                "properties": {},
+            },
+        )
+        features[20]["geometry"]["coordinates"].append(120.5)  # Elevation
+        # Flat "coordinates" arrays outside of Point geometries are skipped
+        features[30]["properties"]["coordinates"] = [1.5, 2.5]
+        # Reversed member order
+        features[40]["geometry"] = dict(reversed(features[40]["geometry"].items()))
+        features[40]["properties"]["type"] = "Point"
+        features[40]["properties"]["coordinates"] = [3.5]
+        features.insert(
+            50,
+            {
+                "type": "Feature",
+                "geometry": {"type": "Unknown", "coordinates": [5, 5]},
+                "properties": {},
+            },
+        )
+        features.insert(
+            60,
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": []},
+                "properties": {"coordinates": [1, 2, 3, 4]},
+            },
+        )
+        collection = {"type": "FeatureCollection", "features": features}
+        path = self.write("points.geojson", json.dumps(collection, indent=2))
+        chunks = list(read_geojson(path, block_size=20000))
+        self.assertGreater(len(chunks), 1)
+        np.testing.assert_array_equal(
+            np.concatenate([chunk.to_numpy() for chunk in chunks]), self.points
+        )
+
+        sequence = "\n".join(json.dumps(feature) for feature in features[:100])
+        path = self.write("points.geojsonl", sequence)
+        points = np.concatenate([c.to_numpy() for c in read_geojson(path)])
+        np.testing.assert_array_equal(points, self.points[:97])
+
+
+if __name__ == "__main__":
+    unittest.main()
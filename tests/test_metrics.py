@@ -0,0 +1,166 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from geotools.analysis import calculate_centroid
+from geotools.config import Config
+from geotools.distance import (
+    batch_haversine_distance,
+    get_distance_cache,
+    haversine_distance,
+)
+from geotools.geocode import AsyncGeocoder, geocode_address, geocode_many
+from geotools.metrics import MetricsRegistry, instrument, registry
+from stub_server import INVALID_KEY, StubGeocodingServer
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        registry.reset()
+        Config.update_config(distance_cache_size=128, metrics_enabled=True)
+        get_distance_cache().clear()
+
+    def tearDown(self):
+        Config.reset_config()
+        registry.reset()
+
+    def test_disabled_records_nothing(self):
+        Config.metrics_enabled = False
+        haversine_distance((40.7128, -74.0060), (34.0522, -118.2437))
+        calculate_centroid([(0, 0), (1, 1)])
+        snapshot = registry.snapshot()
+        self.assertNotIn('calls{function="haversine_distance"}', snapshot["counters"])
+        self.assertEqual(snapshot["histograms"], {})
+
+    def test_function_calls_and_latency(self):
+        point1 = (40.7128, -74.0060)  # New York City
+        point2 = (34.0522, -118.2437)  # Los Angeles
+        haversine_distance(point1, point2)
+        haversine_distance(point1, point2)
+        batch_haversine_distance(np.array([point1]), np.array([point2]))
+        calculate_centroid([point1, point2])
+
+        snapshot = registry.snapshot()
+        counters = snapshot["counters"]
+        self.assertEqual(counters['calls{function="haversine_distance"}'], 2)
+        self.assertEqual(counters['calls{function="batch_haversine_distance"}'], 1)
+        self.assertEqual(counters['calls{function="calculate_centroid"}'], 1)
+        self.assertEqual(counters["distance_cache_hits"], 1)
+        self.assertEqual(counters["distance_cache_misses"], 1)
+
+        histogram = snapshot["histograms"]['latency{function="haversine_distance"}']
+        self.assertEqual(histogram["count"], 2)
+        self.assertEqual(sum(histogram["buckets"].values()), 2)
+        self.assertGreater(histogram["sum"], 0)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            haversine_distance((100, 0), (0, 0))
+        counters = registry.snapshot()["counters"]
+        self.assertEqual(
+            counters['errors{error="ValueError",function="haversine_distance"}'], 1
+        )
+
+    def test_geocode_metrics(self):
+        Config.geocode_rate_limits = {}
+        with StubGeocodingServer() as server:
+            results = list(
+                geocode_many(
+                    ["Mountain View", "Invalid Address"],
+                    endpoints=server.endpoints,
+                    return_exceptions=True,
+                )
+            )
+        self.assertIsInstance(results[1][1], ValueError)
+
+        snapshot = registry.snapshot()
+        self.assertEqual(
+            snapshot["counters"][
+                'geocode_errors{error="AddressNotFoundError",provider="google"}'
+            ],
+            1,
+        )
+        histogram = snapshot["histograms"]['geocode_request{provider="google"}']
+        self.assertEqual(histogram["count"], 2)
+
+    def test_prometheus_and_dump(self):
+        haversine_distance((40.7128, -74.0060), (34.0522, -118.2437))
+        text = registry.to_prometheus()
+        self.assertIn('geotools_calls{function="haversine_distance"} 1\n', text)
+        self.assertIn(
+            'geotools_latency_seconds_bucket{function="haversine_distance",le="+Inf"} 1',
+            text,
+        )
+        self.assertIn(
+            'geotools_latency_seconds_count{function="haversine_distance"} 1', text
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metrics.json")
+            registry.dump(path)
+            with open(path) as file:
+                self.assertEqual(json.load(file), registry.snapshot())
+
+    def test_registry(self):
+        metrics = MetricsRegistry()
+        metrics.increment("requests", provider="google")
+        metrics.increment("requests", 2, provider="google")
+        metrics.observe("wait", 0.003)
+        metrics.add_collector(lambda: {"queue_size": 7})
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["counters"]['requests{provider="google"}'], 3)
+        self.assertEqual(snapshot["counters"]["queue_size"], 7)
+        self.assertEqual(snapshot["histograms"]["wait"]["buckets"]["0.005"], 1)
+
+        metrics.reset()
+        self.assertEqual(metrics.snapshot()["counters"], {"queue_size": 7})
+
+    def test_instrument_decorator(self):
+        @instrument("custom")
+        def function(x):
+            return x * 2
+
+        self.assertEqual(function(2), 4)
+        self.assertEqual(function.__name__, "function")
+        self.assertEqual(registry.snapshot()["counters"]['calls{function="custom"}'], 1)
+
+    def test_geocode_address_lru_hits(self):
+        geocode_address.cache_clear()
+        self.addCleanup(geocode_address.cache_clear)
+        with StubGeocodingServer() as server:
+            Config.geocode_endpoints = server.endpoints
+            geocode_address("Mountain View")
+            geocode_address("Mountain View")
+
+        counters = registry.snapshot()["counters"]
+        self.assertEqual(counters['calls{function="geocode_address"}'], 2)
+        self.assertEqual(counters["geocode_lru_hits"], 1)
+        self.assertEqual(counters["geocode_lru_misses"], 1)
+
+
+class TestAsyncMetrics(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        registry.reset()
+        Config.metrics_enabled = True
+
+    def tearDown(self):
+        Config.reset_config()
+        registry.reset()
+
+    async def test_async_geocoder_metrics(self):
+        with StubGeocodingServer() as server:
+            async with AsyncGeocoder(endpoints=server.endpoints) as geocoder:
+                await geocoder.geocode("Mountain View")
+                with self.assertRaises(ValueError):
+                    await geocoder.geocode("Mountain View", api_key=INVALID_KEY)
+
+        counters = registry.snapshot()["counters"]
+        self.assertEqual(counters['calls{function="AsyncGeocoder.geocode"}'], 2)
+        self.assertEqual(
+            counters['geocode_errors{error="ValueError",provider="google"}'], 1
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
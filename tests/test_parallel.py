@@ -0,0 +1,129 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import numpy as np
+from geotools.config import Config
+from geotools.distance import (
+    batch_haversine_distance,
+    batch_vincenty_distance,
+    distance_matrix,
+)
+from geotools.parallel import _SharedArray, map_chunks, resolve_workers
+
+
+def _add_into(out, values, offset):
+    out[...] = values + offset
+
+
+class TestParallel(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        self.points1 = np.column_stack(
+            [rng.uniform(-90, 90, 2000), rng.uniform(-180, 180, 2000)]
+        )
+        self.points2 = np.column_stack(
+            [rng.uniform(-90, 90, 2000), rng.uniform(-180, 180, 2000)]
+        )
+        Config.chunk_size = 300
+
+    def tearDown(self):
+        Config.reset_config()
+
+    def test_resolve_workers(self):
+        self.assertEqual(resolve_workers(), 1)
+        self.assertEqual(resolve_workers(0), 1)
+        Config.workers = None
+        self.assertGreaterEqual(resolve_workers(), 1)
+
+    def test_map_chunks(self):
+        values = np.arange(1000, dtype=np.float64)
+        out = map_chunks(
+            _add_into, np.empty(1000), [values], [True], args=(1,), workers=2
+        )
+        np.testing.assert_array_equal(out, values + 1)
+
+    def test_batch_haversine_parallel(self):
+        serial = batch_haversine_distance(self.points1, self.points2)
+        parallel = batch_haversine_distance(self.points1, self.points2, workers=2)
+        np.testing.assert_array_equal(parallel, serial)
+
+        point = (40.7128, -74.0060)  # New York City
+        np.testing.assert_array_equal(
+            batch_haversine_distance(point, self.points2, unit="miles", workers=2),
+            batch_haversine_distance(point, self.points2, unit="miles"),
+        )
+
+    def test_batch_vincenty_parallel(self):
+        serial, serial_iterations = batch_vincenty_distance(
+            self.points1, self.points2, return_iterations=True
+        )
+        parallel, iterations = batch_vincenty_distance(
+            self.points1, self.points2, return_iterations=True, workers=2
+        )
+        np.testing.assert_array_equal(parallel, serial)
+        np.testing.assert_array_equal(iterations, serial_iterations)
+
+    def test_distance_matrix_parallel(self):
+        Config.chunk_size = 20000
+        np.testing.assert_array_equal(
+            distance_matrix(self.points1[:500], self.points2[:300], workers=2),
+            distance_matrix(self.points1[:500], self.points2[:300]),
+        )
+        np.testing.assert_allclose(
+            distance_matrix(self.points1[:200], workers=2),
+            distance_matrix(self.points1[:200]),
+            rtol=1e-12,
+            atol=1e-9,
+        )
+
+    def test_distance_matrix_parallel_memmap(self):
+        Config.chunk_size = 20000
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "matrix.npy")
+            result = distance_matrix(
+                self.points1[:500],
+                self.points2[:300],
+                dtype=np.float32,
+                filename=filename,
+                workers=2,
+            )
+            self.assertIsInstance(result, np.memmap)
+            del result
+            np.testing.assert_array_equal(
+                np.load(filename),
+                distance_matrix(
+                    self.points1[:500], self.points2[:300], dtype=np.float32
+                ),
+            )
+
+    def test_distance_matrix_parallel_out_memmap(self):
+        Config.chunk_size = 20000
+        points1, points2 = self.points1[:500], self.points2[:300]
+        expected = distance_matrix(points1, points2)
+        with tempfile.TemporaryDirectory() as directory, patch(
+            "geotools.parallel._SharedArray", wraps=_SharedArray
+        ) as shared:
+            out = np.memmap(
+                os.path.join(directory, "matrix.bin"),
+                dtype=np.float64,
+                mode="w+",
+                shape=(500, 300),
+            )
+            result = distance_matrix(points1, points2, out=out, workers=2)
+            self.assertIs(result, out)
+            np.testing.assert_array_equal(out, expected)
+            # The inputs go to shared memory, but the output is never copied
+            shapes = [call.args[0] for call in shared.call_args_list]
+            self.assertNotIn((500, 300), shapes)
+
+            # A view cannot be opened by the workers, so it is filled in place
+            out[...] = 0
+            distance_matrix(points1[100:], points2, out=out[100:], workers=2)
+            np.testing.assert_array_equal(out[100:], expected[100:])
+            self.assertNotIn((400, 300), [c.args[0] for c in shared.call_args_list])
+            del result, out
+
+
+if __name__ == "__main__":
+    unittest.main()
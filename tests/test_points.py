@@ -0,0 +1,173 @@
+import os
+import pickle
+import tempfile
+import unittest
+import numpy as np
+from geotools.analysis import batch_iterator, calculate_centroid
+from geotools.distance import (
+    batch_haversine_distance,
+    batch_vincenty_distance,
+    distance_matrix,
+)
+from geotools.index import SpatialIndex
+from geotools.points import PointArray
+
+CITIES = [
+    (40.7128, -74.0060),  # New York City
+    (34.0522, -118.2437),  # Los Angeles
+    (41.8781, -87.6298),  # Chicago
+    (51.5074, -0.1278),  # London
+]
+
+
+class TestPointArray(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.array = np.column_stack(
+            [rng.uniform(-90, 90, 1000), rng.uniform(-180, 180, 1000)]
+        )
+
+    def test_from_list(self):
+        points = PointArray(CITIES)
+        self.assertEqual(len(points), 4)
+        self.assertEqual(points.shape, (4, 2))
+        self.assertEqual(points.dtype, np.float64)
+        self.assertEqual(points[1], (34.0522, -118.2437))
+        self.assertEqual(points[-1], (51.5074, -0.1278))
+        self.assertEqual(list(points), CITIES)
+        np.testing.assert_array_equal(points.latitudes, [c[0] for c in CITIES])
+        np.testing.assert_array_equal(points.longitudes, [c[1] for c in CITIES])
+
+    def test_columns_are_contiguous(self):
+        points = PointArray(self.array)
+        self.assertTrue(points.latitudes.flags.c_contiguous)
+        self.assertTrue(points.longitudes.flags.c_contiguous)
+        self.assertEqual(points.nbytes, 16000)
+        self.assertEqual(PointArray(self.array, dtype="float32").nbytes, 8000)
+
+    def test_zero_copy(self):
+        points = PointArray(self.array)
+        view = points[100:200]
+        self.assertIsInstance(view, PointArray)
+        self.assertEqual(len(view), 100)
+        self.assertTrue(np.shares_memory(view.latitudes, points.latitudes))
+
+        array = np.asarray(points)
+        self.assertEqual(array.shape, (1000, 2))
+        self.assertTrue(np.shares_memory(array, points.latitudes))
+        np.testing.assert_array_equal(array, self.array)
+        self.assertFalse(array.flags.writeable)
+
+        copy = points.copy()
+        self.assertFalse(np.shares_memory(copy.latitudes, points.latitudes))
+
+    def test_fancy_indexing(self):
+        points = PointArray(CITIES)
+        selected = points[np.array([3, 0])]
+        self.assertEqual(list(selected), [CITIES[3], CITIES[0]])
+        self.assertEqual(len(points[points.latitudes > 40]), 3)
+
+    def test_input_array_is_not_modified(self):
+        array = np.array([[1.0, 2.0]])
+        PointArray(array)
+        self.assertTrue(array.flags.writeable)
+
+    def test_from_columns(self):
+        points = PointArray.from_columns(self.array[:, 0], self.array[:, 1])
+        np.testing.assert_array_equal(points.to_numpy(), self.array)
+        with self.assertRaises(ValueError):
+            PointArray.from_columns([1, 2], [3])
+
+    def test_from_csv(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "points.csv")
+            with open(path, "w") as file:
+                file.write("id,Latitude,Longitude,name\n")
+                file.write('1,40.7128,-74.0060,"New York, NY"\n')
+                file.write("2,34.0522,-118.2437,Los Angeles\n")
+            points = PointArray.from_csv(path, dtype="float32")
+            self.assertEqual(points.dtype, np.float32)
+            np.testing.assert_allclose(points.to_numpy(), CITIES[:2], rtol=1e-6)
+
+            with self.assertRaises(ValueError) as context:
+                PointArray.from_csv(path, latitude="lat")
+            self.assertIn("Column 'lat' not found", str(context.exception))
+
+    def test_invalid_points(self):
+        with self.assertRaises(ValueError) as context:
+            PointArray([(40.7128, -74.0060), (100, 0)])
+        self.assertIn("at index 1", str(context.exception))
+        with self.assertRaises(ValueError):
+            PointArray([(1, 2, 3)])
+        with self.assertRaises(ValueError):
+            PointArray([("a", "b")])
+        with self.assertRaises(ValueError):
+            PointArray(CITIES, dtype="int64")
+
+    def test_empty(self):
+        points = PointArray()
+        self.assertEqual(len(points), 0)
+        self.assertEqual(np.asarray(points).shape, (0, 2))
+
+    def test_pickle(self):
+        points = PointArray(self.array)[::2]
+        restored = pickle.loads(pickle.dumps(points))
+        np.testing.assert_array_equal(restored.to_numpy(), points.to_numpy())
+
+
+class TestPointArrayFunctions(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.array = np.column_stack(
+            [rng.uniform(-90, 90, 500), rng.uniform(-180, 180, 500)]
+        )
+        self.points = PointArray(self.array)
+
+    def test_batch_distances(self):
+        np.testing.assert_array_equal(
+            batch_haversine_distance(self.points, self.points[::-1]),
+            batch_haversine_distance(self.array, self.array[::-1]),
+        )
+        np.testing.assert_array_equal(
+            batch_vincenty_distance(self.points[:50], CITIES[0]),
+            batch_vincenty_distance(self.array[:50], CITIES[0]),
+        )
+
+    def test_float32_distances(self):
+        points = PointArray(self.array, dtype="float32")
+        distances = batch_haversine_distance(points, self.points)
+        self.assertEqual(distances.dtype, np.float64)
+        self.assertLess(distances.max(), 0.01)
+
+    def test_distance_matrix(self):
+        np.testing.assert_array_equal(
+            distance_matrix(self.points[:100]), distance_matrix(self.array[:100])
+        )
+
+    def test_centroid(self):
+        expected = calculate_centroid(self.array)
+        self.assertEqual(calculate_centroid(self.points), expected)
+        result = calculate_centroid(batch_iterator(self.points, 100))
+        self.assertAlmostEqual(result[0], expected[0], places=12)
+        self.assertAlmostEqual(result[1], expected[1], places=12)
+        self.assertEqual(
+            calculate_centroid(self.points, method="spherical"),
+            calculate_centroid(self.array, method="spherical"),
+        )
+
+    def test_batch_iterator(self):
+        batches = list(batch_iterator(self.points, 200))
+        self.assertEqual([len(batch) for batch in batches], [200, 200, 100])
+        self.assertTrue(all(isinstance(batch, PointArray) for batch in batches))
+
+    def test_spatial_index(self):
+        index = SpatialIndex(self.points)
+        self.assertEqual(len(index), 500)
+        indices, _ = index.query(CITIES[0], k=3)
+        np.testing.assert_array_equal(
+            indices, SpatialIndex(self.array).query(CITIES[0], k=3)[0]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()